@@ -11,7 +11,6 @@ import logging
 import time
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Union
-from functools import lru_cache
 
 from flask import Blueprint, request, jsonify, current_app, send_file
 from flask import Response, stream_with_context
@@ -24,6 +23,7 @@ from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
 
 from ai_agents.mcp_core import get_mcp, TaskPriority
+from api.tile_cache import get_tile_cache, tiles_for_bbox, COUNTY_EXTENT
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -247,6 +247,121 @@ def get_layer_info(layer_name):
             "message": str(e)
         }), 500
 
+def _get_primary_key_column(cursor, layer_name: str) -> Optional[str]:
+    """
+    Get the single-column primary key of a layer table.
+    
+    Args:
+        cursor: Database cursor
+        layer_name: Name of the layer
+        
+    Returns:
+        Primary key column name, or None if the table has no single-column primary key
+    """
+    cursor.execute("""
+        SELECT a.attname AS column_name
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE n.nspname = 'public' AND c.relname = %s AND i.indisprimary
+    """, (layer_name,))
+    
+    columns = cursor.fetchall()
+    if len(columns) != 1:
+        return None
+    
+    return columns[0]["column_name"]
+
+def _estimate_row_count(cursor, query, params) -> int:
+    """
+    Estimate the number of rows a query returns from planner statistics.
+    
+    Args:
+        cursor: Database cursor
+        query: Query to estimate
+        params: Query parameters
+        
+    Returns:
+        Estimated row count
+    """
+    cursor.execute(sql.SQL("EXPLAIN (FORMAT JSON) {}").format(query), params or None)
+    plan = cursor.fetchone()["QUERY PLAN"]
+    
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def _stream_features(query, params, layer_name: str,
+                     key_column: Optional[str], limit: Optional[int],
+                     total_count: Optional[int], count_mode: str):
+    """
+    Stream a GeoJSON FeatureCollection from a server-side cursor.
+    
+    Geometries are passed through as the GeoJSON text produced by PostGIS
+    without being parsed. A pooled connection is taken only when the stream
+    starts, so a response that is never read holds none, and it is released
+    when the stream ends.
+    
+    Args:
+        query: Feature query, selecting the GeoJSON geometry as __geojson
+        params: Query parameters
+        layer_name: Name of the layer
+        key_column: Keyset column used for the next cursor, if any
+        limit: Page size, or None for the whole result
+        total_count: Total feature count, if requested
+        count_mode: How the total count was obtained
+        
+    Yields:
+        Chunks of the GeoJSON document
+    """
+    conn = get_db_connection()
+    
+    try:
+        header = {"type": "FeatureCollection", "layer": layer_name}
+        if total_count is not None:
+            header["totalFeatures"] = total_count
+            header["countMode"] = count_mode
+        
+        # Open the document and leave the features array open
+        yield json.dumps(header)[:-1] + ', "features": ['
+        
+        number_returned = 0
+        rows_read = 0
+        last_key = None
+        
+        with conn.cursor(name=f"features_{layer_name}_{int(time.time() * 1000)}",
+                         cursor_factory=RealDictCursor) as cursor:
+            cursor.itersize = 2000
+            cursor.execute(query, params)
+            
+            for feature in cursor:
+                rows_read += 1
+                geojson = feature.pop("__geojson")
+                
+                if key_column:
+                    last_key = feature.get(key_column)
+                
+                # Skip features with null geometry
+                if geojson is None:
+                    continue
+                
+                prefix = "," if number_returned else ""
+                properties = json.dumps(feature, default=str)
+                yield f'{prefix}{{"type": "Feature", "geometry": {geojson}, "properties": {properties}}}'
+                number_returned += 1
+        
+        footer = {"numberReturned": number_returned}
+        if key_column and limit is not None and rows_read == limit:
+            footer["nextCursor"] = last_key
+        
+        yield "], " + json.dumps(footer, default=str)[1:]
+        
+    finally:
+        conn.rollback()
+        release_db_connection(conn)
+
 @spatial_bp.route("/layer/<layer_name>/features", methods=["GET"])
 def get_layer_features(layer_name):
     """
@@ -259,8 +374,13 @@ def get_layer_features(layer_name):
         bbox: Bounding box filter (minx,miny,maxx,maxy)
         limit: Maximum number of features to return
         offset: Offset for pagination
+        cursor: Keyset cursor (the nextCursor of the previous page); pages by
+            primary key instead of OFFSET
         fields: Comma-separated list of fields to include
         where: SQL WHERE clause for filtering
+        count: Total count mode: exact, estimate (from planner statistics) or none
+        stream: If true, stream the response from a server-side cursor; the
+            limit then defaults to the whole layer
         
     Returns:
         GeoJSON FeatureCollection
@@ -268,10 +388,19 @@ def get_layer_features(layer_name):
     try:
         # Get query parameters
         bbox = request.args.get("bbox")
-        limit = request.args.get("limit", default=1000, type=int)
+        stream = request.args.get("stream", "false").lower() in ("1", "true", "yes")
+        limit = request.args.get("limit", default=None if stream else 1000, type=int)
         offset = request.args.get("offset", default=0, type=int)
+        keyset_cursor = request.args.get("cursor")
         fields = request.args.get("fields")
         where_clause = request.args.get("where")
+        count_mode = request.args.get("count", "none" if stream else "exact").lower()
+        
+        if count_mode not in ("exact", "estimate", "none"):
+            return jsonify({
+                "error": "Invalid count parameter",
+                "message": "count should be one of: exact, estimate, none"
+            }), 400
         
         conn = get_db_connection()
         
@@ -297,17 +426,40 @@ def get_layer_features(layer_name):
                     "message": f"Layer {layer_name} does not exist or is not a spatial layer"
                 }), 404
             
+            geometry_column = geometry_info["geometry_column"]
+            
+            # Page by primary key where possible
+            key_column = _get_primary_key_column(cursor, layer_name)
+            if keyset_cursor is not None and not key_column:
+                release_db_connection(conn)
+                return jsonify({
+                    "error": "Invalid cursor parameter",
+                    "message": f"Layer {layer_name} has no single-column primary key to page by"
+                }), 400
+            
             # Determine fields to include
             if fields:
                 field_list = [field.strip() for field in fields.split(",")]
-                field_list.append(geometry_info["geometry_column"])  # Always include geometry
-                field_sql = sql.SQL(", ").join(map(sql.Identifier, field_list))
+                if key_column and key_column not in field_list:
+                    field_list.append(key_column)  # Needed for the next cursor
             else:
-                field_sql = sql.SQL("*")
+                cursor.execute("""
+                    SELECT column_name
+                    FROM information_schema.columns
+                    WHERE table_schema = 'public' AND table_name = %s
+                    ORDER BY ordinal_position
+                """, (layer_name,))
+                field_list = [row["column_name"] for row in cursor.fetchall()]
+            
+            # The geometry is only sent as GeoJSON, never also in its raw form
+            select_list = [sql.Identifier(field) for field in field_list if field != geometry_column]
+            select_list.append(sql.SQL("ST_AsGeoJSON({geom}) AS __geojson").format(
+                geom=sql.Identifier(geometry_column)
+            ))
             
-            # Build query
+            # Build query, with the geometry rendered as GeoJSON text by PostGIS
             query = sql.SQL("SELECT {fields} FROM {table}").format(
-                fields=field_sql,
+                fields=sql.SQL(", ").join(select_list),
                 table=sql.Identifier(layer_name)
             )
             
@@ -319,7 +471,7 @@ def get_layer_features(layer_name):
                 try:
                     minx, miny, maxx, maxy = map(float, bbox.split(","))
                     bbox_clause = sql.SQL("ST_Intersects({geom}, ST_MakeEnvelope(%s, %s, %s, %s, %s))").format(
-                        geom=sql.Identifier(geometry_info["geometry_column"])
+                        geom=sql.Identifier(geometry_column)
                     )
                     where_clauses.append(bbox_clause)
                     query_params.extend([minx, miny, maxx, maxy, geometry_info["srid"]])
@@ -334,6 +486,29 @@ def get_layer_features(layer_name):
             if where_clause:
                 where_clauses.append(sql.SQL(where_clause))
             
+            # Get total count (without paging)
+            count_query = sql.SQL("SELECT 1 FROM {table}").format(
+                table=sql.Identifier(layer_name)
+            )
+            if where_clauses:
+                count_query = sql.SQL("{} WHERE {}").format(
+                    count_query,
+                    sql.SQL(" AND ").join(where_clauses)
+                )
+            
+            total_count = None
+            if count_mode == "exact":
+                cursor.execute(sql.SQL("SELECT COUNT(*) FROM ({}) AS filtered").format(count_query),
+                               query_params or None)
+                total_count = cursor.fetchone()["count"]
+            elif count_mode == "estimate":
+                total_count = _estimate_row_count(cursor, count_query, query_params)
+            
+            # Add keyset condition after counting, so the count covers all pages
+            if keyset_cursor is not None:
+                where_clauses.append(sql.SQL("{} > %s").format(sql.Identifier(key_column)))
+                query_params.append(keyset_cursor)
+            
             # Combine WHERE clauses
             if where_clauses:
                 query = sql.SQL("{} WHERE {}").format(
@@ -341,34 +516,42 @@ def get_layer_features(layer_name):
                     sql.SQL(" AND ").join(where_clauses)
                 )
             
+            # Order by key so pages are stable
+            if key_column:
+                query = sql.SQL("{} ORDER BY {}").format(query, sql.Identifier(key_column))
+            
             # Add limit and offset
-            query = sql.SQL("{} LIMIT %s OFFSET %s").format(
-                query
-            )
-            query_params.extend([limit, offset])
+            if limit is not None:
+                query = sql.SQL("{} LIMIT %s").format(query)
+                query_params.append(limit)
+            if offset and keyset_cursor is None:
+                query = sql.SQL("{} OFFSET %s").format(query)
+                query_params.append(offset)
+            
+            if stream:
+                # The stream takes its own connection once the response is read
+                cursor.close()
+                release_db_connection(conn)
+                return Response(
+                    stream_with_context(_stream_features(
+                        query, query_params, layer_name,
+                        key_column, limit, total_count, count_mode
+                    )),
+                    mimetype="application/geo+json"
+                )
             
             # Execute query
             cursor.execute(query, query_params)
             features = cursor.fetchall()
             
-            # Get total count (without limit/offset)
-            count_query = sql.SQL("SELECT COUNT(*) FROM {table}").format(
-                table=sql.Identifier(layer_name)
-            )
-            
-            if where_clauses:
-                count_query = sql.SQL("{} WHERE {}").format(
-                    count_query,
-                    sql.SQL(" AND ").join(where_clauses)
-                )
-            
-            cursor.execute(count_query, query_params[:-2] if query_params else None)
-            total_count = cursor.fetchone()["count"]
-            
             # Convert to GeoJSON
             geojson_features = []
+            last_key = None
             for feature in features:
-                geom_data = feature[geometry_info["geometry_column"]]
+                geom_data = feature.pop("__geojson")
+                
+                if key_column:
+                    last_key = feature.get(key_column)
                 
                 # Skip features with null geometry
                 if geom_data is None:
@@ -378,20 +561,26 @@ def get_layer_features(layer_name):
                 geojson_feature = {
                     "type": "Feature",
                     "geometry": json.loads(geom_data),
-                    "properties": {k: v for k, v in feature.items() if k != geometry_info["geometry_column"]}
+                    "properties": feature
                 }
                 
                 geojson_features.append(geojson_feature)
         
         release_db_connection(conn)
         
-        return jsonify({
+        result = {
             "type": "FeatureCollection",
             "features": geojson_features,
-            "totalFeatures": total_count,
             "numberReturned": len(geojson_features),
             "layer": layer_name
-        })
+        }
+        if total_count is not None:
+            result["totalFeatures"] = total_count
+            result["countMode"] = count_mode
+        if key_column and limit is not None and len(features) == limit:
+            result["nextCursor"] = last_key
+        
+        return jsonify(result)
         
     except Exception as e:
         logger.error(f"Error fetching features: {str(e)}")
@@ -404,11 +593,9 @@ def get_layer_features(layer_name):
             "message": str(e)
         }), 500
 
-@spatial_bp.route("/tiles/<layer_name>/<int:z>/<int:x>/<int:y>.mvt", methods=["GET"])
-@lru_cache(maxsize=512)
-def get_vector_tile(layer_name, z, x, y):
+def generate_vector_tile(layer_name: str, z: int, x: int, y: int) -> Optional[bytes]:
     """
-    Get a Mapbox Vector Tile for a specific layer and tile coordinates.
+    Generate a Mapbox Vector Tile from the database.
     
     Args:
         layer_name: Name of the layer
@@ -417,12 +604,12 @@ def get_vector_tile(layer_name, z, x, y):
         y: Tile y coordinate
         
     Returns:
-        Mapbox Vector Tile (MVT)
+        Tile data, or None if the layer does not exist
     """
+    conn = get_db_connection()
+    
     try:
-        conn = get_db_connection()
-        
-        with conn.cursor() as cursor:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
             # Get geometry column information
             cursor.execute("""
                 SELECT
@@ -438,23 +625,7 @@ def get_vector_tile(layer_name, z, x, y):
             geometry_info = cursor.fetchone()
             
             if not geometry_info:
-                release_db_connection(conn)
-                return jsonify({
-                    "error": "Layer not found",
-                    "message": f"Layer {layer_name} does not exist or is not a spatial layer"
-                }), 404
-            
-            # Calculate tile bounds
-            # Convert tile coordinates to mercator bounds (XYZ to EPSG:3857)
-            tile_size = 256
-            merc_max = 20037508.34
-            res = (2 * merc_max) / (tile_size * 2**z)
-            
-            # Calculate pixel bounds
-            min_x = -merc_max + (x * tile_size * res)
-            min_y = merc_max - ((y + 1) * tile_size * res)
-            max_x = -merc_max + ((x + 1) * tile_size * res)
-            max_y = merc_max - (y * tile_size * res)
+                return None
             
             # Generate MVT
             mvt_query = """
@@ -479,7 +650,7 @@ def get_vector_tile(layer_name, z, x, y):
                         )
                     LIMIT 10000
                 )
-                SELECT ST_AsMVT(mvtgeom.*, %s)
+                SELECT ST_AsMVT(mvtgeom.*, %s) AS mvt
             """
             
             # Format the query with proper parameter handling
@@ -490,28 +661,195 @@ def get_vector_tile(layer_name, z, x, y):
             
             # Execute query
             cursor.execute(formatted_query, (z, x, y, layer_name))
-            mvt_data = cursor.fetchone()[0]
-        
+            mvt_data = cursor.fetchone()["mvt"]
+    finally:
         release_db_connection(conn)
+    
+    # Empty tiles are cached too, so normalize NULL to an empty tile
+    return bytes(mvt_data) if mvt_data is not None else b""
+
+def invalidate_tiles(layer_name: str, bbox: Optional[List[float]] = None, srid: int = 4326) -> Dict[str, Any]:
+    """
+    Invalidate cached vector tiles after features in a layer are edited or re-synced.
+    
+    Args:
+        layer_name: Name of the layer
+        bbox: Optional bounding box (minx, miny, maxx, maxy) of the changed
+            features; if omitted, every tile of the layer is invalidated
+        srid: SRID of the bounding box, 4326 or 3857
+        
+    Returns:
+        Summary of the invalidation
+    """
+    cache = get_tile_cache()
+    
+    if bbox:
+        removed = cache.invalidate_bbox(layer_name, tuple(bbox), srid)
+        return {"layer": layer_name, "bbox": list(bbox), "tiles_removed": removed}
+    
+    version = cache.invalidate_layer(layer_name)
+    return {"layer": layer_name, "version": version}
+
+def seed_tiles(layer_name: str, min_zoom: int, max_zoom: int,
+               bbox: Optional[List[float]] = None, srid: int = 4326) -> Dict[str, Any]:
+    """
+    Pre-generate cached vector tiles for a range of zoom levels.
+    
+    Args:
+        layer_name: Name of the layer
+        min_zoom: Lowest zoom level
+        max_zoom: Highest zoom level, inclusive
+        bbox: Bounding box (minx, miny, maxx, maxy) to seed, defaults to the county extent
+        srid: SRID of the bounding box, 4326 or 3857
+        
+    Returns:
+        Summary with tile counts and elapsed time
+    """
+    cache = get_tile_cache()
+    bbox = tuple(bbox) if bbox else COUNTY_EXTENT
+    
+    start_time = time.time()
+    seeded = 0
+    cached = 0
+    
+    for z, x, y in tiles_for_bbox(bbox, min_zoom, max_zoom, srid):
+        generated = []
+        
+        def generate(z=z, x=x, y=y):
+            generated.append(True)
+            return generate_vector_tile(layer_name, z, x, y)
+        
+        if cache.get_or_generate(layer_name, z, x, y, generate) is None:
+            raise ValueError(f"Layer {layer_name} does not exist or is not a spatial layer")
+        
+        if generated:
+            seeded += 1
+        else:
+            cached += 1
+    
+    elapsed = time.time() - start_time
+    logger.info(f"Seeded {seeded} tiles for layer {layer_name} (zoom {min_zoom}-{max_zoom}, "
+                f"{cached} already cached) in {elapsed:.2f}s")
+    
+    return {
+        "layer": layer_name,
+        "min_zoom": min_zoom,
+        "max_zoom": max_zoom,
+        "bbox": list(bbox),
+        "seeded": seeded,
+        "already_cached": cached,
+        "seconds": round(elapsed, 2)
+    }
+
+@spatial_bp.route("/tiles/<layer_name>/<int:z>/<int:x>/<int:y>.mvt", methods=["GET"])
+def get_vector_tile(layer_name, z, x, y):
+    """
+    Get a Mapbox Vector Tile for a specific layer and tile coordinates.
+    
+    Tiles are served from the tile cache and generated on a miss. Clients must
+    revalidate every tile against its ETag, a hash of the tile, so tiles
+    invalidated through /tiles/<layer>/invalidate are not served stale; an
+    unchanged tile is answered with 304 Not Modified.
+    
+    Args:
+        layer_name: Name of the layer
+        z: Zoom level
+        x: Tile x coordinate
+        y: Tile y coordinate
+        
+    Returns:
+        Mapbox Vector Tile (MVT)
+    """
+    try:
+        cache = get_tile_cache()
+        mvt_data = cache.get_or_generate(layer_name, z, x, y,
+                                         lambda: generate_vector_tile(layer_name, z, x, y))
+        
+        if mvt_data is None:
+            return jsonify({
+                "error": "Layer not found",
+                "message": f"Layer {layer_name} does not exist or is not a spatial layer"
+            }), 404
         
         # Return the MVT
         response = Response(mvt_data, mimetype="application/vnd.mapbox-vector-tile")
         response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Cache-Control"] = "public, max-age=86400"
+        response.headers["Cache-Control"] = "no-cache"
+        response.add_etag()
         
-        return response
+        return response.make_conditional(request)
         
+    except ValueError as e:
+        return jsonify({
+            "error": "Invalid layer name",
+            "message": str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Error generating vector tile: {str(e)}")
         
-        if 'conn' in locals():
-            release_db_connection(conn)
-        
         return jsonify({
             "error": "Error generating vector tile",
             "message": str(e)
         }), 500
 
+@spatial_bp.route("/tiles/<layer_name>/invalidate", methods=["POST"])
+def invalidate_vector_tiles(layer_name):
+    """
+    Invalidate cached vector tiles for a layer.
+    
+    Request body may contain:
+    {
+        "bbox": [minx, miny, maxx, maxy],
+        "srid": 4326|3857
+    }
+    
+    Without a bbox every cached tile of the layer is invalidated.
+    
+    Args:
+        layer_name: Name of the layer
+        
+    Returns:
+        Invalidation summary
+    """
+    try:
+        request_data = request.get_json(silent=True) or {}
+        bbox = request_data.get("bbox")
+        srid = int(request_data.get("srid", 4326))
+        
+        if bbox is not None and len(bbox) != 4:
+            return jsonify({
+                "error": "Invalid bbox parameter",
+                "message": "bbox should be a list: [minx, miny, maxx, maxy]"
+            }), 400
+        
+        return jsonify({
+            "status": "success",
+            **invalidate_tiles(layer_name, [float(v) for v in bbox] if bbox else None, srid)
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            "error": "Invalid invalidation request",
+            "message": str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error invalidating vector tiles: {str(e)}")
+        
+        return jsonify({
+            "error": "Error invalidating vector tiles",
+            "message": str(e)
+        }), 500
+
+@spatial_bp.route("/tiles/metrics", methods=["GET"])
+def get_tile_cache_metrics():
+    """
+    Get vector tile cache metrics.
+    
+    Returns:
+        JSON with hit rate and tile generation times
+    """
+    return jsonify(get_tile_cache().get_metrics())
+
 @spatial_bp.route("/analyze", methods=["POST"])
 def analyze_spatial_data():
     """
@@ -0,0 +1,507 @@
+"""
+Vector Tile Cache for GeoAssessmentPro
+
+This module provides a two-level cache for Mapbox Vector Tiles: an in-memory
+LRU in front of an on-disk z/x/y store. Tiles are keyed by a per-layer version
+so a whole layer can be invalidated by bumping its version, and individual
+areas can be invalidated by bounding box when features are edited or re-synced.
+"""
+
+import os
+import math
+import time
+import shutil
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Web Mercator constants (EPSG:3857)
+MERC_MAX = 20037508.34
+MAX_LATITUDE = 85.0511287798
+
+# Approximate extent of Benton County, WA in EPSG:4326 (minx, miny, maxx, maxy)
+COUNTY_EXTENT = (-119.88, 45.93, -118.94, 46.74)
+
+# How long a layer version is trusted before its VERSION file is checked again,
+# bounding how long other processes serve tiles after an invalidation
+VERSION_CHECK_SECONDS = 1.0
+
+
+def lonlat_to_tile(lon: float, lat: float, z: int) -> Tuple[int, int]:
+    """
+    Convert a longitude/latitude to XYZ tile coordinates.
+
+    Args:
+        lon: Longitude in degrees
+        lat: Latitude in degrees
+        z: Zoom level
+
+    Returns:
+        Tuple of (x, y) tile coordinates
+    """
+    n = 2 ** z
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    lat_rad = math.radians(lat)
+
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.log(math.tan(lat_rad) + 1.0 / math.cos(lat_rad)) / math.pi) / 2.0 * n)
+
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_range(bbox: Tuple[float, float, float, float], z: int,
+               srid: int = 4326, margin: int = 0) -> Tuple[int, int, int, int]:
+    """
+    Get the range of tiles covering a bounding box at a zoom level.
+
+    Args:
+        bbox: Bounding box (minx, miny, maxx, maxy)
+        z: Zoom level
+        srid: SRID of the bounding box, 4326 or 3857
+        margin: Number of extra tiles to include on each side
+
+    Returns:
+        Tuple of (min_x, min_y, max_x, max_y) tile coordinates, inclusive
+    """
+    minx, miny, maxx, maxy = bbox
+
+    if srid == 3857:
+        minx, maxx = minx / MERC_MAX * 180.0, maxx / MERC_MAX * 180.0
+        miny = math.degrees(math.atan(math.sinh(miny / MERC_MAX * math.pi)))
+        maxy = math.degrees(math.atan(math.sinh(maxy / MERC_MAX * math.pi)))
+    elif srid != 4326:
+        raise ValueError(f"Unsupported SRID for tile range: {srid}")
+
+    # Tile y grows southwards, so the northern edge gives the smallest y
+    min_x, min_y = lonlat_to_tile(minx, maxy, z)
+    max_x, max_y = lonlat_to_tile(maxx, miny, z)
+
+    n = 2 ** z
+    return (max(min_x - margin, 0), max(min_y - margin, 0),
+            min(max_x + margin, n - 1), min(max_y + margin, n - 1))
+
+
+def tiles_for_bbox(bbox: Tuple[float, float, float, float], min_zoom: int, max_zoom: int,
+                   srid: int = 4326) -> Iterator[Tuple[int, int, int]]:
+    """
+    Iterate over all tiles covering a bounding box for a range of zoom levels.
+
+    Args:
+        bbox: Bounding box (minx, miny, maxx, maxy)
+        min_zoom: Lowest zoom level
+        max_zoom: Highest zoom level, inclusive
+        srid: SRID of the bounding box, 4326 or 3857
+
+    Yields:
+        Tuples of (z, x, y)
+    """
+    for z in range(min_zoom, max_zoom + 1):
+        min_x, min_y, max_x, max_y = tile_range(bbox, z, srid)
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                yield z, x, y
+
+
+class TileCache:
+    """
+    Two-level cache for vector tiles.
+
+    Tiles are looked up in memory first, then on disk under
+    ``<cache_dir>/<layer>/v<version>/<z>/<x>/<y>.mvt``. Layer versions are
+    persisted so disk tiles survive restarts, and every invalidation rewrites
+    the layer's VERSION file so other processes sharing the cache directory
+    drop their in-memory tiles of the layer.
+    """
+
+    def __init__(self, cache_dir: str = "tile_cache",
+                 memory_limit_bytes: int = 64 * 1024 * 1024,
+                 disk_enabled: bool = True,
+                 version_check_seconds: float = VERSION_CHECK_SECONDS):
+        """
+        Initialize the tile cache.
+
+        Args:
+            cache_dir: Directory for the on-disk tile store
+            memory_limit_bytes: Maximum total size of tiles held in memory
+            disk_enabled: Whether to persist tiles to disk
+            version_check_seconds: How long a layer version is trusted before
+                the VERSION file is checked for changes by other processes
+        """
+        self.cache_dir = cache_dir
+        self.memory_limit_bytes = memory_limit_bytes
+        self.disk_enabled = disk_enabled
+        self.version_check_seconds = version_check_seconds
+
+        self._memory: "OrderedDict[Tuple[str, int, int, int, int], bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._versions: Dict[str, int] = {}
+        self._version_stamps: Dict[str, Tuple[float, Optional[Tuple[int, int, int]]]] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+        self._metrics = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "generated": 0,
+            "generation_seconds": 0.0,
+            "max_generation_seconds": 0.0,
+            "invalidated_tiles": 0,
+            "layer_invalidations": 0
+        }
+
+        if self.disk_enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_layer_version(self, layer_name: str) -> int:
+        """
+        Get the current cache version of a layer.
+
+        Args:
+            layer_name: Name of the layer
+
+        Returns:
+            Layer version
+
+        Raises:
+            ValueError: If the layer name cannot be used as a cache path
+        """
+        if not layer_name or layer_name.startswith(".") or "/" in layer_name or os.sep in layer_name:
+            raise ValueError(f"Invalid layer name for tile cache: {layer_name!r}")
+
+        with self._lock:
+            now = time.time()
+            checked_at, stamp = self._version_stamps.get(layer_name, (0.0, None))
+            if layer_name in self._versions and now - checked_at < self.version_check_seconds:
+                return self._versions[layer_name]
+
+            new_stamp = self._version_stamp(layer_name)
+            if layer_name in self._versions and new_stamp == stamp:
+                self._version_stamps[layer_name] = (now, stamp)
+                return self._versions[layer_name]
+
+            version = 1
+            if new_stamp is not None:
+                try:
+                    with open(os.path.join(self.cache_dir, layer_name, "VERSION")) as f:
+                        version = int(f.read().strip() or 1)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not read tile cache version for {layer_name}: {str(e)}")
+
+            if layer_name in self._versions:
+                # Another process invalidated the layer; tiles it removed may still be in memory
+                self._generations[layer_name] = self._generations.get(layer_name, 0) + 1
+                for key in [k for k in self._memory if k[0] == layer_name]:
+                    self._forget(key)
+
+            self._versions[layer_name] = version
+            self._version_stamps[layer_name] = (now, new_stamp)
+            return version
+
+    def get(self, layer_name: str, z: int, x: int, y: int) -> Optional[bytes]:
+        """
+        Get a cached tile.
+
+        Args:
+            layer_name: Name of the layer
+            z: Zoom level
+            x: Tile x coordinate
+            y: Tile y coordinate
+
+        Returns:
+            Tile data, or None if the tile is not cached
+        """
+        version = self.get_layer_version(layer_name)
+        key = (layer_name, version, z, x, y)
+
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._metrics["memory_hits"] += 1
+                return data
+
+        if self.disk_enabled:
+            try:
+                with open(self._tile_path(layer_name, version, z, x, y), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = None
+            except OSError as e:
+                logger.warning(f"Error reading cached tile {layer_name}/{z}/{x}/{y}: {str(e)}")
+                data = None
+
+            if data is not None:
+                with self._lock:
+                    self._metrics["disk_hits"] += 1
+                    self._remember(key, data)
+                return data
+
+        with self._lock:
+            self._metrics["misses"] += 1
+        return None
+
+    def put(self, layer_name: str, z: int, x: int, y: int, data: bytes,
+            generation: Optional[int] = None):
+        """
+        Store a tile in the cache.
+
+        Args:
+            layer_name: Name of the layer
+            z: Zoom level
+            x: Tile x coordinate
+            y: Tile y coordinate
+            data: Tile data
+            generation: Invalidation generation the tile was built against; the
+                tile is discarded if the layer has been invalidated since
+        """
+        version = self.get_layer_version(layer_name)
+
+        with self._lock:
+            if generation is not None and generation != self._generations.get(layer_name, 0):
+                return
+            self._remember((layer_name, version, z, x, y), data)
+
+        if self.disk_enabled:
+            path = self._tile_path(layer_name, version, z, x, y)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            except OSError as e:
+                logger.warning(f"Error writing cached tile {layer_name}/{z}/{x}/{y}: {str(e)}")
+
+    def get_or_generate(self, layer_name: str, z: int, x: int, y: int,
+                        generator: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """
+        Get a tile from the cache, generating and storing it on a miss.
+
+        Args:
+            layer_name: Name of the layer
+            z: Zoom level
+            x: Tile x coordinate
+            y: Tile y coordinate
+            generator: Function producing the tile data, or None if the tile
+                cannot be produced (which is not cached)
+
+        Returns:
+            Tile data, or None if the generator returned None
+        """
+        data = self.get(layer_name, z, x, y)
+        if data is not None:
+            return data
+
+        with self._lock:
+            generation = self._generations.get(layer_name, 0)
+
+        start_time = time.time()
+        data = generator()
+        elapsed = time.time() - start_time
+
+        if data is None:
+            return None
+
+        with self._lock:
+            self._metrics["generated"] += 1
+            self._metrics["generation_seconds"] += elapsed
+            self._metrics["max_generation_seconds"] = max(self._metrics["max_generation_seconds"], elapsed)
+
+        self.put(layer_name, z, x, y, data, generation=generation)
+        return data
+
+    def invalidate_bbox(self, layer_name: str, bbox: Tuple[float, float, float, float],
+                        srid: int = 4326) -> int:
+        """
+        Invalidate cached tiles of a layer that intersect a bounding box.
+
+        One extra tile is invalidated on each side to cover features drawn
+        into neighbouring tiles' buffers.
+
+        Args:
+            layer_name: Name of the layer
+            bbox: Bounding box (minx, miny, maxx, maxy) of the changed features
+            srid: SRID of the bounding box, 4326 or 3857
+
+        Returns:
+            Number of tiles removed
+        """
+        version = self.get_layer_version(layer_name)
+        ranges: Dict[int, Tuple[int, int, int, int]] = {}
+
+        def in_range(z: int, x: int, y: int) -> bool:
+            if z not in ranges:
+                ranges[z] = tile_range(bbox, z, srid, margin=1)
+            min_x, min_y, max_x, max_y = ranges[z]
+            return min_x <= x <= max_x and min_y <= y <= max_y
+
+        removed = set()
+        with self._lock:
+            self._generations[layer_name] = self._generations.get(layer_name, 0) + 1
+
+            for key in [k for k in self._memory if k[0] == layer_name and k[1] == version]:
+                if in_range(*key[2:]):
+                    self._forget(key)
+                    removed.add(key[2:])
+
+        if self.disk_enabled:
+            version_dir = os.path.join(self.cache_dir, layer_name, f"v{version}")
+            for z_name in self._list_numeric(version_dir):
+                z_dir = os.path.join(version_dir, str(z_name))
+                for x_name in self._list_numeric(z_dir):
+                    x_dir = os.path.join(z_dir, str(x_name))
+                    for file_name in os.listdir(x_dir):
+                        y_name = file_name[:-4] if file_name.endswith(".mvt") else None
+                        if y_name is None or not y_name.isdigit():
+                            continue
+                        if in_range(z_name, x_name, int(y_name)):
+                            try:
+                                os.remove(os.path.join(x_dir, file_name))
+                                removed.add((z_name, x_name, int(y_name)))
+                            except FileNotFoundError:
+                                pass
+
+            self._write_version(layer_name, version)
+
+        with self._lock:
+            self._metrics["invalidated_tiles"] += len(removed)
+
+        logger.info(f"Invalidated {len(removed)} cached tiles for layer {layer_name} in bbox {bbox}")
+        return len(removed)
+
+    def invalidate_layer(self, layer_name: str) -> int:
+        """
+        Invalidate all cached tiles of a layer by bumping its version.
+
+        Args:
+            layer_name: Name of the layer
+
+        Returns:
+            New layer version
+        """
+        with self._lock:
+            # Build on the latest version on disk, which another process may have bumped
+            if layer_name in self._version_stamps:
+                self._version_stamps[layer_name] = (0.0, self._version_stamps[layer_name][1])
+            old_version = self.get_layer_version(layer_name)
+            new_version = old_version + 1
+            self._versions[layer_name] = new_version
+            self._generations[layer_name] = self._generations.get(layer_name, 0) + 1
+            self._metrics["layer_invalidations"] += 1
+
+            for key in [k for k in self._memory if k[0] == layer_name]:
+                self._forget(key)
+
+        if self.disk_enabled:
+            self._write_version(layer_name, new_version)
+            shutil.rmtree(os.path.join(self.cache_dir, layer_name, f"v{old_version}"), ignore_errors=True)
+
+        logger.info(f"Invalidated tile cache for layer {layer_name}, now at version {new_version}")
+        return new_version
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dictionary with hit counts, hit rate and tile generation times
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["memory_tiles"] = len(self._memory)
+            metrics["memory_bytes"] = self._memory_bytes
+
+        hits = metrics["memory_hits"] + metrics["disk_hits"]
+        requests = hits + metrics["misses"]
+        metrics["requests"] = requests
+        metrics["hit_rate"] = round(hits / requests, 4) if requests else 0.0
+        metrics["avg_generation_ms"] = (
+            round(1000 * metrics["generation_seconds"] / metrics["generated"], 2)
+            if metrics["generated"] else 0.0
+        )
+
+        return metrics
+
+    def _remember(self, key: Tuple[str, int, int, int, int], data: bytes):
+        """Add a tile to the memory LRU, evicting the oldest tiles over the limit."""
+        if len(data) > self.memory_limit_bytes:
+            return
+
+        self._forget(key)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+
+        while self._memory_bytes > self.memory_limit_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _forget(self, key: Tuple[str, int, int, int, int]):
+        """Remove a tile from the memory LRU."""
+        data = self._memory.pop(key, None)
+        if data is not None:
+            self._memory_bytes -= len(data)
+
+    def _version_stamp(self, layer_name: str) -> Optional[Tuple[int, int, int]]:
+        """Get the identity of a layer's VERSION file, or None if it does not exist."""
+        if not self.disk_enabled:
+            return None
+        try:
+            stat = os.stat(os.path.join(self.cache_dir, layer_name, "VERSION"))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _write_version(self, layer_name: str, version: int):
+        """Atomically replace a layer's VERSION file, signalling other processes to reload it."""
+        layer_dir = os.path.join(self.cache_dir, layer_name)
+        try:
+            os.makedirs(layer_dir, exist_ok=True)
+            temp_path = os.path.join(layer_dir, f"VERSION.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_path, "w") as f:
+                f.write(str(version))
+            os.replace(temp_path, os.path.join(layer_dir, "VERSION"))
+        except OSError as e:
+            logger.warning(f"Error writing tile cache version for {layer_name}: {str(e)}")
+            return
+
+        with self._lock:
+            if self._versions.get(layer_name) == version:
+                self._version_stamps[layer_name] = (time.time(), self._version_stamp(layer_name))
+
+    def _tile_path(self, layer_name: str, version: int, z: int, x: int, y: int) -> str:
+        """Get the on-disk path of a tile."""
+        return os.path.join(self.cache_dir, layer_name, f"v{version}", str(z), str(x), f"{y}.mvt")
+
+    @staticmethod
+    def _list_numeric(directory: str) -> list:
+        """List the numeric entries of a directory as integers."""
+        try:
+            return [int(name) for name in os.listdir(directory) if name.isdigit()]
+        except FileNotFoundError:
+            return []
+
+
+# Global tile cache instance
+_tile_cache = None
+
+def get_tile_cache() -> TileCache:
+    """
+    Get the global tile cache, creating it from environment settings.
+
+    Returns:
+        TileCache instance
+    """
+    global _tile_cache
+
+    if _tile_cache is None:
+        _tile_cache = TileCache(
+            cache_dir=os.environ.get("TILE_CACHE_DIR", "tile_cache"),
+            memory_limit_bytes=int(os.environ.get("TILE_CACHE_MEMORY_MB", "64")) * 1024 * 1024,
+            disk_enabled=os.environ.get("TILE_CACHE_DISK", "true").lower() in ("1", "true", "yes")
+        )
+
+    return _tile_cache
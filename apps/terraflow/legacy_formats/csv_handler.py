@@ -5,7 +5,9 @@ CSV Format Handler for legacy data conversion
 import os
 import io
 import csv
+import mmap
 import logging
+import warnings
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Tuple, Optional, Union, Generator, TextIO
@@ -14,12 +16,31 @@ from legacy_converter import FormatHandler, ColumnMapping
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Bytes read from each of the head, middle and tail of a file for schema sampling
+SAMPLE_WINDOW_SIZE = 1024 * 1024  # 1MB
+
+# Bytes scanned at a time when counting lines
+SCAN_BLOCK_SIZE = 16 * 1024 * 1024  # 16MB
+
+# Values tried as dates before parsing a whole sampled column
+DATE_PROBE_SIZE = 20
+
+# Values read as booleans
+BOOLEAN_VALUES = ["true", "false", "yes", "no", "y", "n", "t", "f", "1", "0"]
+
 class CSVHandler(FormatHandler):
     """Handler for CSV and similar delimited formats"""
     
-    def __init__(self):
-        """Initialize CSV handler"""
+    def __init__(self, exact_row_count: bool = False):
+        """
+        Initialize CSV handler
+        
+        Args:
+            exact_row_count: Count every line of the file for the schema's row
+                count instead of estimating it from the sampled windows
+        """
         self.delimiter = ","  # Default delimiter
+        self.exact_row_count = exact_row_count
     
     def can_handle(self, file_path: str) -> bool:
         """
@@ -68,22 +89,28 @@ class CSVHandler(FormatHandler):
             Dict with schema information
         """
         try:
-            # Read the first few rows to infer schema
-            with open(file_path, "r", errors="ignore") as f:
-                # Detect delimiter if not already set
-                if self.delimiter == ",":
-                    dialect = csv.Sniffer().sniff(f.read(10000))
-                    f.seek(0)
-                    self.delimiter = dialect.delimiter
-                
-                # Read the first few rows
-                reader = csv.reader(f, delimiter=self.delimiter)
-                headers = next(reader)
-                sample_rows = []
-                for i, row in enumerate(reader):
-                    if i >= 10:  # Read up to 10 sample rows
-                        break
-                    sample_rows.append(row)
+            windows = self._read_sample_windows(file_path)
+            
+            # Detect delimiter if not already set
+            if self.delimiter == ",":
+                sample = windows[0][:10000].decode("utf-8", errors="ignore")
+                dialect = csv.Sniffer().sniff(sample)
+                self.delimiter = dialect.delimiter
+            
+            head = self._parse_window(windows[0])
+            if head.empty:
+                raise ValueError("File has no header row")
+            headers = list(head.iloc[0].fillna(""))
+            head = head.iloc[1:]
+            
+            # Later windows start mid-file, so rows are matched to the header by position
+            frames = [head]
+            for window in windows[1:]:
+                try:
+                    frames.append(self._parse_window(window, len(headers)))
+                except Exception as e:
+                    logger.debug(f"Skipping CSV sample window: {str(e)}")
+            sample_df = pd.concat(frames, ignore_index=True)
             
             # Infer column types from sample data
             columns = {}
@@ -93,14 +120,10 @@ class CSVHandler(FormatHandler):
                 if not header:
                     header = f"Column_{i+1}"
                 
-                # Collect sample values
-                sample_values = []
-                for row in sample_rows:
-                    if i < len(row):
-                        sample_values.append(row[i])
+                values = sample_df[i] if i in sample_df.columns else pd.Series([], dtype=object)
                 
                 # Infer type from sample values
-                data_type = self._infer_type(sample_values)
+                data_type = self._infer_type(values)
                 
                 columns[header] = {
                     "index": i,
@@ -108,19 +131,80 @@ class CSVHandler(FormatHandler):
                     "type": data_type,
                     "nullable": True,
                     "description": "",
-                    "sample_values": sample_values[:5]  # Include a few sample values
+                    "sample_values": list(head[i].fillna("").iloc[:5]) if i in head.columns else []
                 }
             
             return {
                 "columns": columns,
                 "delimiter": self.delimiter,
                 "file_size": os.path.getsize(file_path),
-                "row_count_estimate": self._estimate_row_count(file_path)
+                "row_count_estimate": self._estimate_row_count(file_path, windows),
+                "row_count_exact": self.exact_row_count or len(windows) == 1
             }
         except Exception as e:
             logger.error(f"Error reading CSV schema: {str(e)}")
             return {"error": str(e)}
     
+    def _read_sample_windows(self, file_path: str) -> List[bytes]:
+        """
+        Read whole lines from the head, middle and tail of a file
+        
+        Files no larger than the three windows together are returned as a
+        single window. Otherwise each later window starts after the first
+        line break following its offset and ends at its last line break.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            List of byte windows, the first starting at the header
+        """
+        file_size = os.path.getsize(file_path)
+        
+        with open(file_path, "rb") as f:
+            if file_size <= 3 * SAMPLE_WINDOW_SIZE:
+                return [f.read()]
+            
+            windows = []
+            for offset in (0, (file_size - SAMPLE_WINDOW_SIZE) // 2, file_size - SAMPLE_WINDOW_SIZE):
+                f.seek(offset)
+                data = f.read(SAMPLE_WINDOW_SIZE)
+                
+                start = 0 if offset == 0 else data.find(b"\n") + 1
+                end = len(data) if offset + len(data) == file_size else data.rfind(b"\n") + 1
+                if 0 < start < end or offset == 0:
+                    windows.append(data[start:end])
+            
+            return windows
+    
+    def _parse_window(self, data: bytes, num_columns: Optional[int] = None) -> pd.DataFrame:
+        """
+        Parse a window of whole lines into string columns
+        
+        Args:
+            data: Encoded lines
+            num_columns: Number of columns in the header, or None to parse
+                the header window itself
+            
+        Returns:
+            DataFrame of raw string values with positional column labels
+        """
+        # Rows wider than the header are truncated rather than shifted into the index
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", pd.errors.ParserWarning)
+            return pd.read_csv(
+                io.BytesIO(data),
+                delimiter=self.delimiter,
+                header=None,
+                names=range(num_columns) if num_columns is not None else None,
+                index_col=False,
+                dtype=str,
+                keep_default_na=False,
+                skip_blank_lines=True,
+                on_bad_lines="skip",
+                encoding_errors="replace"
+            )
+    
     def read_data(self, file_path: str, batch_size: int = 1000) -> Generator[pd.DataFrame, None, None]:
         """
         Read data from the CSV file as a generator
@@ -214,75 +298,48 @@ class CSVHandler(FormatHandler):
             })
             return issues
     
-    def _infer_type(self, values: List[str]) -> str:
+    def _infer_type(self, values: Union[pd.Series, List[str]]) -> str:
         """
-        Infer data type from a list of values
+        Infer data type from a column of sample values
         
         Args:
-            values: List of sample values
+            values: Sample values as strings
             
         Returns:
             Inferred data type
         """
         # Remove empty values for type inference
-        non_empty = [v for v in values if v and v.strip()]
-        if not non_empty:
+        values = pd.Series(values, dtype=object).dropna().astype(str).str.strip()
+        non_empty = values[values != ""]
+        if non_empty.empty:
             return "string"
         
         # Check if all values are numeric
-        try:
-            # Try converting to int
-            all_int = all(self._is_integer(v) for v in non_empty)
-            if all_int:
-                return "integer"
-            
-            # Try converting to float
-            all_float = all(self._is_float(v) for v in non_empty)
-            if all_float:
-                return "float"
-        except:
-            pass
+        if non_empty.str.fullmatch(r"[+-]?\d+").all():
+            return "integer"
         
-        # Check if all values are dates
-        try:
-            all_dates = all(self._is_date(v) for v in non_empty)
-            if all_dates:
-                return "date"
-        except:
-            pass
+        if pd.to_numeric(non_empty, errors="coerce").notna().all():
+            return "float"
+        
+        # Check if all values are dates; text without digits is never a date,
+        # and a few values are probed before the column is parsed in full
+        if non_empty.str.contains(r"\d").all():
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    if (pd.to_datetime(non_empty.iloc[:DATE_PROBE_SIZE], errors="coerce").notna().all() and
+                            pd.to_datetime(non_empty, errors="coerce").notna().all()):
+                        return "date"
+            except:
+                pass
         
         # Check if all values are booleans
-        bool_values = ["true", "false", "yes", "no", "y", "n", "t", "f", "1", "0"]
-        if all(v.lower() in bool_values for v in non_empty):
+        if non_empty.str.lower().isin(BOOLEAN_VALUES).all():
             return "boolean"
         
         # Default to string
         return "string"
     
-    def _is_integer(self, value: str) -> bool:
-        """Check if value is an integer"""
-        try:
-            int(value.strip())
-            return True
-        except:
-            return False
-    
-    def _is_float(self, value: str) -> bool:
-        """Check if value is a float"""
-        try:
-            float(value.strip())
-            return True
-        except:
-            return False
-    
-    def _is_date(self, value: str) -> bool:
-        """Check if value is a date"""
-        try:
-            pd.to_datetime(value.strip())
-            return True
-        except:
-            return False
-    
     def _are_types_compatible(self, source_type: str, target_type: str) -> bool:
         """
         Check if source and target types are compatible
@@ -306,38 +363,69 @@ class CSVHandler(FormatHandler):
         
         return target_type in compatibility.get(source_type, [])
     
-    def _estimate_row_count(self, file_path: str) -> int:
+    def _estimate_row_count(self, file_path: str, windows: Optional[List[bytes]] = None) -> int:
         """
         Estimate the number of rows in a CSV file
         
+        The median line density of the head, middle and tail windows is
+        used, so files whose row lengths vary are estimated closely. Files
+        small enough to be read as one window, or any file when
+        exact_row_count is set, are counted exactly.
+        
         Args:
             file_path: Path to the file
+            windows: Sample windows already read from the file
             
         Returns:
-            Estimated row count
+            Estimated row count, excluding the header
         """
         try:
-            # Count lines in file
-            with open(file_path, "r", errors="ignore") as f:
-                # Read first chunk to count lines
-                chunk = f.read(1024 * 1024)  # 1MB chunk
-                lines_in_chunk = chunk.count("\n")
-                
-                # If file is smaller than chunk, we have exact count
-                if len(chunk) < 1024 * 1024:
-                    return lines_in_chunk
-                
-                # Otherwise estimate based on file size and lines per chunk ratio
-                bytes_per_line = len(chunk) / max(lines_in_chunk, 1)
-                file_size = os.path.getsize(file_path)
-                
-                estimated_lines = int(file_size / bytes_per_line)
-                
-                # Subtract 1 for header if file has at least one line
-                if estimated_lines > 0:
-                    estimated_lines -= 1
-                
-                return max(0, estimated_lines)
+            if self.exact_row_count:
+                return self.count_rows(file_path)
+            
+            if windows is None:
+                windows = self._read_sample_windows(file_path)
+            
+            if len(windows) == 1:
+                data = windows[0]
+                lines = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+                return max(0, lines - 1)
+            
+            # The median density is not thrown off by one atypical window, such as short rows at the head
+            lines_per_byte = np.median([window.count(b"\n") / max(len(window), 1) for window in windows])
+            
+            estimated_lines = int(round(os.path.getsize(file_path) * lines_per_byte))
+            
+            # Subtract 1 for the header
+            return max(0, estimated_lines - 1)
         except Exception as e:
             logger.error(f"Error estimating row count: {str(e)}")
-            return 0
\ No newline at end of file
+            return 0
+    
+    def count_rows(self, file_path: str) -> int:
+        """
+        Count the data rows in a CSV file exactly
+        
+        Line breaks are counted block by block over a memory map, so the
+        file is never decoded or split into lines. Line breaks inside quoted
+        values are counted as rows.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Number of lines after the header
+        """
+        if os.path.getsize(file_path) == 0:
+            return 0
+        
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lines = 0
+            for start in range(0, len(mm), SCAN_BLOCK_SIZE):
+                lines += mm[start:start + SCAN_BLOCK_SIZE].count(b"\n")
+            
+            # A last line without a line break is still a row
+            if mm[-1:] != b"\n":
+                lines += 1
+        
+        return max(0, lines - 1)
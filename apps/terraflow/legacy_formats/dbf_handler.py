@@ -7,21 +7,306 @@ older technologies like FoxPro, Clipper, and ESRI Shapefile-related data.
 """
 
 import os
+import mmap
 import logging
 import numpy as np
 import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from typing import Dict, List, Any, Tuple, Optional, Union, Generator
 from legacy_converter import FormatHandler, ColumnMapping
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Size of the DBF file header and of each field descriptor
+HEADER_SIZE = 32
+FIELD_DESCRIPTOR_SIZE = 32
+
+# Marker ending the field descriptors, and the flag of deleted records
+FIELD_TERMINATOR = 0x0D
+DELETED_FLAG = ord("*")
+
+# Batches decoded ahead of the consumer for each worker process
+BATCHES_PER_WORKER = 2
+
+# Julian day number of 1970-01-01, for FoxPro datetime fields
+UNIX_EPOCH_JULIAN_DAY = 2440588
+
+# Logical field values
+TRUE_VALUES = [b"T", b"t", b"Y", b"y"]
+FALSE_VALUES = [b"F", b"f", b"N", b"n"]
+
+
+@dataclass
+class DBFField:
+    """A field descriptor of a DBF file"""
+    name: str
+    type: str
+    offset: int  # Offset of the field within a record, after the deletion flag
+    length: int
+    decimal: int
+
+
+class DBFReader:
+    """
+    Memory-mapped reader of DBF records
+    
+    The header and field descriptors are parsed once. Record i starts at
+    header_length + i * record_length, so any range of records is read
+    without walking the file, and each field is decoded for a whole batch
+    at once.
+    
+    Memo fields (M, G, P) hold block numbers into a separate memo file,
+    which is not read; their block numbers are returned as strings.
+    """
+    
+    def __init__(self, file_path: str, encoding: str = "cp437"):
+        """
+        Open a DBF file
+        
+        Args:
+            file_path: Path to the file
+            encoding: Character encoding of text fields
+        """
+        self.file_path = file_path
+        self.encoding = encoding
+        
+        with open(file_path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise ValueError(f"Not a DBF file: {file_path}")
+            
+            self.version = header[0]
+            declared_count = int.from_bytes(header[4:8], byteorder="little")
+            self.header_length = int.from_bytes(header[8:10], byteorder="little")
+            self.record_length = int.from_bytes(header[10:12], byteorder="little")
+            
+            self.fields = self._parse_fields(f.read(self.header_length - HEADER_SIZE))
+            
+            # Never read past the end of a truncated file
+            file_size = os.fstat(f.fileno()).st_size
+            available = max(file_size - self.header_length, 0) // self.record_length if self.record_length else 0
+            self.record_count = min(declared_count, available)
+            
+            self._mmap = None
+            self._records = None
+            if self.record_count:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._records = np.frombuffer(
+                    self._mmap, dtype=np.uint8,
+                    count=self.record_count * self.record_length, offset=self.header_length
+                ).reshape(self.record_count, self.record_length)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Release the memory map"""
+        # The array view must go before the map can be closed
+        self._records = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+    
+    def _parse_fields(self, descriptors: bytes) -> List[DBFField]:
+        """
+        Parse the field descriptors following the file header
+        
+        Args:
+            descriptors: Bytes between the file header and the first record
+            
+        Returns:
+            List of fields
+        """
+        fields = []
+        offset = 1  # Each record starts with the deletion flag
+        
+        for start in range(0, len(descriptors) - FIELD_DESCRIPTOR_SIZE + 1, FIELD_DESCRIPTOR_SIZE):
+            descriptor = descriptors[start:start + FIELD_DESCRIPTOR_SIZE]
+            if descriptor[0] == FIELD_TERMINATOR:
+                break
+            
+            name = descriptor[:11].split(b"\x00", 1)[0].decode("ascii", errors="replace").strip()
+            field = DBFField(
+                name=name,
+                type=chr(descriptor[11]),
+                offset=offset,
+                length=descriptor[16],
+                decimal=descriptor[17]
+            )
+            offset += field.length
+            
+            # FoxPro null flags are bookkeeping, not data
+            if field.type != "0":
+                fields.append(field)
+        
+        return fields
+    
+    def read_records(self, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """
+        Decode a range of records, skipping deleted ones
+        
+        Args:
+            start: Index of the first record
+            stop: Index after the last record (the end of the file by default)
+            
+        Returns:
+            DataFrame with one column per field
+        """
+        if stop is None or stop > self.record_count:
+            stop = self.record_count
+        
+        if self._records is None or start >= stop:
+            return pd.DataFrame({field.name: pd.Series(dtype=object) for field in self.fields})
+        
+        records = self._records[start:stop]
+        records = records[records[:, 0] != DELETED_FLAG]
+        
+        return pd.DataFrame({field.name: self._decode_field(records, field) for field in self.fields})
+    
+    def iter_batches(self, batch_size: int = 1000, max_workers: int = 1) -> Generator[pd.DataFrame, None, None]:
+        """
+        Decode the file in batches, in order
+        
+        Args:
+            batch_size: Number of records in each batch, including deleted ones
+            max_workers: Number of worker processes decoding disjoint record ranges;
+                1 decodes in this process
+            
+        Returns:
+            Generator yielding DataFrames
+        """
+        ranges = [(start, min(start + batch_size, self.record_count))
+                  for start in range(0, self.record_count, batch_size)]
+        
+        if max_workers <= 1 or len(ranges) <= 1:
+            for start, stop in ranges:
+                yield self.read_records(start, stop)
+            return
+        
+        # Keep a bounded number of batches in flight and yield them in file order
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            ranges = iter(ranges)
+            
+            for start, stop in ranges:
+                pending.append(executor.submit(_read_range, self.file_path, self.encoding, start, stop))
+                if len(pending) >= max_workers * BATCHES_PER_WORKER:
+                    break
+            
+            while pending:
+                df = pending.popleft().result()
+                next_range = next(ranges, None)
+                if next_range is not None:
+                    pending.append(executor.submit(_read_range, self.file_path, self.encoding, *next_range))
+                yield df
+    
+    def _decode_field(self, records: np.ndarray, field: DBFField) -> Union[np.ndarray, pd.Series]:
+        """
+        Decode one field of a block of records
+        
+        Args:
+            records: Records as a 2-D array of bytes
+            field: Field to decode
+            
+        Returns:
+            Column values
+        """
+        raw = np.ascontiguousarray(records[:, field.offset:field.offset + field.length])
+        
+        if field.type == "I" and field.length == 4:
+            return raw.view("<i4").ravel()
+        if field.type in ("B", "O") and field.length == 8:
+            return raw.view("<f8").ravel()
+        if field.type == "Y" and field.length == 8:
+            return raw.view("<i8").ravel() / 10000.0
+        if field.type == "T" and field.length == 8:
+            return self._decode_datetime(raw)
+        
+        # Everything else is stored as text
+        values = raw.view(f"S{field.length}").ravel()
+        
+        if field.type in ("N", "F"):
+            text = self._decode_text(values, "latin1")
+            return pd.to_numeric(pd.Series(text), errors="coerce").to_numpy()
+        if field.type == "D":
+            return pd.to_datetime(pd.Series(self._decode_text(values, "latin1")), format="%Y%m%d", errors="coerce").to_numpy()
+        if field.type == "L":
+            result = np.full(len(values), None, dtype=object)
+            result[np.isin(values, TRUE_VALUES)] = True
+            result[np.isin(values, FALSE_VALUES)] = False
+            return result
+        
+        text = np.char.strip(self._decode_text(values, self.encoding))
+        result = text.astype(object)
+        result[text == ""] = None
+        return result
+    
+    def _decode_text(self, values: np.ndarray, encoding: str) -> np.ndarray:
+        """
+        Decode fixed-width byte strings, with NUL padding turned into spaces
+        
+        Single-byte encodings are decoded for the whole block in one call.
+        
+        Args:
+            values: Array of byte strings
+            encoding: Character encoding
+            
+        Returns:
+            Array of unicode strings
+        """
+        width = values.dtype.itemsize
+        block = np.ascontiguousarray(values).tobytes().replace(b"\x00", b" ")
+        text = block.decode(encoding)
+        
+        if len(text) == len(block):
+            # One character per byte, so the fixed-width layout is kept
+            return np.frombuffer(text.encode("utf-32-le"), dtype=f"<U{width}")
+        
+        return np.array([block[i:i + width].decode(encoding) for i in range(0, len(block), width)], dtype=str)
+    
+    def _decode_datetime(self, raw: np.ndarray) -> np.ndarray:
+        """
+        Decode FoxPro datetime fields: a Julian day number and milliseconds since midnight
+        
+        Args:
+            raw: Field bytes as a 2-D array
+            
+        Returns:
+            Array of datetime64 values
+        """
+        days = raw[:, :4].copy().view("<i4").ravel().astype("int64")
+        milliseconds = raw[:, 4:].copy().view("<i4").ravel().astype("int64")
+        
+        values = ((days - UNIX_EPOCH_JULIAN_DAY) * 86400000 + milliseconds).astype("datetime64[ms]")
+        values[days == 0] = np.datetime64("NaT")
+        return values
+
+
+# Readers opened by this worker process, by file path and encoding
+_worker_readers: Dict[Tuple[str, str], DBFReader] = {}
+
+
+def _read_range(file_path: str, encoding: str, start: int, stop: int) -> pd.DataFrame:
+    """Decode a range of records in a worker process, reusing its memory map"""
+    reader = _worker_readers.get((file_path, encoding))
+    if reader is None:
+        reader = _worker_readers[(file_path, encoding)] = DBFReader(file_path, encoding)
+    return reader.read_records(start, stop)
+
+
 class DBFHandler(FormatHandler):
     """Handler for DBF (dBase) files"""
     
     def __init__(self):
         """Initialize DBF handler"""
         self.encoding = "cp437"  # Default DBF encoding
+        self.max_workers = 1  # Worker processes decoding record ranges in read_data
     
     def can_handle(self, file_path: str) -> bool:
         """
@@ -101,34 +386,27 @@ class DBFHandler(FormatHandler):
                     "sample_values": sample_values
                 }
             
-            # Try to get more detailed schema info if simpledbf is available
+            # Add DBF-specific details from the field descriptors
             try:
-                from simpledbf import Dbf5
-                dbf = Dbf5(file_path, codec=self.encoding)
-                
-                # Update column info with DBF-specific details
-                for i, field in enumerate(dbf.fields):
-                    field_name = field[0]
-                    if field_name in columns:
-                        field_type = field[1]
-                        field_length = field[2]
-                        field_decimal = field[3]
-                        
-                        columns[field_name].update({
-                            "dbf_type": field_type,
-                            "length": field_length,
-                            "decimal_places": field_decimal
-                        })
-            except ImportError:
-                logger.warning("simpledbf package not available for detailed DBF schema info")
+                with DBFReader(file_path, self.encoding) as reader:
+                    row_count = reader.record_count
+                    
+                    for field in reader.fields:
+                        if field.name in columns:
+                            columns[field.name].update({
+                                "dbf_type": field.type,
+                                "length": field.length,
+                                "decimal_places": field.decimal
+                            })
             except Exception as e:
                 logger.warning(f"Error getting detailed DBF schema: {str(e)}")
+                row_count = self._get_row_count(file_path)
             
             return {
                 "columns": columns,
                 "file_size": os.path.getsize(file_path),
                 "encoding": self.encoding,
-                "row_count": len(df)
+                "row_count": row_count
             }
         except Exception as e:
             logger.error(f"Error reading DBF schema: {str(e)}")
@@ -138,6 +416,9 @@ class DBFHandler(FormatHandler):
         """
         Read data from the DBF file as a generator
         
+        Records are decoded straight from a memory map of the file, in
+        parallel when max_workers is above 1.
+        
         Args:
             file_path: Path to the file
             batch_size: Number of rows to read at a time
@@ -145,25 +426,21 @@ class DBFHandler(FormatHandler):
         Returns:
             Generator yielding DataFrames
         """
+        yielded = False
+        
         try:
-            # Get total number of rows
-            total_rows = self._get_row_count(file_path)
-            
-            # Process in batches
-            for start_row in range(0, total_rows, batch_size):
-                end_row = min(start_row + batch_size, total_rows)
-                
-                # Read batch from DBF file
-                df = pd.read_dbf(file_path, encoding=self.encoding, skip=start_row, nrows=batch_size)
-                
-                # Clean column names
-                df.columns = [col.strip() if isinstance(col, str) else col for col in df.columns]
-                
-                yield df
+            with DBFReader(file_path, self.encoding) as reader:
+                for df in reader.iter_batches(batch_size, max_workers=self.max_workers):
+                    yielded = True
+                    yield df
         except Exception as e:
             logger.error(f"Error reading DBF data: {str(e)}")
             
-            # Try alternative method if pandas.read_dbf fails
+            # Rows already yielded must not be repeated by the fallback
+            if yielded:
+                return
+            
+            # Try alternative method if the native reader fails
             try:
                 logger.info("Trying alternative DBF reading method")
                 from simpledbf import Dbf5
@@ -264,29 +541,34 @@ class DBFHandler(FormatHandler):
             })
             return issues
     
-    def _read_sample_data(self, file_path: str, encoding: str) -> pd.DataFrame:
+    def _read_sample_data(self, file_path: str, encoding: str, nrows: int = 100) -> pd.DataFrame:
         """
         Read a sample of data from DBF file
         
         Args:
             file_path: Path to the file
             encoding: Character encoding
+            nrows: Number of records to sample
             
         Returns:
             DataFrame with sample data
         """
         try:
-            # Try using pandas.read_dbf
-            return pd.read_dbf(file_path, encoding=encoding)
-        except:
+            with DBFReader(file_path, encoding) as reader:
+                return reader.read_records(0, nrows)
+        except UnicodeDecodeError:
+            raise
+        except Exception as e:
+            logger.warning(f"Error reading DBF sample: {str(e)}")
+            
             # Fall back to simpledbf if available
             try:
                 from simpledbf import Dbf5
                 dbf = Dbf5(file_path, codec=encoding)
-                return dbf.to_dataframe()
+                return dbf.to_dataframe(start=0, stop=min(nrows, dbf.numrec))
             except ImportError:
-                logger.warning("Neither pandas.read_dbf nor simpledbf available")
-                raise
+                logger.warning("simpledbf not available")
+                raise e
     
     def _get_row_count(self, file_path: str) -> int:
         """
@@ -64,26 +64,26 @@ class ExcelHandler(FormatHandler):
             Dict with schema information
         """
         try:
-            # Get list of sheet names
-            xl = pd.ExcelFile(file_path)
-            sheet_names = xl.sheet_names
-            
-            # If multiple sheets, use the first non-empty one or the first one
-            if len(sheet_names) > 1:
-                for sheet in sheet_names:
-                    # Read a sample to check if sheet is empty
-                    sample = pd.read_excel(file_path, sheet_name=sheet, nrows=5)
-                    if not sample.empty:
-                        self.sheet_name = sheet
-                        break
+            # Open the workbook once and parse every sample from it
+            with pd.ExcelFile(file_path) as xl:
+                sheet_names = xl.sheet_names
+                
+                # If multiple sheets, use the first non-empty one or the first one
+                if len(sheet_names) > 1:
+                    for sheet in sheet_names:
+                        # Read a sample to check if sheet is empty
+                        sample = xl.parse(sheet_name=sheet, nrows=5)
+                        if not sample.empty:
+                            self.sheet_name = sheet
+                            break
+                    else:
+                        # If all sheets are empty, use the first one
+                        self.sheet_name = sheet_names[0]
                 else:
-                    # If all sheets are empty, use the first one
                     self.sheet_name = sheet_names[0]
-            else:
-                self.sheet_name = sheet_names[0]
-            
-            # Read a sample of the data
-            df = pd.read_excel(file_path, sheet_name=self.sheet_name, nrows=100)
+                
+                # Read a sample of the data
+                df = xl.parse(sheet_name=self.sheet_name, nrows=100)
             
             # Collect column information
             columns = {}
@@ -125,6 +125,9 @@ class ExcelHandler(FormatHandler):
         """
         Read data from the Excel file as a generator
         
+        XLSX files are streamed from a single read-only pass over the sheet;
+        XLS files are parsed once and sliced into batches.
+        
         Args:
             file_path: Path to the file
             batch_size: Number of rows to read at a time
@@ -132,37 +135,24 @@ class ExcelHandler(FormatHandler):
         Returns:
             Generator yielding DataFrames
         """
+        yielded = False
+        
         try:
-            # Get total row count estimate
-            row_count = self._estimate_row_count(file_path, self.sheet_name)
+            if self._is_xlsx(file_path):
+                batches = self._iter_xlsx_batches(file_path, batch_size)
+            else:
+                batches = self._iter_xls_batches(file_path, batch_size)
             
-            # Process in batches
-            for start_row in range(0, row_count, batch_size):
-                # Read batch from Excel file
-                df = pd.read_excel(
-                    file_path,
-                    sheet_name=self.sheet_name,
-                    skiprows=start_row if start_row == 0 else start_row + 1,  # Add 1 to skip header except for first batch
-                    nrows=batch_size,
-                    header=0 if start_row == 0 else None  # Only use header for first batch
-                )
-                
-                # If not the first batch, set column names from first batch
-                if start_row > 0:
-                    first_batch = pd.read_excel(file_path, sheet_name=self.sheet_name, nrows=1)
-                    df.columns = first_batch.columns
-                
-                # Stop if batch is empty
-                if df.empty:
-                    break
-                
-                # Clean column names
-                df.columns = [str(col).strip() if isinstance(col, str) else str(col) for col in df.columns]
-                
+            for df in batches:
+                yielded = True
                 yield df
         except Exception as e:
             logger.error(f"Error reading Excel data: {str(e)}")
             
+            # Rows already yielded must not be repeated by the fallback
+            if yielded:
+                return
+            
             # Fallback to single batch read
             try:
                 logger.info("Trying alternative Excel reading method (single batch)")
@@ -176,6 +166,136 @@ class ExcelHandler(FormatHandler):
                 logger.error(f"Error with alternative Excel reading: {str(e2)}")
                 yield pd.DataFrame()
     
+    def _iter_xlsx_batches(self, file_path: str, batch_size: int) -> Generator[pd.DataFrame, None, None]:
+        """
+        Stream an XLSX sheet in batches from one read-only cursor
+        
+        Args:
+            file_path: Path to the file
+            batch_size: Number of rows per batch
+            
+        Returns:
+            Generator yielding DataFrames
+        """
+        from openpyxl import load_workbook
+        
+        wb = load_workbook(filename=file_path, read_only=True, data_only=True)
+        try:
+            rows = self._get_worksheet(wb, self.sheet_name).iter_rows(values_only=True)
+            
+            header = next(rows, None)
+            if header is None:
+                return
+            
+            columns = self._clean_header(header)
+            width = len(columns)
+            batch = []
+            
+            for row in rows:
+                # Skip blank rows, as pandas does
+                if all(value is None for value in row):
+                    continue
+                
+                batch.append(row[:width])
+                if len(batch) >= batch_size:
+                    yield pd.DataFrame(batch, columns=columns)
+                    batch = []
+            
+            if batch:
+                yield pd.DataFrame(batch, columns=columns)
+        finally:
+            wb.close()
+    
+    def _iter_xls_batches(self, file_path: str, batch_size: int) -> Generator[pd.DataFrame, None, None]:
+        """
+        Parse an XLS sheet once and yield it in batches
+        
+        XLS sheets are limited to 65,536 rows, so the sheet fits in memory.
+        
+        Args:
+            file_path: Path to the file
+            batch_size: Number of rows per batch
+            
+        Returns:
+            Generator yielding DataFrames
+        """
+        df = pd.read_excel(file_path, sheet_name=self.sheet_name)
+        
+        # Clean column names
+        df.columns = [str(col).strip() if isinstance(col, str) else str(col) for col in df.columns]
+        
+        for start_row in range(0, len(df), batch_size):
+            yield df.iloc[start_row:start_row + batch_size].reset_index(drop=True)
+    
+    def _clean_header(self, header: Tuple[Any, ...]) -> List[str]:
+        """
+        Build column names from a header row the way pandas names them
+        
+        Empty header cells become "Unnamed: <index>" and repeated names get
+        a ".<n>" suffix.
+        
+        Args:
+            header: Values of the header row
+            
+        Returns:
+            List of column names
+        """
+        # Trailing empty cells are not columns
+        header = list(header)
+        while header and header[-1] is None:
+            header.pop()
+        
+        columns = []
+        seen = {}
+        for i, value in enumerate(header):
+            if value is None:
+                name = f"Unnamed: {i}"
+            else:
+                name = str(value).strip()
+            
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            
+            columns.append(name)
+        
+        return columns
+    
+    def _get_worksheet(self, wb, sheet_name: Union[str, int]):
+        """
+        Get a worksheet from an openpyxl workbook by name or index
+        
+        Args:
+            wb: openpyxl workbook
+            sheet_name: Name or index of the sheet
+            
+        Returns:
+            The worksheet
+        """
+        return wb[sheet_name] if isinstance(sheet_name, str) else wb.worksheets[sheet_name]
+    
+    def _is_xlsx(self, file_path: str) -> bool:
+        """
+        Check whether a file is an XLSX/XLSM workbook rather than XLS
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            True for XLSX/XLSM files
+        """
+        _, ext = os.path.splitext(file_path.lower())
+        if ext in [".xlsx", ".xlsm"]:
+            return True
+        if ext == ".xls":
+            return False
+        
+        # Fall back to the file signature: XLSX is a ZIP archive
+        with open(file_path, "rb") as f:
+            return f.read(4) == b"PK\x03\x04"
+    
     def validate_mapping(self, file_path: str, mapping: List[ColumnMapping]) -> List[Dict[str, Any]]:
         """
         Validate a column mapping against the file
@@ -241,6 +361,8 @@ class ExcelHandler(FormatHandler):
         """
         Estimate the number of rows in an Excel file sheet
         
+        The count comes from the sheet dimensions, without parsing the rows.
+        
         Args:
             file_path: Path to the file
             sheet_name: Name of the sheet
@@ -249,21 +371,31 @@ class ExcelHandler(FormatHandler):
             Estimated row count
         """
         try:
-            # For fast row count estimation
-            from openpyxl import load_workbook
-            
-            # For XLSX files
-            if file_path.lower().endswith(".xlsx") or file_path.lower().endswith(".xlsm"):
-                # Load workbook with read_only=True for better performance with large files
-                wb = load_workbook(filename=file_path, read_only=True)
-                ws = wb[sheet_name] if isinstance(sheet_name, str) else wb.worksheets[sheet_name]
+            if self._is_xlsx(file_path):
+                from openpyxl import load_workbook
                 
-                # Get dimensions
-                return ws.max_row - 1  # Subtract 1 for header
+                # Load workbook with read_only=True so only the sheet dimensions are read
+                wb = load_workbook(filename=file_path, read_only=True)
+                try:
+                    ws = self._get_worksheet(wb, sheet_name)
+                    
+                    # Sheets written without a dimension record have to be scanned
+                    if ws.max_row is None:
+                        ws.calculate_dimension(force=True)
+                    
+                    return max((ws.max_row or 0) - 1, 0)  # Subtract 1 for header
+                finally:
+                    wb.close()
             else:
-                # For XLS files, read with pandas
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                return len(df)
+                # XLS sheets know their row count once the workbook is opened
+                import xlrd
+                
+                book = xlrd.open_workbook(file_path, on_demand=True)
+                try:
+                    sheet = book.sheet_by_name(sheet_name) if isinstance(sheet_name, str) else book.sheet_by_index(sheet_name)
+                    return max(sheet.nrows - 1, 0)
+                finally:
+                    book.release_resources()
         except Exception as e:
             logger.error(f"Error estimating Excel row count: {str(e)}")
             
@@ -9,15 +9,195 @@ at specific character positions within each line.
 
 import os
 import re
+import mmap
 import logging
+import warnings
 import numpy as np
 import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any, Tuple, Optional, Union, Generator, TextIO
 from legacy_converter import FormatHandler, ColumnMapping
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Line feed and padding code points
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+SPACE = ord(" ")
+
+# Bytes scanned per line, as a first guess when looking for batch boundaries
+LINE_LENGTH_GUESS = 128
+
+# Byte ranges decoded ahead of the consumer for each worker process
+BATCHES_PER_WORKER = 2
+
+# Values read as booleans, and the values they map to
+BOOLEAN_VALUES = {
+    'True': True, 'true': True, 'T': True, 'Y': True, 'Yes': True, 'yes': True, '1': True,
+    'False': False, 'false': False, 'F': False, 'N': False, 'No': False, 'no': False, '0': False
+}
+
+
+def decode_fixed_width(data: Union[bytes, memoryview], column_specs: List[Tuple[str, int, int]],
+                       encoding: str, dtype_plan: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Slice fixed-width columns out of a block of whole lines
+    
+    The block is decoded once into an array of code points, so column
+    positions are character offsets whatever the encoding. When every
+    line has the same length the lines are viewed as a 2-D array without
+    copying; ragged lines are padded with spaces column by column.
+    
+    Args:
+        data: Encoded lines
+        column_specs: List of (name, start, end) tuples, with inclusive ends
+        encoding: Character encoding
+        dtype_plan: Column kinds from FixedWidthHandler; number and date
+            columns are left unstripped for their parsers
+        
+    Returns:
+        DataFrame of strings, with empty fields as missing values
+    """
+    text = bytes(data).decode(encoding, errors="replace")
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+    
+    # Line boundaries, without line terminators and blank lines
+    newlines = np.flatnonzero(codes == NEWLINE)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(codes)]))
+    nonempty = ends > starts
+    ends[nonempty] -= codes[ends[nonempty] - 1] == CARRIAGE_RETURN
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    lengths = ends - starts
+    
+    if not len(starts):
+        return pd.DataFrame({name: pd.Series(dtype=object) for name, _, _ in column_specs})
+    
+    line_length = int(lengths[0])
+    stride = int(starts[1] - starts[0]) if len(starts) > 1 else line_length
+    uniform = (lengths == line_length).all() and (np.diff(starts) == stride).all()
+    
+    if uniform:
+        lines = np.lib.stride_tricks.as_strided(
+            codes[starts[0]:], shape=(len(starts), line_length), strides=(stride * 4, 4), writeable=False
+        )
+    
+    columns = {}
+    for name, start, end in column_specs:
+        width = end - start + 1
+        
+        if uniform:
+            values = lines[:, start:end + 1]
+            if values.shape[1] < width:
+                # Columns past the end of the lines are blank
+                padded = np.full((len(starts), width), SPACE, dtype="<u4")
+                padded[:, :values.shape[1]] = values
+                values = padded
+        else:
+            positions = np.arange(start, end + 1)
+            index = np.minimum(starts[:, None] + positions, len(codes) - 1)
+            values = np.where(positions < lengths[:, None], codes[index], SPACE).astype("<u4")
+        
+        values = np.ascontiguousarray(values).view(f"<U{width}").ravel()
+        
+        if dtype_plan and dtype_plan.get(name) in ("integer", "float", "datetime"):
+            columns[name] = values
+            continue
+        
+        values = np.char.strip(values)
+        column = values.astype(object)
+        column[values == ""] = None
+        columns[name] = column
+    
+    return pd.DataFrame(columns)
+
+
+def split_at_lines(data: Union[bytes, mmap.mmap], start: int, end: int, target_size: int) -> Generator[Tuple[int, int], None, None]:
+    """
+    Split a byte range into ranges of about target_size bytes ending at line boundaries
+    
+    Args:
+        data: File contents
+        start: Offset of the first byte
+        end: Offset after the last byte
+        target_size: Approximate size of each range
+        
+    Returns:
+        Generator yielding (start, stop) offsets
+    """
+    position = start
+    while position < end:
+        stop = min(position + max(target_size, 1), end)
+        if stop < end:
+            newline = data.find(b"\n", stop - 1, end)
+            stop = end if newline == -1 else newline + 1
+        yield position, stop
+        position = stop
+
+
+def apply_dtype_plan(df: pd.DataFrame, dtype_plan: Dict[str, str]) -> pd.DataFrame:
+    """
+    Convert decoded string columns to the kinds fixed from the first batch
+    
+    Values that do not fit their column's kind become missing values, and
+    how many did is logged per column for the batch. Integer columns are
+    nullable Int64 and float columns float64 in every batch, whether or not
+    the batch has missing values.
+    
+    Args:
+        df: DataFrame of strings
+        dtype_plan: Column name to kind: integer, float, datetime, boolean or string
+        
+    Returns:
+        The converted DataFrame
+    """
+    for col, kind in dtype_plan.items():
+        if col not in df.columns:
+            continue
+        
+        values = df[col]
+        if kind == "integer":
+            numbers = pd.to_numeric(values, errors="coerce")
+            converted = numbers.where((numbers % 1 == 0) & (numbers.abs() < 2 ** 63)).astype("Int64")
+        elif kind == "float":
+            converted = pd.to_numeric(values, errors="coerce").astype("float64")
+        elif kind == "datetime":
+            converted = pd.to_datetime(pd.Series(values).str.strip(), errors="coerce")
+        elif kind == "boolean":
+            converted = values.map(BOOLEAN_VALUES)
+        else:
+            continue
+        
+        present = values.notna() & (values.astype(str).str.strip() != "")
+        dropped = int((present & converted.isna()).sum())
+        if dropped:
+            logger.warning(f"Set {dropped} of {len(df)} values in column {col} to missing: "
+                           f"not {kind} values as planned from the first batch")
+        
+        df[col] = converted
+    
+    return df
+
+
+# File contents mapped by this worker process, by path
+_worker_maps: Dict[str, mmap.mmap] = {}
+
+
+def _decode_range(file_path: str, column_specs: List[Tuple[str, int, int]], encoding: str,
+                  dtype_plan: Dict[str, str], start: int, stop: int) -> pd.DataFrame:
+    """Decode and convert a range of lines in a worker process, reusing its memory map"""
+    data = _worker_maps.get(file_path)
+    if data is None:
+        with open(file_path, "rb") as f:
+            data = _worker_maps[file_path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    df = decode_fixed_width(data[start:stop], column_specs, encoding, dtype_plan)
+    return apply_dtype_plan(df, dtype_plan)
+
+
 class FixedWidthHandler(FormatHandler):
     """Handler for fixed-width text files"""
     
@@ -26,6 +206,8 @@ class FixedWidthHandler(FormatHandler):
         self.encoding = "utf-8"
         self.column_specs = []  # List of (name, start, end) tuples
         self.has_inferred_specs = False
+        self.has_header = False
+        self.max_workers = 1  # Worker processes decoding line ranges in read_data
     
     def can_handle(self, file_path: str) -> bool:
         """
@@ -126,6 +308,12 @@ class FixedWidthHandler(FormatHandler):
         """
         Read data from the fixed-width file as a generator
         
+        Columns are sliced straight out of a memory map of the file. Column
+        types are decided from the first batch and kept for the rest of the
+        file. With max_workers above 1, the rest of the file is split at line
+        boundaries into ranges of about the first batch's size, which are
+        decoded in worker processes and yielded in order.
+        
         Args:
             file_path: Path to the file
             batch_size: Number of rows to read at a time
@@ -138,43 +326,125 @@ class FixedWidthHandler(FormatHandler):
             if not self.has_inferred_specs:
                 self._infer_column_specs(file_path)
             
-            # Convert column specs to format expected by pandas
-            column_positions = [(name, (start, end + 1)) for name, start, end in self.column_specs]
-            
-            # Open file
-            with open(file_path, "r", encoding=self.encoding, errors="replace") as f:
-                while True:
-                    # Read batch of lines
-                    lines = []
-                    for _ in range(batch_size):
-                        line = f.readline()
-                        if not line:
-                            break
-                        lines.append(line)
-                    
-                    # If no lines were read, we're done
-                    if not lines:
-                        break
-                    
-                    # Convert batch to DataFrame
-                    df = pd.read_fwf(
-                        pd.io.common.StringIO("\n".join(lines)),
-                        colspecs=[pos for _, pos in column_positions],
-                        names=[name for name, _ in column_positions],
-                        dtype=str  # Read everything as string initially
-                    )
-                    
-                    # Clean column names
-                    df.columns = [col.strip() if isinstance(col, str) else col for col in df.columns]
-                    
-                    # Try to convert to appropriate types
-                    self._convert_dtypes(df)
-                    
-                    yield df
+            if os.path.getsize(file_path) == 0:
+                return
+            
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                start = self._data_start(data)
+                end = len(data)
+                
+                batches = self._iter_batch_ranges(data, start, end, batch_size)
+                first_batch = next(batches, None)
+                if first_batch is None:
+                    return
+                
+                # Fix the column types from the first batch
+                df = decode_fixed_width(data[first_batch[0]:first_batch[1]], self.column_specs, self.encoding)
+                dtype_plan = self._plan_dtypes(df)
+                yield apply_dtype_plan(df, dtype_plan)
+                
+                if self.max_workers > 1:
+                    ranges = split_at_lines(data, first_batch[1], end, first_batch[1] - first_batch[0])
+                    yield from self._decode_parallel(file_path, ranges, dtype_plan)
+                    return
+                
+                for batch_start, batch_stop in batches:
+                    df = decode_fixed_width(data[batch_start:batch_stop], self.column_specs, self.encoding, dtype_plan)
+                    yield apply_dtype_plan(df, dtype_plan)
         except Exception as e:
             logger.error(f"Error reading fixed-width data: {str(e)}")
             yield pd.DataFrame()
     
+    def _decode_parallel(self, file_path: str, ranges: Generator[Tuple[int, int], None, None],
+                         dtype_plan: Dict[str, str]) -> Generator[pd.DataFrame, None, None]:
+        """
+        Decode byte ranges in worker processes, yielding them in file order
+        
+        Args:
+            file_path: Path to the file
+            ranges: Byte ranges of whole lines
+            dtype_plan: Column kinds fixed from the first batch
+            
+        Returns:
+            Generator yielding DataFrames
+        """
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            
+            def submit(byte_range):
+                pending.append(executor.submit(
+                    _decode_range, file_path, self.column_specs, self.encoding, dtype_plan, *byte_range
+                ))
+            
+            # Keep a bounded number of ranges in flight
+            for byte_range in ranges:
+                submit(byte_range)
+                if len(pending) >= self.max_workers * BATCHES_PER_WORKER:
+                    break
+            
+            while pending:
+                df = pending.popleft().result()
+                byte_range = next(ranges, None)
+                if byte_range is not None:
+                    submit(byte_range)
+                yield df
+    
+    def _data_start(self, data: mmap.mmap) -> int:
+        """
+        Get the offset of the first data line, after the header line if there is one
+        
+        Args:
+            data: File contents
+            
+        Returns:
+            Byte offset
+        """
+        if not self.has_header:
+            return 0
+        
+        # The header is the first line that is not blank
+        position = 0
+        while position < len(data):
+            newline = data.find(b"\n", position)
+            line_end = len(data) if newline == -1 else newline + 1
+            if data[position:line_end].strip():
+                return line_end
+            position = line_end
+        
+        return len(data)
+    
+    def _iter_batch_ranges(self, data: mmap.mmap, start: int, end: int,
+                           batch_size: int) -> Generator[Tuple[int, int], None, None]:
+        """
+        Split a byte range into ranges of batch_size lines
+        
+        Args:
+            data: File contents
+            start: Offset of the first byte
+            end: Offset after the last byte
+            batch_size: Number of lines in each range
+            
+        Returns:
+            Generator yielding (start, stop) offsets
+        """
+        window = batch_size * LINE_LENGTH_GUESS
+        position = start
+        
+        while position < end:
+            stop = min(position + window, end)
+            newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8, count=stop - position, offset=position) == NEWLINE)
+            
+            if len(newlines) >= batch_size:
+                stop = position + int(newlines[batch_size - 1]) + 1
+                # Size the next window from this batch's lines
+                window = (stop - position) * 9 // 8
+            elif stop < end:
+                window *= 2
+                continue
+            
+            yield position, stop
+            position = stop
+    
     def validate_mapping(self, file_path: str, mapping: List[ColumnMapping]) -> List[Dict[str, Any]]:
         """
         Validate a column mapping against the file
@@ -289,6 +559,8 @@ class FixedWidthHandler(FormatHandler):
             # First, check if there's a header row that might have field names
             has_header = self._detect_header(sample_lines)
             
+            self.has_header = has_header
+            
             if has_header:
                 # Try to use header to detect columns
                 header_line = sample_lines[0]
@@ -563,62 +835,64 @@ class FixedWidthHandler(FormatHandler):
             DataFrame with sample data
         """
         try:
-            # Convert column specs to format expected by pandas
-            column_positions = [(name, (start, end + 1)) for name, start, end in self.column_specs]
-            
-            # Read sample data
-            df = pd.read_fwf(
-                file_path,
-                colspecs=[pos for _, pos in column_positions],
-                names=[name for name, _ in column_positions],
-                encoding=self.encoding,
-                nrows=100
-            )
-            
-            # Clean column names
-            df.columns = [col.strip() if isinstance(col, str) else col for col in df.columns]
-            
-            # Try to convert to appropriate types
-            self._convert_dtypes(df)
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                sample = next(self._iter_batch_ranges(data, self._data_start(data), len(data), 100), None)
+                if sample is None:
+                    return pd.DataFrame()
+                
+                df = decode_fixed_width(data[sample[0]:sample[1]], self.column_specs, self.encoding)
             
-            return df
+            # Convert to the types read_data will use
+            return apply_dtype_plan(df, self._plan_dtypes(df))
         except Exception as e:
             logger.error(f"Error reading fixed-width sample data: {str(e)}")
             return pd.DataFrame()
     
-    def _convert_dtypes(self, df: pd.DataFrame) -> None:
+    def _plan_dtypes(self, df: pd.DataFrame) -> Dict[str, str]:
         """
-        Convert DataFrame columns to appropriate types
+        Decide each column's kind from a batch of strings
+        
+        Columns are numbers (integer if every value is a whole number that
+        fits in 64 bits, otherwise float), then dates, then booleans if every
+        value in the batch parses as one. Columns with no values in the batch
+        stay strings.
         
         Args:
-            df: DataFrame to convert
+            df: DataFrame of strings
+            
+        Returns:
+            Column name to kind: integer, float, datetime, boolean or string
         """
+        dtype_plan = {}
+        
         for col in df.columns:
+            values = df[col].dropna()
+            dtype_plan[col] = "string"
+            
+            if values.empty:
+                continue
+            
             try:
-                # Try to infer better types
-                if df[col].dtype == 'object':
-                    # First check if column is all numeric
-                    try:
-                        df[col] = pd.to_numeric(df[col], errors='raise')
-                        continue
-                    except:
-                        pass
-                    
-                    # Then check if column is datetime
-                    try:
-                        df[col] = pd.to_datetime(df[col], errors='raise')
-                        continue
-                    except:
-                        pass
-                    
-                    # Then check if column is boolean
-                    if df[col].dropna().isin(['True', 'False', 'true', 'false', 'T', 'F', 'Y', 'N', 'Yes', 'No', 'yes', 'no', '1', '0']).all():
-                        df[col] = df[col].map({
-                            'True': True, 'true': True, 'T': True, 'Y': True, 'Yes': True, 'yes': True, '1': True,
-                            'False': False, 'false': False, 'F': False, 'N': False, 'No': False, 'no': False, '0': False
-                        })
+                numbers = pd.to_numeric(values, errors='raise')
+                dtype_plan[col] = "integer" if pd.api.types.is_signed_integer_dtype(numbers) else "float"
+                continue
+            except:
+                pass
+            
+            try:
+                # Text columns are tried as dates without warning about each one
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    pd.to_datetime(values, errors='raise')
+                dtype_plan[col] = "datetime"
+                continue
             except:
                 pass
+            
+            if values.isin(list(BOOLEAN_VALUES)).all():
+                dtype_plan[col] = "boolean"
+        
+        return dtype_plan
     
     def _estimate_row_count(self, file_path: str) -> int:
         """
@@ -660,7 +934,7 @@ class FixedWidthHandler(FormatHandler):
         Returns:
             String representation of the data type
         """
-        dtype_str = str(dtype)
+        dtype_str = str(dtype).lower()
         
         if "int" in dtype_str:
             return "integer"
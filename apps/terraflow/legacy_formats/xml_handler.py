@@ -9,15 +9,33 @@ assessment and tax data.
 import os
 import re
 import logging
+import warnings
 import xml.etree.ElementTree as ET
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Tuple, Optional, Union, Generator
+from typing import Dict, List, Any, Tuple, Optional, Union, Generator, BinaryIO
 from legacy_converter import FormatHandler, ColumnMapping
 
+# lxml parses faster when it is installed
+try:
+    from lxml import etree as lxml_etree
+    HAS_LXML = True
+except ImportError:
+    lxml_etree = None
+    HAS_LXML = False
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Number of elements parsed from the start of the file to detect rows and columns
+ANALYSIS_ELEMENT_LIMIT = 5000
+
+# Files smaller than this have their rows counted exactly
+EXACT_COUNT_SIZE = 10 * 1024 * 1024  # 10MB
+
+# Steps of an element path; namespaced tags ("{uri}tag") may contain slashes
+PATH_STEP_PATTERN = re.compile(r"\{[^}]*\}[^/]*|[^/]+")
+
 class XMLHandler(FormatHandler):
     """Handler for XML format files"""
     
@@ -28,6 +46,7 @@ class XMLHandler(FormatHandler):
         self.column_paths = []
         self.column_names = []
         self.detected_structure = {}
+        self.use_lxml = HAS_LXML
     
     def can_handle(self, file_path: str) -> bool:
         """
@@ -123,6 +142,9 @@ class XMLHandler(FormatHandler):
         """
         Read data from the XML file as a generator
         
+        The file is streamed: each row element is cleared and detached once
+        its values are extracted, so memory use does not grow with the file.
+        
         Args:
             file_path: Path to the file
             batch_size: Number of rows to read at a time
@@ -130,77 +152,147 @@ class XMLHandler(FormatHandler):
         Returns:
             Generator yielding DataFrames
         """
+        yielded = False
+        
         try:
             # Ensure we have analyzed the XML structure
             if not self.row_xpath:
                 self._analyze_xml_structure(file_path)
             
-            # Use iterparse to avoid loading the entire file into memory
-            context = ET.iterparse(file_path, events=("end",))
-            
-            # Extract the root element path from row_xpath
-            row_tag = self.row_xpath.split("/")[-1]
-            
-            # Initialize batch data
-            batch_data = {col: [] for col in self.column_names}
-            row_count = 0
+            accessors = self._compile_column_paths()
+            rows = []
             
-            # Process the XML file incrementally
-            for event, elem in context:
-                if elem.tag == row_tag:
-                    # Extract data from this element
-                    row_data = self._extract_element_data(elem, self.column_paths, self.column_names)
-                    
-                    # Add to batch
-                    for col, value in row_data.items():
-                        batch_data[col].append(value)
-                    
-                    row_count += 1
-                    
-                    # Clear element to save memory
-                    elem.clear()
-                    
-                    # If batch is full, yield it
-                    if row_count >= batch_size:
-                        df = pd.DataFrame(batch_data)
-                        self._convert_dtypes(df)
-                        yield df
-                        
-                        # Reset batch
-                        batch_data = {col: [] for col in self.column_names}
-                        row_count = 0
+            for elem in self._iter_row_elements(file_path):
+                rows.append(self._extract_row(elem, accessors))
+                
+                # If batch is full, yield it
+                if len(rows) >= batch_size:
+                    df = pd.DataFrame.from_records(rows, columns=self.column_names)
+                    self._convert_dtypes(df)
+                    yielded = True
+                    yield df
+                    rows = []
             
             # Yield the last batch if not empty
-            if row_count > 0:
-                df = pd.DataFrame(batch_data)
+            if rows:
+                df = pd.DataFrame.from_records(rows, columns=self.column_names)
                 self._convert_dtypes(df)
+                yielded = True
                 yield df
         except Exception as e:
             logger.error(f"Error reading XML data: {str(e)}")
+            if not yielded:
+                yield pd.DataFrame()
+    
+    def _iterparse(self, source: BinaryIO, events: Tuple[str, ...]):
+        """
+        Parse a file incrementally with lxml if available, or ElementTree
+        
+        Args:
+            source: Binary file object
+            events: Parser events to report
             
-            # Fallback to simpler method if iterparse fails
-            try:
-                logger.info("Trying alternative XML reading method")
-                import xml.etree.ElementTree as ET
+        Returns:
+            Iterator of (event, element) pairs
+        """
+        if self.use_lxml and HAS_LXML:
+            return lxml_etree.iterparse(source, events=events)
+        return ET.iterparse(source, events=events)
+    
+    def _row_path(self, root_tag: str) -> Tuple[str, ...]:
+        """
+        Get the tags from the document root down to the row elements
+        
+        Args:
+            root_tag: Tag of the document root
+            
+        Returns:
+            Tuple of tags, starting with the root tag
+        """
+        steps = tuple(step for step in PATH_STEP_PATTERN.findall(self.row_xpath or ".") if step != ".")
+        
+        # "." and "./<root>" both make the root element the single row
+        if not steps or steps == (root_tag,):
+            return (root_tag,)
+        return (root_tag,) + steps
+    
+    def _iter_row_elements(self, file_path: str) -> Generator[Any, None, None]:
+        """
+        Stream the row elements of the file
+        
+        Elements outside rows are cleared and detached from their parents as
+        soon as they end, and so is each row after the caller has used it.
+        Only the open ancestors and the current row are ever held in memory.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Generator yielding row elements
+        """
+        with open(file_path, "rb") as f:
+            row_path = None
+            row_depth = 0
+            row_tags = []
+            elements = []
+            tags = []
+            
+            for event, elem in self._iterparse(f, ("start", "end")):
+                if event == "start":
+                    if row_path is None:
+                        row_path = self._row_path(elem.tag)
+                        row_depth = len(row_path)
+                        row_tags = list(row_path)
+                    elements.append(elem)
+                    tags.append(elem.tag)
+                    continue
                 
-                tree = ET.parse(file_path)
-                root = tree.getroot()
+                depth = len(elements)
                 
-                # Extract all rows
-                rows = []
-                for elem in root.findall(self.row_xpath):
-                    row_data = self._extract_element_data(elem, self.column_paths, self.column_names)
-                    rows.append(row_data)
+                # Elements inside a row are kept until the row ends
+                if depth > row_depth:
+                    elements.pop()
+                    tags.pop()
+                    continue
                 
-                # Split into batches
-                for i in range(0, len(rows), batch_size):
-                    batch = rows[i:i+batch_size]
-                    df = pd.DataFrame(batch)
-                    self._convert_dtypes(df)
-                    yield df
-            except Exception as e2:
-                logger.error(f"Error with alternative XML reading: {str(e2)}")
-                yield pd.DataFrame()
+                if depth == row_depth and tags == row_tags:
+                    yield elem
+                
+                elements.pop()
+                tags.pop()
+                
+                # Drop the finished element so the tree never grows
+                elem.clear()
+                if elements:
+                    elements[-1].remove(elem)
+    
+    def _read_prefix(self, file_path: str, limit: int = ANALYSIS_ELEMENT_LIMIT):
+        """
+        Parse the start of the file into a partial tree
+        
+        Args:
+            file_path: Path to the file
+            limit: Number of elements to parse
+            
+        Returns:
+            Root element of the partial tree
+        """
+        root = None
+        count = 0
+        
+        with open(file_path, "rb") as f:
+            for event, elem in self._iterparse(f, ("start", "end")):
+                if root is None:
+                    root = elem
+                if event == "end":
+                    count += 1
+                    if count >= limit:
+                        break
+        
+        if root is None:
+            raise ValueError("No elements found in XML file")
+        
+        return root
     
     def validate_mapping(self, file_path: str, mapping: List[ColumnMapping]) -> List[Dict[str, Any]]:
         """
@@ -271,9 +363,8 @@ class XMLHandler(FormatHandler):
             file_path: Path to the file
         """
         try:
-            # Parse the XML file
-            tree = ET.parse(file_path)
-            root = tree.getroot()
+            # Detect the structure from the start of the file only
+            root = self._read_prefix(file_path)
             
             # Start by identifying the structure
             structure = self._analyze_element(root)
@@ -292,7 +383,7 @@ class XMLHandler(FormatHandler):
                 self.row_xpath = best_candidate[0]
                 
                 # Get a sample row element
-                row_element = root.find(self.row_xpath.lstrip("."))
+                row_element = root.find(self.row_xpath)
             
             # Now map out the columns within the row
             if row_element is not None:
@@ -337,6 +428,9 @@ class XMLHandler(FormatHandler):
         # Group children by tag
         children_by_tag = {}
         for child in element:
+            # lxml keeps comments and processing instructions, whose tag is not a string
+            if not isinstance(child.tag, str):
+                continue
             if child.tag not in children_by_tag:
                 children_by_tag[child.tag] = []
             children_by_tag[child.tag].append(child)
@@ -371,7 +465,7 @@ class XMLHandler(FormatHandler):
         
         # Check all paths in the document
         for path in self._get_all_paths(root):
-            elements = root.findall(path)
+            elements = root.findall(f".{path}")
             if len(elements) >= min_repeats:
                 # Check if all elements have similar structure
                 if self._elements_have_similar_structure(elements[:min(10, len(elements))]):
@@ -398,6 +492,8 @@ class XMLHandler(FormatHandler):
             paths = []
         
         for child in element:
+            if not isinstance(child.tag, str):
+                continue
             child_path = f"{current_path}/{child.tag}"
             if child_path not in paths:
                 paths.append(child_path)
@@ -419,11 +515,11 @@ class XMLHandler(FormatHandler):
             return False
         
         # Get the tags of children for the first element
-        first_element_children = {child.tag for child in elements[0]}
+        first_element_children = {child.tag for child in elements[0] if isinstance(child.tag, str)}
         
         # Check if all other elements have similar children
         for element in elements[1:]:
-            element_children = {child.tag for child in element}
+            element_children = {child.tag for child in element if isinstance(child.tag, str)}
             # If the symmetric difference is more than half the tags, structures are too different
             if len(first_element_children.symmetric_difference(element_children)) > len(first_element_children) / 2:
                 return False
@@ -446,6 +542,9 @@ class XMLHandler(FormatHandler):
         
         # First, check for direct child text nodes
         for child in row_element:
+            if not isinstance(child.tag, str):
+                continue
+            
             if child.text and child.text.strip():
                 # This is a potential column
                 xpath = f"{prefix}/{child.tag}"
@@ -506,7 +605,8 @@ class XMLHandler(FormatHandler):
             
             # Process children
             for child in element:
-                extract_paths(child, f"{current_path}/{element.tag}")
+                if isinstance(child.tag, str):
+                    extract_paths(child, f"{current_path}/{element.tag}")
         
         extract_paths(root)
         
@@ -519,6 +619,78 @@ class XMLHandler(FormatHandler):
         self.column_paths = all_paths
         self.column_names = all_names
     
+    def _compile_column_paths(self, paths: List[str] = None) -> List[Tuple[Tuple[str, ...], Optional[str]]]:
+        """
+        Compile column paths into child tag steps and an optional attribute name
+        
+        Args:
+            paths: Column paths (the detected column paths by default)
+            
+        Returns:
+            List of (steps, attribute) tuples, one per path
+        """
+        if paths is None:
+            paths = self.column_paths
+        
+        accessors = []
+        for path in paths:
+            attr_name = None
+            elem_path = path
+            if "/@" in path:
+                elem_path, attr_name = path.rsplit("/@", 1)
+            elif path.startswith("@"):
+                elem_path, attr_name = "", path[1:]
+            
+            steps = tuple(step for step in PATH_STEP_PATTERN.findall(elem_path) if step != ".")
+            
+            # Flat structures map paths from the document root, which is also the row
+            if self.row_xpath == "." and steps and self.detected_structure.get("tag") == steps[0]:
+                steps = steps[1:]
+            
+            accessors.append((steps, attr_name))
+        
+        return accessors
+    
+    def _extract_row(self, element, accessors: List[Tuple[Tuple[str, ...], Optional[str]]]) -> Tuple[Any, ...]:
+        """
+        Extract the values of a row element using compiled column paths
+        
+        Each element's children are indexed by tag once, so every column is
+        a dictionary lookup per step.
+        
+        Args:
+            element: Row element
+            accessors: Compiled column paths
+            
+        Returns:
+            Tuple of column values
+        """
+        indexes = {}
+        values = []
+        
+        for steps, attr_name in accessors:
+            node = element
+            for step in steps:
+                index = indexes.get(node)
+                if index is None:
+                    index = indexes[node] = {}
+                    for child in node:
+                        # Comments and processing instructions have no string tag
+                        if isinstance(child.tag, str) and child.tag not in index:
+                            index[child.tag] = child
+                node = index.get(step)
+                if node is None:
+                    break
+            
+            if node is None:
+                values.append(None)
+            elif attr_name is not None:
+                values.append(node.get(attr_name))
+            else:
+                values.append(node.text.strip() if node.text else None)
+        
+        return tuple(values)
+    
     def _extract_element_data(self, element, paths, names):
         """
         Extract data from an XML element based on XPaths
@@ -531,57 +703,9 @@ class XMLHandler(FormatHandler):
         Returns:
             Dict with column values
         """
+        values = self._extract_row(element, self._compile_column_paths(paths[:len(names)]))
         result = {name: None for name in names}
-        
-        # Process each path
-        for i, path in enumerate(paths):
-            if i >= len(names):
-                break
-            
-            name = names[i]
-            
-            # Handle attribute paths
-            if "/@" in path:
-                elem_path, attr_name = path.rsplit("/@", 1)
-                # Remove leading dot if present
-                if elem_path.startswith("./"):
-                    elem_path = elem_path[1:]
-                elif elem_path.startswith("/"):
-                    elem_path = elem_path[1:]
-                
-                # Find the element
-                if not elem_path:
-                    # Attribute of the current element
-                    if attr_name in element.attrib:
-                        result[name] = element.attrib[attr_name]
-                else:
-                    # Attribute of a child element
-                    try:
-                        child = element.find(elem_path)
-                        if child is not None and attr_name in child.attrib:
-                            result[name] = child.attrib[attr_name]
-                    except:
-                        pass
-            else:
-                # Handle element text
-                clean_path = path
-                if clean_path.startswith("./"):
-                    clean_path = clean_path[2:]
-                elif clean_path.startswith("/"):
-                    clean_path = clean_path[1:]
-                
-                if not clean_path or clean_path == element.tag:
-                    # This element's text
-                    result[name] = element.text.strip() if element.text else None
-                else:
-                    # Child element's text
-                    try:
-                        child = element.find(clean_path)
-                        if child is not None:
-                            result[name] = child.text.strip() if child.text else None
-                    except:
-                        pass
-        
+        result.update(zip(names, values))
         return result
     
     def _read_sample_data(self, file_path: str, num_rows=100) -> pd.DataFrame:
@@ -600,21 +724,16 @@ class XMLHandler(FormatHandler):
             if not self.row_xpath:
                 self._analyze_xml_structure(file_path)
             
-            # Parse the XML file
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            # Extract data from rows
+            # Extract data from the first rows only
+            accessors = self._compile_column_paths()
             rows = []
-            for i, elem in enumerate(root.findall(self.row_xpath.lstrip("."))):
-                if i >= num_rows:
+            for elem in self._iter_row_elements(file_path):
+                rows.append(self._extract_row(elem, accessors))
+                if len(rows) >= num_rows:
                     break
-                
-                row_data = self._extract_element_data(elem, self.column_paths, self.column_names)
-                rows.append(row_data)
             
             # Create DataFrame
-            df = pd.DataFrame(rows)
+            df = pd.DataFrame.from_records(rows, columns=self.column_names)
             
             # Try to convert to appropriate types
             self._convert_dtypes(df)
@@ -634,7 +753,7 @@ class XMLHandler(FormatHandler):
         for col in df.columns:
             try:
                 # Try to infer better types
-                if df[col].dtype == 'object':
+                if pd.api.types.is_string_dtype(df[col].dtype):
                     # First check if column is numeric
                     try:
                         df[col] = pd.to_numeric(df[col], errors='raise')
@@ -644,7 +763,10 @@ class XMLHandler(FormatHandler):
                     
                     # Then check if column is datetime
                     try:
-                        df[col] = pd.to_datetime(df[col], errors='raise')
+                        # Without a format pandas warns that it is parsing element by element
+                        with warnings.catch_warnings():
+                            warnings.simplefilter("ignore")
+                            df[col] = pd.to_datetime(df[col], errors='raise')
                         continue
                     except:
                         pass
@@ -669,20 +791,24 @@ class XMLHandler(FormatHandler):
             Estimated row count
         """
         try:
-            # For small files, just count directly
+            # For small files, count the rows while streaming through them
             file_size = os.path.getsize(file_path)
-            if file_size < 10 * 1024 * 1024:  # 10MB
-                tree = ET.parse(file_path)
-                root = tree.getroot()
-                return len(root.findall(self.row_xpath.lstrip(".")))
+            if file_size < EXACT_COUNT_SIZE:
+                return sum(1 for _ in self._iter_row_elements(file_path))
+            
+            # The root element is the only row
+            steps = [step for step in PATH_STEP_PATTERN.findall(self.row_xpath or ".") if step != "."]
+            if not steps or steps == [self.detected_structure.get("tag")]:
+                return 1
             
             # For larger files, estimate based on sample
             sample_size = 1024 * 1024  # 1MB
             with open(file_path, "r", encoding=self.encoding, errors="ignore") as f:
                 sample = f.read(sample_size)
             
-            # Count row elements in sample
-            sample_count = sample.count(f"<{self.row_xpath.split('/')[-1]}")
+            # Count row start tags in sample, with or without a namespace prefix
+            local_name = steps[-1].rsplit("}", 1)[-1]
+            sample_count = len(re.findall(rf"<(?:[\w.-]+:)?{re.escape(local_name)}[\s/>]", sample))
             if sample_count == 0:
                 return 0
             
@@ -0,0 +1,24 @@
+"""Add resume key to table configuration
+
+Revision ID: 03_add_table_sync_resume_key
+Revises: 02_add_quality_alert_table
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '03_add_table_sync_resume_key'
+down_revision = '02_add_quality_alert_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Primary key of the last page loaded by the sync engine, used to resume
+    op.add_column('table_configuration', sa.Column('last_synced_key', sa.Text(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('table_configuration', 'last_synced_key')
@@ -8,5 +8,6 @@ including caching, database optimization, and performance monitoring.
 from performance.optimization import (
     PerformanceOptimizer, optimizer, cached, timed
 )
+from performance.cache import LRUTTLCache, SQLiteCacheBackend
 
-__all__ = ['PerformanceOptimizer', 'optimizer', 'cached', 'timed']
\ No newline at end of file
+__all__ = ['PerformanceOptimizer', 'optimizer', 'cached', 'timed', 'LRUTTLCache', 'SQLiteCacheBackend']
\ No newline at end of file
@@ -0,0 +1,388 @@
+"""
+Cache Backends Module
+
+This module provides the storage behind PerformanceOptimizer.cache: a bounded,
+thread-safe LRU cache with per-entry TTLs and byte accounting, and an optional
+SQLite-backed store that lets several worker processes share cached results.
+"""
+
+import os
+import re
+import sys
+import time
+import pickle
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for cache misses, so that None can be cached
+MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Args:
+        value: Value to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class SQLiteCacheBackend:
+    """
+    Cache store in a local SQLite database shared by worker processes.
+
+    Values are pickled. Each thread uses its own connection and the database
+    runs in WAL mode, so readers do not block the writer.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000, prune_interval: int = 100):
+        """
+        Initialize the SQLite cache backend.
+
+        Args:
+            path: Path of the SQLite database file
+            max_entries: Maximum number of entries kept in the database
+            prune_interval: Number of writes between pruning expired and excess entries
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.prune_interval = prune_interval
+        self._local = threading.local()
+        self._writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = self._get_connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires)")
+        conn.commit()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.create_function("REGEXP", 2, lambda pattern, value: re.search(pattern, value) is not None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Tuple[Any, float]:
+        """
+        Get a value from the store.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value, expiry timestamp), with MISSING as the value on a miss
+        """
+        try:
+            row = self._get_connection().execute(
+                "SELECT value, expires FROM cache_entries WHERE key = ? AND expires > ?",
+                (key, time.time())
+            ).fetchone()
+            if row is None:
+                return MISSING, 0.0
+            return pickle.loads(row[0]), row[1]
+        except Exception as e:
+            logger.warning(f"Error reading shared cache entry: {str(e)}")
+            return MISSING, 0.0
+
+    def set(self, key: str, value: Any, expires: float):
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to store; values that cannot be pickled are skipped
+            expires: Expiry timestamp
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+
+        try:
+            conn = self._get_connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(data), expires)
+            )
+            conn.commit()
+
+            self._writes += 1
+            if self._writes % self.prune_interval == 0:
+                self.prune()
+        except Exception as e:
+            logger.warning(f"Error writing shared cache entry: {str(e)}")
+
+    def delete(self, pattern: Optional[str] = None):
+        """
+        Delete entries from the store.
+
+        Args:
+            pattern: Optional regex pattern to match cache keys; all entries if omitted
+        """
+        try:
+            conn = self._get_connection()
+            if pattern:
+                conn.execute("DELETE FROM cache_entries WHERE key REGEXP ?", (pattern,))
+            else:
+                conn.execute("DELETE FROM cache_entries")
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Error clearing shared cache: {str(e)}")
+
+    def prune(self):
+        """Remove expired entries and the soonest-expiring entries over max_entries."""
+        conn = self._get_connection()
+        conn.execute("DELETE FROM cache_entries WHERE expires <= ?", (time.time(),))
+        conn.execute("""
+            DELETE FROM cache_entries WHERE key IN (
+                SELECT key FROM cache_entries ORDER BY expires DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+        conn.commit()
+
+    def count(self) -> int:
+        """Get the number of live entries in the store."""
+        try:
+            return self._get_connection().execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE expires > ?", (time.time(),)
+            ).fetchone()[0]
+        except Exception:
+            return 0
+
+
+class _Flight:
+    """A computation in progress for a cache key."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = MISSING
+        self.error = None
+
+
+class LRUTTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTLs.
+
+    Entries are bounded by count and, optionally, by total estimated size in
+    bytes; the least recently used entries are evicted first. Concurrent
+    misses for the same key are coalesced so the value is computed once. An
+    optional shared backend is consulted on local misses and written through
+    on stores.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 0,
+                 shared_backend: Optional[SQLiteCacheBackend] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total estimated size of entries, 0 for no limit
+            shared_backend: Optional store shared between processes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.shared_backend = shared_backend
+
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "coalesced": 0
+        }
+
+    def get(self, key: str) -> Any:
+        """
+        Get a value from the cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or MISSING
+        """
+        with self._lock:
+            value = self._get_local(key)
+            if value is not MISSING:
+                self.stats["hits"] += 1
+                return value
+
+        if self.shared_backend is not None:
+            value, expires = self.shared_backend.get(key)
+            if value is not MISSING:
+                with self._lock:
+                    self.stats["shared_hits"] += 1
+                    self._set_local(key, value, expires)
+                return value
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return MISSING
+
+    def set(self, key: str, value: Any, ttl: float):
+        """
+        Store a value in the cache.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live in seconds
+        """
+        expires = time.time() + ttl
+        with self._lock:
+            self._set_local(key, value, expires)
+
+        if self.shared_backend is not None:
+            self.shared_backend.set(key, value, expires)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: float) -> Tuple[Any, bool]:
+        """
+        Get a value, computing and storing it on a miss.
+
+        If another thread is already computing the same key, this waits for
+        its result instead of computing it again.
+
+        Args:
+            key: Cache key
+            compute: Function producing the value
+            ttl: Time-to-live in seconds
+
+        Returns:
+            Tuple of (value, whether it was served without computing)
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value, True
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+
+        try:
+            flight.value = compute()
+            self.set(key, flight.value, ttl)
+            return flight.value, False
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def clear(self, pattern: Optional[str] = None):
+        """
+        Remove entries from the cache.
+
+        Args:
+            pattern: Optional regex pattern to match cache keys; all entries if omitted
+        """
+        with self._lock:
+            if pattern:
+                match_pattern = re.compile(pattern)
+                for key in [k for k in self._entries if match_pattern.search(k)]:
+                    self._remove(key)
+            else:
+                self._entries.clear()
+                self._bytes = 0
+
+        if self.shared_backend is not None:
+            self.shared_backend.delete(pattern)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit, miss and eviction counts and current size
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self._entries)
+            stats["bytes"] = self._bytes
+
+        stats["max_entries"] = self.max_entries
+        stats["max_bytes"] = self.max_bytes
+        if self.shared_backend is not None:
+            stats["shared_size"] = self.shared_backend.count()
+
+        return stats
+
+    def _get_local(self, key: str) -> Any:
+        """Get a live local entry, refreshing its recency. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+
+        value, expires, _ = entry
+        if expires <= time.time():
+            self._remove(key)
+            self.stats["expirations"] += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Any, expires: float):
+        """Store a local entry and evict over the limits. Caller holds the lock."""
+        size = estimate_size(value)
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = (value, expires, size)
+        self._bytes += size
+
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 (self.max_bytes and self._bytes > self.max_bytes)):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        """Remove a local entry. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
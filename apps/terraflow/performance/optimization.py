@@ -11,6 +11,7 @@ import time
 import functools
 import inspect
 import re
+import pickle
 import hashlib
 from typing import Dict, List, Any, Optional, Callable, Tuple, Set, Union
 
@@ -32,14 +33,12 @@ try:
 except ImportError:
     SQLALCHEMY_AVAILABLE = False
 
+from performance.cache import LRUTTLCache, SQLiteCacheBackend
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Simple in-memory cache
-_memory_cache = {}
-_cache_stats = {"hits": 0, "misses": 0, "size": 0}
-
 class PerformanceOptimizer:
     """
     Performance optimization tools for the application.
@@ -53,20 +52,8 @@ class PerformanceOptimizer:
         Args:
             config: Configuration dictionary
         """
-        self.config = config or {}
-        
-        # Configure caching
-        self.cache_enabled = self.config.get("cache_enabled", True)
-        self.cache_default_ttl = self.config.get("cache_default_ttl", 300)  # 5 minutes
-        self.max_cache_size = self.config.get("max_cache_size", 1000)
-        
-        # Configure query optimization
-        self.query_optimization_enabled = self.config.get("query_optimization_enabled", True)
-        self.slow_query_threshold = self.config.get("slow_query_threshold", 1.0)  # 1 second
-        
-        # Configure monitoring
-        self.monitoring_enabled = self.config.get("monitoring_enabled", True)
-        self.monitoring_interval = self.config.get("monitoring_interval", 60)  # 1 minute
+        self.config = {}
+        self.configure(config or {})
         
         # Performance metrics
         self.metrics = {
@@ -86,6 +73,48 @@ class PerformanceOptimizer:
         
         logger.info("Performance optimizer initialized")
     
+    def configure(self, config: Dict[str, Any]):
+        """
+        Apply configuration settings, rebuilding the cache from them.
+        
+        The module-level optimizer is created at import time, so the
+        application applies its settings here. Entries cached in this
+        process are dropped; entries in a shared cache are kept.
+        
+        Args:
+            config: Configuration settings to merge into the current ones
+        """
+        self.config.update(config)
+        
+        # Configure caching
+        self.cache_enabled = self.config.get("cache_enabled", True)
+        self.cache_default_ttl = self.config.get("cache_default_ttl", 300)  # 5 minutes
+        
+        # Optional cache shared between worker processes
+        shared_backend = None
+        if self.config.get("cache_shared_path"):
+            try:
+                shared_backend = SQLiteCacheBackend(
+                    self.config["cache_shared_path"],
+                    max_entries=self.config.get("cache_shared_max_entries", 10000)
+                )
+            except Exception as e:
+                logger.warning(f"Shared cache unavailable, using process-local cache only: {str(e)}")
+        
+        self._cache = LRUTTLCache(
+            max_entries=self.config.get("max_cache_size", 1000),
+            max_bytes=self.config.get("max_cache_bytes", 64 * 1024 * 1024),
+            shared_backend=shared_backend
+        )
+        
+        # Configure query optimization
+        self.query_optimization_enabled = self.config.get("query_optimization_enabled", True)
+        self.slow_query_threshold = self.config.get("slow_query_threshold", 1.0)  # 1 second
+        
+        # Configure monitoring
+        self.monitoring_enabled = self.config.get("monitoring_enabled", True)
+        self.monitoring_interval = self.config.get("monitoring_interval", 60)  # 1 minute
+    
     def cache(self, ttl: Optional[int] = None) -> Callable:
         """
         Decorator for caching function results.
@@ -107,35 +136,13 @@ class PerformanceOptimizer:
                 # Create cache key
                 key = self._create_cache_key(func, args, kwargs)
                 
-                # Check cache
-                cached_item = _memory_cache.get(key)
-                if cached_item:
-                    if time.time() < cached_item["expires"]:
-                        # Cache hit
-                        self.metrics["cache_hits"] += 1
-                        _cache_stats["hits"] += 1
-                        return cached_item["value"]
-                    else:
-                        # Expired
-                        del _memory_cache[key]
-                
-                # Cache miss
-                self.metrics["cache_misses"] += 1
-                _cache_stats["misses"] += 1
+                # Concurrent misses for the same key execute the function once
+                result, hit = self._cache.get_or_compute(key, lambda: func(*args, **kwargs), ttl)
                 
-                # Execute function
-                result = func(*args, **kwargs)
-                
-                # Store in cache
-                _memory_cache[key] = {
-                    "value": result,
-                    "expires": time.time() + ttl
-                }
-                _cache_stats["size"] = len(_memory_cache)
-                
-                # Check cache size and evict if necessary
-                if len(_memory_cache) > self.max_cache_size:
-                    self._evict_cache_items()
+                if hit:
+                    self.metrics["cache_hits"] += 1
+                else:
+                    self.metrics["cache_misses"] += 1
                 
                 return result
             
@@ -196,32 +203,29 @@ class PerformanceOptimizer:
         elif isinstance(arg, (list, tuple)):
             return f"[{','.join([self._convert_arg_to_str(a) for a in arg])}]"
         elif isinstance(arg, dict):
-            return f"{{{','.join([f'{k}:{self._convert_arg_to_str(v)}' for k, v in sorted(arg.items())])}}}"
+            return f"{{{','.join([f'{k}:{self._convert_arg_to_str(v)}' for k, v in sorted(arg.items(), key=lambda item: str(item[0]))])}}}"
+        elif isinstance(arg, (set, frozenset)):
+            return f"{{{','.join(sorted(self._convert_arg_to_str(a) for a in arg))}}}"
         else:
-            # For complex objects, use their id
-            return f"{arg.__class__.__name__}:{id(arg)}"
+            # For complex objects, use a digest of their state so equal objects
+            # share a key; fall back to their id if the state cannot be read
+            try:
+                state = pickle.dumps(arg, protocol=4)
+            except Exception:
+                try:
+                    state = self._convert_arg_to_str(vars(arg)).encode('utf-8')
+                except (TypeError, RecursionError):
+                    return f"{arg.__class__.__name__}:{id(arg)}"
+            return f"{arg.__class__.__name__}:{hashlib.md5(state).hexdigest()}"
+    
+    @property
+    def max_cache_size(self) -> int:
+        """Maximum number of cache entries"""
+        return self._cache.max_entries
     
-    def _evict_cache_items(self):
-        """Evict items from cache when it grows too large"""
-        # Strategy: Remove expired items first, then oldest items
-        now = time.time()
-        
-        # Remove expired items
-        expired_keys = [k for k, v in _memory_cache.items() if v["expires"] < now]
-        for key in expired_keys:
-            del _memory_cache[key]
-        
-        # If cache is still too large, remove oldest items
-        if len(_memory_cache) > self.max_cache_size:
-            # Sort by expiration time (oldest first)
-            sorted_cache = sorted(_memory_cache.items(), key=lambda x: x[1]["expires"])
-            
-            # Remove oldest items until we're under the limit
-            items_to_remove = len(_memory_cache) - self.max_cache_size
-            for i in range(items_to_remove):
-                del _memory_cache[sorted_cache[i][0]]
-        
-        _cache_stats["size"] = len(_memory_cache)
+    @max_cache_size.setter
+    def max_cache_size(self, value: int):
+        self._cache.max_entries = value
     
     def clear_cache(self, pattern: Optional[str] = None):
         """
@@ -230,18 +234,7 @@ class PerformanceOptimizer:
         Args:
             pattern: Optional regex pattern to match cache keys
         """
-        global _memory_cache
-        if pattern:
-            # Clear cache entries matching pattern
-            match_pattern = re.compile(pattern)
-            matching_keys = [k for k in _memory_cache.keys() if match_pattern.search(k)]
-            for key in matching_keys:
-                del _memory_cache[key]
-        else:
-            # Clear entire cache
-            _memory_cache = {}
-        
-        _cache_stats["size"] = len(_memory_cache)
+        self._cache.clear(pattern)
         logger.info(f"Cache cleared{' (pattern: ' + pattern + ')' if pattern else ''}")
     
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -251,8 +244,9 @@ class PerformanceOptimizer:
         Returns:
             Dictionary with cache statistics
         """
-        stats = _cache_stats.copy()
-        hit_rate = stats["hits"] / (stats["hits"] + stats["misses"]) if (stats["hits"] + stats["misses"]) > 0 else 0
+        stats = self._cache.get_stats()
+        hits = stats["hits"] + stats["shared_hits"]
+        hit_rate = hits / (hits + stats["misses"]) if (hits + stats["misses"]) > 0 else 0
         stats["hit_rate"] = hit_rate
         return stats
     
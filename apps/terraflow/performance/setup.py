@@ -25,17 +25,8 @@ def setup_performance_optimization(app: Flask, config: Optional[Dict[str, Any]]
     """
     try:
         if config:
-            # Update optimizer configuration
-            optimizer.config.update(config)
-            
-            # Reconfigure based on updated config
-            optimizer.cache_enabled = optimizer.config.get("cache_enabled", True)
-            optimizer.cache_default_ttl = optimizer.config.get("cache_default_ttl", 300)
-            optimizer.max_cache_size = optimizer.config.get("max_cache_size", 1000)
-            optimizer.query_optimization_enabled = optimizer.config.get("query_optimization_enabled", True)
-            optimizer.slow_query_threshold = optimizer.config.get("slow_query_threshold", 1.0)
-            optimizer.monitoring_enabled = optimizer.config.get("monitoring_enabled", True)
-            optimizer.monitoring_interval = optimizer.config.get("monitoring_interval", 60)
+            # Apply the configuration, rebuilding the cache and its shared backend
+            optimizer.configure(config)
         
         # Set up Flask monitoring
         optimizer.setup_flask_monitoring(app)
@@ -9,6 +9,7 @@ import os
 import logging
 import threading
 import time
+from collections import deque
 from typing import Dict, Any, Optional, Tuple, Union, List
 from datetime import datetime, timedelta
 
@@ -25,20 +26,30 @@ logger = logging.getLogger(__name__)
 # Thread-local storage for client connections
 local = threading.local()
 
-# Connection pool
+# Connection pools, keyed by URL and key
 _connection_pool = {}
 _pool_lock = threading.RLock()
 
 # Connection pool configuration
-MAX_POOL_SIZE = 10
+MAX_POOL_SIZE = int(os.environ.get('SUPABASE_POOL_MAX_SIZE', '10'))
 IDLE_TIMEOUT_SECONDS = 300  # 5 minutes
+ACQUIRE_TIMEOUT_SECONDS = float(os.environ.get('SUPABASE_POOL_ACQUIRE_TIMEOUT', '5.0'))
+REAP_INTERVAL_SECONDS = 30
+ORPHAN_CHECK_SECONDS = 0.25  # How often waiters look for connections left by exited threads
+
+# Background reaper
+_reaper_thread = None
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no connection becomes available before the acquire timeout."""
+    pass
 
 class PooledConnection:
     """
     A connection in the connection pool.
     """
     
-    def __init__(self, client: Any, url: str, key: str):
+    def __init__(self, client: Any, url: str, key: str, conn_id: str = None):
         """
         Initialize a new pooled connection.
         
@@ -46,27 +57,32 @@ class PooledConnection:
             client: Supabase client
             url: Supabase URL
             key: Supabase API key or service key
+            conn_id: Identifier of the connection within its pool
         """
         self.client = client
         self.url = url
         self.key = key
+        self.conn_id = conn_id or str(time.time())
         self.last_used = time.time()
         self.in_use = False
+        self.owner = None
     
     def acquire(self) -> Any:
         """
-        Acquire the connection.
+        Acquire the connection for the calling thread.
         
         Returns:
             Supabase client
         """
         self.in_use = True
+        self.owner = threading.current_thread()
         self.last_used = time.time()
         return self.client
     
     def release(self) -> None:
         """Release the connection back to the pool."""
         self.in_use = False
+        self.owner = None
         self.last_used = time.time()
     
     def is_expired(self) -> bool:
@@ -77,107 +93,319 @@ class PooledConnection:
             True if the connection has expired, False otherwise
         """
         return (time.time() - self.last_used) > IDLE_TIMEOUT_SECONDS and not self.in_use
+    
+    def is_orphaned(self) -> bool:
+        """
+        Check if the connection is held by a thread that has exited without releasing it.
+        
+        Returns:
+            True if the connection is orphaned, False otherwise
+        """
+        return self.in_use and self.owner is not None and not self.owner.is_alive()
 
-def get_connection(url: str, key: str) -> Any:
+class _Waiter:
+    """A thread waiting for a connection, served in arrival order."""
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None
+        self.may_create = False
+
+class ConnectionPool:
+    """
+    Bounded pool of clients for one Supabase URL and key.
+    
+    Idle connections are kept on a free list. When none is free and the pool
+    is at its size limit, callers wait in FIFO order; a released connection is
+    handed directly to the longest waiting caller, so later callers cannot
+    overtake it. Connections left held by threads that exited are reclaimed
+    before and while callers wait. Clients are created outside the pool lock.
+    """
+    
+    def __init__(self, url: str, key: str, max_size: int = MAX_POOL_SIZE):
+        """
+        Initialize a connection pool.
+        
+        Args:
+            url: Supabase URL
+            key: Supabase API key or service key
+            max_size: Maximum number of connections, in use or idle
+        """
+        self.url = url
+        self.key = key
+        self.max_size = max(1, max_size)
+        
+        self.lock = threading.Lock()
+        self.connections = {}  # Map conn_id to PooledConnection
+        self.idle = deque()  # Free list, most recently released last
+        self.waiters = deque()  # Waiting callers, oldest first
+        self.creating = 0  # Connections being created outside the lock
+        self.counter = 0
+        
+        self.stats = {
+            'acquisitions': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'created': 0,
+            'expired': 0,
+            'orphaned': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0
+        }
+    
+    def acquire(self, timeout: float = ACQUIRE_TIMEOUT_SECONDS) -> PooledConnection:
+        """
+        Acquire a connection, waiting up to timeout seconds if the pool is exhausted.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            Pooled connection, acquired by the calling thread
+            
+        Raises:
+            PoolTimeoutError: If no connection became available in time
+        """
+        start_time = time.monotonic()
+        waiter = None
+        
+        with self.lock:
+            if not self.idle and not self._has_capacity():
+                self._reclaim_orphans()
+            
+            if self.idle and not self.waiters:
+                return self._lease(self.idle.pop(), start_time)
+            
+            if not self.waiters and self._has_capacity():
+                self.creating += 1
+            else:
+                waiter = _Waiter()
+                self.waiters.append(waiter)
+                self.stats['waits'] += 1
+        
+        if waiter is not None:
+            deadline = start_time + timeout
+            while not waiter.event.wait(max(0.0, min(ORPHAN_CHECK_SECONDS, deadline - time.monotonic()))):
+                if time.monotonic() >= deadline:
+                    break
+                with self.lock:
+                    if self._reclaim_orphans():
+                        self._dispatch()
+            
+            with self.lock:
+                if waiter.conn is not None:
+                    return self._lease(waiter.conn, start_time)
+                
+                if not waiter.may_create:
+                    # Timed out; leave the queue
+                    self.waiters.remove(waiter)
+                    self.stats['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No Supabase connection available for {self.url} "
+                        f"after {timeout:.1f}s (pool size {self.max_size})"
+                    )
+        
+        # A creation slot was reserved above or handed over by _dispatch
+        try:
+            client = create_client(self.url, self.key)
+        except Exception:
+            with self.lock:
+                self.creating -= 1
+                self._dispatch()
+            raise
+        
+        with self.lock:
+            self.creating -= 1
+            self.counter += 1
+            conn = PooledConnection(client, self.url, self.key, conn_id=f"{self.counter}-{time.time()}")
+            self.connections[conn.conn_id] = conn
+            self.stats['created'] += 1
+            logger.debug(f"Created new connection {conn.conn_id} for {self.url}")
+            return self._lease(conn, start_time)
+    
+    def release(self, conn: PooledConnection) -> None:
+        """
+        Return a connection to the pool, handing it to the oldest waiter if there is one.
+        
+        Args:
+            conn: Connection to release
+        """
+        with self.lock:
+            if conn.conn_id not in self.connections or not conn.in_use:
+                return
+            conn.release()
+            self.idle.append(conn)
+            self._dispatch()
+    
+    def reap(self) -> int:
+        """
+        Remove idle connections past the idle timeout and reclaim connections
+        held by threads that exited without releasing them.
+        
+        Returns:
+            Number of connections removed or reclaimed
+        """
+        with self.lock:
+            count = self._reclaim_orphans()
+            
+            for conn in list(self.idle):
+                if conn.is_expired():
+                    logger.debug(f"Removing expired connection {conn.conn_id} for {self.url}")
+                    self.idle.remove(conn)
+                    del self.connections[conn.conn_id]
+                    self.stats['expired'] += 1
+                    count += 1
+            
+            self._dispatch()
+        
+        return count
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the status and metrics of the pool.
+        
+        Returns:
+            Dictionary with connection counts, utilization and wait-time metrics
+        """
+        now = time.time()
+        with self.lock:
+            active = sum(1 for conn in self.connections.values() if conn.in_use)
+            stats = dict(self.stats)
+            status = {
+                'total': len(self.connections),
+                'active': active,
+                'idle': len(self.connections) - active,
+                'waiting': len(self.waiters),
+                'max_size': self.max_size,
+                'utilization': active / self.max_size,
+                'connections': [
+                    {
+                        'id': conn.conn_id,
+                        'in_use': conn.in_use,
+                        'last_used': conn.last_used,
+                        'last_used_hr': datetime.fromtimestamp(conn.last_used).strftime('%Y-%m-%d %H:%M:%S'),
+                        'idle_time': now - conn.last_used
+                    }
+                    for conn in self.connections.values()
+                ]
+            }
+        
+        total_wait_time = stats.pop('total_wait_time')
+        max_wait_time = stats.pop('max_wait_time')
+        status.update(stats)
+        status['avg_wait_ms'] = (total_wait_time / stats['acquisitions'] * 1000) if stats['acquisitions'] else 0.0
+        status['max_wait_ms'] = max_wait_time * 1000
+        return status
+    
+    def _has_capacity(self) -> bool:
+        """Check whether another connection may be created. Caller holds the lock."""
+        return len(self.connections) + self.creating < self.max_size
+    
+    def _reclaim_orphans(self) -> int:
+        """Return connections held by exited threads to the free list. Caller holds the lock."""
+        count = 0
+        for conn in self.connections.values():
+            if conn.is_orphaned():
+                logger.warning(f"Reclaiming connection {conn.conn_id} for {self.url} from exited thread {conn.owner.name}")
+                conn.release()
+                self.idle.append(conn)
+                self.stats['orphaned'] += 1
+                count += 1
+        return count
+    
+    def _dispatch(self) -> None:
+        """Serve waiters from the free list or free capacity, oldest first. Caller holds the lock."""
+        while self.waiters:
+            if self.idle:
+                waiter = self.waiters.popleft()
+                waiter.conn = self.idle.pop()
+                # Mark in use so the reaper does not expire it before the waiter wakes
+                waiter.conn.in_use = True
+            elif self._has_capacity():
+                waiter = self.waiters.popleft()
+                waiter.may_create = True
+                self.creating += 1
+            else:
+                return
+            waiter.event.set()
+    
+    def _lease(self, conn: PooledConnection, start_time: float) -> PooledConnection:
+        """Acquire a connection for the calling thread and record metrics. Caller holds the lock."""
+        conn.acquire()
+        wait_time = time.monotonic() - start_time
+        self.stats['acquisitions'] += 1
+        self.stats['total_wait_time'] += wait_time
+        self.stats['max_wait_time'] = max(self.stats['max_wait_time'], wait_time)
+        return conn
+
+def _get_pool(url: str, key: str) -> ConnectionPool:
+    """Get or create the pool for a URL and key."""
+    conn_key = f"{url}:{key}"
+    with _pool_lock:
+        pool = _connection_pool.get(conn_key)
+        if pool is None:
+            pool = _connection_pool[conn_key] = ConnectionPool(url, key, MAX_POOL_SIZE)
+        _start_reaper()
+        return pool
+
+def _start_reaper() -> None:
+    """Start the background reaper thread if it is not running. Caller holds _pool_lock."""
+    global _reaper_thread
+    if _reaper_thread is not None and _reaper_thread.is_alive():
+        return
+    
+    _reaper_thread = threading.Thread(target=_run_reaper, name='supabase-pool-reaper', daemon=True)
+    _reaper_thread.start()
+
+def _run_reaper() -> None:
+    """Periodically clean all pools."""
+    while True:
+        time.sleep(REAP_INTERVAL_SECONDS)
+        try:
+            clean_pool()
+        except Exception as e:
+            logger.error(f"Error cleaning Supabase connection pool: {str(e)}")
+
+def _get_thread_connections() -> Dict[str, Tuple[ConnectionPool, PooledConnection]]:
+    """Get the connections held by the calling thread, keyed by URL and key."""
+    if not hasattr(local, 'connections'):
+        local.connections = {}
+    return local.connections
+
+def get_connection(url: str, key: str, timeout: Optional[float] = None) -> Any:
     """
     Get a connection from the pool, or create a new one if none is available.
     
+    A thread that already holds a connection for the same URL and key gets the
+    same client back. When the pool is at its size limit, the caller waits in
+    FIFO order for a connection to be released.
+    
     Args:
         url: Supabase URL
         key: Supabase API key or service key
+        timeout: Maximum time to wait for a connection in seconds
+            (default ACQUIRE_TIMEOUT_SECONDS)
         
     Returns:
         Supabase client
+        
+    Raises:
+        PoolTimeoutError: If the pool is exhausted for longer than the timeout
     """
     if not SUPABASE_AVAILABLE:
         raise ImportError("Supabase package not installed")
     
     # Check if thread already has a connection
-    thread_id = threading.get_ident()
-    if hasattr(local, 'client'):
-        if local.url == url and local.key == key:
-            return local.client
-    
-    # Create the connection key
     conn_key = f"{url}:{key}"
+    held = _get_thread_connections()
+    if conn_key in held:
+        return held[conn_key][1].client
     
-    # Acquire the pool lock
-    with _pool_lock:
-        # Clean up expired connections in the pool
-        for pool_key in list(_connection_pool.keys()):
-            pool = _connection_pool[pool_key]
-            for conn_id in list(pool.keys()):
-                conn = pool[conn_id]
-                if conn.is_expired():
-                    logger.debug(f"Removing expired connection {conn_id} from pool {pool_key}")
-                    del pool[conn_id]
-        
-        # Create pool for this connection if it doesn't exist
-        if conn_key not in _connection_pool:
-            _connection_pool[conn_key] = {}
-        
-        # Get available connection from pool
-        pool = _connection_pool[conn_key]
-        for conn_id, conn in pool.items():
-            if not conn.in_use:
-                client = conn.acquire()
-                local.client = client
-                local.url = url
-                local.key = key
-                local.conn_id = conn_id
-                local.conn_key = conn_key
-                logger.debug(f"Acquired connection {conn_id} from pool {conn_key}")
-                return client
-        
-        # Create new connection if pool isn't full
-        if len(pool) < MAX_POOL_SIZE:
-            client = create_client(url, key)
-            conn_id = str(time.time())
-            conn = PooledConnection(client, url, key)
-            client = conn.acquire()
-            pool[conn_id] = conn
-            local.client = client
-            local.url = url
-            local.key = key
-            local.conn_id = conn_id
-            local.conn_key = conn_key
-            logger.debug(f"Created new connection {conn_id} in pool {conn_key}")
-            return client
-        
-        # If pool is full, wait for a connection to become available
-        # (This should rarely happen, as we limit concurrent requests)
-        logger.warning(f"Connection pool {conn_key} is full, waiting for a connection")
-        max_wait = 5.0  # 5 seconds
-        start_time = time.time()
-        while time.time() - start_time < max_wait:
-            # Sleep briefly
-            time.sleep(0.1)
-            
-            # Check for available connections
-            for conn_id, conn in pool.items():
-                if not conn.in_use:
-                    client = conn.acquire()
-                    local.client = client
-                    local.url = url
-                    local.key = key
-                    local.conn_id = conn_id
-                    local.conn_key = conn_key
-                    logger.debug(f"Acquired connection {conn_id} from pool {conn_key} after waiting")
-                    return client
-        
-        # If still no connection available, create a new one (exceeding pool size temporarily)
-        logger.warning(f"Connection pool {conn_key} is still full after waiting, creating new connection anyway")
-        client = create_client(url, key)
-        conn_id = str(time.time())
-        conn = PooledConnection(client, url, key)
-        client = conn.acquire()
-        pool[conn_id] = conn
-        local.client = client
-        local.url = url
-        local.key = key
-        local.conn_id = conn_id
-        local.conn_key = conn_key
-        return client
+    pool = _get_pool(url, key)
+    conn = pool.acquire(ACQUIRE_TIMEOUT_SECONDS if timeout is None else timeout)
+    held[conn_key] = (pool, conn)
+    logger.debug(f"Acquired connection {conn.conn_id} from pool for {url}")
+    return conn.client
 
 def release_connection(client: Any) -> None:
     """
@@ -186,81 +414,59 @@ def release_connection(client: Any) -> None:
     Args:
         client: Supabase client to release
     """
-    if not hasattr(local, 'client') or local.client != client:
-        # This client wasn't acquired by this thread
-        return
-    
-    # Release the connection in the pool
-    with _pool_lock:
-        if hasattr(local, 'conn_key') and hasattr(local, 'conn_id'):
-            conn_key = local.conn_key
-            conn_id = local.conn_id
-            
-            if conn_key in _connection_pool and conn_id in _connection_pool[conn_key]:
-                conn = _connection_pool[conn_key][conn_id]
-                conn.release()
-                logger.debug(f"Released connection {conn_id} to pool {conn_key}")
-    
-    # Clear thread-local storage
-    del local.client
-    del local.url
-    del local.key
-    del local.conn_id
-    del local.conn_key
+    held = _get_thread_connections()
+    for conn_key, (pool, conn) in list(held.items()):
+        if conn.client is client:
+            # This client was acquired by this thread
+            del held[conn_key]
+            pool.release(conn)
+            logger.debug(f"Released connection {conn.conn_id} to pool for {pool.url}")
+            return
 
 def get_pool_status() -> Dict[str, Any]:
     """
     Get the status of the connection pool.
     
     Returns:
-        Dictionary with pool status information
+        Dictionary with pool status information, including per-pool
+        utilization and wait-time metrics
     """
     with _pool_lock:
-        status = {
-            'total_pools': len(_connection_pool),
-            'total_connections': sum(len(pool) for pool in _connection_pool.values()),
-            'active_connections': sum(sum(1 for conn in pool.values() if conn.in_use) for pool in _connection_pool.values()),
-            'idle_connections': sum(sum(1 for conn in pool.values() if not conn.in_use) for pool in _connection_pool.values()),
-            'pools': {}
-        }
-        
-        for conn_key, pool in _connection_pool.items():
-            status['pools'][conn_key] = {
-                'total': len(pool),
-                'active': sum(1 for conn in pool.values() if conn.in_use),
-                'idle': sum(1 for conn in pool.values() if not conn.in_use),
-                'connections': []
-            }
-            
-            for conn_id, conn in pool.items():
-                status['pools'][conn_key]['connections'].append({
-                    'id': conn_id,
-                    'in_use': conn.in_use,
-                    'last_used': conn.last_used,
-                    'last_used_hr': datetime.fromtimestamp(conn.last_used).strftime('%Y-%m-%d %H:%M:%S'),
-                    'idle_time': time.time() - conn.last_used
-                })
-        
-        return status
+        pools = dict(_connection_pool)
+    
+    status = {
+        'total_pools': len(pools),
+        'total_connections': 0,
+        'active_connections': 0,
+        'idle_connections': 0,
+        'waiting_threads': 0,
+        'timeouts': 0,
+        'pools': {}
+    }
+    
+    for conn_key, pool in pools.items():
+        pool_status = pool.get_status()
+        status['pools'][conn_key] = pool_status
+        status['total_connections'] += pool_status['total']
+        status['active_connections'] += pool_status['active']
+        status['idle_connections'] += pool_status['idle']
+        status['waiting_threads'] += pool_status['waiting']
+        status['timeouts'] += pool_status['timeouts']
+    
+    return status
 
 def clean_pool() -> int:
     """
-    Clean the connection pool, removing expired connections.
+    Clean the connection pool, removing expired connections and reclaiming
+    connections held by threads that have exited.
     
     Returns:
-        Number of connections removed
+        Number of connections removed or reclaimed
     """
-    count = 0
     with _pool_lock:
-        for pool_key in list(_connection_pool.keys()):
-            pool = _connection_pool[pool_key]
-            for conn_id in list(pool.keys()):
-                conn = pool[conn_id]
-                if conn.is_expired():
-                    del pool[conn_id]
-                    count += 1
+        pools = list(_connection_pool.values())
     
-    return count
+    return sum(pool.reap() for pool in pools)
 
 # Function aliases for compatibility with supabase_client.py
 def get_client(url: str, key: str) -> Any:
@@ -283,4 +489,13 @@ def release_client(client: Any) -> None:
     Args:
         client: Supabase client to release
     """
-    release_connection(client)
\ No newline at end of file
+    release_connection(client)
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Alias for get_pool_status for compatibility.
+    
+    Returns:
+        Dictionary with pool status information
+    """
+    return get_pool_status()
@@ -22,7 +22,8 @@ from sync_service.models import (
 )
 from sync_service.sync_engine import SyncEngine
 from sync_service.config import (
-    PROD_CLONE_DB_URI, TRAINING_DB_URI, SQL_SERVER_CONNECTION_STRING
+    PROD_CLONE_DB_URI, TRAINING_DB_URI, SQL_SERVER_CONNECTION_STRING,
+    BATCH_SIZE, UPSYNC_BATCH_MODE
 )
 
 # Set up logging
@@ -55,10 +56,22 @@ class BidirectionalSyncEngine(SyncEngine):
 class UpSyncEngine(BidirectionalSyncEngine):
     """Engine for up-sync operations (training to production)."""
     
-    def __init__(self, job_id: str = None, user_id: int = None):
-        """Initialize the up-sync engine."""
+    def __init__(self, job_id: str = None, user_id: int = None, 
+                 batch_mode: bool = None, page_size: int = None):
+        """Initialize the up-sync engine.
+        
+        Args:
+            job_id: Optional job ID for tracking. If None, a new UUID will be generated.
+            user_id: Optional user ID who initiated the sync.
+            batch_mode: Whether to apply changes page by page with coalesced row updates.
+                Defaults to the SYNC_UPSYNC_BATCH_MODE setting.
+            page_size: Number of pending changes per page in batch mode.
+        """
         super().__init__(job_id, user_id, sync_direction='up')
         
+        self.batch_mode = UPSYNC_BATCH_MODE if batch_mode is None else batch_mode
+        self.page_size = page_size or BATCH_SIZE
+        
         # For up-sync, the source is training and target is production
         self.source_engine = self.target_engine  # Initially set in SyncEngine
         self.target_engine = sa.create_engine(PROD_CLONE_DB_URI)
@@ -79,6 +92,17 @@ class UpSyncEngine(BidirectionalSyncEngine):
             
             self.log("Starting up-sync process", level="INFO", component="Main")
             
+            if self.batch_mode:
+                self._sync_changes_batched()
+                self._update_sync_timestamp()
+                
+                self.job.status = 'completed'
+                self.job.end_time = datetime.datetime.utcnow()
+                db.session.commit()
+                
+                self.log("Up-sync process completed successfully", level="INFO", component="Main")
+                return True
+            
             # Get pending changes to sync
             changes = self._get_pending_changes()
             self.job.total_records = len(changes)
@@ -126,7 +150,48 @@ class UpSyncEngine(BidirectionalSyncEngine):
         self.log(f"Found {len(changes)} pending changes to up-sync", level="INFO", component="Extract")
         
         # Convert to dictionaries for processing
-        return [{
+        return [self._change_to_dict(change) for change in changes]
+    
+    def _sync_changes_batched(self):
+        """Apply pending changes page by page, one target transaction per page."""
+        total = UpSyncDataChange.query.filter_by(is_processed=False).count()
+        self.job.total_records = total
+        db.session.commit()
+        
+        self.log(f"Found {total} pending changes to up-sync", level="INFO", component="Extract")
+        
+        last_id = 0
+        while True:
+            page = (UpSyncDataChange.query
+                    .filter(UpSyncDataChange.is_processed == False, UpSyncDataChange.id > last_id)
+                    .order_by(UpSyncDataChange.id)
+                    .limit(self.page_size)
+                    .all())
+            if not page:
+                break
+            
+            last_id = page[-1].id
+            changes = [self._change_to_dict(change) for change in page]
+            
+            # Release the ORM objects; the archive step works on IDs
+            for change in page:
+                db.session.expunge(change)
+            
+            if self._apply_change_page(changes):
+                self._archive_changes([change['id'] for change in changes])
+            else:
+                # Re-apply the page change by change so one bad change doesn't block the rest
+                self.log(f"Falling back to per-change apply for {len(changes)} changes",
+                        level="WARNING", component="Load")
+                for change in changes:
+                    self._apply_change(change)
+            
+            self.job.processed_records += len(changes)
+            db.session.commit()
+    
+    def _change_to_dict(self, change: UpSyncDataChange) -> Dict[str, Any]:
+        """Convert an UpSyncDataChange row to a change dictionary."""
+        return {
             'id': change.id,
             'table_name': change.table_name,
             'field_name': change.field_name,
@@ -137,7 +202,146 @@ class UpSyncEngine(BidirectionalSyncEngine):
             'date': change.date,
             'pacs_user': change.pacs_user,
             'parcel_id': change.parcel_id
-        } for change in changes]
+        }
+    
+    def _parse_keys(self, keys: str) -> Dict[str, str]:
+        """Parse a 'key=value,key=value' string into a dictionary."""
+        keys_dict = {}
+        for key_pair in keys.split(','):
+            if '=' in key_pair:
+                key, value = key_pair.split('=', 1)
+                keys_dict[key.strip()] = value.strip()
+        return keys_dict
+    
+    def _coalesce_changes(self, changes: List[Dict[str, Any]]) -> List[List[Tuple[str, str, Dict[str, str], Any]]]:
+        """Coalesce a page of changes into per-row statements.
+        
+        Changes are grouped by table and keys. Consecutive field changes to the same
+        row collapse into one UPDATE (the latest value of each field wins), and a
+        delete supersedes any earlier field changes to that row.
+        
+        Returns:
+            A list of rounds. Round N holds the Nth statement of every row, so the
+            statements within a round touch different rows and can run in any order,
+            while statements for the same row keep their original order across rounds.
+            Each statement is a tuple of (table_name, action, keys, fields) where fields
+            maps field names to new values ('delete' statements have no fields).
+        """
+        row_statements = {}
+        
+        for change in changes:
+            row = (change['table_name'], change['keys'])
+            statements = row_statements.setdefault(row, [])
+            
+            if change['action'] == 'delete':
+                # Field changes made since the last delete are moot
+                while statements and statements[-1][0] == 'update':
+                    statements.pop()
+                if not statements:
+                    statements.append(('delete', {}))
+            elif statements and statements[-1][0] == 'update':
+                statements[-1][1][change['field_name']] = change['new_value']
+            else:
+                # 'insert' is applied as a field update, as in _apply_change
+                statements.append(('update', {change['field_name']: change['new_value']}))
+        
+        rounds = []
+        for (table_name, keys), statements in row_statements.items():
+            keys_dict = self._parse_keys(keys)
+            for i, (action, fields) in enumerate(statements):
+                if i == len(rounds):
+                    rounds.append([])
+                rounds[i].append((table_name, action, keys_dict, fields))
+        
+        return rounds
+    
+    def _apply_change_page(self, changes: List[Dict[str, Any]]) -> bool:
+        """Apply a page of changes to the target (production) database in one transaction.
+        
+        Statements with the same table, action, keys and fields are sent together
+        as one executemany.
+        
+        Returns:
+            True if the whole page was applied, False if it was rolled back
+        """
+        rounds = self._coalesce_changes(changes)
+        
+        try:
+            with self.target_engine.begin() as conn:
+                for statements in rounds:
+                    grouped = {}
+                    for table_name, action, keys_dict, fields in statements:
+                        shape = (table_name, action, tuple(keys_dict), tuple(fields))
+                        grouped.setdefault(shape, []).append((keys_dict, fields))
+                    
+                    for (table_name, action, key_names, field_names), rows in grouped.items():
+                        where_conditions = " AND ".join(f"{k} = :k_{i}" for i, k in enumerate(key_names))
+                        if action == 'delete':
+                            query = f"DELETE FROM {table_name} WHERE {where_conditions}"
+                        else:
+                            set_clause = ", ".join(f"{f} = :v_{i}" for i, f in enumerate(field_names))
+                            query = f"UPDATE {table_name} SET {set_clause} WHERE {where_conditions}"
+                        
+                        params = []
+                        for keys_dict, fields in rows:
+                            row_params = {f"k_{i}": keys_dict[k] for i, k in enumerate(key_names)}
+                            row_params.update({f"v_{i}": fields[f] for i, f in enumerate(field_names)})
+                            params.append(row_params)
+                        
+                        conn.execute(text(query), params)
+            
+            self.log(f"Applied {len(changes)} changes as {sum(len(r) for r in rounds)} row statements",
+                    level="INFO", component="Load", record_count=len(changes))
+            return True
+            
+        except Exception as e:
+            self.log(f"Error applying change page: {str(e)}", level="ERROR", component="Load")
+            return False
+    
+    def _archive_changes(self, change_ids: List[int]):
+        """Archive and mark a page of changes as processed with two set-based statements."""
+        if not change_ids:
+            return
+        
+        now = datetime.datetime.utcnow()
+        change_table = UpSyncDataChange.__table__
+        archive_table = UpSyncDataChangeArchive.__table__
+        
+        copied_columns = [
+            'table_name', 'field_name', 'keys', 'new_value', 'old_value', 'action', 'date',
+            'record_inserted_date', 'pacs_user', 'cc_field_id', 'parcel_id',
+            'unique_cc_row_id', 'unique_cc_parent_row_id'
+        ]
+        
+        try:
+            select_changes = sa.select(
+                *[change_table.c[name] for name in copied_columns],
+                sa.literal(now).label('is_processed_date'),
+                sa.literal(True).label('is_processed'),
+                sa.literal(now).label('created_at'),
+                sa.literal(now).label('updated_at')
+            ).where(change_table.c.id.in_(change_ids))
+            
+            db.session.execute(
+                archive_table.insert().from_select(
+                    copied_columns + ['is_processed_date', 'is_processed', 'created_at', 'updated_at'],
+                    select_changes
+                )
+            )
+            db.session.execute(
+                change_table.update()
+                .where(change_table.c.id.in_(change_ids))
+                .values(is_processed=True, is_processed_date=now)
+            )
+            db.session.commit()
+            
+            self.log(f"Archived {len(change_ids)} processed changes", level="INFO", component="Archive",
+                    record_count=len(change_ids))
+            
+        except Exception as e:
+            self.log(f"Error archiving processed changes: {str(e)}", level="ERROR", component="Archive")
+            db.session.rollback()
+            raise
     
     def _apply_change(self, change: Dict[str, Any]) -> bool:
         """Apply a single change to the target (production) database."""
@@ -146,11 +350,7 @@ class UpSyncEngine(BidirectionalSyncEngine):
         
         try:
             # Parse the keys to use in the WHERE clause
-            keys_dict = {}
-            for key_pair in change['keys'].split(','):
-                if '=' in key_pair:
-                    key, value = key_pair.split('=', 1)
-                    keys_dict[key.strip()] = value.strip()
+            keys_dict = self._parse_keys(change['keys'])
             
             # Build the WHERE clause
             where_conditions = " AND ".join([f"{k} = :{k}" for k in keys_dict.keys()])
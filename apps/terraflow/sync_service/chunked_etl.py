@@ -4,24 +4,152 @@ Chunked ETL Processing Module
 This module provides enhanced ETL functionality with chunking support for large datasets.
 It extends the basic ETL functionality with batch processing capabilities to handle timeouts
 and memory limitations when processing large files.
+
+Sources are read lazily, one chunk at a time, and every chunk has deterministic
+boundaries (row positions, or key ranges for keyed database queries) so that a
+chunk that failed can be extracted and processed again on its own. With more than
+one worker (opt-in with the 'parallel' option), chunks are transformed, validated
+and loaded by a pool of processes, each with its own target database connection.
 """
 
 import os
+import re
 import logging
 import time
+import threading
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Union, Tuple, Callable
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Iterator
 from sqlalchemy import create_engine, types, text
 from sqlalchemy.orm import Session
 
 from sync_service.mapping_loader import get_mapping_loader
-from sync_service.enhanced_etl import get_enhanced_etl
+from sync_service.enhanced_etl import EnhancedETL, get_enhanced_etl
 
 # Setup logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Number of chunks queued for each worker in parallel mode
+CHUNKS_PER_WORKER = 2
+
+# Key columns are interpolated into SQL, so only plain (optionally qualified) identifiers are allowed
+KEY_COLUMN_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$')
+
+
+
+class UnsupportedSourceError(ValueError):
+    """Raised when a source or file type cannot be read in chunks"""
+    pass
+
+
+class ChunkSpec:
+    """
+    Deterministic boundaries of one chunk of a source
+
+    File chunks and paginated queries are bounded by row positions [start, stop).
+    Chunks of a keyed database query are bounded by key values [lower, upper),
+    where None leaves that end open; the first chunk also holds rows without a key.
+    """
+
+    def __init__(self, index: int, start: Optional[int] = None, stop: Optional[int] = None,
+                 lower: Any = None, upper: Any = None, key_column: Optional[str] = None):
+        """
+        Initialize the chunk spec
+
+        Args:
+            index: Position of the chunk in the source
+            start: First row position of the chunk
+            stop: Row position after the last row of the chunk
+            lower: Smallest key value in the chunk
+            upper: Key value of the first row after the chunk
+            key_column: Column the key range applies to
+        """
+        self.index = index
+        self.start = start
+        self.stop = stop
+        self.lower = lower
+        self.upper = upper
+        self.key_column = key_column
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            'index': self.index,
+            'start': self.start,
+            'stop': self.stop,
+            'lower': self.lower,
+            'upper': self.upper,
+            'key_column': self.key_column
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ChunkSpec':
+        """Create a chunk spec from a dictionary"""
+        return cls(
+            index=data['index'],
+            start=data.get('start'),
+            stop=data.get('stop'),
+            lower=data.get('lower'),
+            upper=data.get('upper'),
+            key_column=data.get('key_column')
+        )
+
+    def __repr__(self) -> str:
+        if self.key_column:
+            return f"ChunkSpec({self.index}, {self.key_column} in [{self.lower!r}, {self.upper!r}))"
+        return f"ChunkSpec({self.index}, rows [{self.start}, {self.stop}))"
+
+
+def _chunk_result(spec: ChunkSpec, records: int = 0, processed: bool = False,
+                  valid: int = 0, invalid: int = 0, loaded: int = 0,
+                  error: Optional[str] = None, duration: float = 0.0) -> Dict[str, Any]:
+    """Build the result reported for one chunk"""
+    return {
+        'chunk': spec.to_dict(),
+        'records': records,
+        'processed': processed,
+        'valid_records': valid,
+        'invalid_records': invalid,
+        'loaded_records': loaded,
+        'error': error,
+        'duration': duration,
+        'worker': os.getpid()
+    }
+
+
+# State of a parallel ETL worker process, set up once per process by _init_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(chunk_size: int, target_connection: Optional[str], source: Tuple[str, str, str, Dict[str, Any]]):
+    """
+    Set up a worker process with its own target database connection
+
+    Args:
+        chunk_size: Number of records in each chunk
+        target_connection: Connection string of the target database
+        source: Source connection, query, type and options for extracting chunks
+    """
+    engine = create_engine(target_connection) if target_connection else None
+    _worker_state['processor'] = ChunkedETLProcessor(chunk_size, max_workers=1, etl=EnhancedETL(db_engine=engine))
+    _worker_state['source'] = source
+
+
+def _process_chunk_in_worker(spec: ChunkSpec, chunk_df: Optional[pd.DataFrame], data_type: str,
+                             mapping: Optional[Dict[str, str]], target_table: Optional[str]) -> Dict[str, Any]:
+    """Extract a chunk if it was not passed in, then transform, validate and load it"""
+    processor = _worker_state['processor']
+    if chunk_df is None:
+        try:
+            chunk_df = processor.extract_chunk(spec, *_worker_state['source'])
+        except Exception as e:
+            logger.error(f"Error extracting chunk {spec.index + 1}: {str(e)}")
+            return _chunk_result(spec, error=f'Extract error: {str(e)}')
+    return processor.process_chunk(spec, chunk_df, data_type, mapping, target_table)
+
+
 # Chunked ETL Processor
 class ChunkedETLProcessor:
     """
@@ -31,19 +159,24 @@ class ChunkedETLProcessor:
     It processes data in smaller chunks to avoid memory issues and timeouts.
     """
     
-    def __init__(self, chunk_size: int = 5000, max_workers: int = 4):
+    def __init__(self, chunk_size: int = 5000, max_workers: int = 4, etl: Optional[EnhancedETL] = None):
         """
         Initialize the chunked ETL processor
         
         Args:
             chunk_size: Number of records to process in each chunk
-            max_workers: Maximum number of concurrent workers for parallel processing
+            max_workers: Maximum number of worker processes; 1 processes chunks in this process
+            etl: ETL engine to use (the application's by default)
         """
         self.chunk_size = chunk_size
-        self.max_workers = max_workers
-        self.etl = get_enhanced_etl()
+        self.max_workers = max(1, max_workers)
+        self.etl = etl or get_enhanced_etl()
         self.mapping_loader = get_mapping_loader()
         
+        # Source engines by connection string, shared by the chunks of a run
+        self._source_engines = {}
+        self._source_engines_lock = threading.Lock()
+        
         logger.info(f"Chunked ETL Processor initialized with chunk_size={chunk_size}, max_workers={max_workers}")
     
     def execute_chunked_etl(
@@ -54,7 +187,8 @@ class ChunkedETLProcessor:
         source_type: str = 'file',
         mapping_name: Optional[str] = None,
         target_table: Optional[str] = None,
-        options: Optional[Dict[str, Any]] = None
+        options: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any], int, int], None]] = None
     ) -> Dict[str, Any]:
         """
         Execute ETL pipeline with chunking for large datasets
@@ -66,7 +200,13 @@ class ChunkedETLProcessor:
             source_type: Type of source (file, database, api)
             mapping_name: Name of the field mapping to use
             target_table: Target table name (overrides default)
-            options: Additional options for processing
+            options: Additional options for processing:
+                parallel: Process chunks in worker processes when max_workers > 1 (default False)
+                key_column: Column to split a database query into key ranges instead of pages
+                target_connection: Target database for the workers (default: the ETL engine's URL)
+                queue_size: Maximum number of chunks queued for the workers
+            progress_callback: Called with each chunk result and the number of
+                completed and total chunks
             
         Returns:
             Dictionary with ETL results
@@ -77,100 +217,17 @@ class ChunkedETLProcessor:
         
         options = options or {}
         
-        # Extract data or get dataframe iterator
-        if source_type == 'file':
-            try:
-                # Determine the file type and use appropriate chunking method
-                file_ext = os.path.splitext(source_connection)[1].lower()
-                
-                if file_ext == '.csv':
-                    # For CSV files, use chunksize parameter in read_csv
-                    chunked_data = pd.read_csv(source_connection, chunksize=self.chunk_size)
-                    total_rows = sum(1 for _ in open(source_connection)) - 1  # Subtract header row
-                elif file_ext in ('.xlsx', '.xls'):
-                    # For Excel files, we need to load it all and then chunk it
-                    # Note: This could still cause memory issues with very large Excel files
-                    df = pd.read_excel(source_connection)
-                    total_rows = len(df)
-                    chunked_data = [df[i:i + self.chunk_size] for i in range(0, len(df), self.chunk_size)]
-                elif file_ext == '.json':
-                    # For JSON files, load in chunks
-                    # This is a simplified approach - for very large JSON files, a streaming JSON parser would be better
-                    df = pd.read_json(source_connection)
-                    total_rows = len(df)
-                    chunked_data = [df[i:i + self.chunk_size] for i in range(0, len(df), self.chunk_size)]
-                elif file_ext == '.parquet':
-                    # For Parquet files, use a chunked reader
-                    import pyarrow.parquet as pq
-                    table = pq.read_table(source_connection)
-                    total_rows = table.num_rows
-                    chunked_data = [table.slice(i, min(self.chunk_size, total_rows - i)).to_pandas() 
-                                   for i in range(0, total_rows, self.chunk_size)]
-                else:
-                    logger.error(f"Unsupported file type: {file_ext}")
-                    return {
-                        'status': 'error',
-                        'message': f'Unsupported file type: {file_ext}',
-                        'extract': {'success': False, 'records': 0, 'message': 'Unsupported file type'},
-                        'transform': {'success': False, 'records': 0, 'message': 'Not attempted'},
-                        'validate': {'success': False, 'valid_records': 0, 'invalid_records': 0, 'message': 'Not attempted'},
-                        'load': {'success': False, 'records': 0, 'message': 'Not attempted'}
-                    }
-                
-                logger.info(f"Extracted {total_rows} total records from file, processing in chunks of {self.chunk_size}")
-                
-            except Exception as e:
-                logger.error(f"Error extracting data from file: {str(e)}")
-                return {
-                    'status': 'error',
-                    'message': f'Error extracting data: {str(e)}',
-                    'extract': {'success': False, 'records': 0, 'message': str(e)},
-                    'transform': {'success': False, 'records': 0, 'message': 'Not attempted'},
-                    'validate': {'success': False, 'valid_records': 0, 'invalid_records': 0, 'message': 'Not attempted'},
-                    'load': {'success': False, 'records': 0, 'message': 'Not attempted'}
-                }
-                
-        elif source_type == 'database':
-            try:
-                # Create database engine and execute query with chunking
-                engine = create_engine(source_connection)
-                
-                # First, get the total row count for the query
-                count_query = f"SELECT COUNT(*) FROM ({source_query}) as sq"
-                with engine.connect() as conn:
-                    total_rows = conn.execute(text(count_query)).scalar()
-                
-                # Modify the query to support pagination
-                # Note: This assumes the source database supports LIMIT and OFFSET
-                # For SQL Server, Oracle, etc., different pagination syntax would be needed
-                chunked_data = []
-                for offset in range(0, total_rows, self.chunk_size):
-                    paginated_query = f"{source_query} LIMIT {self.chunk_size} OFFSET {offset}"
-                    chunk_df = pd.read_sql(paginated_query, engine)
-                    chunked_data.append(chunk_df)
-                
-                logger.info(f"Extracted {total_rows} total records from database, processing in chunks of {self.chunk_size}")
-                
-            except Exception as e:
-                logger.error(f"Error extracting data from database: {str(e)}")
-                return {
-                    'status': 'error',
-                    'message': f'Error extracting data: {str(e)}',
-                    'extract': {'success': False, 'records': 0, 'message': str(e)},
-                    'transform': {'success': False, 'records': 0, 'message': 'Not attempted'},
-                    'validate': {'success': False, 'valid_records': 0, 'invalid_records': 0, 'message': 'Not attempted'},
-                    'load': {'success': False, 'records': 0, 'message': 'Not attempted'}
-                }
-        else:
-            logger.error(f"Unsupported source type: {source_type}")
-            return {
-                'status': 'error',
-                'message': f'Unsupported source type: {source_type}',
-                'extract': {'success': False, 'records': 0, 'message': 'Unsupported source type'},
-                'transform': {'success': False, 'records': 0, 'message': 'Not attempted'},
-                'validate': {'success': False, 'valid_records': 0, 'invalid_records': 0, 'message': 'Not attempted'},
-                'load': {'success': False, 'records': 0, 'message': 'Not attempted'}
-            }
+        # Plan the chunks; data is only read as the chunks are consumed
+        try:
+            total_rows, chunks = self.plan_chunks(source_connection, source_query, source_type, options)
+            logger.info(f"Found {total_rows} total records in {source_type}, processing in chunks of {self.chunk_size}")
+        except UnsupportedSourceError as e:
+            logger.error(str(e))
+            return self._error_result(str(e), str(e))
+        except Exception as e:
+            logger.error(f"Error extracting data from {source_type}: {str(e)}")
+            self._dispose_source_engine(source_connection)
+            return self._error_result(f'Error extracting data: {str(e)}', str(e))
         
         # Initialize counters and result tracking
         processed_chunks = 0
@@ -180,6 +237,7 @@ class ChunkedETLProcessor:
         total_valid = 0
         total_invalid = 0
         error_messages = []
+        failed_chunks = []
         
         # Get field mapping if specified
         mapping = None
@@ -188,39 +246,40 @@ class ChunkedETLProcessor:
             if not mapping:
                 logger.warning(f"Mapping '{mapping_name}' not found for {data_type}, will use auto-detection")
         
+        parallel = options.get('parallel', False) and self.max_workers > 1 and total_chunks > 1
+        source = (source_connection, source_query, source_type, options)
+        if parallel:
+            results = self._process_parallel(chunks, source, data_type, mapping, target_table, options)
+        else:
+            results = self._process_sequential(chunks, source, data_type, mapping, target_table)
+        
         # Process each chunk
-        for chunk_index, chunk_df in enumerate(chunked_data):
-            logger.info(f"Processing chunk {chunk_index + 1}/{total_chunks} with {len(chunk_df)} records")
-            
-            try:
-                # Transform data
-                transformed_df = self.transform_chunk(chunk_df, data_type, mapping)
-                if transformed_df is None or transformed_df.empty:
-                    logger.warning(f"No data transformed in chunk {chunk_index + 1}")
-                    continue
-                
-                # Validate data
-                validation_result = self.validate_chunk(transformed_df, data_type)
-                valid_df = validation_result.get('valid_data')
-                
-                # Update counters
-                total_processed += len(chunk_df)
-                total_valid += validation_result.get('valid_count', 0)
-                total_invalid += validation_result.get('invalid_count', 0)
+        completed = 0
+        try:
+            for chunk_result in results:
+                completed += 1
+                chunk_number = chunk_result['chunk']['index'] + 1
                 
-                # Load data if validation succeeded and valid data exists
-                if valid_df is not None and not valid_df.empty:
-                    load_result = self.load_chunk(valid_df, data_type, target_table)
-                    total_loaded += load_result.get('records', 0)
-                    
-                    if not load_result.get('success', False):
-                        error_messages.append(f"Chunk {chunk_index + 1}: {load_result.get('message', 'Unknown error')}")
+                if chunk_result['processed']:
+                    processed_chunks += 1
+                    total_processed += chunk_result['records']
+                    total_valid += chunk_result['valid_records']
+                    total_invalid += chunk_result['invalid_records']
+                    total_loaded += chunk_result['loaded_records']
                 
-                processed_chunks += 1
+                if chunk_result['error']:
+                    error_messages.append(f"Chunk {chunk_number}: {chunk_result['error']}")
+                    failed_chunks.append(chunk_result['chunk'])
                 
-            except Exception as e:
-                logger.error(f"Error processing chunk {chunk_index + 1}: {str(e)}")
-                error_messages.append(f"Chunk {chunk_index + 1}: {str(e)}")
+                logger.info(f"Completed chunk {chunk_number} ({completed}/{total_chunks}) "
+                            f"with {chunk_result['records']} records")
+                if progress_callback:
+                    progress_callback(chunk_result, completed, total_chunks)
+        except Exception as e:
+            logger.error(f"Error reading chunks from {source_type}: {str(e)}")
+            error_messages.append(f"Extract error after {completed} chunks: {str(e)}")
+        finally:
+            self._dispose_source_engine(source_connection)
         
         # Prepare final result
         end_time = time.time()
@@ -254,13 +313,382 @@ class ChunkedETLProcessor:
             'chunking': {
                 'total_chunks': total_chunks,
                 'processed_chunks': processed_chunks,
-                'chunk_size': self.chunk_size
+                'chunk_size': self.chunk_size,
+                'workers': self.max_workers if parallel else 1,
+                'failed_chunks': sorted(failed_chunks, key=lambda chunk: chunk['index'])
             }
         }
         
         logger.info(f"Chunked ETL process completed in {duration:.2f} seconds: {result['message']}")
         return result
     
+    def retry_chunk(
+        self,
+        chunk: Union[ChunkSpec, Dict[str, Any]],
+        source_connection: str,
+        source_query: str,
+        data_type: str,
+        source_type: str = 'file',
+        mapping_name: Optional[str] = None,
+        target_table: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract and process a single chunk again, e.g. one listed in 'failed_chunks'
+        
+        Args:
+            chunk: Chunk spec, or its dictionary form from a previous result
+            source_connection: Connection string or file path
+            source_query: SQL query or empty string for file
+            data_type: Type of data (property, sales, valuation, tax)
+            source_type: Type of source (file, database)
+            mapping_name: Name of the field mapping to use
+            target_table: Target table name (overrides default)
+            options: Options used for the original run
+            
+        Returns:
+            Chunk result dictionary
+        """
+        spec = chunk if isinstance(chunk, ChunkSpec) else ChunkSpec.from_dict(chunk)
+        mapping = self.mapping_loader.get_mapping(data_type, mapping_name) if mapping_name else None
+        
+        try:
+            chunk_df = self.extract_chunk(spec, source_connection, source_query, source_type, options or {})
+        except Exception as e:
+            logger.error(f"Error extracting chunk {spec.index + 1}: {str(e)}")
+            return _chunk_result(spec, error=f'Extract error: {str(e)}')
+        finally:
+            self._dispose_source_engine(source_connection)
+        
+        return self.process_chunk(spec, chunk_df, data_type, mapping, target_table)
+    
+    def plan_chunks(
+        self,
+        source_connection: str,
+        source_query: str,
+        source_type: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Iterator[Tuple[ChunkSpec, Optional[pd.DataFrame]]]]:
+        """
+        Count the source records and open a lazy iterator over its chunks
+        
+        File chunks are yielded with their data, read in order by a single reader.
+        Database chunks are yielded without data; whoever processes a chunk
+        extracts it with extract_chunk.
+        
+        Args:
+            source_connection: Connection string or file path
+            source_query: SQL query or empty string for file
+            source_type: Type of source (file, database)
+            options: Additional options (key_column)
+            
+        Returns:
+            Tuple of (total records, iterator of (chunk spec, chunk data or None))
+            
+        Raises:
+            UnsupportedSourceError: If the source or file type is not supported
+        """
+        options = options or {}
+        
+        if source_type == 'file':
+            file_ext = os.path.splitext(source_connection)[1].lower()
+            
+            if file_ext == '.csv':
+                with open(source_connection) as f:
+                    total_rows = sum(1 for _ in f) - 1  # Subtract header row
+                return total_rows, self._iter_frames(pd.read_csv(source_connection, chunksize=self.chunk_size))
+            elif file_ext in ('.xlsx', '.xls', '.json'):
+                # These formats cannot be read incrementally, so the file is loaded once and sliced
+                df = pd.read_json(source_connection) if file_ext == '.json' else pd.read_excel(source_connection)
+                frames = (df.iloc[i:i + self.chunk_size] for i in range(0, len(df), self.chunk_size))
+                return len(df), self._iter_frames(frames)
+            elif file_ext == '.parquet':
+                import pyarrow.parquet as pq
+                parquet_file = pq.ParquetFile(source_connection)
+                frames = (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=self.chunk_size))
+                return parquet_file.metadata.num_rows, self._iter_frames(frames)
+            
+            raise UnsupportedSourceError(f'Unsupported file type: {file_ext}')
+        
+        elif source_type == 'database':
+            engine = self._get_source_engine(source_connection)
+            
+            # First, get the total row count for the query
+            count_query = f"SELECT COUNT(*) FROM ({source_query}) as sq"
+            with engine.connect() as conn:
+                total_rows = conn.execute(text(count_query)).scalar()
+            
+            key_column = options.get('key_column')
+            if key_column:
+                return total_rows, self._iter_key_ranges(engine, source_query, self._check_key_column(key_column))
+            
+            # Note: This assumes the source database supports LIMIT and OFFSET, and the
+            # query needs an ORDER BY for the pages to be deterministic
+            specs = (ChunkSpec(index, start=offset, stop=offset + self.chunk_size)
+                     for index, offset in enumerate(range(0, total_rows, self.chunk_size)))
+            return total_rows, ((spec, None) for spec in specs)
+        
+        raise UnsupportedSourceError(f'Unsupported source type: {source_type}')
+    
+    def extract_chunk(
+        self,
+        spec: ChunkSpec,
+        source_connection: str,
+        source_query: str,
+        source_type: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Extract the data of a single chunk from the source
+        
+        Args:
+            spec: Chunk to extract
+            source_connection: Connection string or file path
+            source_query: SQL query or empty string for file
+            source_type: Type of source (file, database)
+            options: Additional options
+            
+        Returns:
+            DataFrame with the chunk data
+            
+        Raises:
+            UnsupportedSourceError: If the source or file type is not supported
+        """
+        if source_type == 'database':
+            engine = self._get_source_engine(source_connection)
+            if spec.key_column:
+                key = self._check_key_column(spec.key_column)
+                conditions = []
+                params = {}
+                if spec.lower is not None:
+                    conditions.append(f"{key} >= :lower")
+                    params['lower'] = spec.lower
+                if spec.upper is not None:
+                    conditions.append(f"{key} < :upper")
+                    params['upper'] = spec.upper
+                where = ' AND '.join(conditions) or '1 = 1'
+                if spec.lower is None:
+                    where = f"({where}) OR {key} IS NULL"
+                query = text(f"SELECT * FROM ({source_query}) as sq WHERE {where} ORDER BY {key}")
+                return pd.read_sql(query, engine, params=params)
+            
+            paginated_query = f"{source_query} LIMIT {spec.stop - spec.start} OFFSET {spec.start}"
+            return pd.read_sql(paginated_query, engine)
+        
+        if source_type != 'file':
+            raise UnsupportedSourceError(f'Unsupported source type: {source_type}')
+        
+        file_ext = os.path.splitext(source_connection)[1].lower()
+        rows = spec.stop - spec.start
+        if file_ext == '.csv':
+            return pd.read_csv(source_connection, skiprows=range(1, spec.start + 1), nrows=rows)
+        elif file_ext in ('.xlsx', '.xls'):
+            return pd.read_excel(source_connection, skiprows=range(1, spec.start + 1), nrows=rows)
+        elif file_ext == '.json':
+            return pd.read_json(source_connection).iloc[spec.start:spec.stop]
+        elif file_ext == '.parquet':
+            import pyarrow.parquet as pq
+            return pq.read_table(source_connection).slice(spec.start, rows).to_pandas()
+        
+        raise UnsupportedSourceError(f'Unsupported file type: {file_ext}')
+    
+    def process_chunk(
+        self,
+        spec: ChunkSpec,
+        chunk_df: pd.DataFrame,
+        data_type: str,
+        mapping: Optional[Dict[str, str]] = None,
+        target_table: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Transform, validate and load a single chunk
+        
+        Args:
+            spec: Chunk being processed
+            chunk_df: DataFrame with chunk data
+            data_type: Type of data (property, sales, valuation, tax)
+            mapping: Field mapping dictionary
+            target_table: Target table name (overrides default)
+            
+        Returns:
+            Chunk result dictionary; 'error' is set if the chunk needs to be retried
+        """
+        start_time = time.time()
+        logger.info(f"Processing chunk {spec.index + 1} with {len(chunk_df)} records")
+        
+        try:
+            # Transform data
+            transformed_df = self.transform_chunk(chunk_df, data_type, mapping)
+            if transformed_df is None or transformed_df.empty:
+                logger.warning(f"No data transformed in chunk {spec.index + 1}")
+                return _chunk_result(spec, records=len(chunk_df), duration=time.time() - start_time)
+            
+            # Validate data
+            validation_result = self.validate_chunk(transformed_df, data_type)
+            valid_df = validation_result.get('valid_data')
+            
+            # Load data if validation succeeded and valid data exists
+            loaded = 0
+            error = None
+            if valid_df is not None and not valid_df.empty:
+                load_result = self.load_chunk(valid_df, data_type, target_table)
+                loaded = load_result.get('records', 0)
+                
+                if not load_result.get('success', False):
+                    error = load_result.get('message', 'Unknown error')
+            
+            return _chunk_result(
+                spec,
+                records=len(chunk_df),
+                processed=True,
+                valid=validation_result.get('valid_count', 0),
+                invalid=validation_result.get('invalid_count', 0),
+                loaded=loaded,
+                error=error,
+                duration=time.time() - start_time
+            )
+            
+        except Exception as e:
+            logger.error(f"Error processing chunk {spec.index + 1}: {str(e)}")
+            return _chunk_result(spec, records=len(chunk_df), error=str(e), duration=time.time() - start_time)
+    
+    def _process_sequential(
+        self,
+        chunks: Iterator[Tuple[ChunkSpec, Optional[pd.DataFrame]]],
+        source: Tuple[str, str, str, Dict[str, Any]],
+        data_type: str,
+        mapping: Optional[Dict[str, str]],
+        target_table: Optional[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """Process chunks one at a time in this process"""
+        for spec, chunk_df in chunks:
+            if chunk_df is None:
+                try:
+                    chunk_df = self.extract_chunk(spec, *source)
+                except Exception as e:
+                    logger.error(f"Error extracting chunk {spec.index + 1}: {str(e)}")
+                    yield _chunk_result(spec, error=f'Extract error: {str(e)}')
+                    continue
+            yield self.process_chunk(spec, chunk_df, data_type, mapping, target_table)
+    
+    def _process_parallel(
+        self,
+        chunks: Iterator[Tuple[ChunkSpec, Optional[pd.DataFrame]]],
+        source: Tuple[str, str, str, Dict[str, Any]],
+        data_type: str,
+        mapping: Optional[Dict[str, str]],
+        target_table: Optional[str],
+        options: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Process chunks in a pool of worker processes
+        
+        At most queue_size chunks are handed to the pool at a time, so the source is
+        only read as fast as the workers keep up. Results are yielded as chunks complete.
+        """
+        target_connection = options.get('target_connection') or self._get_target_connection()
+        max_pending = options.get('queue_size') or self.max_workers * CHUNKS_PER_WORKER
+        worker_source = source[:3] + ({'key_column': options.get('key_column')},)
+        
+        logger.info(f"Processing chunks with {self.max_workers} worker processes")
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(self.chunk_size, target_connection, worker_source)) as executor:
+            pending = {}
+            
+            def collect(futures):
+                for future in futures:
+                    spec = pending.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        logger.error(f"Worker failed on chunk {spec.index + 1}: {str(e)}")
+                        yield _chunk_result(spec, error=f'Worker error: {str(e)}')
+            
+            for spec, chunk_df in chunks:
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from collect(done)
+                future = executor.submit(_process_chunk_in_worker, spec, chunk_df, data_type, mapping, target_table)
+                pending[future] = spec
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+    
+    def _iter_frames(self, frames: Iterator[pd.DataFrame]) -> Iterator[Tuple[ChunkSpec, pd.DataFrame]]:
+        """Attach row position boundaries to consecutive chunk frames"""
+        start = 0
+        for index, chunk_df in enumerate(frames):
+            stop = start + len(chunk_df)
+            yield ChunkSpec(index, start=start, stop=stop), chunk_df
+            start = stop
+    
+    def _iter_key_ranges(self, engine, source_query: str, key_column: str) -> Iterator[Tuple[ChunkSpec, None]]:
+        """
+        Split a query into key ranges of chunk_size rows by streaming its sorted keys
+        
+        Only the keys are read here; a chunk is yielded as soon as the first key
+        of the next chunk is known.
+        """
+        key_query = text(f"SELECT {key_column} FROM ({source_query}) as sq "
+                         f"WHERE {key_column} IS NOT NULL ORDER BY {key_column}")
+        index = 0
+        lower = None
+        
+        with engine.connect() as conn:
+            rows = conn.execution_options(stream_results=True).execute(key_query)
+            for position, (key,) in enumerate(rows):
+                if position and position % self.chunk_size == 0:
+                    yield ChunkSpec(index, lower=lower, upper=key, key_column=key_column), None
+                    index += 1
+                    lower = key
+        
+        yield ChunkSpec(index, lower=lower, key_column=key_column), None
+    
+    def _get_source_engine(self, source_connection: str):
+        """
+        Get the engine of a source database, creating it on first use
+        
+        Chunks of a run, or of a worker process, share one engine and its
+        connection pool instead of connecting anew for every chunk.
+        """
+        with self._source_engines_lock:
+            engine = self._source_engines.get(source_connection)
+            if engine is None:
+                engine = self._source_engines[source_connection] = create_engine(source_connection)
+            return engine
+    
+    def _dispose_source_engine(self, source_connection: str):
+        """Close the pooled connections of a source database once a run is over"""
+        with self._source_engines_lock:
+            engine = self._source_engines.pop(source_connection, None)
+        if engine is not None:
+            engine.dispose()
+    
+    def _check_key_column(self, key_column: str) -> str:
+        """Make sure a key column is a plain identifier before it is used in SQL"""
+        if not KEY_COLUMN_PATTERN.match(key_column):
+            raise ValueError(f'Invalid key column: {key_column}')
+        return key_column
+    
+    def _get_target_connection(self) -> Optional[str]:
+        """Get the connection string of the ETL engine so workers can open their own connections"""
+        engine = self.etl.get_database_engine()
+        if engine is None:
+            return None
+        return engine.url.render_as_string(hide_password=False)
+    
+    def _error_result(self, message: str, extract_message: str) -> Dict[str, Any]:
+        """Build the result for a run that failed before any chunk was processed"""
+        return {
+            'status': 'error',
+            'message': message,
+            'extract': {'success': False, 'records': 0, 'message': extract_message},
+            'transform': {'success': False, 'records': 0, 'message': 'Not attempted'},
+            'validate': {'success': False, 'valid_records': 0, 'invalid_records': 0, 'message': 'Not attempted'},
+            'load': {'success': False, 'records': 0, 'message': 'Not attempted'}
+        }
+    
     def transform_chunk(
         self, 
         chunk_df: pd.DataFrame, 
@@ -292,7 +720,7 @@ class ChunkedETLProcessor:
                 return transformed_df
             else:
                 # Use auto-detection with the ETL engine
-                return self.etl.transform_data(chunk_df, data_type)
+                return self.etl.transform_data(chunk_df, self.etl.schemas.get(data_type, {}), data_type=data_type)
                 
         except Exception as e:
             logger.error(f"Error transforming chunk: {str(e)}")
@@ -327,30 +755,18 @@ class ChunkedETLProcessor:
                     'message': 'No schema found, all data treated as valid'
                 }
             
-            # Initialize valid and invalid DataFrames
-            valid_data = pd.DataFrame()
-            invalid_data = pd.DataFrame()
-            
-            # Add validation result column
-            chunk_df['_validation_errors'] = ''
-            
-            # Validate each row
-            for index, row in chunk_df.iterrows():
-                errors = []
-                
-                # Check required fields
-                for field, field_schema in schema.items():
-                    if field_schema.get('required', False) and (field not in row or pd.isna(row[field])):
-                        errors.append(f"Missing required field: {field}")
-                
-                # Store validation result
-                if errors:
-                    chunk_df.at[index, '_validation_errors'] = '; '.join(errors)
+            # Collect the missing required fields of each row
+            errors = pd.Series('', index=chunk_df.index)
+            for field, field_schema in schema.items():
+                if not field_schema.get('required', False):
+                    continue
+                missing = chunk_df[field].isna() if field in chunk_df.columns else pd.Series(True, index=chunk_df.index)
+                errors = errors.where(~missing, errors + f"Missing required field: {field}; ")
             
             # Split into valid and invalid based on validation errors
-            valid_mask = chunk_df['_validation_errors'] == ''
-            valid_data = chunk_df[valid_mask].drop('_validation_errors', axis=1).reset_index(drop=True)
-            invalid_data = chunk_df[~valid_mask].reset_index(drop=True)
+            valid_mask = errors == ''
+            valid_data = chunk_df[valid_mask].reset_index(drop=True)
+            invalid_data = chunk_df[~valid_mask].assign(_validation_errors=errors[~valid_mask].str[:-2]).reset_index(drop=True)
             
             valid_count = len(valid_data)
             invalid_count = len(invalid_data)
@@ -434,14 +850,15 @@ class ChunkedETLProcessor:
                         elif field_type == 'boolean':
                             dtype[field] = types.Boolean
             
-            # Import to database
-            chunk_df.to_sql(
-                target_table,
-                engine,
-                if_exists='append',
-                index=False,
-                dtype=dtype
-            )
+            # Import to database in one transaction, so a failed chunk can be retried without duplicates
+            with engine.begin() as conn:
+                chunk_df.to_sql(
+                    target_table,
+                    conn,
+                    if_exists='append',
+                    index=False,
+                    dtype=dtype
+                )
             
             return {
                 'success': True,
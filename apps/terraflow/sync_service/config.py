@@ -17,6 +17,7 @@ CONFIG_DB_URI = os.environ.get('DATABASE_URL')
 # Sync configuration
 SYNC_INTERVAL_MINUTES = int(os.environ.get('SYNC_INTERVAL_MINUTES', 30))
 BATCH_SIZE = int(os.environ.get('SYNC_BATCH_SIZE', 1000))
+UPSYNC_BATCH_MODE = os.environ.get('SYNC_UPSYNC_BATCH_MODE', 'true').lower() in ('1', 'true', 'yes')
 
 # Error handling configuration
 MAX_RETRIES = int(os.environ.get('SYNC_MAX_RETRIES', 3))
@@ -15,7 +15,7 @@ import json
 import hashlib
 
 from app import db
-from sync_service.models import FieldConfiguration, TableConfiguration, SyncLog
+from sync_service.models import FieldConfiguration, SyncLog
 from sync_service.app_context import with_app_context
 
 # Set up logging
@@ -25,6 +25,34 @@ logger.setLevel(logging.INFO)
 # Sanitization function type hint
 SanitizerFunc = Callable[[Any, Dict[str, Any]], Any]
 
+# Log detail levels: one log row per sanitized value, counts per table/field/rule, or nothing
+LOG_DETAIL_RECORD = 'record'
+LOG_DETAIL_SUMMARY = 'summary'
+LOG_DETAIL_NONE = 'none'
+LOG_DETAIL_LEVELS = (LOG_DETAIL_RECORD, LOG_DETAIL_SUMMARY, LOG_DETAIL_NONE)
+
+# Number of buffered log rows written per bulk insert
+DEFAULT_LOG_BATCH_SIZE = 1000
+
+# Fields left alone by default when sanitizing records
+DEFAULT_SKIP_FIELDS = frozenset({'id', 'record_id', 'created_at', 'updated_at', 'last_updated'})
+
+# Fields never masked by the fallback for unknown string fields
+UNMASKED_FIELDS = frozenset({'id', 'key', 'created_at', 'updated_at'})
+
+# Field name patterns used to infer field types, checked in order
+FIELD_TYPE_PATTERNS = [
+    (re.compile(r'name|first|last|middle'), 'personal_data'),
+    (re.compile(r'email'), 'email'),
+    (re.compile(r'phone|mobile|cell|fax'), 'phone_number'),
+    (re.compile(r'address|street|city|state|zip|postal'), 'address'),
+    (re.compile(r'ssn|social|tax|account|card|credit|payment'), 'financial'),
+    (re.compile(r'password|secret|key|token|auth'), 'credential'),
+    (re.compile(r'birth|dob'), 'date_of_birth'),
+]
+
+DIGIT_PATTERN = re.compile(r'\d')
+
 
 class SanitizationLog(db.Model):
     """Log of sanitization actions for audit purposes"""
@@ -95,19 +123,59 @@ class SanitizationRule:
         return f"<SanitizationRule {self.name} [{self.strategy}] for {','.join(self.field_types)}>"
 
 
+class FieldPlan:
+    """The rules resolved for one field of a table, compiled once and reused for every record"""
+    
+    def __init__(self, field_name: str, field_type: str, rules: List[SanitizationRule], mask_unknown: bool):
+        """Initialize a field plan
+        
+        Args:
+            field_name: Name of the field
+            field_type: Configured or inferred type of the field
+            rules: Rules to apply, in order
+            mask_unknown: Whether non-empty strings are masked because no rule applies
+        """
+        self.field_name = field_name
+        self.field_type = field_type
+        self.rules = rules
+        self.mask_unknown = mask_unknown
+    
+    def __repr__(self):
+        return f"<FieldPlan {self.field_name} [{self.field_type}] {[rule.name for rule in self.rules]}>"
+
+
 class DataSanitizer:
     """Configurable, rule-based data sanitization engine"""
     
-    def __init__(self, job_id: str = None):
+    def __init__(self, job_id: str = None, log_detail: str = LOG_DETAIL_RECORD,
+                 log_batch_size: int = DEFAULT_LOG_BATCH_SIZE):
         """Initialize the data sanitizer
         
         Args:
             job_id: ID of the current sync job
+            log_detail: How much to log: 'record' (every sanitized value), 'summary'
+                (counts per table, field and rule) or 'none'
+            log_batch_size: Number of buffered log rows that triggers a bulk insert
         """
+        if log_detail not in LOG_DETAIL_LEVELS:
+            raise ValueError(f"Invalid log detail level: {log_detail}")
+        
         self.job_id = job_id
+        self.log_detail = log_detail
+        self.log_batch_size = log_batch_size
         self.rules: Dict[str, SanitizationRule] = {}
         self.field_type_rules: Dict[str, List[str]] = {}  # field_type -> list of rule names
         
+        # Compiled field plans and configured field types, per table
+        self._table_plans: Dict[str, Dict[str, FieldPlan]] = {}
+        self._table_field_types: Dict[str, Dict[str, str]] = {}
+        
+        # Buffered sanitization logs
+        self._pending_logs: List[Dict[str, Any]] = []
+        self._log_counts: Dict[Tuple[str, str, str, str, str], int] = {}
+        self._warned_no_job = False
+        self._in_record = False  # sanitize_record writes the logs of its fields once
+        
         # Register default sanitization rules
         self._register_default_rules()
     
@@ -204,6 +272,9 @@ class DataSanitizer:
                 self.field_type_rules[field_type] = []
             self.field_type_rules[field_type].append(rule.name)
         
+        # Plans compiled before this rule existed are stale
+        self._table_plans.clear()
+        
         logger.info(f"Registered sanitization rule: {rule.name} for field types: {rule.field_types}")
     
     def get_rules_for_field_type(self, field_type: str) -> List[SanitizationRule]:
@@ -227,6 +298,9 @@ class DataSanitizer:
                      field_type: str = None) -> Tuple[Any, bool]:
         """Sanitize a field value according to applicable rules
         
+        The sanitization log is written before returning, except for fields
+        sanitized as part of sanitize_record, which writes it once per record.
+        
         Args:
             table_name: Name of the table
             field_name: Name of the field
@@ -241,68 +315,13 @@ class DataSanitizer:
         if value is None:
             return value, False
         
-        # Get field configuration if not provided
-        if not field_type:
-            field_config = FieldConfiguration.query.filter_by(
-                table_name=table_name,
-                field_name=field_name
-            ).first()
-            
-            if field_config and field_config.data_type:
-                field_type = field_config.data_type
-            else:
-                # Guess field type from name
-                field_type = self._infer_field_type(field_name)
-        
-        # Get applicable rules
-        rules = self.get_rules_for_field_type(field_type)
-        
-        # If no rules found, try to infer from field name
-        if not rules:
-            inferred_type = self._infer_field_type(field_name)
-            if inferred_type != field_type:
-                rules = self.get_rules_for_field_type(inferred_type)
-        
-        # If still no rules, use a default conservative approach for unknown fields
-        if not rules and not field_name.lower() in ['id', 'key', 'created_at', 'updated_at']:
-            # Use masking for unknown string fields
-            if isinstance(value, str) and len(value) > 0:
-                rules = [self.rules.get("mask_text")]
-        
-        was_modified = False
-        sanitized_value = value
+        plan = self._get_field_plan(table_name, field_name, field_type)
+        result = self._apply_plan(table_name, plan, value, record_id)
         
-        # Apply all applicable rules
-        for rule in rules:
-            if rule:
-                context = {
-                    'table_name': table_name,
-                    'field_name': field_name,
-                    'field_type': field_type,
-                    'record_id': record_id
-                }
-                
-                original_value = sanitized_value
-                sanitized_value = rule.apply(sanitized_value, context)
-                
-                # Check if the value was modified
-                if sanitized_value != original_value:
-                    was_modified = True
-                    
-                    # Log sanitization
-                    self._log_sanitization(
-                        table_name=table_name,
-                        field_name=field_name,
-                        record_id=record_id,
-                        sanitization_type=rule.strategy,
-                        was_modified=True,
-                        context={
-                            'field_type': field_type,
-                            'rule_name': rule.name
-                        }
-                    )
+        if not self._in_record:
+            self.flush_logs()
         
-        return sanitized_value, was_modified
+        return result
     
     @with_app_context
     def sanitize_record(self, 
@@ -320,45 +339,224 @@ class DataSanitizer:
             Sanitized record
         """
         if skip_fields is None:
-            skip_fields = {'id', 'record_id', 'created_at', 'updated_at', 'last_updated'}
+            skip_fields = DEFAULT_SKIP_FIELDS
         
         # Get record ID
         record_id = record.get('id', None)
         
-        # Get table configuration
-        table_config = TableConfiguration.query.filter_by(name=table_name).first()
-        
-        # Get all field configurations for this table
-        field_configs = FieldConfiguration.query.filter_by(table_name=table_name).all()
-        field_config_dict = {fc.field_name: fc for fc in field_configs}
+        # Field types configured for this table, loaded once per table
+        field_types = self._get_table_field_types(table_name)
         
         sanitized_record = {}
         
-        # Process each field
-        for field_name, value in record.items():
-            # Skip certain fields
-            if field_name in skip_fields:
-                sanitized_record[field_name] = value
-                continue
+        self._in_record = True
+        try:
+            # Process each field
+            for field_name, value in record.items():
+                # Skip certain fields
+                if field_name in skip_fields:
+                    sanitized_record[field_name] = value
+                    continue
+                
+                # Sanitize the field
+                sanitized_value, was_modified = self.sanitize_field(
+                    table_name=table_name,
+                    field_name=field_name,
+                    value=value,
+                    record_id=record_id,
+                    field_type=field_types.get(field_name)
+                )
+                
+                sanitized_record[field_name] = sanitized_value
+        finally:
+            self._in_record = False
+        
+        self.flush_logs()
+        
+        return sanitized_record
+    
+    @with_app_context
+    def sanitize_records(self,
+                       table_name: str,
+                       records: List[Dict[str, Any]],
+                       skip_fields: Set[str] = None) -> List[Dict[str, Any]]:
+        """Sanitize a batch of records from one table
+        
+        The table's field configuration is read once and compiled into a plan
+        per field, so each value only runs the rules that apply to it. Logs are
+        buffered and written in bulk.
+        
+        Args:
+            table_name: Name of the table
+            records: Record data (list of dictionaries)
+            skip_fields: Set of field names to skip
             
-            # Check if field needs sanitization
-            field_config = field_config_dict.get(field_name)
-            field_type = field_config.data_type if field_config else None
+        Returns:
+            Sanitized records, in the same order
+        """
+        if skip_fields is None:
+            skip_fields = DEFAULT_SKIP_FIELDS
+        
+        plans = self.compile_table_plan(table_name)
+        sanitized_records = []
+        
+        for record in records:
+            record_id = record.get('id', None)
+            sanitized_record = {}
             
-            # Sanitize the field
-            sanitized_value, was_modified = self.sanitize_field(
-                table_name=table_name,
-                field_name=field_name,
-                value=value,
-                record_id=record_id,
-                field_type=field_type
-            )
+            for field_name, value in record.items():
+                if value is None or field_name in skip_fields:
+                    sanitized_record[field_name] = value
+                    continue
+                
+                plan = plans.get(field_name)
+                if plan is None:
+                    plan = self._get_field_plan(table_name, field_name)
+                
+                sanitized_record[field_name], _ = self._apply_plan(table_name, plan, value, record_id)
             
-            sanitized_record[field_name] = sanitized_value
+            sanitized_records.append(sanitized_record)
         
-        return sanitized_record
+        self.flush_logs()
+        
+        return sanitized_records
+    
+    def compile_table_plan(self, table_name: str) -> Dict[str, FieldPlan]:
+        """Compile the field plans for every configured field of a table
+        
+        Fields that are not configured get a plan the first time they are seen.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Dictionary of field name to field plan
+        """
+        for field_name in self._get_table_field_types(table_name):
+            self._get_field_plan(table_name, field_name)
+        
+        return self._table_plans.setdefault(table_name, {})
+    
+    def _get_table_field_types(self, table_name: str) -> Dict[str, str]:
+        """Get the configured field types of a table, querying the configuration once
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Dictionary of field name to configured field type
+        """
+        field_types = self._table_field_types.get(table_name)
+        if field_types is None:
+            field_configs = FieldConfiguration.query.filter_by(table_name=table_name).all()
+            field_types = {fc.field_name: fc.data_type for fc in field_configs if fc.data_type}
+            self._table_field_types[table_name] = field_types
+        
+        return field_types
+    
+    def _get_field_plan(self, table_name: str, field_name: str, field_type: str = None) -> FieldPlan:
+        """Get the plan for a field, compiling it on first use
+        
+        Args:
+            table_name: Name of the table
+            field_name: Name of the field
+            field_type: Type of field (optional, taken from the configuration or inferred if omitted)
+            
+        Returns:
+            The field plan
+        """
+        table_plans = self._table_plans.setdefault(table_name, {})
+        
+        if not field_type:
+            field_type = (self._get_table_field_types(table_name).get(field_name)
+                          or self._infer_field_type(field_name))
+        
+        plan = table_plans.get(field_name)
+        if plan is None:
+            plan = table_plans[field_name] = self._compile_field_plan(field_name, field_type)
+        elif plan.field_type != field_type:
+            # An explicit type that differs from the compiled one gets a plan of its own
+            plan = self._compile_field_plan(field_name, field_type)
+        
+        return plan
+    
+    def _compile_field_plan(self, field_name: str, field_type: str) -> FieldPlan:
+        """Resolve the rules that apply to a field
+        
+        Args:
+            field_name: Name of the field
+            field_type: Type of field
+            
+        Returns:
+            The field plan
+        """
+        # Get applicable rules
+        rules = self.get_rules_for_field_type(field_type)
+        
+        # If no rules found, try to infer from field name
+        if not rules:
+            inferred_type = self._infer_field_type(field_name)
+            if inferred_type != field_type:
+                rules = self.get_rules_for_field_type(inferred_type)
+        
+        # If still no rules, mask unknown string fields as a conservative default
+        mask_unknown = (not rules and field_name.lower() not in UNMASKED_FIELDS
+                        and 'mask_text' in self.rules)
+        
+        return FieldPlan(field_name, field_type, rules, mask_unknown)
+    
+    def _apply_plan(self, table_name: str, plan: FieldPlan, value: Any, record_id: Any) -> Tuple[Any, bool]:
+        """Apply a field plan to a value
+        
+        Args:
+            table_name: Name of the table
+            plan: Plan of the field
+            value: Value to sanitize
+            record_id: ID of the record
+            
+        Returns:
+            Tuple of (sanitized_value, was_modified)
+        """
+        rules = plan.rules
+        if not rules:
+            if not (plan.mask_unknown and isinstance(value, str) and value):
+                return value, False
+            rules = [self.rules['mask_text']]
+        
+        context = {
+            'table_name': table_name,
+            'field_name': plan.field_name,
+            'field_type': plan.field_type,
+            'record_id': record_id
+        }
+        
+        was_modified = False
+        sanitized_value = value
+        
+        # Apply all applicable rules
+        for rule in rules:
+            original_value = sanitized_value
+            sanitized_value = rule.apply(sanitized_value, dict(context))
+            
+            # Check if the value was modified
+            if sanitized_value != original_value:
+                was_modified = True
+                
+                # Log sanitization
+                self._log_sanitization(
+                    table_name=table_name,
+                    field_name=plan.field_name,
+                    record_id=record_id,
+                    sanitization_type=rule.strategy,
+                    was_modified=True,
+                    context={
+                        'field_type': plan.field_type,
+                        'rule_name': rule.name
+                    }
+                )
+        
+        return sanitized_value, was_modified
     
-    @with_app_context
     def _log_sanitization(self, 
                         table_name: str, 
                         field_name: str, 
@@ -366,7 +564,10 @@ class DataSanitizer:
                         sanitization_type: str,
                         was_modified: bool,
                         context: Dict[str, Any] = None) -> None:
-        """Log a sanitization action
+        """Buffer a sanitization action for the next flush
+        
+        Depending on the log detail level, the action is kept as its own log
+        row, counted under its table, field and rule, or dropped.
         
         Args:
             table_name: Name of the table
@@ -376,34 +577,97 @@ class DataSanitizer:
             was_modified: Whether the value was modified
             context: Additional context information
         """
+        if self.log_detail == LOG_DETAIL_NONE:
+            return
+        
         if not self.job_id:
-            logger.warning("Cannot log sanitization without a job ID")
+            if not self._warned_no_job:
+                logger.warning("Cannot log sanitization without a job ID")
+                self._warned_no_job = True
             return
         
-        # Create sanitization log entry
-        log_entry = SanitizationLog()
-        log_entry.job_id = self.job_id
-        log_entry.table_name = table_name
-        log_entry.field_name = field_name
-        log_entry.record_id = str(record_id) if record_id is not None else 'unknown'
-        log_entry.sanitization_type = sanitization_type
-        log_entry.was_modified = was_modified
-        log_entry.context_data = context or {}  # Note: Using context_data here instead of context
-        
-        # Add to session and commit
-        db.session.add(log_entry)
-        db.session.commit()
-        
-        # Also log to sync log
-        sync_log = SyncLog()
-        sync_log.job_id = self.job_id
-        sync_log.level = 'INFO' if was_modified else 'DEBUG'
-        sync_log.message = f"Sanitized {table_name}.{field_name} using {sanitization_type}"
-        sync_log.component = 'DataSanitizer'
-        sync_log.table_name = table_name
-        
-        db.session.add(sync_log)
-        db.session.commit()
+        context = context or {}
+        
+        if self.log_detail == LOG_DETAIL_SUMMARY:
+            key = (table_name, field_name, sanitization_type,
+                   context.get('field_type'), context.get('rule_name'))
+            self._log_counts[key] = self._log_counts.get(key, 0) + 1
+            return
+        
+        self._pending_logs.append({
+            'job_id': self.job_id,
+            'table_name': table_name,
+            'field_name': field_name,
+            'record_id': str(record_id) if record_id is not None else 'unknown',
+            'sanitization_type': sanitization_type,
+            'was_modified': was_modified,
+            'context': context
+        })
+        
+        if len(self._pending_logs) >= self.log_batch_size:
+            self.flush_logs()
+    
+    @with_app_context
+    def flush_logs(self) -> int:
+        """Write buffered sanitization logs in bulk
+        
+        Sanitization logs are bulk inserted, followed by one sync log entry per
+        table, field and sanitization type, all in a single commit.
+        
+        Returns:
+            Number of sanitization log rows written
+        """
+        if not self._pending_logs and not self._log_counts:
+            return 0
+        
+        now = datetime.datetime.utcnow()
+        rows = self._pending_logs
+        totals: Dict[Tuple[str, str, str], int] = {}
+        
+        for row in rows:
+            row['created_at'] = now
+            key = (row['table_name'], row['field_name'], row['sanitization_type'])
+            totals[key] = totals.get(key, 0) + 1
+        
+        # Summary rows stand for every value sanitized by one rule on one field
+        for (table_name, field_name, sanitization_type, field_type, rule_name), count in self._log_counts.items():
+            rows.append({
+                'job_id': self.job_id,
+                'table_name': table_name,
+                'field_name': field_name,
+                'record_id': '*',
+                'sanitization_type': sanitization_type,
+                'was_modified': True,
+                'context': {'field_type': field_type, 'rule_name': rule_name, 'count': count},
+                'created_at': now
+            })
+            key = (table_name, field_name, sanitization_type)
+            totals[key] = totals.get(key, 0) + count
+        
+        self._pending_logs = []
+        self._log_counts = {}
+        
+        try:
+            db.session.bulk_insert_mappings(SanitizationLog, rows)
+            
+            # Also log to sync log
+            for (table_name, field_name, sanitization_type), count in totals.items():
+                sync_log = SyncLog()
+                sync_log.job_id = self.job_id
+                sync_log.level = 'INFO'
+                sync_log.message = f"Sanitized {count} values of {table_name}.{field_name} using {sanitization_type}"
+                sync_log.component = 'DataSanitizer'
+                sync_log.table_name = table_name
+                sync_log.record_count = count
+                db.session.add(sync_log)
+            
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error writing sanitization logs: {str(e)}")
+            return 0
+        
+        return len(rows)
     
     def _infer_field_type(self, field_name: str) -> str:
         """Infer field type from field name
@@ -416,33 +680,9 @@ class DataSanitizer:
         """
         field_name = field_name.lower()
         
-        # Personal data
-        if any(term in field_name for term in ['name', 'first', 'last', 'middle']):
-            return 'personal_data'
-        
-        # Email
-        if 'email' in field_name or field_name.endswith('_email'):
-            return 'email'
-        
-        # Phone
-        if any(term in field_name for term in ['phone', 'mobile', 'cell', 'fax']):
-            return 'phone_number'
-        
-        # Address
-        if any(term in field_name for term in ['address', 'street', 'city', 'state', 'zip', 'postal']):
-            return 'address'
-        
-        # Financial
-        if any(term in field_name for term in ['ssn', 'social', 'tax', 'account', 'card', 'credit', 'payment']):
-            return 'financial'
-        
-        # Credentials
-        if any(term in field_name for term in ['password', 'secret', 'key', 'token', 'auth']):
-            return 'credential'
-        
-        # Dates of birth
-        if any(term in field_name for term in ['birth', 'dob']):
-            return 'date_of_birth'
+        for pattern, field_type in FIELD_TYPE_PATTERNS:
+            if pattern.search(field_name):
+                return field_type
         
         # Default to unknown
         return 'unknown'
@@ -524,27 +764,10 @@ class DataSanitizer:
         if not isinstance(value, str) or not value:
             return value
         
-        # Extract digits only
-        digits = ''.join(c for c in value if c.isdigit())
-        
-        if not digits:
-            return value
-        
-        # Generate random digits of the same length
-        random_digits = ''.join(random.choices(string.digits, k=len(digits)))
-        
-        # Replace each digit in the original string
-        result = ''
-        digit_index = 0
+        # Replace each digit in the original string with a random one
+        result, count = DIGIT_PATTERN.subn(lambda match: random.choice(string.digits), value)
         
-        for c in value:
-            if c.isdigit():
-                result += random_digits[digit_index]
-                digit_index += 1
-            else:
-                result += c
-        
-        return result
+        return result if count else value
     
     def _nullify_sanitizer(self, value: Any, context: Dict[str, Any]) -> Any:
         """Set value to NULL
@@ -631,13 +854,14 @@ class DataSanitizer:
 
 
 # Factory function to create a data sanitizer
-def create_data_sanitizer(job_id: str = None) -> DataSanitizer:
+def create_data_sanitizer(job_id: str = None, log_detail: str = LOG_DETAIL_RECORD) -> DataSanitizer:
     """Create a data sanitizer instance
     
     Args:
         job_id: ID of the current sync job
+        log_detail: How much to log: 'record', 'summary' or 'none'
         
     Returns:
         A DataSanitizer instance
     """
-    return DataSanitizer(job_id)
\ No newline at end of file
+    return DataSanitizer(job_id, log_detail=log_detail)
\ No newline at end of file
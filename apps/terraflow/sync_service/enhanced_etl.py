@@ -359,7 +359,35 @@ class EnhancedETL:
             "TIMESTAMP": DateTime,
             "TEXT": Text
         }
-    
+
+    def get_database_engine(self):
+        """
+        Get the database engine used for loading
+
+        Returns:
+            SQLAlchemy engine or None
+        """
+        return self.db_engine
+
+    def get_schema(self, data_type: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the field schema for a data type with its constraints
+
+        Args:
+            data_type: Type of data ('property', 'sales', 'valuation', 'tax')
+
+        Returns:
+            Dictionary mapping field names to their type and constraints,
+            empty for unknown data types
+        """
+        type_names = {"TIMESTAMP": "datetime", "TEXT": "string"}
+        constraints = self.default_constraints.get(data_type, {})
+
+        return {
+            field: {"type": type_names.get(field_type, field_type.lower()), **constraints.get(field, {})}
+            for field, field_type in self.schemas.get(data_type, {}).items()
+        }
+
     def create_sql_table(self, table_name: str, schema: Dict[str, str], 
                          if_exists: str = 'replace') -> bool:
         """
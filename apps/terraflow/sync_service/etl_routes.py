@@ -334,6 +334,7 @@ def api_import():
     target_table = data.get('target_table', '')
     use_chunking = data.get('use_chunking', False)
     chunk_size = data.get('chunk_size', 1000)
+    parallel = bool(data.get('parallel', False))
     
     if not source_connection:
         return jsonify({'status': 'error', 'message': 'Source connection is required'}), 400
@@ -351,7 +352,8 @@ def api_import():
             data_type=data_type,
             source_type=source_type,
             mapping_name=mapping_name if mapping_name else None,
-            target_table=target_table if target_table else None
+            target_table=target_table if target_table else None,
+            options={'parallel': parallel}
         )
     else:
         # Use standard ETL processing
@@ -384,6 +386,7 @@ def api_chunked_import():
     mapping_name = data.get('mapping_name', '')
     target_table = data.get('target_table', '')
     chunk_size = data.get('chunk_size', 1000)
+    parallel = bool(data.get('parallel', False))
     
     if not source_connection:
         return jsonify({'status': 'error', 'message': 'Source connection is required'}), 400
@@ -399,7 +402,8 @@ def api_chunked_import():
         data_type=data_type,
         source_type=source_type,
         mapping_name=mapping_name if mapping_name else None,
-        target_table=target_table if target_table else None
+        target_table=target_table if target_table else None,
+        options={'parallel': parallel}
     )
     
     return jsonify(results)
@@ -81,6 +81,7 @@ class TableConfiguration(SyncBase, db.Model):
     is_controller = db.Column(db.Boolean, default=False)
     sub_select = db.Column(db.Text)
     order_by_sql = db.Column(db.Text)
+    last_synced_key = db.Column(db.Text)  # JSON list of PK values of the last loaded page
     
     # Using properties for backward compatibility where columns might not exist yet
     @property
@@ -6,6 +6,13 @@ This module provides functionality for exporting data from DataFrames to multipl
 - CSV
 - JSON
 - GeoJSON (for spatial data)
+
+Large exports can be streamed instead: the source is read in batches and each batch is
+appended to the output, so memory use is bounded by the batch size. Streaming supports:
+- CSV
+- NDJSON (one JSON record per line)
+- Parquet (one row group per batch)
+- Feather (Arrow IPC file, one record batch per batch)
 """
 import os
 import json
@@ -13,7 +20,10 @@ import logging
 import pandas as pd
 import sqlite3
 import datetime
-from typing import Dict, Any, Optional, Union, List, Literal, cast
+from typing import Dict, Any, Optional, Union, List, Literal, Iterator, cast
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 
 from sync_service.sqlite_export import SQLiteExporter
 
@@ -22,7 +32,272 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 # Define export format type
-ExportFormat = Literal['sqlite', 'csv', 'json', 'geojson']
+ExportFormat = Literal['sqlite', 'csv', 'json', 'geojson', 'ndjson', 'parquet', 'feather']
+
+# Formats that can be written batch by batch
+STREAM_FORMATS = ('csv', 'ndjson', 'parquet', 'feather')
+
+# Number of rows read from the source per batch (and per Parquet row group)
+DEFAULT_BATCH_SIZE = 100000
+
+# Text columns with at most this share of distinct values in the first batch are
+# dictionary encoded in Parquet and Feather output
+DICTIONARY_ENCODING_RATIO = 0.5
+
+# Default compression codec per columnar format
+DEFAULT_COMPRESSION = {'parquet': 'snappy', 'feather': 'lz4'}
+
+
+def iter_batches(source: Any,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 query: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """Read a source as a sequence of DataFrame batches.
+    
+    Args:
+        source: A DataFrame, an iterable of DataFrames, or (with a query) a database
+            connection string, SQLAlchemy engine or DB-API connection.
+        batch_size: Maximum number of rows per batch.
+        query: SQL query to read from a database source.
+        
+    Yields:
+        Non-empty DataFrames of at most batch_size rows (iterables of DataFrames are
+        passed through as they are).
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), batch_size):
+            yield source.iloc[start:start + batch_size]
+        return
+    
+    if query is None:
+        for batch in source:
+            if not batch.empty:
+                yield batch
+        return
+    
+    if isinstance(source, str):
+        source = create_engine(source)
+    
+    if isinstance(source, Engine):
+        # Stream the result set with a server-side cursor instead of buffering it
+        with source.connect() as conn:
+            conn = conn.execution_options(stream_results=True)
+            for batch in pd.read_sql(text(query), conn, chunksize=batch_size):
+                yield batch
+    else:
+        for batch in pd.read_sql(query, source, chunksize=batch_size):
+            yield batch
+
+
+class _CSVStreamWriter:
+    """Appends batches to a CSV file, writing the header once."""
+    
+    def __init__(self, file_path: str):
+        self.file = open(file_path, 'w', newline='')
+        self.header = True
+    
+    def write(self, batch: pd.DataFrame):
+        batch.to_csv(self.file, index=False, header=self.header)
+        self.header = False
+    
+    def close(self):
+        self.file.close()
+
+
+class _NDJSONStreamWriter:
+    """Appends batches to a newline-delimited JSON file."""
+    
+    def __init__(self, file_path: str):
+        self.file = open(file_path, 'w')
+    
+    def write(self, batch: pd.DataFrame):
+        lines = batch.to_json(orient='records', lines=True, date_format='iso')
+        self.file.write(lines if lines.endswith('\n') else lines + '\n')
+    
+    def close(self):
+        self.file.close()
+
+
+class _ArrowStreamWriter:
+    """Writes batches to a Parquet or Feather file as they arrive.
+    
+    The schema is taken from the first batch. When a later batch does not fit
+    it, the column is widened (a missing type to the batch's type, integers to
+    floats, anything else to text) and the batches already written are copied
+    into a file with the wider schema. Dictionary columns keep one growing
+    dictionary for the whole export, so every batch shares the same codes and
+    Feather files only need dictionary deltas.
+    """
+    
+    def __init__(self, file_path: str, format: str, first_batch: pd.DataFrame,
+                 dictionary_columns: List[str], compression: Optional[str]):
+        import pyarrow as pa
+        
+        self.pa = pa
+        self.file_path = file_path
+        self.format = format
+        self.compression = compression
+        self.categories = {col: {} for col in dictionary_columns}
+        
+        fields = []
+        for column in first_batch.columns:
+            if column in self.categories:
+                fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+            else:
+                fields.append(pa.field(column, self._to_array(first_batch[column]).type))
+        self.schema = pa.schema(fields)
+        self.rewrites = 0
+        self._open(file_path)
+    
+    def _open(self, path: str):
+        """Open the Parquet or Feather writer for the current schema."""
+        import pyarrow.parquet as pq
+        
+        self.path = path
+        if self.format == 'parquet':
+            self.sink = None
+            self.writer = pq.ParquetWriter(path, self.schema, compression=self.compression,
+                                           use_dictionary=list(self.categories) or False)
+        else:
+            self.sink = self.pa.OSFile(path, 'wb')
+            options = self.pa.ipc.IpcWriteOptions(compression=self.compression, emit_dictionary_deltas=True)
+            self.writer = self.pa.ipc.new_file(self.sink, self.schema, options=options)
+    
+    def write(self, batch: pd.DataFrame):
+        arrays = []
+        widened = []
+        for field in self.schema:
+            if field.name in self.categories:
+                arrays.append(self._dictionary_array(field.name, batch[field.name]))
+                widened.append(field)
+                continue
+            
+            array = self._to_array(batch[field.name])
+            field = field.with_type(self._widen_type(field.type, array.type))
+            arrays.append(array)
+            widened.append(field)
+        
+        schema = self.pa.schema(widened)
+        if not schema.equals(self.schema):
+            self._rewrite(schema)
+        
+        arrays = [
+            array if array.type.equals(field.type) else array.cast(field.type)
+            for array, field in zip(arrays, self.schema)
+        ]
+        table = self.pa.Table.from_arrays(arrays, schema=self.schema)
+        
+        # Each batch becomes one Parquet row group or one Feather record batch
+        if self.sink is None:
+            self.writer.write_table(table, row_group_size=len(batch))
+        else:
+            self.writer.write_table(table)
+    
+    def _to_array(self, values: pd.Series):
+        """Convert a column to Arrow, falling back to text for mixed values."""
+        try:
+            return self.pa.Array.from_pandas(values)
+        except (self.pa.ArrowInvalid, self.pa.ArrowTypeError):
+            strings = values.astype(object).where(values.isna(), values.astype(str))
+            return self.pa.Array.from_pandas(strings, type=self.pa.string())
+    
+    def _widen_type(self, current, incoming):
+        """Get a type holding the values of both the current and the incoming type."""
+        pa = self.pa
+        if current.equals(incoming) or pa.types.is_null(incoming):
+            return current
+        if pa.types.is_null(current):
+            return incoming
+        if pa.types.is_integer(current) and pa.types.is_integer(incoming):
+            return pa.int64()
+        if ((pa.types.is_integer(current) or pa.types.is_floating(current)) and
+                (pa.types.is_integer(incoming) or pa.types.is_floating(incoming))):
+            return pa.float64()
+        return pa.string()
+    
+    def _rewrite(self, schema):
+        """Copy the batches written so far into a new file with a wider schema."""
+        import pyarrow.parquet as pq
+        
+        changes = [
+            f"{new.name}: {old.type} -> {new.type}"
+            for old, new in zip(self.schema, schema) if not old.type.equals(new.type)
+        ]
+        logger.warning(f"Widening export schema ({', '.join(changes)}), rewriting batches written so far")
+        
+        self._close_writer()
+        old_path = self.path
+        self.rewrites += 1
+        self.schema = schema
+        self._open(f"{self.file_path}.widen{self.rewrites}")
+        
+        if self.format == 'parquet':
+            parquet_file = pq.ParquetFile(old_path)
+            for i in range(parquet_file.num_row_groups):
+                table = parquet_file.read_row_group(i).cast(schema)
+                self.writer.write_table(table, row_group_size=len(table))
+        else:
+            with self.pa.memory_map(old_path) as source:
+                reader = self.pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    table = self.pa.Table.from_batches([reader.get_batch(i)]).cast(schema)
+                    self.writer.write_table(table)
+        
+        # Later batches are appended to the new file, which is moved into place on close
+        os.remove(old_path)
+    
+    def _dictionary_array(self, column: str, values: pd.Series):
+        """Encode values against the column's dictionary, adding unseen values at the end."""
+        categories = self.categories[column]
+        missing = values.isna()
+        strings = values[~missing].astype(str)
+        
+        for value in strings.unique():
+            if value not in categories:
+                categories[value] = len(categories)
+        
+        codes = pd.Series(-1, index=values.index, dtype='int32')
+        codes[~missing] = strings.map(categories).astype('int32')
+        return self.pa.DictionaryArray.from_arrays(
+            self.pa.array(codes.to_numpy(), type=self.pa.int32(), mask=missing.to_numpy()),
+            self.pa.array(list(categories), type=self.pa.string())
+        )
+    
+    def _close_writer(self):
+        self.writer.close()
+        if self.sink is not None:
+            self.sink.close()
+    
+    def close(self):
+        self._close_writer()
+        if self.path != self.file_path:
+            os.replace(self.path, self.file_path)
+
+
+def choose_dictionary_columns(batch: pd.DataFrame,
+                              ratio: float = DICTIONARY_ENCODING_RATIO) -> List[str]:
+    """Pick the low-cardinality text columns of a batch for dictionary encoding.
+    
+    Args:
+        batch: Sample of the data, normally the first batch.
+        ratio: Maximum share of distinct values among the non-null values.
+        
+    Returns:
+        List of column names.
+    """
+    columns = []
+    for col in batch.columns:
+        series = batch[col]
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+                or isinstance(series.dtype, pd.CategoricalDtype)):
+            continue
+        
+        values = series.dropna()
+        if values.empty or pd.api.types.infer_dtype(values, skipna=True) != 'string':
+            continue
+        if values.nunique() <= ratio * len(values):
+            columns.append(col)
+    return columns
+
 
 class MultiFormatExporter:
     """Class for handling exports to multiple file formats."""
@@ -53,7 +328,7 @@ class MultiFormatExporter:
         Args:
             df: DataFrame containing data to export.
             name: Base name for the export file.
-            format: Export format ('sqlite', 'csv', 'json', 'geojson').
+            format: Export format ('sqlite', 'csv', 'json', 'geojson', 'ndjson', 'parquet', 'feather').
             timestamp: Optional timestamp to include in the filename.
             
         Returns:
@@ -124,6 +399,10 @@ class MultiFormatExporter:
             logger.info(f"Exported {len(df)} records to JSON file: {file_path}")
             return file_path
             
+        elif format in ('ndjson', 'parquet', 'feather'):
+            # Columnar and line-based formats are written batch by batch
+            return self.export_stream(df, name, format, timestamp)
+            
         elif format == 'geojson':
             # Export to GeoJSON (if the DataFrame has geometry column)
             if 'geometry' not in df.columns:
@@ -163,6 +442,93 @@ class MultiFormatExporter:
             logger.error(f"Unsupported export format: {format}")
             return None
     
+    def export_stream(self,
+                      source: Any,
+                      name: str,
+                      format: ExportFormat,
+                      timestamp: Optional[datetime.datetime] = None,
+                      query: Optional[str] = None,
+                      batch_size: int = DEFAULT_BATCH_SIZE,
+                      dictionary_columns: Optional[List[str]] = None,
+                      compression: Optional[str] = None) -> Optional[str]:
+        """Export data batch by batch without loading the whole source into memory.
+        
+        Args:
+            source: Data to export, read with iter_batches: a DataFrame, an iterable of
+                DataFrames, or a database connection to run the query against.
+            name: Base name for the export file.
+            format: Export format ('csv', 'ndjson', 'parquet', 'feather').
+            timestamp: Optional timestamp to include in the filename.
+            query: SQL query to read from a database source.
+            batch_size: Number of rows read per batch; each batch becomes one Parquet
+                row group or Feather record batch.
+            dictionary_columns: Columns to dictionary encode in Parquet and Feather
+                output. Defaults to the low-cardinality text columns of the first batch.
+            compression: Compression codec for Parquet and Feather output.
+            
+        Returns:
+            Path to the created export file.
+        """
+        if format not in STREAM_FORMATS:
+            logger.error(f"Unsupported streaming export format: {format}")
+            return None
+            
+        if timestamp is None:
+            timestamp = datetime.datetime.now()
+        
+        timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S")
+        file_path = os.path.join(self.export_dir, f"{name}_{timestamp_str}.{format}")
+        
+        writer = None
+        rows = 0
+        batches = 0
+        try:
+            for batch in iter_batches(source, batch_size, query):
+                if writer is None:
+                    writer = self._open_stream_writer(file_path, format, batch, dictionary_columns, compression)
+                writer.write(batch)
+                rows += len(batch)
+                batches += 1
+        except ImportError:
+            logger.error(f"Cannot export to {format}: pyarrow module not available")
+            return None
+        except Exception as e:
+            logger.error(f"Error exporting to {format}: {str(e)}")
+            if writer is not None:
+                writer.close()
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            return None
+        
+        if writer is None:
+            logger.info(f"No data to export for {name}")
+            return None
+        writer.close()
+        
+        # Create a symlink to the latest version
+        latest_link = os.path.join(self.export_dir, f"{name}.{format}")
+        if os.path.lexists(latest_link):
+            os.remove(latest_link)
+        os.symlink(file_path, latest_link)
+        
+        logger.info(f"Exported {rows} records in {batches} batches to {format} file: {file_path}")
+        return file_path
+    
+    def _open_stream_writer(self, file_path: str, format: str, first_batch: pd.DataFrame,
+                            dictionary_columns: Optional[List[str]], compression: Optional[str]):
+        """Create the writer for a streaming export from its first batch."""
+        if format == 'csv':
+            return _CSVStreamWriter(file_path)
+        if format == 'ndjson':
+            return _NDJSONStreamWriter(file_path)
+        
+        if dictionary_columns is None:
+            dictionary_columns = choose_dictionary_columns(first_batch)
+        logger.info(f"Dictionary encoding columns: {', '.join(dictionary_columns) or 'none'}")
+        
+        return _ArrowStreamWriter(file_path, format, first_batch, dictionary_columns,
+                                  compression or DEFAULT_COMPRESSION[format])
+    
     def export_data_multi_format(self, 
                                 df: pd.DataFrame, 
                                 name: str,
@@ -225,46 +591,8 @@ class MultiFormatExporter:
                     # If the database doesn't exist, create a new one
                     return self.export_data(df, name, 'sqlite')
                 
-                logger.info(f"Merging {len(df)} records with SQLite database: {db_path}")
-                
-                with sqlite3.connect(db_path) as conn:
-                    # Read existing data
-                    existing_df = pd.read_sql(f"SELECT * FROM {name}", conn)
-                    
-                    # Merge dataframes
-                    cursor = conn.cursor()
-                    
-                    for _, row in df.iterrows():
-                        # Convert any datetime objects to strings for SQLite compatibility
-                        row_dict = {}
-                        for col in df.columns:
-                            if isinstance(row[col], (pd.Timestamp, datetime.datetime)):
-                                row_dict[col] = row[col].strftime('%Y-%m-%d %H:%M:%S')
-                            else:
-                                row_dict[col] = row[col]
-                        
-                        # Build WHERE clause for key columns
-                        where_conditions = " AND ".join([f"{col} = ?" for col in key_columns])
-                        params = [row_dict[col] for col in key_columns]
-                        
-                        # Check if record exists
-                        cursor.execute(f"SELECT 1 FROM {name} WHERE {where_conditions}", params)
-                        exists = cursor.fetchone() is not None
-                        
-                        if exists:
-                            # Update existing record
-                            set_clause = ", ".join([f"{col} = ?" for col in df.columns if col not in key_columns])
-                            update_params = [row_dict[col] for col in df.columns if col not in key_columns]
-                            cursor.execute(f"UPDATE {name} SET {set_clause} WHERE {where_conditions}", update_params + params)
-                        else:
-                            # Insert new record
-                            cols = ", ".join(df.columns)
-                            placeholders = ", ".join(["?" for _ in df.columns])
-                            insert_params = [row_dict[col] for col in df.columns]
-                            cursor.execute(f"INSERT INTO {name} ({cols}) VALUES ({placeholders})", insert_params)
-                    
-                    conn.commit()
-                    logger.info(f"Successfully merged {len(df)} records with SQLite database")
+                # Stage the records and upsert them in bulk
+                self.sqlite_exporter.merge_into_table(df, name, key_columns, db_path)
                 
                 return db_path
             
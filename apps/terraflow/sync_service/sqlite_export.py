@@ -9,7 +9,8 @@ import logging
 import pandas as pd
 import sqlite3
 import datetime
-from typing import Dict, Any, Optional, Union, List
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Union, List, Iterator
 
 # Configure pandas to display all columns
 pd.set_option('display.max_columns', None)
@@ -18,6 +19,58 @@ pd.set_option('display.max_columns', None)
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Number of incoming rows staged and merged per statement
+MERGE_BATCH_SIZE = 50000
+
+# Table holding the last-modified watermark of each incrementally merged table
+WATERMARK_TABLE = '_export_watermarks'
+
+# Format used for datetimes written by merges
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _quote(identifier: str) -> str:
+    """Quote a table or column name for use in SQL."""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _to_rows(df: pd.DataFrame) -> List[tuple]:
+    """Convert a DataFrame to tuples of plain Python values that sqlite3 can bind."""
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime(DATETIME_FORMAT)
+    df = df.astype(object)
+    return list(df.where(df.notna(), None).itertuples(index=False, name=None))
+
+
+@contextmanager
+def export_connection(db_path: str) -> Iterator[sqlite3.Connection]:
+    """Open a SQLite database tuned for a bulk export.
+    
+    WAL journaling and synchronous=OFF are used while loading; the journal is
+    switched back to DELETE on close so the exported file stays self-contained.
+    The transaction is committed on success and rolled back on error.
+    
+    Args:
+        db_path: Path to the SQLite database file.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        try:
+            conn.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            conn.close()
+
 class SQLiteExporter:
     """Class for handling exports to SQLite databases."""
     
@@ -52,11 +105,11 @@ class SQLiteExporter:
         logger.info(f"Creating stats database at {db_path}")
         
         # Connect to SQLite database
-        with sqlite3.connect(db_path) as conn:
+        with export_connection(db_path) as conn:
             # Write the DataFrame to the SQLite database
-            df_stats.to_sql('stats', conn, if_exists='replace', index=False)
+            df_stats.to_sql('stats', conn, if_exists='replace', index=False, chunksize=MERGE_BATCH_SIZE)
             
-            # Create indexes for better query performance
+            # Create indexes after the load for better query performance
             cursor = conn.cursor()
             # Create appropriate indexes based on the dataframe columns
             # Try to identify good index candidates like ID fields, use_code, etc.
@@ -93,11 +146,11 @@ class SQLiteExporter:
         logger.info(f"Creating working database at {db_path}")
         
         # Connect to SQLite database
-        with sqlite3.connect(db_path) as conn:
+        with export_connection(db_path) as conn:
             # Write the DataFrame to the SQLite database
-            df_working.to_sql('working', conn, if_exists='replace', index=False)
+            df_working.to_sql('working', conn, if_exists='replace', index=False, chunksize=MERGE_BATCH_SIZE)
             
-            # Create indexes for better query performance
+            # Create indexes after the load for better query performance
             cursor = conn.cursor()
             # Create appropriate indexes based on the dataframe columns
             if 'id' in df_working.columns:
@@ -179,7 +232,8 @@ class SQLiteExporter:
             
         return db_path
     
-    def merge_with_working_db(self, df_working: pd.DataFrame, key_columns: List[str], db_path: Optional[str] = None) -> str:
+    def merge_with_working_db(self, df_working: pd.DataFrame, key_columns: List[str], db_path: Optional[str] = None,
+                             watermark_column: Optional[str] = None) -> str:
         """Merge (upsert) data with an existing working database based on key columns.
         
         This method is used for incremental updates where we need to update existing records
@@ -190,6 +244,9 @@ class SQLiteExporter:
             key_columns: List of column names that form the unique key.
             db_path: Optional path to an existing SQLite database. If not provided,
                      the latest working database will be used.
+            watermark_column: Optional last-modified column for incremental merges; only
+                     records not older than the stored watermark are merged, and existing
+                     records are never replaced by older versions.
                      
         Returns:
             Path to the updated SQLite database file.
@@ -199,54 +256,17 @@ class SQLiteExporter:
             
         if not os.path.exists(db_path):
             # If the database doesn't exist, create a new one
-            return self.create_and_load_working_db(df_working)
+            db_path = self.create_and_load_working_db(df_working)
+            if watermark_column:
+                with export_connection(db_path) as conn:
+                    self._save_watermark(conn, 'working', df_working, watermark_column)
+            return db_path
         
-        logger.info(f"Merging {len(df_working)} records with working database at {db_path}")
-        
-        # Connect to SQLite database
-        with sqlite3.connect(db_path) as conn:
-            # Read existing data
-            existing_df = pd.read_sql("SELECT * FROM working", conn)
-            
-            # Merge dataframes - this is a more complex operation
-            # We'll iterate through records and insert/update as needed
-            cursor = conn.cursor()
-            
-            for _, row in df_working.iterrows():
-                # Convert any datetime objects to strings for SQLite compatibility
-                row_dict = {}
-                for col in df_working.columns:
-                    if isinstance(row[col], (pd.Timestamp, datetime.datetime)):
-                        row_dict[col] = row[col].strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        row_dict[col] = row[col]
-                
-                # Build WHERE clause for key columns
-                where_conditions = " AND ".join([f"{col} = ?" for col in key_columns])
-                params = [row_dict[col] for col in key_columns]
-                
-                # Check if record exists
-                cursor.execute(f"SELECT 1 FROM working WHERE {where_conditions}", params)
-                exists = cursor.fetchone() is not None
-                
-                if exists:
-                    # Update existing record
-                    set_clause = ", ".join([f"{col} = ?" for col in df_working.columns if col not in key_columns])
-                    update_params = [row_dict[col] for col in df_working.columns if col not in key_columns]
-                    cursor.execute(f"UPDATE working SET {set_clause} WHERE {where_conditions}", update_params + params)
-                else:
-                    # Insert new record
-                    cols = ", ".join(df_working.columns)
-                    placeholders = ", ".join(["?" for _ in df_working.columns])
-                    insert_params = [row_dict[col] for col in df_working.columns]
-                    cursor.execute(f"INSERT INTO working ({cols}) VALUES ({placeholders})", insert_params)
-            
-            conn.commit()
-            logger.info(f"Successfully merged {len(df_working)} records with working database")
-            
+        self.merge_into_table(df_working, 'working', key_columns, db_path, watermark_column)
         return db_path
     
-    def merge_with_stats_db(self, df_stats: pd.DataFrame, key_columns: List[str], db_path: Optional[str] = None) -> str:
+    def merge_with_stats_db(self, df_stats: pd.DataFrame, key_columns: List[str], db_path: Optional[str] = None,
+                            watermark_column: Optional[str] = None) -> str:
         """Merge (upsert) data with an existing stats database based on key columns.
         
         This method is used for incremental updates where we need to update existing records
@@ -257,6 +277,9 @@ class SQLiteExporter:
             key_columns: List of column names that form the unique key.
             db_path: Optional path to an existing SQLite database. If not provided,
                      the latest stats database will be used.
+            watermark_column: Optional last-modified column for incremental merges; only
+                     records not older than the stored watermark are merged, and existing
+                     records are never replaced by older versions.
                      
         Returns:
             Path to the updated SQLite database file.
@@ -266,48 +289,191 @@ class SQLiteExporter:
             
         if not os.path.exists(db_path):
             # If the database doesn't exist, create a new one
-            return self.create_and_load_stats_db(df_stats)
+            db_path = self.create_and_load_stats_db(df_stats)
+            if watermark_column:
+                with export_connection(db_path) as conn:
+                    self._save_watermark(conn, 'stats', df_stats, watermark_column)
+            return db_path
+        
+        self.merge_into_table(df_stats, 'stats', key_columns, db_path, watermark_column)
+        return db_path
+    
+    def merge_into_table(self, df: pd.DataFrame, table_name: str, key_columns: List[str], db_path: str,
+                         watermark_column: Optional[str] = None,
+                         batch_size: int = MERGE_BATCH_SIZE) -> int:
+        """Merge (upsert) data into a table of an existing SQLite database in bulk.
         
-        logger.info(f"Merging {len(df_stats)} records with stats database at {db_path}")
+        Each batch of incoming records is staged in a temporary table and applied with a
+        single INSERT ... ON CONFLICT DO UPDATE statement keyed on a unique index over the
+        key columns. If existing duplicate keys prevent that index, the batch is applied
+        with one UPDATE ... FROM and one INSERT of the missing keys instead.
         
-        # Connect to SQLite database
-        with sqlite3.connect(db_path) as conn:
-            # Read existing data
-            existing_df = pd.read_sql("SELECT * FROM stats", conn)
+        Args:
+            df: DataFrame containing data to merge.
+            table_name: Name of the table to merge into.
+            key_columns: List of column names that form the unique key.
+            db_path: Path to the SQLite database.
+            watermark_column: Optional last-modified column for incremental merges.
+            batch_size: Number of records staged and merged per statement.
             
-            # Merge dataframes
-            cursor = conn.cursor()
+        Returns:
+            Number of incoming records merged.
+        """
+        logger.info(f"Merging {len(df)} records with {table_name} table at {db_path}")
+        
+        with export_connection(db_path) as conn:
+            if watermark_column:
+                watermark = self.get_watermark(table_name, db_path, conn)
+                if watermark is not None:
+                    df = df[self._newer_than(df[watermark_column], watermark)]
+                    logger.info(f"{len(df)} records are not older than the {table_name} watermark {watermark}")
             
-            for _, row in df_stats.iterrows():
-                # Convert any datetime objects to strings for SQLite compatibility
-                row_dict = {}
-                for col in df_stats.columns:
-                    if isinstance(row[col], (pd.Timestamp, datetime.datetime)):
-                        row_dict[col] = row[col].strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        row_dict[col] = row[col]
+            if not df.empty:
+                columns = list(df.columns)
+                use_upsert = self._ensure_unique_index(conn, table_name, key_columns)
+                newer = None
+                if watermark_column:
+                    newer = self._newer_condition(watermark_column,
+                                                  pd.api.types.is_datetime64_any_dtype(df[watermark_column]))
                 
-                # Build WHERE clause for key columns
-                where_conditions = " AND ".join([f"{col} = ?" for col in key_columns])
-                params = [row_dict[col] for col in key_columns]
+                conn.execute("DROP TABLE IF EXISTS temp._merge_batch")
+                conn.execute(f"CREATE TEMP TABLE _merge_batch ({', '.join(_quote(col) for col in columns)})")
+                insert_batch = (f"INSERT INTO temp._merge_batch VALUES "
+                                f"({', '.join('?' for _ in columns)})")
                 
-                # Check if record exists
-                cursor.execute(f"SELECT 1 FROM stats WHERE {where_conditions}", params)
-                exists = cursor.fetchone() is not None
+                for start in range(0, len(df), batch_size):
+                    conn.executemany(insert_batch, _to_rows(df.iloc[start:start + batch_size]))
+                    if use_upsert:
+                        conn.execute(self._upsert_sql(table_name, columns, key_columns, newer))
+                    else:
+                        for statement in self._update_insert_sql(table_name, columns, key_columns, newer):
+                            conn.execute(statement)
+                    conn.execute("DELETE FROM temp._merge_batch")
                 
-                if exists:
-                    # Update existing record
-                    set_clause = ", ".join([f"{col} = ?" for col in df_stats.columns if col not in key_columns])
-                    update_params = [row_dict[col] for col in df_stats.columns if col not in key_columns]
-                    cursor.execute(f"UPDATE stats SET {set_clause} WHERE {where_conditions}", update_params + params)
-                else:
-                    # Insert new record
-                    cols = ", ".join(df_stats.columns)
-                    placeholders = ", ".join(["?" for _ in df_stats.columns])
-                    insert_params = [row_dict[col] for col in df_stats.columns]
-                    cursor.execute(f"INSERT INTO stats ({cols}) VALUES ({placeholders})", insert_params)
+                conn.execute("DROP TABLE temp._merge_batch")
             
-            conn.commit()
-            logger.info(f"Successfully merged {len(df_stats)} records with stats database")
+            if watermark_column:
+                self._save_watermark(conn, table_name, df, watermark_column)
+        
+        logger.info(f"Successfully merged {len(df)} records with {table_name} table")
+        return len(df)
+    
+    def get_watermark(self, table_name: str, db_path: str, conn: Optional[sqlite3.Connection] = None) -> Any:
+        """Get the last-modified watermark stored for a table.
+        
+        Callers can use it to extract only records modified since the last export.
+        
+        Args:
+            table_name: Name of the merged table.
+            db_path: Path to the SQLite database.
+            conn: Optional open connection to the database.
             
-        return db_path
\ No newline at end of file
+        Returns:
+            The watermark, or None if the table has not been merged incrementally.
+        """
+        if conn is None:
+            if not os.path.exists(db_path):
+                return None
+            with sqlite3.connect(db_path) as own_conn:
+                return self.get_watermark(table_name, db_path, own_conn)
+        
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                              (WATERMARK_TABLE,)).fetchone()
+        if not exists:
+            return None
+        row = conn.execute(f"SELECT watermark FROM {WATERMARK_TABLE} WHERE table_name = ?",
+                           (table_name,)).fetchone()
+        return row[0] if row else None
+    
+    def _save_watermark(self, conn: sqlite3.Connection, table_name: str, df: pd.DataFrame, watermark_column: str):
+        """Advance the stored watermark of a table to the newest merged record."""
+        if df.empty or watermark_column not in df.columns:
+            return
+        newest = df[watermark_column].max()
+        if pd.isna(newest):
+            return
+        if isinstance(newest, (pd.Timestamp, datetime.datetime)):
+            newest = newest.strftime(DATETIME_FORMAT)
+        elif hasattr(newest, 'item'):
+            newest = newest.item()
+        
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} "
+                     f"(table_name TEXT PRIMARY KEY, watermark, updated_at TEXT)")
+        conn.execute(f"INSERT INTO {WATERMARK_TABLE} (table_name, watermark, updated_at) VALUES (?, ?, ?) "
+                     f"ON CONFLICT (table_name) DO UPDATE SET watermark = MAX(watermark, excluded.watermark), "
+                     f"updated_at = excluded.updated_at",
+                     (table_name, newest, datetime.datetime.now().strftime(DATETIME_FORMAT)))
+    
+    def _newer_than(self, values: pd.Series, watermark: Any) -> pd.Series:
+        """Mask of values not older than a stored watermark.
+        
+        Records at the watermark itself are kept: it is stored to the second, so
+        later records within the same second would otherwise be skipped, and
+        re-merging a record already applied is harmless.
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values >= pd.Timestamp(watermark)
+        return values >= watermark
+    
+    def _ensure_unique_index(self, conn: sqlite3.Connection, table_name: str, key_columns: List[str]) -> bool:
+        """Create a unique index over the key columns if possible, so upserts can use it."""
+        index_name = f"idx_{table_name}_{'_'.join(key_columns)}_unique"
+        try:
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(index_name)} ON {_quote(table_name)} "
+                         f"({', '.join(_quote(col) for col in key_columns)})")
+            return True
+        except sqlite3.IntegrityError:
+            logger.warning(f"Duplicate keys in {table_name}, merging without a unique index")
+            return False
+    
+    def _newer_condition(self, watermark_column: str, is_datetime: bool) -> str:
+        """Build the condition under which a staged record ({new}) replaces an existing one ({old}).
+        
+        Datetimes are compared with julianday() because pandas and merges store them
+        with and without fractional seconds.
+        """
+        column = _quote(watermark_column)
+        if is_datetime:
+            return f"(julianday({{new}}.{column}) >= julianday({{old}}.{column}) OR {{old}}.{column} IS NULL)"
+        return f"({{new}}.{column} >= {{old}}.{column} OR {{old}}.{column} IS NULL)"
+    
+    def _upsert_sql(self, table_name: str, columns: List[str], key_columns: List[str],
+                    newer: Optional[str]) -> str:
+        """Build the statement applying the staged batch with ON CONFLICT DO UPDATE."""
+        column_list = ', '.join(_quote(col) for col in columns)
+        update_columns = [col for col in columns if col not in key_columns]
+        
+        # WHERE true keeps SQLite from parsing ON CONFLICT as part of the SELECT
+        sql = (f"INSERT INTO {_quote(table_name)} ({column_list}) "
+               f"SELECT {column_list} FROM temp._merge_batch WHERE true "
+               f"ON CONFLICT ({', '.join(_quote(col) for col in key_columns)}) ")
+        if not update_columns:
+            return sql + "DO NOTHING"
+        
+        sql += "DO UPDATE SET " + ', '.join(f"{_quote(col)} = excluded.{_quote(col)}" for col in update_columns)
+        if newer:
+            sql += " WHERE " + newer.format(new='excluded', old=_quote(table_name))
+        return sql
+    
+    def _update_insert_sql(self, table_name: str, columns: List[str], key_columns: List[str],
+                           newer: Optional[str]) -> List[str]:
+        """Build the statements applying the staged batch when keys are not unique."""
+        table = _quote(table_name)
+        column_list = ', '.join(_quote(col) for col in columns)
+        key_match = ' AND '.join(f"b.{_quote(col)} = {table}.{_quote(col)}" for col in key_columns)
+        update_columns = [col for col in columns if col not in key_columns]
+        statements = []
+        
+        if update_columns:
+            update = (f"UPDATE {table} SET " +
+                      ', '.join(f"{_quote(col)} = b.{_quote(col)}" for col in update_columns) +
+                      f" FROM temp._merge_batch AS b WHERE {key_match}")
+            if newer:
+                update += " AND " + newer.format(new='b', old=table)
+            statements.append(update)
+        
+        statements.append(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM temp._merge_batch AS b "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {key_match})"
+        )
+        return statements
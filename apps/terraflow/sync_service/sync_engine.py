@@ -5,11 +5,12 @@ This module contains the main classes and functions for extracting data from sou
 transforming it according to configuration, and loading it into target systems.
 """
 import os
+import json
 import uuid
 import datetime
 import logging
 import pyodbc
-from typing import Dict, List, Any, Union, Optional, Tuple
+from typing import Dict, List, Any, Union, Optional, Tuple, Iterator
 
 import sqlalchemy as sa
 from sqlalchemy.engine import Engine, Connection
@@ -18,6 +19,7 @@ from sqlalchemy.ext.automap import automap_base
 from sqlalchemy.orm import Session
 
 from app import db
+from sync_service.table_dependency_graph import TableDependencyGraph
 from sync_service.models import (
     SyncJob, SyncLog, TableConfiguration, FieldConfiguration, 
     FieldDefaultValue, PrimaryKeyColumn, DataChangeMap,
@@ -33,6 +35,9 @@ from sync_service.config import (
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Upper bound on bind parameters per multi-row statement (PostgreSQL allows 65535)
+MAX_BIND_PARAMS = 30000
+
 class SyncEngine:
     """Main engine for synchronization operations."""
     
@@ -167,13 +172,25 @@ class SyncEngine:
             return False
     
     def _get_tables_to_sync(self) -> List[TableConfiguration]:
-        """Get the list of tables to synchronize based on configuration."""
+        """
+        Get the list of tables to synchronize based on configuration.
+        
+        Tables are returned in configured order, adjusted so that tables referenced
+        by foreign keys in the target database are loaded before the tables that
+        reference them.
+        """
         tables = TableConfiguration.query.order_by(TableConfiguration.order).all()
         self.log(f"Found {len(tables)} tables to synchronize", level="INFO", component="Extract")
-        return tables
+        
+        if len(tables) < 2:
+            return tables
+        
+        tables_by_name = {table.name: table for table in tables}
+        graph = TableDependencyGraph.from_engine(self.target_engine, list(tables_by_name))
+        return [tables_by_name[name] for name in graph.topological_order()]
     
     def _sync_table(self, table: TableConfiguration):
-        """Synchronize a single table."""
+        """Synchronize a single table page by page, resuming from the last loaded page."""
         start_time = datetime.datetime.utcnow()
         self.log(f"Starting sync for table: {table.name}", level="INFO", component="Extract", table_name=table.name)
         
@@ -188,6 +205,10 @@ class SyncEngine:
             fields = table.field_configurations.all()
             field_names = [field.name for field in fields]
             
+            # Keyset paging needs the primary key in every extracted row
+            if field_names:
+                field_names += [pk for pk in pk_columns if pk not in field_names]
+            
             # Get field default values
             default_values = {fd.column_name: fd.default_value for fd in table.field_default_values.all()}
             
@@ -195,28 +216,45 @@ class SyncEngine:
             last_sync = GlobalSetting.query.first()
             last_sync_time = last_sync.last_sync_time if last_sync else None
             
-            # Extract data
-            source_data = self._extract_data(table.name, pk_columns, field_names, last_sync_time)
+            # Resume after the last loaded page of an interrupted sync
+            resume_key = json.loads(table.last_synced_key) if table.last_synced_key else None
+            if resume_key:
+                self.log(f"Resuming sync for {table.name} after key {resume_key} (page {table.current_page})",
+                        level="INFO", component="Extract", table_name=table.name)
+            else:
+                table.current_page = 0
+                db.session.commit()
             
-            # Transform data
-            transformed_data = self._transform_data(table.name, source_data, default_values)
+            total_records = 0
             
-            # Load data
-            self._load_data(table.name, transformed_data, pk_columns)
+            for page in self._extract_pages(table.name, pk_columns, field_names, last_sync_time, resume_key):
+                # Transform data
+                transformed_data = self._transform_data(table.name, page, default_values)
+                
+                # Load data
+                self._load_data(table.name, transformed_data, pk_columns)
+                
+                # Persist progress so an interrupted sync continues after this page
+                table.current_page = (table.current_page or 0) + 1
+                table.last_synced_key = json.dumps([page[-1][pk] for pk in pk_columns], default=str)
+                db.session.commit()
+                
+                total_records += len(page)
             
             # Update table sync status
-            table.current_page = table.total_pages
+            table.total_pages = table.current_page
+            table.last_synced_key = None
             db.session.commit()
             
             end_time = datetime.datetime.utcnow()
             duration = (end_time - start_time).total_seconds() * 1000  # milliseconds
             
             self.log(
-                f"Completed sync for table {table.name}: {len(source_data)} records processed",
+                f"Completed sync for table {table.name}: {total_records} records processed",
                 level="INFO",
                 component="Load",
                 table_name=table.name,
-                record_count=len(source_data),
+                record_count=total_records,
                 duration_ms=int(duration)
             )
             
@@ -229,53 +267,76 @@ class SyncEngine:
             db.session.commit()
             raise
     
-    def _extract_data(self, table_name: str, pk_columns: List[str], field_names: List[str], 
-                     last_sync_time: datetime.datetime = None) -> List[Dict[str, Any]]:
-        """Extract data from the source database."""
+    def _extract_pages(self, table_name: str, pk_columns: List[str], field_names: List[str], 
+                      last_sync_time: datetime.datetime = None, 
+                      resume_key: List[Any] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Extract data from the source database in keyset-paginated pages of BATCH_SIZE rows."""
         self.log(f"Extracting data from {table_name}", level="INFO", component="Extract", table_name=table_name)
         
+        last_key = resume_key
+        extracted = 0
+        
         try:
-            # Connect to source database
-            with self.source_engine.connect() as conn:
-                # Build query
-                query = self._build_extract_query(table_name, pk_columns, field_names, last_sync_time)
+            while True:
+                query, params = self._build_extract_query(table_name, pk_columns, field_names, last_sync_time, last_key)
                 
-                # Execute query
-                result = conn.execute(text(query))
+                # Use a server-side cursor so the page is streamed rather than buffered by the driver
+                with self.source_engine.connect() as conn:
+                    result = conn.execution_options(stream_results=True).execute(text(query), params)
+                    page = [dict(row._mapping) for row in result]
                 
-                # Fetch data
-                data = [dict(row) for row in result]
+                if not page:
+                    break
                 
-                self.log(f"Extracted {len(data)} records from {table_name}", level="INFO", component="Extract", table_name=table_name, record_count=len(data))
-                return data
+                extracted += len(page)
+                last_key = [page[-1][pk] for pk in pk_columns]
+                yield page
+                
+                if len(page) < BATCH_SIZE:
+                    break
+            
+            self.log(f"Extracted {extracted} records from {table_name}", level="INFO", component="Extract", table_name=table_name, record_count=extracted)
                 
         except Exception as e:
             self.log(f"Error extracting data from {table_name}: {str(e)}", level="ERROR", component="Extract", table_name=table_name)
             raise
     
     def _build_extract_query(self, table_name: str, pk_columns: List[str], field_names: List[str], 
-                            last_sync_time: datetime.datetime = None) -> str:
-        """Build the SQL query for extracting data."""
+                            last_sync_time: datetime.datetime = None,
+                            last_key: List[Any] = None) -> Tuple[str, Dict[str, Any]]:
+        """Build the SQL query and parameters for extracting the page after ``last_key``."""
         # If field names is empty, select all columns
         fields_clause = ", ".join(field_names) if field_names else "*"
         
-        # Basic query
-        query = f"SELECT {fields_clause} FROM {table_name}"
+        conditions = []
+        params = {}
         
         # Add filter for incremental sync
         # This is a simplified example - in a real system you'd need a more robust 
         # change detection mechanism based on your database capabilities
         if last_sync_time and 'updated_at' in field_names:
-            query += f" WHERE updated_at >= '{last_sync_time.isoformat()}'"
+            conditions.append("updated_at >= :last_sync_time")
+            params['last_sync_time'] = last_sync_time
+        
+        # Keyset condition: (pk1, pk2, ...) > (last1, last2, ...), expanded so it
+        # works on databases without row value comparison
+        if last_key:
+            alternatives = []
+            for i, pk in enumerate(pk_columns):
+                equal_parts = [f"{pk_columns[j]} = :last_key_{j}" for j in range(i)]
+                alternatives.append("(" + " AND ".join(equal_parts + [f"{pk} > :last_key_{i}"]) + ")")
+                params[f"last_key_{i}"] = last_key[i]
+            conditions.append("(" + " OR ".join(alternatives) + ")")
         
-        # Add order by
         pk_clause = ", ".join(pk_columns)
-        query += f" ORDER BY {pk_clause}"
+        where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
         
-        # Add limit for batching
-        query += f" LIMIT {BATCH_SIZE}"
+        if self.source_engine.dialect.name == 'mssql':
+            query = f"SELECT TOP {BATCH_SIZE} {fields_clause} FROM {table_name}{where_clause} ORDER BY {pk_clause}"
+        else:
+            query = f"SELECT {fields_clause} FROM {table_name}{where_clause} ORDER BY {pk_clause} LIMIT {BATCH_SIZE}"
         
-        return query
+        return query, params
     
     def _transform_data(self, table_name: str, source_data: List[Dict[str, Any]], 
                        default_values: Dict[str, str]) -> List[Dict[str, Any]]:
@@ -301,7 +362,7 @@ class SyncEngine:
         return transformed_data
     
     def _load_data(self, table_name: str, data: List[Dict[str, Any]], pk_columns: List[str]):
-        """Load transformed data into the target database."""
+        """Load a page of transformed data into the target database with set-based upserts."""
         self.log(f"Loading {len(data)} records into {table_name}", 
                 level="INFO", component="Load", table_name=table_name, record_count=len(data))
         
@@ -310,29 +371,18 @@ class SyncEngine:
                 self.log(f"No data to load for {table_name}", level="INFO", component="Load", table_name=table_name)
                 return
             
+            columns = list(data[0].keys())
+            
             # Connect to target database
             with self.target_engine.connect() as conn:
                 # Begin transaction
                 trans = conn.begin()
                 
                 try:
-                    for record in data:
-                        # Check if record exists
-                        pk_conditions = " AND ".join([f"{pk} = :{pk}" for pk in pk_columns])
-                        check_query = f"SELECT 1 FROM {table_name} WHERE {pk_conditions}"
-                        exists = conn.execute(text(check_query), record).scalar() is not None
-                        
-                        if exists:
-                            # Update existing record
-                            set_clause = ", ".join([f"{k} = :{k}" for k in record.keys() if k not in pk_columns])
-                            update_query = f"UPDATE {table_name} SET {set_clause} WHERE {pk_conditions}"
-                            conn.execute(text(update_query), record)
-                        else:
-                            # Insert new record
-                            columns = ", ".join(record.keys())
-                            values = ", ".join([f":{k}" for k in record.keys()])
-                            insert_query = f"INSERT INTO {table_name} ({columns}) VALUES ({values})"
-                            conn.execute(text(insert_query), record)
+                    if conn.dialect.name in ('postgresql', 'sqlite'):
+                        self._upsert_rows(conn, table_name, columns, data, pk_columns)
+                    else:
+                        self._merge_rows(conn, table_name, columns, data, pk_columns)
                     
                     # Commit transaction
                     trans.commit()
@@ -347,6 +397,62 @@ class SyncEngine:
             self.log(f"Error connecting to target database for table {table_name}: {str(e)}", level="ERROR", component="Load", table_name=table_name)
             raise
     
+    def _upsert_rows(self, conn: Connection, table_name: str, columns: List[str], 
+                    data: List[Dict[str, Any]], pk_columns: List[str]):
+        """Upsert rows with multi-row INSERT ... ON CONFLICT statements."""
+        update_columns = [col for col in columns if col not in pk_columns]
+        conflict_clause = f" ON CONFLICT ({', '.join(pk_columns)}) "
+        if update_columns:
+            conflict_clause += "DO UPDATE SET " + ", ".join(f"{col} = excluded.{col}" for col in update_columns)
+        else:
+            conflict_clause += "DO NOTHING"
+        
+        # Keep each statement well below driver bind parameter limits
+        rows_per_statement = max(1, MAX_BIND_PARAMS // len(columns))
+        
+        for start in range(0, len(data), rows_per_statement):
+            chunk = data[start:start + rows_per_statement]
+            values_clauses = []
+            params = {}
+            for i, record in enumerate(chunk):
+                values_clauses.append("(" + ", ".join(f":r{i}_{j}" for j in range(len(columns))) + ")")
+                for j, col in enumerate(columns):
+                    params[f"r{i}_{j}"] = record.get(col)
+            
+            insert_query = (
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES {', '.join(values_clauses)}"
+                f"{conflict_clause}"
+            )
+            conn.execute(text(insert_query), params)
+    
+    def _merge_rows(self, conn: Connection, table_name: str, columns: List[str], 
+                   data: List[Dict[str, Any]], pk_columns: List[str]):
+        """Merge rows on databases without ON CONFLICT: one key lookup, then batched UPDATE and INSERT."""
+        pk_conditions = " AND ".join([f"{pk} = :{pk}" for pk in pk_columns])
+        
+        if len(pk_columns) == 1:
+            pk = pk_columns[0]
+            check_query = text(f"SELECT {pk} FROM {table_name} WHERE {pk} IN :keys").bindparams(
+                sa.bindparam('keys', expanding=True)
+            )
+            existing = {row[0] for row in conn.execute(check_query, {'keys': [record[pk] for record in data]})}
+            exists = [record[pk] in existing for record in data]
+        else:
+            check_query = text(f"SELECT 1 FROM {table_name} WHERE {pk_conditions}")
+            exists = [conn.execute(check_query, record).scalar() is not None for record in data]
+        
+        to_update = [record for record, found in zip(data, exists) if found]
+        to_insert = [record for record, found in zip(data, exists) if not found]
+        
+        set_clause = ", ".join([f"{k} = :{k}" for k in columns if k not in pk_columns])
+        if to_update and set_clause:
+            update_query = f"UPDATE {table_name} SET {set_clause} WHERE {pk_conditions}"
+            conn.execute(text(update_query), to_update)
+        
+        if to_insert:
+            insert_query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(f':{k}' for k in columns)})"
+            conn.execute(text(insert_query), to_insert)
+    
     def _update_global_settings(self):
         """Update global settings after sync."""
         global_setting = GlobalSetting.query.first()
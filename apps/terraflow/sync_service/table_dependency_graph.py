@@ -0,0 +1,153 @@
+"""
+Table Dependency Graph for the Sync Service.
+
+This module derives a dependency DAG between tables from foreign key metadata
+and schedules per-table work on a bounded thread pool, so independent tables
+are synchronized concurrently while parent tables are loaded before their
+children (and children are cleaned up before their parents for deletes).
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class TableDependencyGraph:
+    """Directed acyclic graph of table dependencies (child -> parent)."""
+
+    def __init__(self, table_names: List[str]):
+        """
+        Initialize the graph.
+
+        Args:
+            table_names: Tables in the graph, in their configured order
+        """
+        self.table_names = list(table_names)
+        self.parents: Dict[str, Set[str]] = {name: set() for name in self.table_names}
+        self.children: Dict[str, Set[str]] = {name: set() for name in self.table_names}
+
+    @classmethod
+    def from_engine(cls, engine: Engine, table_names: List[str]) -> 'TableDependencyGraph':
+        """
+        Build the graph from the foreign keys defined in a database.
+
+        Only foreign keys between tables in ``table_names`` are considered, and
+        self-references are ignored.
+
+        Args:
+            engine: SQLAlchemy engine to read foreign key metadata from
+            table_names: Tables to include
+
+        Returns:
+            TableDependencyGraph instance
+        """
+        graph = cls(table_names)
+        inspector = sa.inspect(engine)
+
+        for table_name in table_names:
+            try:
+                foreign_keys = inspector.get_foreign_keys(table_name)
+            except Exception as e:
+                logger.warning(f"Could not read foreign keys for {table_name}: {str(e)}")
+                continue
+
+            for fk in foreign_keys:
+                parent = fk.get('referred_table')
+                if parent in graph.parents and parent != table_name:
+                    graph.add_dependency(table_name, parent)
+
+        return graph
+
+    def add_dependency(self, child: str, parent: str):
+        """
+        Record that ``child`` references ``parent``.
+
+        Args:
+            child: Referencing table
+            parent: Referenced table
+        """
+        self.parents[child].add(parent)
+        self.children[parent].add(child)
+
+    def topological_order(self, reverse: bool = False) -> List[str]:
+        """
+        Get a sequential order respecting dependencies.
+
+        Args:
+            reverse: If True, children come before parents (delete order)
+
+        Returns:
+            List of table names
+        """
+        order = []
+        self.run(order.append, max_workers=1, reverse=reverse)
+        return order
+
+    def run(self,
+            func: Callable[[str], Any],
+            max_workers: int = 4,
+            reverse: bool = False,
+            should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, Optional[Exception]]:
+        """
+        Run ``func`` for every table, concurrently where dependencies allow.
+
+        A table is started once all tables it depends on have finished: its
+        parents in normal order, its children when ``reverse`` is set. A table
+        whose function raises still counts as finished so the rest of the graph
+        proceeds. If a dependency cycle blocks progress, the earliest configured
+        table in the cycle is released and a warning is logged.
+
+        Args:
+            func: Function called with each table name
+            max_workers: Maximum number of tables processed at once
+            reverse: Whether to process children before parents
+            should_stop: Optional callable; when it returns True no new tables are started
+
+        Returns:
+            Dictionary mapping each started table to the exception it raised, or None
+        """
+        waits_on = self.children if reverse else self.parents
+        releases = self.parents if reverse else self.children
+
+        pending = {name: set(waits_on[name]) for name in self.table_names}
+        results: Dict[str, Optional[Exception]] = {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            while pending or running:
+                if should_stop and should_stop():
+                    pending.clear()
+
+                ready = [name for name in self.table_names if name in pending and not pending[name]]
+
+                if not ready and not running and pending:
+                    # Dependency cycle: release the earliest configured table
+                    blocked = next(name for name in self.table_names if name in pending)
+                    logger.warning(f"Dependency cycle detected, releasing table {blocked} early")
+                    ready = [blocked]
+
+                for name in ready[:max(0, max_workers - len(running))]:
+                    del pending[name]
+                    running[executor.submit(func, name)] = name
+
+                if not running:
+                    continue
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error:
+                        logger.error(f"Error processing table {name}: {str(error)}")
+                    results[name] = error
+
+                    for dependent in releases[name]:
+                        if dependent in pending:
+                            pending[dependent].discard(name)
+
+        return results
@@ -10,7 +10,13 @@ import uuid
 import logging
 import datetime
 import json
+import time
+import queue
+import atexit
+import itertools
 import threading
+import contextlib
+from collections import OrderedDict
 from typing import Dict, List, Any, Tuple, Optional, Union, Set, Callable
 
 import sqlalchemy as sa
@@ -18,6 +24,12 @@ from sqlalchemy.sql import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.engine import Engine, Connection
 
+# Advisory file locks keep processes sharing an audit directory off each other's files
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -133,6 +145,37 @@ class AuditStore:
         """
         raise NotImplementedError("Subclasses must implement store_event method")
         
+    def store_events(self, events: List[AuditEvent]) -> int:
+        """
+        Store a batch of audit events.
+        
+        The default implementation stores events one at a time; stores that
+        can write a batch more cheaply override it.
+        
+        Args:
+            events: Events to store
+            
+        Returns:
+            Number of events stored successfully
+        """
+        return sum(1 for event in events if self.store_event(event))
+        
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write out any buffered events.
+        
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait indefinitely
+            
+        Returns:
+            True if all buffered events were written
+        """
+        return True
+        
+    def close(self):
+        """Flush buffered events and release resources."""
+        self.flush()
+        
     def get_events(self, 
                   job_id: Optional[str] = None,
                   event_type: Optional[str] = None,
@@ -199,8 +242,21 @@ class InMemoryAuditStore(AuditStore):
         Returns:
             True if storage was successful
         """
+        return self.store_events([event]) == 1
+        
+    def store_events(self, events: List[AuditEvent]) -> int:
+        """
+        Store a batch of audit events in memory.
+        
+        Args:
+            events: Events to store
+            
+        Returns:
+            Number of events stored
+        """
         with self.lock:
-            self.events[event.event_id] = event
+            for event in events:
+                self.events[event.event_id] = event
             
             # Enforce max events limit
             if len(self.events) > self.max_events:
@@ -213,7 +269,7 @@ class InMemoryAuditStore(AuditStore):
                 for event_id, _ in oldest:
                     del self.events[event_id]
                     
-        return True
+        return len(events)
         
     def get_events(self, 
                   job_id: Optional[str] = None,
@@ -368,40 +424,75 @@ class DatabaseAuditStore(AuditStore):
         Returns:
             True if storage was successful
         """
-        try:
-            query = text(f"""
-            INSERT INTO {self.table_name} (
-                event_id, event_type, component, job_id, table_name, record_id,
-                operation, user_id, data, timestamp, success, error_message
-            ) VALUES (
-                :event_id, :event_type, :component, :job_id, :table_name, :record_id,
-                :operation, :user_id, :data, :timestamp, :success, :error_message
-            )
-            """)
-            
-            params = {
-                'event_id': event.event_id,
-                'event_type': event.event_type,
-                'component': event.component,
-                'job_id': event.job_id,
-                'table_name': event.table_name,
-                'record_id': event.record_id,
-                'operation': event.operation,
-                'user_id': event.user_id,
-                'data': json.dumps(event.data),
-                'timestamp': event.timestamp,
-                'success': event.success,
-                'error_message': event.error_message
-            }
+        return self.store_events([event]) == 1
+        
+    def store_events(self, events: List[AuditEvent]) -> int:
+        """
+        Store a batch of audit events in the database.
+        
+        The batch is inserted in a single transaction with one executemany
+        call, which SQLAlchemy sends as multi-row INSERT statements. If the
+        batch fails, events are retried one at a time so that a single bad
+        event does not lose the rest of the batch.
+        
+        Args:
+            events: Events to store
             
+        Returns:
+            Number of events stored successfully
+        """
+        if not events:
+            return 0
+            
+        query = text(f"""
+        INSERT INTO {self.table_name} (
+            event_id, event_type, component, job_id, table_name, record_id,
+            operation, user_id, data, timestamp, success, error_message
+        ) VALUES (
+            :event_id, :event_type, :component, :job_id, :table_name, :record_id,
+            :operation, :user_id, :data, :timestamp, :success, :error_message
+        )
+        """)
+        params = [self._event_params(event) for event in events]
+        
+        try:
             with self.engine.begin() as conn:
                 conn.execute(query, params)
-                
-            return True
+            return len(events)
             
         except Exception as e:
-            logger.error(f"Error storing audit event: {str(e)}")
-            return False
+            if len(events) == 1:
+                logger.error(f"Error storing audit event: {str(e)}")
+                return 0
+            logger.warning(f"Error storing batch of {len(events)} audit events, retrying individually: {str(e)}")
+            
+        stored = 0
+        for event_params in params:
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(query, event_params)
+                stored += 1
+            except Exception as e:
+                logger.error(f"Error storing audit event {event_params['event_id']}: {str(e)}")
+                
+        return stored
+        
+    def _event_params(self, event: AuditEvent) -> Dict[str, Any]:
+        """Get the insert parameters for an event."""
+        return {
+            'event_id': event.event_id,
+            'event_type': event.event_type,
+            'component': event.component,
+            'job_id': event.job_id,
+            'table_name': event.table_name,
+            'record_id': event.record_id,
+            'operation': event.operation,
+            'user_id': event.user_id,
+            'data': json.dumps(event.data, default=str),
+            'timestamp': event.timestamp,
+            'success': event.success,
+            'error_message': event.error_message
+        }
             
     def get_events(self, 
                   job_id: Optional[str] = None,
@@ -559,14 +650,255 @@ class DatabaseAuditStore(AuditStore):
             return None
 
 
+class AuditFileIndex:
+    """
+    Index of a single audit file.
+    
+    The summary (indexed size, event count, time range and the job IDs and
+    table names present) is small and always kept in memory, so files that
+    cannot match a query are skipped without being opened. The postings (the
+    byte offset of every event, and the offsets per job ID and per table name)
+    are persisted in a sidecar file next to the audit file and loaded on demand.
+    """
+    
+    def __init__(self, file_path: str, legacy: bool = False):
+        """
+        Initialize an empty file index.
+        
+        Args:
+            file_path: Path of the audit file
+            legacy: Whether the file is a legacy JSON array file without byte offsets
+        """
+        self.file_path = file_path
+        self.legacy = legacy
+        self.size = 0
+        self.count = 0
+        self.min_timestamp = None
+        self.max_timestamp = None
+        self.partition = None
+        self.job_ids = set()
+        self.table_names = set()
+        
+        # Postings, loaded on demand
+        self.offsets = None  # Map event_id to byte offset
+        self.job_postings = None  # Map job_id to byte offsets
+        self.table_postings = None  # Map table_name to byte offsets
+        
+    @property
+    def postings_path(self) -> str:
+        """Path of the sidecar file holding the postings."""
+        return os.path.splitext(self.file_path)[0] + '.idx'
+        
+    @property
+    def postings_loaded(self) -> bool:
+        """Whether the postings are in memory."""
+        return self.offsets is not None
+        
+    def reset_postings(self):
+        """Start with empty postings, for a new file or a rebuild."""
+        self.offsets = {}
+        self.job_postings = {}
+        self.table_postings = {}
+        
+    def release_postings(self):
+        """Drop the postings from memory."""
+        self.offsets = None
+        self.job_postings = None
+        self.table_postings = None
+        
+    def add(self, 
+            event_id: str,
+            job_id: Optional[str],
+            table_name: Optional[str],
+            timestamp: Optional[datetime.datetime],
+            offset: int):
+        """
+        Add an event to the index.
+        
+        Args:
+            event_id: ID of the event
+            job_id: Job ID of the event
+            table_name: Table name of the event
+            timestamp: Timestamp of the event
+            offset: Byte offset of the event's line in the file
+        """
+        self.count += 1
+        
+        if timestamp is not None:
+            if self.min_timestamp is None or timestamp < self.min_timestamp:
+                self.min_timestamp = timestamp
+            if self.max_timestamp is None or timestamp > self.max_timestamp:
+                self.max_timestamp = timestamp
+                
+        if job_id is not None:
+            self.job_ids.add(job_id)
+        if table_name is not None:
+            self.table_names.add(table_name)
+            
+        if self.postings_loaded:
+            self.offsets[event_id] = offset
+            if job_id is not None:
+                self.job_postings.setdefault(job_id, []).append(offset)
+            if table_name is not None:
+                self.table_postings.setdefault(table_name, []).append(offset)
+                
+    def may_contain(self, 
+                    job_id: Optional[str] = None,
+                    table_name: Optional[str] = None,
+                    start_time: Optional[datetime.datetime] = None,
+                    end_time: Optional[datetime.datetime] = None) -> bool:
+        """
+        Check whether the file can hold events matching the filters.
+        
+        Args:
+            job_id: Filter by job ID
+            table_name: Filter by table name
+            start_time: Filter for events after this time
+            end_time: Filter for events before this time
+            
+        Returns:
+            False if no event in the file can match
+        """
+        if self.count == 0:
+            return False
+        if job_id is not None and job_id not in self.job_ids:
+            return False
+        if table_name is not None and table_name not in self.table_names:
+            return False
+        if start_time is not None and self.max_timestamp is not None and self.max_timestamp < start_time:
+            return False
+        if end_time is not None and self.min_timestamp is not None and self.min_timestamp > end_time:
+            return False
+        return True
+        
+    def to_summary(self) -> Dict[str, Any]:
+        """Convert the summary to a dictionary representation."""
+        return {
+            'size': self.size,
+            'count': self.count,
+            'legacy': self.legacy,
+            'partition': self.partition,
+            'min_timestamp': self.min_timestamp.isoformat() if self.min_timestamp else None,
+            'max_timestamp': self.max_timestamp.isoformat() if self.max_timestamp else None,
+            'job_ids': sorted(self.job_ids),
+            'table_names': sorted(self.table_names)
+        }
+        
+    @classmethod
+    def from_summary(cls, file_path: str, summary: Dict[str, Any]) -> 'AuditFileIndex':
+        """
+        Create a file index from a summary, without postings.
+        
+        Args:
+            file_path: Path of the audit file
+            summary: Dictionary representation of the summary
+            
+        Returns:
+            AuditFileIndex instance
+        """
+        index = cls(file_path, legacy=summary.get('legacy', False))
+        index.size = summary['size']
+        index.count = summary['count']
+        index.partition = summary.get('partition')
+        index.min_timestamp = parse_timestamp(summary.get('min_timestamp'))
+        index.max_timestamp = parse_timestamp(summary.get('max_timestamp'))
+        index.job_ids = set(summary.get('job_ids', []))
+        index.table_names = set(summary.get('table_names', []))
+        return index
+        
+    def save_postings(self):
+        """Write the postings to the sidecar file."""
+        if self.legacy or not self.postings_loaded:
+            return
+            
+        write_json_atomic(self.postings_path, {
+            'size': self.size,
+            'events': self.offsets,
+            'jobs': self.job_postings,
+            'tables': self.table_postings
+        })
+        
+    def load_postings(self) -> bool:
+        """
+        Read the postings from the sidecar file.
+        
+        Returns:
+            True if the sidecar file exists and matches the indexed size
+        """
+        try:
+            with open(self.postings_path, 'r') as f:
+                postings = json.load(f)
+        except (OSError, ValueError):
+            return False
+            
+        if postings.get('size') != self.size:
+            return False
+            
+        self.offsets = postings['events']
+        self.job_postings = postings['jobs']
+        self.table_postings = postings['tables']
+        return True
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parse an ISO format timestamp, returning None if it is missing or malformed."""
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def write_json_atomic(path: str, data: Any):
+    """Write a JSON file by replacing it, so readers never see a partial file."""
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+
 class FileAuditStore(AuditStore):
-    """File-based implementation of AuditStore."""
+    """
+    File-based implementation of AuditStore.
+    
+    Events are appended to newline-delimited JSON files (audit_NNN.ndjson),
+    one event per line, so a batch of events is written with a single append.
+    A new file is started when the current one reaches max_file_size_mb or
+    when events cross a partition boundary, so each file covers a bounded
+    time range.
+    
+    Each file has an AuditFileIndex. The summaries of all files are kept in a
+    manifest (audit_index.json) that is read at startup, so opening the store
+    does not read the audit history; only files whose size no longer matches
+    the manifest (for example after a crash) are rescanned. Lookups by event,
+    job, table or time range skip files that cannot match and seek directly to
+    the matching lines in the rest.
+    
+    Several processes can share a directory: each appends only to files it
+    has locked (or created, where file locks are unavailable), and the
+    manifest is merged with the copy on disk rather than overwritten.
+    
+    Files written by earlier versions as a single JSON array (audit_NNN.json)
+    are still read.
+    """
+    
+    FILE_PREFIX = 'audit_'
+    FILE_EXTENSION = '.ndjson'
+    LEGACY_FILE_EXTENSION = '.json'
+    MANIFEST_FILE = 'audit_index.json'
+    PARTITION_FORMATS = {
+        'day': '%Y%m%d',
+        'hour': '%Y%m%d%H'
+    }
     
     def __init__(self, 
                  directory: str,
                  max_file_size_mb: float = 10.0,
                  max_files: int = 10,
-                 index_in_memory: bool = True):
+                 index_in_memory: bool = True,
+                 partition: Optional[str] = 'day',
+                 max_cached_indexes: int = 4):
         """
         Initialize a file-based audit store.
         
@@ -574,19 +906,31 @@ class FileAuditStore(AuditStore):
             directory: Directory to store audit files
             max_file_size_mb: Maximum size of audit files in MB
             max_files: Maximum number of audit files to keep
-            index_in_memory: Whether to keep an in-memory index of events
+            index_in_memory: Whether to keep the postings of recently read files in memory
+            partition: Start a new file when events cross a 'day' or 'hour'
+                boundary, or None to rotate files by size only
+            max_cached_indexes: Number of older files whose postings are kept in memory
         """
+        if partition is not None and partition not in self.PARTITION_FORMATS:
+            raise ValueError(f"Unsupported audit file partition: {partition}")
+            
         self.directory = directory
         self.max_file_size_mb = max_file_size_mb
         self.max_files = max_files
         self.index_in_memory = index_in_memory
+        self.partition = partition
+        self.max_cached_indexes = max_cached_indexes if index_in_memory else 1
         
         self.current_file = None
+        self.current_handle = None  # Open handle holding the lock on the current file
         self.file_counter = 0
         self.lock = threading.RLock()
         
-        # In-memory index for faster lookups
-        self.event_index = {}  # Map event_id to (file_path, line_offset)
+        # Index of every audit file, ordered oldest to newest
+        self.file_indexes: Dict[str, AuditFileIndex] = {}
+        
+        # Older files with postings in memory, least recently used first
+        self.cached_postings = OrderedDict()
         
         # Create directory if it doesn't exist
         os.makedirs(directory, exist_ok=True)
@@ -594,77 +938,286 @@ class FileAuditStore(AuditStore):
         # Initialize current file
         self._initialize_current_file()
         
+    def _get_file_counter(self, file_name: str) -> Optional[int]:
+        """Get the counter of an audit file name, or None if it is not an audit file."""
+        if not file_name.startswith(self.FILE_PREFIX):
+            return None
+            
+        stem, extension = os.path.splitext(file_name)
+        if extension not in (self.FILE_EXTENSION, self.LEGACY_FILE_EXTENSION):
+            return None
+            
+        try:
+            return int(stem[len(self.FILE_PREFIX):])  # Extract number from audit_NNN
+        except ValueError:
+            return None
+            
+    def _list_audit_files(self, newest_first: bool = False) -> List[str]:
+        """
+        List audit file paths ordered by file counter.
+        
+        Args:
+            newest_first: Whether to list the newest file first
+            
+        Returns:
+            List of audit file paths
+        """
+        audit_files = []
+        for file_name in os.listdir(self.directory):
+            counter = self._get_file_counter(file_name)
+            if counter is not None:
+                audit_files.append((counter, os.path.join(self.directory, file_name)))
+                
+        audit_files.sort(reverse=newest_first)
+        return [file_path for _, file_path in audit_files]
+        
+    def _get_partition_key(self, timestamp: Optional[datetime.datetime]) -> Optional[str]:
+        """Get the partition an event timestamp belongs to."""
+        if self.partition is None or timestamp is None:
+            return None
+        return timestamp.strftime(self.PARTITION_FORMATS[self.partition])
+        
     def _initialize_current_file(self):
-        """Initialize the current audit file."""
+        """Load the file indexes and open the current audit file."""
         with self.lock:
-            # Find the highest existing file counter
-            file_pattern = os.path.join(self.directory, 'audit_*.json')
-            existing_files = [
-                f for f in os.listdir(self.directory)
-                if f.startswith('audit_') and f.endswith('.json')
-            ]
+            self._load_index()
             
-            if existing_files:
-                # Extract counter values
-                counters = []
-                for f in existing_files:
-                    try:
-                        counter = int(f[6:-5])  # Extract number from audit_NNN.json
-                        counters.append(counter)
-                    except ValueError:
-                        pass
-                        
-                if counters:
-                    self.file_counter = max(counters)
+            audit_files = list(self.file_indexes)
+            if audit_files:
+                self.file_counter = self._get_file_counter(os.path.basename(audit_files[-1]))
+                
+            # Keep appending to the newest file if it has room and no other process writes it
+            newest = audit_files[-1] if audit_files else None
+            if (newest and newest.endswith(self.FILE_EXTENSION) and
+                    os.path.getsize(newest) < self.max_file_size_mb * 1024 * 1024 and
+                    self._claim_file(newest)):
+                self.current_file = newest
+                self._get_postings(self.file_indexes[newest])
+                self._terminate_last_line(newest)
+            else:
+                self._create_new_file()
+                
+    def _claim_file(self, file_path: str) -> bool:
+        """
+        Lock an audit file so that only this store appends to it.
+        
+        The lock is held until the store moves to another file or is closed.
+        
+        Args:
+            file_path: Path of the audit file
+            
+        Returns:
+            True if the file was locked; always False where file locks are unavailable
+        """
+        if fcntl is None:
+            return False
+            
+        handle = open(file_path, 'ab')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+            
+        self._release_file()
+        self.current_handle = handle
+        return True
+        
+    def _release_file(self):
+        """Release the lock on the current audit file."""
+        if self.current_handle is not None:
+            self.current_handle.close()
+            self.current_handle = None
+            
+    @contextlib.contextmanager
+    def _manifest_lock(self):
+        """Hold an exclusive lock on the manifest across processes, where file locks are available."""
+        if fcntl is None:
+            yield
+            return
+            
+        with open(os.path.join(self.directory, self.MANIFEST_FILE + '.lock'), 'a') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                
+    def _load_index(self):
+        """Load file summaries from the manifest, rescanning files that changed since it was written."""
+        try:
+            with open(os.path.join(self.directory, self.MANIFEST_FILE), 'r') as f:
+                summaries = json.load(f).get('files', {})
+        except (OSError, ValueError):
+            summaries = {}
+            
+        self.file_indexes = {}
+        changed = False
+        
+        for file_path in self._list_audit_files():
+            summary = summaries.get(os.path.basename(file_path))
+            if summary and summary.get('size') == os.path.getsize(file_path):
+                self.file_indexes[file_path] = AuditFileIndex.from_summary(file_path, summary)
+            else:
+                index = self._index_file(file_path)
+                index.release_postings()
+                self.file_indexes[file_path] = index
+                changed = True
+                
+        if changed or len(summaries) != len(self.file_indexes):
+            self._save_manifest()
+            
+    def _save_manifest(self):
+        """
+        Write the summaries of all files to the manifest.
+        
+        Summaries written by other processes are kept for files this store
+        has not indexed. Of two summaries of the same file the one covering
+        more of it wins, since audit files are only appended to.
+        """
+        manifest_path = os.path.join(self.directory, self.MANIFEST_FILE)
+        try:
+            with self._manifest_lock():
+                try:
+                    with open(manifest_path, 'r') as f:
+                        summaries = json.load(f).get('files', {})
+                except (OSError, ValueError):
+                    summaries = {}
                     
-            # Create a new file
-            self._create_new_file()
+                for file_path, index in self.file_indexes.items():
+                    summary = summaries.get(os.path.basename(file_path))
+                    if not isinstance(summary, dict) or summary.get('size', -1) <= index.size:
+                        summaries[os.path.basename(file_path)] = index.to_summary()
+                        
+                write_json_atomic(manifest_path, {
+                    'files': {
+                        file_name: summary for file_name, summary in summaries.items()
+                        if os.path.exists(os.path.join(self.directory, file_name))
+                    }
+                })
+        except OSError as e:
+            logger.error(f"Error writing audit index manifest: {str(e)}")
+            
+    def _index_file(self, file_path: str) -> AuditFileIndex:
+        """
+        Build the index of an audit file by reading it.
+        
+        Args:
+            file_path: Path of the audit file
             
-            # Build index if enabled
-            if self.index_in_memory:
-                self._build_index()
+        Returns:
+            AuditFileIndex with postings loaded
+        """
+        index = AuditFileIndex(file_path, legacy=file_path.endswith(self.LEGACY_FILE_EXTENSION))
+        index.reset_postings()
+        
+        try:
+            for offset, event_dict in self._read_file(file_path):
+                if 'event_id' not in event_dict:
+                    continue
+                timestamp = parse_timestamp(event_dict.get('timestamp'))
+                index.add(
+                    event_dict['event_id'],
+                    event_dict.get('job_id'),
+                    event_dict.get('table_name'),
+                    timestamp,
+                    offset
+                )
+                if index.partition is None:
+                    index.partition = self._get_partition_key(timestamp)
+            index.size = os.path.getsize(file_path)
+            index.save_postings()
+        except Exception as e:
+            logger.error(f"Error building index for file {file_path}: {str(e)}")
+            
+        return index
+        
+    def _get_postings(self, index: AuditFileIndex) -> AuditFileIndex:
+        """
+        Get a file index with its postings loaded.
+        
+        Args:
+            index: File index, with or without postings
+            
+        Returns:
+            File index with postings; this replaces the given index if the
+            postings had to be rebuilt from the audit file
+        """
+        if not index.postings_loaded and (index.legacy or not index.load_postings()):
+            index = self._index_file(index.file_path)
+            self.file_indexes[index.file_path] = index
+            
+        # The current file's postings always stay in memory
+        if index.file_path != self.current_file:
+            self.cached_postings[index.file_path] = index
+            self.cached_postings.move_to_end(index.file_path)
+            while len(self.cached_postings) > max(self.max_cached_indexes, 1):
+                _, evicted = self.cached_postings.popitem(last=False)
+                evicted.release_postings()
+                
+        return index
+        
+    def _terminate_last_line(self, file_path: str):
+        """Make sure appends start on a new line after a partially written last line."""
+        with open(file_path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+                self.file_indexes[file_path].size = f.tell()
                 
     def _create_new_file(self):
-        """Create a new audit file."""
-        self.file_counter += 1
-        self.current_file = os.path.join(
-            self.directory, 
-            f'audit_{self.file_counter:03d}.json'
-        )
-        
-        # If file doesn't exist, create it with an empty JSON array
-        if not os.path.exists(self.current_file):
-            with open(self.current_file, 'w') as f:
-                f.write('[\n]')
+        """Seal the current audit file and create a new one."""
+        current = self.file_indexes.get(self.current_file)
+        if current is not None and current.postings_loaded:
+            current.save_postings()
+            current.release_postings()
+            
+        # Create an empty file; events are appended one per line. Another
+        # process may have taken the next counter, so creation must be exclusive.
+        while True:
+            self.file_counter += 1
+            self.current_file = os.path.join(
+                self.directory, 
+                f'{self.FILE_PREFIX}{self.file_counter:03d}{self.FILE_EXTENSION}'
+            )
+            try:
+                open(self.current_file, 'x').close()
+                break
+            except FileExistsError:
+                continue
+                
+        self._release_file()
+        self._claim_file(self.current_file)
+            
+        index = AuditFileIndex(self.current_file)
+        index.reset_postings()
+        self.file_indexes[self.current_file] = index
                 
         logger.info(f"Created new audit file: {self.current_file}")
         
         # Clean up old files
         self._cleanup_old_files()
+        self._save_manifest()
         
     def _cleanup_old_files(self):
         """Delete oldest audit files if over the max limit."""
-        audit_files = sorted([
-            os.path.join(self.directory, f)
-            for f in os.listdir(self.directory)
-            if f.startswith('audit_') and f.endswith('.json')
-        ])
+        audit_files = list(self.file_indexes)
         
         # Keep the newest files
         files_to_delete = audit_files[:-self.max_files] if len(audit_files) > self.max_files else []
         
         for file_path in files_to_delete:
             try:
+                index = self.file_indexes.pop(file_path)
+                self.cached_postings.pop(file_path, None)
+                
                 os.remove(file_path)
+                if os.path.exists(index.postings_path):
+                    os.remove(index.postings_path)
                 logger.info(f"Deleted old audit file: {file_path}")
-                
-                # Remove from index
-                if self.index_in_memory:
-                    self.event_index = {
-                        event_id: location
-                        for event_id, location in self.event_index.items()
-                        if location[0] != file_path
-                    }
             except OSError as e:
                 logger.error(f"Error deleting old audit file {file_path}: {str(e)}")
                 
@@ -678,60 +1231,93 @@ class FileAuditStore(AuditStore):
         if file_size_mb >= self.max_file_size_mb:
             self._create_new_file()
             
-    def _build_index(self):
-        """Build an in-memory index of all events."""
-        if not self.index_in_memory:
-            return
+    def _read_file(self, file_path: str) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Read all events in an audit file.
+        
+        Args:
+            file_path: Path of the audit file
             
-        self.event_index = {}
+        Returns:
+            List of (byte_offset, event_dict) tuples; offsets are 0 for legacy JSON array files
+        """
+        if file_path.endswith(self.LEGACY_FILE_EXTENSION):
+            return [(0, event_dict) for event_dict in self._read_legacy_file(file_path)]
+            
+        events = []
+        with open(file_path, 'rb') as f:
+            offset = 0
+            for line in f:
+                line_offset = offset
+                offset += len(line)
+                if not line.strip():
+                    continue
+                    
+                try:
+                    events.append((line_offset, json.loads(line)))
+                except json.JSONDecodeError:
+                    # A partially written last line after a crash
+                    logger.warning(f"Skipping malformed line at offset {line_offset} in audit file {file_path}")
+                    
+        return events
         
-        audit_files = sorted([
-            os.path.join(self.directory, f)
-            for f in os.listdir(self.directory)
-            if f.startswith('audit_') and f.endswith('.json')
-        ])
+    def _read_lines(self, file_path: str, offsets: List[int]) -> List[Dict[str, Any]]:
+        """
+        Read the events at the given byte offsets of an audit file.
         
-        for file_path in audit_files:
+        Args:
+            file_path: Path of the audit file
+            offsets: Byte offsets of event lines
+            
+        Returns:
+            List of event dictionaries
+        """
+        events = []
+        with open(file_path, 'rb') as f:
+            for offset in sorted(offsets):
+                f.seek(offset)
+                try:
+                    events.append(json.loads(f.readline()))
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed line at offset {offset} in audit file {file_path}")
+                    
+        return events
+        
+    def _read_legacy_file(self, file_path: str) -> List[Dict[str, Any]]:
+        """Read the events in an audit file written as a single JSON array."""
+        with open(file_path, 'r') as f:
+            content = f.read().strip()
+            
+        if content in ('', '[]', '[', ']'):
+            return []
+            
+        # Fix the JSON format (remove trailing comma if any)
+        if content.endswith(',\n]'):
+            content = content[:-3] + '\n]'
+        elif content.endswith(',]'):
+            content = content[:-2] + ']'
+            
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            pass
+            
+        # Fall back to line-by-line reading for malformed JSON
+        events = []
+        for line in content.splitlines():
+            json_line = line.strip()
+            if not json_line or json_line in ('[]', '[', ']'):
+                continue
+            if json_line.endswith(','):
+                json_line = json_line[:-1]
+                
             try:
-                with open(file_path, 'r') as f:
-                    # Read the entire file to get all events
-                    content = f.read()
-                    if content.strip() in ('', '[]', '['):
-                        continue
-                        
-                    # Fix the JSON format (remove trailing comma if any)
-                    if content.strip().endswith(',\n]'):
-                        content = content.strip()[:-3] + '\n]'
-                    elif content.strip().endswith(',]'):
-                        content = content.strip()[:-2] + ']'
-                        
-                    try:
-                        events_array = json.loads(content)
-                        for event_dict in events_array:
-                            if 'event_id' in event_dict:
-                                self.event_index[event_dict['event_id']] = (file_path, 0)  # Offset is not relevant for full read
-                    except json.JSONDecodeError:
-                        # Fall back to line-by-line reading for malformed JSON
-                        f.seek(0)
-                        line_offset = 0
-                        for line in f:
-                            if line.strip() and not line.strip() in ('[]', '[', ']'):
-                                # Remove trailing comma if any
-                                json_line = line.strip()
-                                if json_line.endswith(','):
-                                    json_line = json_line[:-1]
-                                    
-                                try:
-                                    event_dict = json.loads(json_line)
-                                    if 'event_id' in event_dict:
-                                        self.event_index[event_dict['event_id']] = (file_path, line_offset)
-                                except json.JSONDecodeError:
-                                    pass
-                                    
-                            line_offset = f.tell()
-            except Exception as e:
-                logger.error(f"Error building index for file {file_path}: {str(e)}")
+                events.append(json.loads(json_line))
+            except json.JSONDecodeError:
+                pass
                 
+        return events
+        
     def store_event(self, event: AuditEvent) -> bool:
         """
         Store an audit event in a file.
@@ -742,53 +1328,82 @@ class FileAuditStore(AuditStore):
         Returns:
             True if storage was successful
         """
+        return self.store_events([event]) == 1
+        
+    def store_events(self, events: List[AuditEvent]) -> int:
+        """
+        Store a batch of audit events, appending each partition's events with a single write.
+        
+        Args:
+            events: Events to store
+            
+        Returns:
+            Number of events stored successfully
+        """
+        stored = 0
+        
         with self.lock:
             try:
                 # Check if file needs to be rotated
                 self._check_file_size()
                 
-                # Convert event to JSON
-                event_json = json.dumps(event.to_dict())
-                
-                # Append to the file
-                with open(self.current_file, 'r+') as f:
-                    # Go to the end of the file minus closing bracket
-                    f.seek(0, os.SEEK_END)
-                    position = f.tell()
-                    f.seek(max(0, position - 2))
+                for partition_key, group in itertools.groupby(
+                        events, key=lambda event: self._get_partition_key(event.timestamp)):
+                    group = list(group)
                     
-                    # Check if we need to add a comma
-                    ending = f.read()
-                    f.seek(max(0, position - 2))
+                    index = self.file_indexes[self.current_file]
+                    if index.count and partition_key != index.partition:
+                        self._create_new_file()
+                        index = self.file_indexes[self.current_file]
+                    if not index.count:
+                        index.partition = partition_key
+                        
+                    lines = [
+                        (json.dumps(event.to_dict(), default=str) + '\n').encode('utf-8')
+                        for event in group
+                    ]
                     
-                    if ending.strip() == ']':
-                        # File has events, add comma and new event
-                        f.write(',\n' + event_json + '\n]')
-                    else:
-                        # File is empty or not properly formatted
-                        f.seek(0)
-                        content = f.read().strip()
+                    with open(self.current_file, 'ab') as f:
+                        offset = f.tell()
+                        f.write(b''.join(lines))
                         
-                        if content in ('', '[]', '['):
-                            # Empty file, write with brackets
-                            f.seek(0)
-                            f.write('[\n' + event_json + '\n]')
-                            f.truncate()
-                        else:
-                            # Malformed file, append at end
-                            f.seek(0, os.SEEK_END)
-                            f.write(event_json + '\n]')
-                            
-                # Update index
-                if self.index_in_memory:
-                    self.event_index[event.event_id] = (self.current_file, 0)  # Offset not tracked for simplicity
+                    for event, line in zip(group, lines):
+                        index.add(event.event_id, event.job_id, event.table_name, event.timestamp, offset)
+                        offset += len(line)
+                    index.size = offset
+                    stored += len(group)
                     
-                return True
-                
             except Exception as e:
-                logger.error(f"Error storing audit event to file: {str(e)}")
+                logger.error(f"Error storing audit events to file: {str(e)}")
+                
+        return stored
+        
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Persist the current file's postings and the manifest.
+        
+        Args:
+            timeout: Unused; writing the index does not wait on other threads
+            
+        Returns:
+            True if the index was written
+        """
+        with self.lock:
+            try:
+                self.file_indexes[self.current_file].save_postings()
+            except (KeyError, OSError) as e:
+                logger.error(f"Error writing audit file index: {str(e)}")
                 return False
                 
+            self._save_manifest()
+            return True
+            
+    def close(self):
+        """Write the index and release the lock on the current audit file."""
+        with self.lock:
+            self.flush()
+            self._release_file()
+            
     def get_events(self, 
                   job_id: Optional[str] = None,
                   event_type: Optional[str] = None,
@@ -802,6 +1417,11 @@ class FileAuditStore(AuditStore):
         """
         Get audit events with filtering.
         
+        Files that cannot match the job, table or time range are skipped, and
+        within a file only the lines listed in the job or table postings are
+        read. Files are visited newest first, stopping once the page is full
+        and the remaining files only hold older events.
+        
         Args:
             job_id: Filter by job ID
             event_type: Filter by event type
@@ -817,67 +1437,86 @@ class FileAuditStore(AuditStore):
             List of audit events
         """
         with self.lock:
-            all_events = []
+            candidates = [
+                index for index in self.file_indexes.values()
+                if index.may_contain(job_id, table_name, start_time, end_time)
+            ]
+            # Files without timestamps cannot be ruled out by age, so they are read first
+            candidates.sort(key=lambda index: (index.max_timestamp is None,
+                                               index.max_timestamp or datetime.datetime.min),
+                            reverse=True)
             
-            # Load all events from files
-            audit_files = sorted([
-                os.path.join(self.directory, f)
-                for f in os.listdir(self.directory)
-                if f.startswith('audit_') and f.endswith('.json')
-            ], reverse=True)  # Newest first
+            needed = offset + limit
+            filtered_events = []
             
-            for file_path in audit_files:
-                try:
-                    with open(file_path, 'r') as f:
-                        # Read the entire file
-                        content = f.read()
+            for index in candidates:
+                if needed and len(filtered_events) >= needed:
+                    # Keep the newest page and stop once no file can beat it
+                    filtered_events.sort(key=lambda e: e.timestamp, reverse=True)
+                    del filtered_events[needed:]
+                    if index.max_timestamp is not None and index.max_timestamp < filtered_events[-1].timestamp:
+                        break
                         
-                        # Fix JSON if needed
-                        if content.strip().endswith(',\n]'):
-                            content = content.strip()[:-3] + '\n]'
-                        elif content.strip().endswith(',]'):
-                            content = content.strip()[:-2] + ']'
-                            
-                        if content.strip() in ('', '[]', '[', ']'):
-                            continue
-                            
-                        try:
-                            events_array = json.loads(content)
-                            for event_dict in events_array:
-                                # Create AuditEvent object
-                                event = AuditEvent.from_dict(event_dict)
-                                all_events.append(event)
-                        except json.JSONDecodeError:
-                            logger.error(f"Malformed JSON in audit file {file_path}")
+                try:
+                    event_dicts = self._read_candidate_events(index, job_id, table_name)
                 except Exception as e:
-                    logger.error(f"Error reading audit file {file_path}: {str(e)}")
-                    
-            # Apply filters
-            filtered_events = []
-            for event in all_events:
-                if job_id is not None and event.job_id != job_id:
-                    continue
-                if event_type is not None and event.event_type != event_type:
-                    continue
-                if component is not None and event.component != component:
-                    continue
-                if table_name is not None and event.table_name != table_name:
-                    continue
-                if start_time is not None and event.timestamp < start_time:
-                    continue
-                if end_time is not None and event.timestamp > end_time:
-                    continue
-                if success is not None and event.success != success:
+                    logger.error(f"Error reading audit file {index.file_path}: {str(e)}")
                     continue
                     
-                filtered_events.append(event)
-                
+                # Apply filters
+                for event_dict in event_dicts:
+                    event = AuditEvent.from_dict(event_dict)
+                    if job_id is not None and event.job_id != job_id:
+                        continue
+                    if event_type is not None and event.event_type != event_type:
+                        continue
+                    if component is not None and event.component != component:
+                        continue
+                    if table_name is not None and event.table_name != table_name:
+                        continue
+                    if start_time is not None and event.timestamp < start_time:
+                        continue
+                    if end_time is not None and event.timestamp > end_time:
+                        continue
+                    if success is not None and event.success != success:
+                        continue
+                        
+                    filtered_events.append(event)
+                    
             # Sort by timestamp (newest first)
             filtered_events.sort(key=lambda e: e.timestamp, reverse=True)
             
             # Apply pagination
             return filtered_events[offset:offset+limit]
             
+    def _read_candidate_events(self, 
+                               index: AuditFileIndex,
+                               job_id: Optional[str],
+                               table_name: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Read the events of a file that may match a job or table filter.
+        
+        Args:
+            index: Index of the file
+            job_id: Filter by job ID
+            table_name: Filter by table name
+            
+        Returns:
+            List of event dictionaries
+        """
+        if index.legacy or (job_id is None and table_name is None):
+            return [event_dict for _, event_dict in self._read_file(index.file_path)]
+            
+        index = self._get_postings(index)
+        offsets = None
+        if job_id is not None:
+            offsets = set(index.job_postings.get(job_id, []))
+        if table_name is not None:
+            table_offsets = set(index.table_postings.get(table_name, []))
+            offsets = table_offsets if offsets is None else offsets & table_offsets
+            
+        return self._read_lines(index.file_path, offsets)
+            
     def get_event(self, event_id: str) -> Optional[AuditEvent]:
         """
         Get an audit event by ID.
@@ -889,51 +1528,27 @@ class FileAuditStore(AuditStore):
             AuditEvent if found, None otherwise
         """
         with self.lock:
-            # Use index if available
-            if self.index_in_memory and event_id in self.event_index:
-                file_path, _ = self.event_index[event_id]
-                
-                try:
-                    with open(file_path, 'r') as f:
-                        content = f.read()
-                        
-                        # Fix JSON if needed
-                        if content.strip().endswith(',\n]'):
-                            content = content.strip()[:-3] + '\n]'
-                        elif content.strip().endswith(',]'):
-                            content = content.strip()[:-2] + ']'
-                            
-                        events_array = json.loads(content)
-                        for event_dict in events_array:
-                            if event_dict.get('event_id') == event_id:
-                                return AuditEvent.from_dict(event_dict)
-                except Exception as e:
-                    logger.error(f"Error reading audit file {file_path}: {str(e)}")
+            # Newest files first; the current file's postings are always in memory
+            for index in reversed(list(self.file_indexes.values())):
+                if index.count == 0:
+                    continue
                     
-            # Fall back to full scan if not found or no index
-            audit_files = [
-                os.path.join(self.directory, f)
-                for f in os.listdir(self.directory)
-                if f.startswith('audit_') and f.endswith('.json')
-            ]
-            
-            for file_path in audit_files:
                 try:
-                    with open(file_path, 'r') as f:
-                        content = f.read()
+                    index = self._get_postings(index)
+                    offset = index.offsets.get(event_id)
+                    if offset is None:
+                        continue
                         
-                        # Fix JSON if needed
-                        if content.strip().endswith(',\n]'):
-                            content = content.strip()[:-3] + '\n]'
-                        elif content.strip().endswith(',]'):
-                            content = content.strip()[:-2] + ']'
-                            
-                        events_array = json.loads(content)
-                        for event_dict in events_array:
-                            if event_dict.get('event_id') == event_id:
-                                return AuditEvent.from_dict(event_dict)
+                    if index.legacy:
+                        event_dicts = self._read_legacy_file(index.file_path)
+                    else:
+                        event_dicts = self._read_lines(index.file_path, [offset])
+                        
+                    for event_dict in event_dicts:
+                        if event_dict.get('event_id') == event_id:
+                            return AuditEvent.from_dict(event_dict)
                 except Exception as e:
-                    logger.error(f"Error reading audit file {file_path}: {str(e)}")
+                    logger.error(f"Error reading audit file {index.file_path}: {str(e)}")
                     
             return None
 
@@ -967,6 +1582,43 @@ class MultiAuditStore(AuditStore):
             
         return success
         
+    def store_events(self, events: List[AuditEvent]) -> int:
+        """
+        Store a batch of audit events in all underlying stores.
+        
+        Args:
+            events: Events to store
+            
+        Returns:
+            Largest number of events stored by any one store
+        """
+        stored = 0
+        for store in self.stores:
+            stored = max(stored, store.store_events(events))
+            
+        return stored
+        
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write out buffered events in all underlying stores.
+        
+        Args:
+            timeout: Maximum time to wait per store in seconds, None to wait indefinitely
+            
+        Returns:
+            True if all stores were flushed
+        """
+        flushed = True
+        for store in self.stores:
+            flushed = store.flush(timeout) and flushed
+            
+        return flushed
+        
+    def close(self):
+        """Close all underlying stores."""
+        for store in self.stores:
+            store.close()
+        
     def get_events(self, 
                   job_id: Optional[str] = None,
                   event_type: Optional[str] = None,
@@ -1027,6 +1679,301 @@ class MultiAuditStore(AuditStore):
         return self.stores[0].get_event(event_id)
 
 
+class BufferedAuditStore(AuditStore):
+    """
+    Audit store that queues events and writes them in batches on a background thread.
+    
+    Events are written to the wrapped store with store_events once batch_size
+    events are queued or flush_interval seconds have passed, whichever comes
+    first. The queue is bounded: when it is full, store_event blocks for up to
+    put_timeout seconds and then writes the event synchronously, so a slow
+    store slows producers down instead of dropping events or growing memory
+    without limit. Reads flush the queue first, and queued events are flushed
+    when the store is closed or the interpreter exits.
+    """
+    
+    def __init__(self, 
+                 store: AuditStore,
+                 max_queue_size: int = 10000,
+                 batch_size: int = 500,
+                 flush_interval: float = 1.0,
+                 put_timeout: float = 5.0):
+        """
+        Initialize a buffered audit store.
+        
+        Args:
+            store: Store that events are written to
+            max_queue_size: Maximum number of queued events
+            batch_size: Number of events written per batch
+            flush_interval: Maximum time in seconds an event waits in the queue
+            put_timeout: Time in seconds store_event blocks on a full queue before writing synchronously
+        """
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        
+        self.queue = queue.Queue(maxsize=max(1, max_queue_size))
+        self.lock = threading.Lock()
+        self.closed = False
+        
+        self.stats = {
+            'queued': 0,
+            'written': 0,
+            'failed': 0,
+            'batches': 0,
+            'blocked': 0,
+            'synchronous': 0
+        }
+        
+        self.writer_thread = threading.Thread(
+            target=self._run_writer,
+            name='audit-writer',
+            daemon=True
+        )
+        self.writer_thread.start()
+        
+        atexit.register(self.close)
+        
+    def store_event(self, event: AuditEvent) -> bool:
+        """
+        Queue an audit event for writing.
+        
+        Args:
+            event: Event to store
+            
+        Returns:
+            True if the event was queued or stored
+        """
+        if self.closed:
+            return self._write_synchronously([event]) == 1
+            
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            with self.lock:
+                self.stats['blocked'] += 1
+            try:
+                self.queue.put(event, timeout=self.put_timeout)
+            except queue.Full:
+                logger.warning("Audit queue is full, writing event synchronously")
+                return self._write_synchronously([event]) == 1
+                
+        with self.lock:
+            self.stats['queued'] += 1
+        return True
+        
+    def store_events(self, events: List[AuditEvent]) -> int:
+        """
+        Queue a batch of audit events for writing.
+        
+        Args:
+            events: Events to store
+            
+        Returns:
+            Number of events queued or stored
+        """
+        return sum(1 for event in events if self.store_event(event))
+        
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all events queued so far have been written, then flush the wrapped store.
+        
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait indefinitely
+            
+        Returns:
+            True if the queued events were written and flushed within the timeout
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        if not self._drain(timeout):
+            return False
+            
+        return self.store.flush(None if deadline is None else max(0.0, deadline - time.time()))
+        
+    def _drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all events queued so far have been written to the wrapped store."""
+        if self.closed or not self.writer_thread.is_alive():
+            return self.queue.empty()
+            
+        flushed = threading.Event()
+        try:
+            self.queue.put(flushed, timeout=timeout)
+        except queue.Full:
+            return False
+            
+        return flushed.wait(timeout)
+        
+    def close(self):
+        """Write out all queued events and stop the writer thread."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            
+        # The writer drains the queue before it sees the sentinel
+        self.queue.put(None)
+        self.writer_thread.join()
+        
+        # Write anything that raced in behind the sentinel
+        remaining = []
+        waiters = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                remaining.append(item)
+        if remaining:
+            self._write_synchronously(remaining)
+        for waiter in waiters:
+            waiter.set()
+            
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+            
+        self.store.close()
+        
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get writer statistics.
+        
+        Returns:
+            Dictionary with queued, written and failed event counts, batches
+            written, back-pressure waits and the current queue size
+        """
+        with self.lock:
+            stats = dict(self.stats)
+            
+        stats['queue_size'] = self.queue.qsize()
+        stats['max_queue_size'] = self.queue.maxsize
+        return stats
+        
+    def get_events(self, 
+                  job_id: Optional[str] = None,
+                  event_type: Optional[str] = None,
+                  component: Optional[str] = None,
+                  table_name: Optional[str] = None,
+                  start_time: Optional[datetime.datetime] = None,
+                  end_time: Optional[datetime.datetime] = None,
+                  success: Optional[bool] = None,
+                  limit: int = 1000,
+                  offset: int = 0) -> List[AuditEvent]:
+        """
+        Get audit events with filtering, after writing out queued events.
+        
+        Args:
+            job_id: Filter by job ID
+            event_type: Filter by event type
+            component: Filter by component
+            table_name: Filter by table name
+            start_time: Filter for events after this time
+            end_time: Filter for events before this time
+            success: Filter by success status
+            limit: Maximum number of events to return
+            offset: Offset for pagination
+            
+        Returns:
+            List of audit events
+        """
+        self._drain()
+        return self.store.get_events(
+            job_id=job_id,
+            event_type=event_type,
+            component=component,
+            table_name=table_name,
+            start_time=start_time,
+            end_time=end_time,
+            success=success,
+            limit=limit,
+            offset=offset
+        )
+        
+    def get_event(self, event_id: str) -> Optional[AuditEvent]:
+        """
+        Get an audit event by ID, after writing out queued events.
+        
+        Args:
+            event_id: ID of the event to get
+            
+        Returns:
+            AuditEvent if found, None otherwise
+        """
+        self._drain()
+        return self.store.get_event(event_id)
+        
+    def _run_writer(self):
+        """Write queued events in batches until the store is closed."""
+        batch = []
+        waiters = []
+        deadline = None
+        running = True
+        
+        while running:
+            timeout = self.flush_interval if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+                
+            if item is None:
+                # Close sentinel; everything queued before it is in the batch
+                running = False
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not False:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+                
+            # Flush on size, interval, explicit flush or close
+            expired = deadline is not None and time.monotonic() >= deadline
+            if len(batch) >= self.batch_size or expired or waiters or not running:
+                self._write_batch(batch)
+                batch = []
+                deadline = None
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+                
+    def _write_batch(self, events: List[AuditEvent]):
+        """Write a batch of events to the wrapped store."""
+        if not events:
+            return
+            
+        try:
+            stored = self.store.store_events(events)
+        except Exception as e:
+            logger.error(f"Error writing batch of {len(events)} audit events: {str(e)}")
+            stored = 0
+            
+        with self.lock:
+            self.stats['batches'] += 1
+            self.stats['written'] += stored
+            self.stats['failed'] += len(events) - stored
+            
+    def _write_synchronously(self, events: List[AuditEvent]) -> int:
+        """Write events directly to the wrapped store, bypassing the queue."""
+        with self.lock:
+            self.stats['synchronous'] += len(events)
+            
+        try:
+            stored = self.store.store_events(events)
+        except Exception as e:
+            logger.error(f"Error writing audit events: {str(e)}")
+            stored = 0
+            
+        with self.lock:
+            self.stats['written'] += stored
+            self.stats['failed'] += len(events) - stored
+        return stored
+
+
 class AuditSystem:
     """
     Audit system for tracking all sync operations.
@@ -1042,7 +1989,10 @@ class AuditSystem:
                  audit_store: AuditStore = None,
                  engine: Engine = None,
                  audit_level: str = 'standard',
-                 include_data: bool = False):
+                 include_data: bool = False,
+                 buffer_size: int = 0,
+                 flush_batch_size: int = 500,
+                 flush_interval: float = 1.0):
         """
         Initialize the Audit System.
         
@@ -1051,6 +2001,10 @@ class AuditSystem:
             engine: SQLAlchemy engine (for database store)
             audit_level: Level of auditing ('minimal', 'standard', 'detailed')
             include_data: Whether to include record data in audit events
+            buffer_size: Maximum number of events queued for background writing,
+                0 to write every event synchronously
+            flush_batch_size: Number of events written per batch when buffering
+            flush_interval: Maximum time in seconds an event stays queued when buffering
         """
         # Set up audit store
         if audit_store:
@@ -1060,9 +2014,33 @@ class AuditSystem:
         else:
             self.audit_store = InMemoryAuditStore()
             
+        if buffer_size > 0 and not isinstance(self.audit_store, BufferedAuditStore):
+            self.audit_store = BufferedAuditStore(
+                self.audit_store,
+                max_queue_size=buffer_size,
+                batch_size=flush_batch_size,
+                flush_interval=flush_interval
+            )
+            
         self.audit_level = audit_level
         self.include_data = include_data
         
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write out any buffered audit events.
+        
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait indefinitely
+            
+        Returns:
+            True if all buffered events were written
+        """
+        return self.audit_store.flush(timeout)
+        
+    def close(self):
+        """Flush buffered audit events and close the audit store."""
+        self.audit_store.close()
+        
     def log_event(self, 
                  event_type: str,
                  component: str,
@@ -1360,7 +2338,7 @@ class AuditSystem:
         Returns:
             ID of the created event
         """
-        return self.log_event(
+        event_id = self.log_event(
             event_type='job_end',
             component='Orchestrator',
             job_id=job_id,
@@ -1370,6 +2348,10 @@ class AuditSystem:
             error_message=error_message
         )
         
+        # Make the job's audit trail durable before reporting it finished
+        self.flush()
+        return event_id
+        
     def get_job_events(self, 
                       job_id: str,
                       event_types: Optional[List[str]] = None,
@@ -5,6 +5,7 @@ This module is responsible for detecting changes between source and target datab
 It identifies new records, modifications, and deletions using various change detection strategies.
 """
 
+import os
 import logging
 import datetime
 from typing import Dict, List, Any, Tuple, Optional, Set, Union
@@ -20,6 +21,10 @@ from sync_service.data_type_handlers import DataTypeHandler, get_handler_for_col
 
 logger = logging.getLogger(__name__)
 
+# A stored bucket width is chosen again once a table has this many times
+# ``fingerprint_buckets`` buckets at that width
+BUCKET_REGROWTH_FACTOR = 4
+
 
 class ChangeDetector:
     """
@@ -31,6 +36,9 @@ class ChangeDetector:
     - Full content comparison (slowest, most accurate)
     - CDC (Change Data Capture) log-based detection (requires CDC setup)
     - Hash-based comparison (good balance of speed and accuracy)
+    - Streaming hash comparison (constant memory, hashes computed in the database)
+    - Bucket fingerprint comparison (aggregate hashes per key range, rows compared
+      only in buckets that changed)
     """
     
     def __init__(self, 
@@ -39,7 +47,9 @@ class ChangeDetector:
                  batch_size: int = 1000,
                  detection_strategy: str = 'hash',
                  cdc_table_prefix: str = '_cdc',
-                 cdc_enabled: bool = False):
+                 cdc_enabled: bool = False,
+                 fingerprint_directory: str = 'sync_fingerprints',
+                 fingerprint_buckets: int = 1024):
         """
         Initialize the Change Detector.
         
@@ -48,9 +58,12 @@ class ChangeDetector:
             target_engine: SQLAlchemy engine for target database
             batch_size: Number of records to process at once
             detection_strategy: Strategy to use for change detection
-                               ('pk', 'timestamp', 'content', 'cdc', 'hash')
+                               ('pk', 'timestamp', 'content', 'cdc', 'hash', 'stream_hash',
+                                'bucket_hash')
             cdc_table_prefix: Prefix for CDC tables if CDC detection is used
             cdc_enabled: Whether CDC is enabled in the database
+            fingerprint_directory: Directory for storing bucket fingerprints
+            fingerprint_buckets: Approximate number of key range buckets per table
         """
         self.source_engine = source_engine
         self.target_engine = target_engine
@@ -58,6 +71,8 @@ class ChangeDetector:
         self.detection_strategy = detection_strategy
         self.cdc_table_prefix = cdc_table_prefix
         self.cdc_enabled = cdc_enabled
+        self.fingerprint_directory = fingerprint_directory
+        self.fingerprint_buckets = fingerprint_buckets
         
     def detect_changes(self, 
                        table_name: str, 
@@ -86,7 +101,9 @@ class ChangeDetector:
             'timestamp': self._detect_changes_timestamp,
             'content': self._detect_changes_content,
             'cdc': self._detect_changes_cdc,
-            'hash': self._detect_changes_hash
+            'hash': self._detect_changes_hash,
+            'stream_hash': self._detect_changes_stream_hash,
+            'bucket_hash': self._detect_changes_bucket_hash
         }
         return methods.get(self.detection_strategy, self._detect_changes_hash)
     
@@ -186,7 +203,7 @@ class ChangeDetector:
             
             with self.source_engine.connect() as conn:
                 result = conn.execute(new_records_query, {'last_sync_time': last_sync_time})
-                changes['new'] = [dict(row) for row in result]
+                changes['new'] = [dict(row._mapping) for row in result]
             
             # Get modified records (updated after last sync but created before)
             modified_records_query = text(f"""
@@ -198,7 +215,7 @@ class ChangeDetector:
             
             with self.source_engine.connect() as conn:
                 result = conn.execute(modified_records_query, {'last_sync_time': last_sync_time})
-                changes['modified'] = [dict(row) for row in result]
+                changes['modified'] = [dict(row._mapping) for row in result]
             
             # For deleted records, still need to use PK comparison
             source_pks = self._get_primary_key_values(self.source_engine, table_name, primary_keys)
@@ -366,6 +383,366 @@ class ChangeDetector:
             # Fall back to primary key comparison as a last resort
             return self._detect_changes_pk(table_name, primary_keys, columns, last_sync_time)
     
+    def _detect_changes_stream_hash(self, 
+                                  table_name: str, 
+                                  primary_keys: List[str], 
+                                  columns: List[str],
+                                  last_sync_time: Optional[datetime.datetime] = None) -> Dict[str, Any]:
+        """
+        Detect changes by merge-joining streamed primary key/hash pairs.
+        
+        Both tables are read in primary key order over server-side cursors, with
+        row hashes computed in the database where possible. Only the key/hash
+        streams are compared, in constant memory, and full rows are fetched
+        afterwards for the keys that actually differ.
+        """
+        changes = {
+            'new': [],
+            'modified': [],
+            'deleted': []
+        }
+        
+        try:
+            new_pks, modified_pks, deleted_pks = self._merge_hash_streams(
+                table_name, primary_keys, columns)
+            
+            logger.info(
+                f"Streaming hash comparison for {table_name}: {len(new_pks)} new, "
+                f"{len(modified_pks)} modified, {len(deleted_pks)} deleted"
+            )
+            
+            if new_pks:
+                changes['new'] = self._fetch_records_by_pk_tuples(
+                    self.source_engine, table_name, primary_keys, columns, new_pks)
+            if modified_pks:
+                changes['modified'] = self._fetch_records_by_pk_tuples(
+                    self.source_engine, table_name, primary_keys, columns, modified_pks)
+            if deleted_pks:
+                changes['deleted'] = self._fetch_records_by_pk_tuples(
+                    self.target_engine, table_name, primary_keys, columns, deleted_pks)
+                
+            return changes
+            
+        except Exception as e:
+            logger.error(f"Error detecting changes using streaming hash strategy for table {table_name}: {str(e)}")
+            # Fall back to the in-memory hash comparison
+            return self._detect_changes_hash(table_name, primary_keys, columns, last_sync_time)
+    
+    def _detect_changes_bucket_hash(self, 
+                                  table_name: str, 
+                                  primary_keys: List[str], 
+                                  columns: List[str],
+                                  last_sync_time: Optional[datetime.datetime] = None) -> Dict[str, Any]:
+        """
+        Detect changes by comparing per-bucket fingerprints before comparing rows.
+        
+        The table is partitioned into fixed primary key ranges (buckets). One
+        aggregate query per side computes a row count and an aggregate hash for
+        every bucket; only buckets whose fingerprints differ are descended into
+        with a streaming row-level comparison. Requires PostgreSQL on both sides
+        and a single integer primary key, otherwise falls back to the streaming
+        hash strategy.
+        """
+        if not self._supports_bucket_fingerprints(table_name, primary_keys):
+            logger.info(f"Bucket fingerprints not supported for {table_name}, using streaming hash comparison")
+            return self._detect_changes_stream_hash(table_name, primary_keys, columns, last_sync_time)
+        
+        changes = {
+            'new': [],
+            'modified': [],
+            'deleted': []
+        }
+        
+        try:
+            pk = primary_keys[0]
+            stored = self._load_fingerprints(table_name)
+            bucket_width = stored.get('bucket_width') or self._choose_bucket_width(table_name, pk) or 1
+            
+            source_buckets = self._get_bucket_fingerprints(
+                self.source_engine, table_name, pk, columns, bucket_width)
+            target_buckets = self._get_bucket_fingerprints(
+                self.target_engine, table_name, pk, columns, bucket_width)
+            
+            all_buckets = set(source_buckets) | set(target_buckets)
+            changed_buckets = sorted(
+                bucket for bucket in all_buckets
+                if source_buckets.get(bucket) != target_buckets.get(bucket)
+            )
+            
+            logger.info(
+                f"Bucket fingerprints for {table_name}: {len(changed_buckets)} of "
+                f"{len(source_buckets)} buckets changed (width {bucket_width})"
+            )
+            
+            new_pks = []
+            modified_pks = []
+            deleted_pks = []
+            
+            for bucket in changed_buckets:
+                where_clause = f"{pk} >= :range_start AND {pk} < :range_end"
+                params = {
+                    'range_start': bucket * bucket_width,
+                    'range_end': (bucket + 1) * bucket_width
+                }
+                source_stream = self._stream_pk_hashes(
+                    self.source_engine, table_name, primary_keys, columns, True, where_clause, params)
+                target_stream = self._stream_pk_hashes(
+                    self.target_engine, table_name, primary_keys, columns, True, where_clause, params)
+                
+                bucket_new, bucket_modified, bucket_deleted = self._merge_sorted_streams(
+                    source_stream, target_stream)
+                new_pks.extend(bucket_new)
+                modified_pks.extend(bucket_modified)
+                deleted_pks.extend(bucket_deleted)
+                
+            if new_pks:
+                changes['new'] = self._fetch_records_by_pk_tuples(
+                    self.source_engine, table_name, primary_keys, columns, new_pks)
+            if modified_pks:
+                changes['modified'] = self._fetch_records_by_pk_tuples(
+                    self.source_engine, table_name, primary_keys, columns, modified_pks)
+            if deleted_pks:
+                changes['deleted'] = self._fetch_records_by_pk_tuples(
+                    self.target_engine, table_name, primary_keys, columns, deleted_pks)
+                
+            # Keep the width unless the key range has outgrown it; tables that
+            # are still empty get a width once they have rows
+            if len(all_buckets) > self.fingerprint_buckets * BUCKET_REGROWTH_FACTOR:
+                logger.info(f"Key range of {table_name} outgrew bucket width {bucket_width}, choosing a new width")
+                bucket_width = self._choose_bucket_width(table_name, pk)
+            elif not all_buckets:
+                bucket_width = None
+                
+            if bucket_width:
+                self._save_fingerprints(table_name, {
+                    'bucket_width': bucket_width,
+                    'columns': columns,
+                    'changed_buckets': len(changed_buckets),
+                    'updated_at': datetime.datetime.utcnow().isoformat()
+                })
+            
+            return changes
+            
+        except Exception as e:
+            logger.error(f"Error detecting changes using bucket hash strategy for table {table_name}: {str(e)}")
+            # Fall back to the row-level streaming comparison
+            return self._detect_changes_stream_hash(table_name, primary_keys, columns, last_sync_time)
+    
+    def _supports_bucket_fingerprints(self, table_name: str, primary_keys: List[str]) -> bool:
+        """Check whether a table can be partitioned into integer key range buckets."""
+        if len(primary_keys) != 1:
+            return False
+        if self.source_engine.dialect.name != 'postgresql' or self.target_engine.dialect.name != 'postgresql':
+            return False
+            
+        query = text("""
+            SELECT data_type
+            FROM information_schema.columns
+            WHERE table_name = :table_name AND column_name = :column_name
+        """)
+        with self.source_engine.connect() as conn:
+            data_type = conn.execute(query, {
+                'table_name': table_name,
+                'column_name': primary_keys[0]
+            }).scalar()
+            
+        return data_type in ('smallint', 'integer', 'bigint')
+    
+    def _choose_bucket_width(self, table_name: str, pk: str) -> int:
+        """
+        Choose a key range width giving roughly ``fingerprint_buckets`` buckets.
+        
+        The width is persisted with the fingerprints so bucket boundaries stay
+        stable between runs, until the key range grows ``BUCKET_REGROWTH_FACTOR``
+        times past it.
+        
+        Returns:
+            Bucket width, or None if both tables are empty
+        """
+        query = text(f"SELECT MIN({pk}), MAX({pk}) FROM {table_name}")
+        
+        low, high = None, None
+        for engine in (self.source_engine, self.target_engine):
+            with engine.connect() as conn:
+                row = conn.execute(query).fetchone()
+            if row is None or row[0] is None:
+                continue
+            low = row[0] if low is None else min(low, row[0])
+            high = row[1] if high is None else max(high, row[1])
+            
+        if low is None:
+            return None
+            
+        return max(1, -(-(high - low + 1) // self.fingerprint_buckets))
+    
+    def _get_bucket_fingerprints(self, engine: Engine, table_name: str, pk: str,
+                               columns: List[str], bucket_width: int) -> Dict[int, Tuple[int, str]]:
+        """
+        Compute (row count, aggregate hash) for every key range bucket in one query.
+        
+        Returns:
+            Dictionary mapping bucket number to its (count, hash) fingerprint
+        """
+        row_expr = ", ".join(columns)
+        query = text(f"""
+            SELECT floor({pk}::numeric / :bucket_width)::bigint AS bucket,
+                   COUNT(*) AS row_count,
+                   md5(string_agg(md5(ROW({row_expr})::text), '' ORDER BY {pk})) AS bucket_hash
+            FROM {table_name}
+            GROUP BY 1
+        """)
+        
+        with engine.connect() as conn:
+            result = conn.execute(query, {'bucket_width': bucket_width})
+            return {row[0]: (row[1], row[2]) for row in result}
+    
+    def _fingerprint_path(self, table_name: str) -> str:
+        """Get the path of the fingerprint file for a table."""
+        return os.path.join(self.fingerprint_directory, f"{table_name}.json")
+    
+    def _load_fingerprints(self, table_name: str) -> Dict[str, Any]:
+        """Load the bucket layout stored by the last bucket comparison of a table."""
+        try:
+            with open(self._fingerprint_path(table_name), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable fingerprints for table {table_name}: {str(e)}")
+            return {}
+    
+    def _save_fingerprints(self, table_name: str, fingerprints: Dict[str, Any]):
+        """Store the bucket layout of a table for the next comparison.
+        
+        Only the bucket width is reused; fingerprints themselves are always
+        recomputed on both sides, since either may have changed since.
+        """
+        try:
+            os.makedirs(self.fingerprint_directory, exist_ok=True)
+            temp_path = self._fingerprint_path(table_name) + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(fingerprints, f)
+            os.replace(temp_path, self._fingerprint_path(table_name))
+        except Exception as e:
+            logger.error(f"Error saving fingerprints for table {table_name}: {str(e)}")
+    
+    def _merge_hash_streams(self, 
+                          table_name: str, 
+                          primary_keys: List[str], 
+                          columns: List[str]) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        """
+        Merge-join the source and target primary key/hash streams.
+        
+        Returns:
+            Tuple of (new_pks, modified_pks, deleted_pks) as lists of primary key tuples
+            
+        Raises:
+            ValueError: If either stream is not in ascending primary key order
+        """
+        # Database-side hashes are only comparable if both sides compute them the same way
+        in_database = (
+            self.source_engine.dialect.name == 'postgresql' and
+            self.target_engine.dialect.name == 'postgresql'
+        )
+        
+        source_stream = self._stream_pk_hashes(
+            self.source_engine, table_name, primary_keys, columns, in_database)
+        target_stream = self._stream_pk_hashes(
+            self.target_engine, table_name, primary_keys, columns, in_database)
+        
+        return self._merge_sorted_streams(source_stream, target_stream)
+    
+    def _merge_sorted_streams(self, source_stream, target_stream) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        """
+        Merge-join two (primary key, hash) streams sorted by primary key.
+        
+        Returns:
+            Tuple of (new_pks, modified_pks, deleted_pks) as lists of primary key tuples
+        """
+        new_pks = []
+        modified_pks = []
+        deleted_pks = []
+        
+        source_item = next(source_stream, None)
+        target_item = next(target_stream, None)
+        
+        while source_item is not None or target_item is not None:
+            if target_item is None or (source_item is not None and source_item[0] < target_item[0]):
+                new_pks.append(source_item[0])
+                source_item = next(source_stream, None)
+            elif source_item is None or target_item[0] < source_item[0]:
+                deleted_pks.append(target_item[0])
+                target_item = next(target_stream, None)
+            else:
+                if source_item[1] != target_item[1]:
+                    modified_pks.append(source_item[0])
+                source_item = next(source_stream, None)
+                target_item = next(target_stream, None)
+                
+        return new_pks, modified_pks, deleted_pks
+    
+    def _stream_pk_hashes(self, 
+                        engine: Engine, 
+                        table_name: str, 
+                        primary_keys: List[str], 
+                        columns: List[str],
+                        in_database: bool,
+                        where_clause: str = None,
+                        params: Dict[str, Any] = None):
+        """
+        Yield (primary key tuple, row hash) pairs in ascending primary key order.
+        
+        Rows are read over a server-side cursor in batches of ``batch_size``. With
+        ``in_database`` the hash is computed by PostgreSQL and only keys and hashes
+        cross the wire; otherwise each row is hashed here and discarded immediately.
+        An optional ``where_clause`` restricts the stream, e.g. to a key range.
+        """
+        pk_select = ", ".join(primary_keys)
+        where_sql = f"WHERE {where_clause}" if where_clause else ""
+        
+        if in_database:
+            row_expr = ", ".join(columns)
+            query = text(f"""
+                SELECT {pk_select}, md5(ROW({row_expr})::text) AS row_hash
+                FROM {table_name}
+                {where_sql}
+                ORDER BY {pk_select}
+            """)
+        else:
+            query = text(f"""
+                SELECT {', '.join(columns)}
+                FROM {table_name}
+                {where_sql}
+                ORDER BY {pk_select}
+            """)
+            
+        previous_pk = None
+        
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(query, params or {})
+            
+            while True:
+                rows = result.fetchmany(self.batch_size)
+                if not rows:
+                    break
+                    
+                for row in rows:
+                    row = dict(row._mapping) if hasattr(row, '_mapping') else dict(row)
+                    pk = tuple(row[key] for key in primary_keys)
+                    
+                    # The merge join is only correct if both sides agree on key order
+                    if previous_pk is not None and not previous_pk < pk:
+                        raise ValueError(
+                            f"Primary key order of {table_name} does not match Python ordering "
+                            f"({previous_pk!r} before {pk!r})"
+                        )
+                    previous_pk = pk
+                    
+                    if in_database:
+                        yield pk, row['row_hash']
+                    else:
+                        yield pk, self._calculate_record_hash(row)
+    
     def _get_primary_key_values(self, engine: Engine, table_name: str, primary_keys: List[str]) -> Set[str]:
         """Get all primary key values from a table as a set of strings."""
         pk_select = ", ".join(primary_keys)
@@ -426,17 +803,49 @@ class ChangeDetector:
             query = text(f"SELECT {', '.join(columns)} FROM {table_name} WHERE {where_clause}")
             with engine.connect() as conn:
                 result = conn.execute(query, params)
-                batch_records = [dict(row) for row in result]
+                batch_records = [dict(row._mapping) for row in result]
                 result_records.extend(batch_records)
         
         return result_records
     
+    def _fetch_records_by_pk_tuples(self, engine: Engine, table_name: str,
+                                  primary_keys: List[str], columns: List[str],
+                                  pk_tuples: List[tuple]) -> List[Dict[str, Any]]:
+        """Get full records for a list of primary key tuples, preserving key types."""
+        result_records = []
+        
+        for i in range(0, len(pk_tuples), self.batch_size):
+            batch = pk_tuples[i:i+self.batch_size]
+            
+            if len(primary_keys) == 1:
+                query = text(
+                    f"SELECT {', '.join(columns)} FROM {table_name} WHERE {primary_keys[0]} IN :pk_values"
+                ).bindparams(sa.bindparam('pk_values', expanding=True))
+                params = {'pk_values': [pk[0] for pk in batch]}
+            else:
+                conditions = []
+                params = {}
+                for j, pk_tuple in enumerate(batch):
+                    condition_parts = []
+                    for k, key in enumerate(primary_keys):
+                        param_name = f"pk{j}_{k}"
+                        condition_parts.append(f"{key} = :{param_name}")
+                        params[param_name] = pk_tuple[k]
+                    conditions.append(f"({' AND '.join(condition_parts)})")
+                query = text(f"SELECT {', '.join(columns)} FROM {table_name} WHERE {' OR '.join(conditions)}")
+                
+            with engine.connect() as conn:
+                result = conn.execute(query, params)
+                result_records.extend(dict(row._mapping) for row in result)
+                
+        return result_records
+    
     def _get_all_records(self, engine: Engine, table_name: str, columns: List[str]) -> List[Dict[str, Any]]:
         """Get all records from a table."""
         query = text(f"SELECT {', '.join(columns)} FROM {table_name}")
         with engine.connect() as conn:
             result = conn.execute(query)
-            return [dict(row) for row in result]
+            return [dict(row._mapping) for row in result]
     
     def _get_records_with_hashes(self, engine: Engine, table_name: str, 
                                primary_keys: List[str], columns: List[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
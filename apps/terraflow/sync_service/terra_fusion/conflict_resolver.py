@@ -10,12 +10,14 @@ import datetime
 import json
 from typing import Dict, List, Any, Tuple, Optional, Union, Set, Callable
 
+import numpy as np
+import pandas as pd
 import sqlalchemy as sa
 from sqlalchemy.sql import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.engine import Engine, Connection
 
-from sync_service.data_type_handlers import DataTypeHandler, get_handler_for_column
+from sync_service.terra_fusion.data_type_handlers import DateTimeHandler, get_handler_for_column
 
 logger = logging.getLogger(__name__)
 
@@ -483,6 +485,103 @@ class Conflict:
         )
 
 
+class ConflictFrame:
+    """
+    Conflicting rows of a table, detected in one pass over aligned frames.
+    
+    The source and target frames hold only the conflicting rows and are
+    indexed by the primary key columns. The differences frame has the same
+    shape and marks the fields that differ, or with a base frame the fields
+    that changed on both sides.
+    """
+    
+    def __init__(self, 
+                 table_name: str,
+                 primary_keys: List[str],
+                 source: pd.DataFrame,
+                 target: pd.DataFrame,
+                 differences: pd.DataFrame,
+                 source_columns: Set[str],
+                 target_columns: Set[str],
+                 auto_merged: Optional[pd.DataFrame] = None):
+        """
+        Initialize a conflict frame.
+        
+        Args:
+            table_name: Name of the table
+            primary_keys: List of primary key columns
+            source: Conflicting source rows, indexed by primary key
+            target: Conflicting target rows, indexed by primary key
+            differences: Boolean frame marking the conflicting fields
+            source_columns: Columns present in the source frame
+            target_columns: Columns present in the target frame
+            auto_merged: Rows that differ but merge cleanly against the base
+                frame, with source changes applied over the target, if a base
+                frame was given
+        """
+        self.table_name = table_name
+        self.primary_keys = primary_keys
+        self.source = source
+        self.target = target
+        self.differences = differences
+        self.source_columns = source_columns
+        self.target_columns = target_columns
+        self.auto_merged = auto_merged
+        
+    def __len__(self) -> int:
+        """Get the number of conflicting rows."""
+        return len(self.source)
+        
+    def to_conflicts(self) -> List[Conflict]:
+        """
+        Convert the conflicting rows to Conflict objects.
+        
+        Returns:
+            List of conflicts, in row order
+        """
+        source_records = _frame_to_records(self.source, self.source_columns)
+        target_records = _frame_to_records(self.target, self.target_columns)
+        columns = list(self.differences.columns)
+        
+        conflicts = []
+        for source_record, target_record, differs in zip(
+                source_records, target_records, self.differences.to_numpy()):
+            pk_values = {pk: source_record.get(pk) for pk in self.primary_keys}
+            differences = {
+                column: (source_record.get(column), target_record.get(column))
+                for column, differ in zip(columns, differs) if differ
+            }
+            conflict_id = f"{self.table_name}_{'.'.join(f'{pk}={pk_values[pk]}' for pk in sorted(pk_values.keys()))}"
+            
+            conflicts.append(Conflict(
+                conflict_id=conflict_id,
+                table_name=self.table_name,
+                primary_key_values=pk_values,
+                source_record=source_record,
+                target_record=target_record,
+                differences=differences,
+                status='pending'
+            ))
+            
+        return conflicts
+
+
+def _frame_to_records(frame: pd.DataFrame, columns: Set[str]) -> List[Dict[str, Any]]:
+    """
+    Convert a frame indexed by primary key to records, with missing values as None.
+    
+    Args:
+        frame: Frame to convert
+        columns: Columns to include besides the primary keys
+        
+    Returns:
+        List of records
+    """
+    frame = frame[[column for column in frame.columns if column in columns]].reset_index()
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict('records')
+
+
 class ConflictResolver:
     """
     Detects and resolves conflicts between source and target databases.
@@ -680,6 +779,345 @@ class ConflictResolver:
             
         return results
         
+    def detect_conflicts_frame(self, 
+                              source_df: pd.DataFrame,
+                              target_df: pd.DataFrame,
+                              table_name: str,
+                              primary_keys: List[str],
+                              timestamp_field: str = 'updated_at',
+                              base_df: Optional[pd.DataFrame] = None,
+                              column_types: Optional[Dict[str, str]] = None) -> ConflictFrame:
+        """
+        Detect conflicts between many source and target records at once.
+        
+        Rows are aligned on the primary key columns and compared column by
+        column: values that are equal or both missing are settled with
+        vectorized comparisons, and only the remaining values are checked with
+        the geometry, JSON or date/time handler for the column, or with the
+        same rules as detect_conflicts. Without a base frame, a row is a
+        conflict if any field differs and the source timestamp is not newer
+        than the target timestamp. With a base frame (the last synchronized
+        version of each row), a row is a conflict only if some field changed
+        on both sides to different values; rows where only one side changed a
+        field are returned as auto_merged.
+        
+        Conflicts are not registered; use ConflictFrame.to_conflicts for that.
+        
+        Args:
+            source_df: Records from source database
+            target_df: Records from target database
+            table_name: Name of the table
+            primary_keys: List of primary key columns
+            timestamp_field: Name of the timestamp field for conflict detection
+            base_df: Optional common ancestor records for three-way detection
+            column_types: Optional mapping of column names to SQL types used
+                to pick data type handlers; column names are used otherwise
+            
+        Returns:
+            ConflictFrame with the conflicting rows
+        """
+        source_columns = set(source_df.columns)
+        target_columns = set(target_df.columns)
+        columns = [
+            column for column in list(source_df.columns) + [c for c in target_df.columns if c not in source_columns]
+            if column not in primary_keys
+        ]
+        
+        source = self._index_frame(source_df, primary_keys)
+        target = self._index_frame(target_df, primary_keys)
+        common = source.index.intersection(target.index)
+        source = source.reindex(index=common, columns=columns)
+        target = target.reindex(index=common, columns=columns)
+        
+        differences = self._difference_mask(source, target, column_types)
+        auto_merged = None
+        
+        if base_df is not None:
+            base = self._index_frame(base_df, primary_keys).reindex(index=common, columns=columns)
+            source_changed = self._difference_mask(source, base, column_types)
+            target_changed = self._difference_mask(target, base, column_types)
+            both_changed = differences & source_changed & target_changed
+            
+            conflict_rows = both_changed.any(axis=1)
+            clean_rows = differences.any(axis=1) & ~conflict_rows
+            differences = both_changed
+            
+            # Apply the source's changes over the target
+            auto_merged = target[clean_rows].where(~source_changed[clean_rows], source[clean_rows])
+            auto_merged = auto_merged.reset_index()
+        else:
+            conflict_rows = differences.any(axis=1)
+            
+            # If source is newer, this is a simple update, not a conflict
+            if timestamp_field in source_columns and timestamp_field in target_columns:
+                conflict_rows &= ~(self._compare_timestamps(source[timestamp_field], target[timestamp_field]) > 0)
+                
+        frame = ConflictFrame(
+            table_name=table_name,
+            primary_keys=primary_keys,
+            source=source[conflict_rows],
+            target=target[conflict_rows],
+            differences=differences[conflict_rows],
+            source_columns=source_columns,
+            target_columns=target_columns,
+            auto_merged=auto_merged
+        )
+        
+        logger.info(f"Detected {len(frame)} conflicts in {len(common)} matched rows of {table_name}")
+        return frame
+        
+    def resolve_conflict_frame(self, 
+                               frame: ConflictFrame,
+                               strategy_name: str = None,
+                               context: Dict[str, Any] = None) -> pd.DataFrame:
+        """
+        Resolve all conflicts in a conflict frame using the specified strategy.
+        
+        Source-wins, target-wins, newer-wins and merge strategies are applied
+        as column-wise selects over the whole frame. Other strategies, such as
+        AI and custom strategies, are applied record by record through
+        resolve_conflict, and those conflicts are registered.
+        
+        Args:
+            frame: Conflicts to resolve
+            strategy_name: Name of the strategy to use, or None to use default
+            context: Additional context for resolution
+            
+        Returns:
+            Resolved records, with the primary key columns
+        """
+        # Use default if no strategy specified
+        strategy_name = strategy_name or self.default_strategy
+        
+        # Get the strategy
+        strategy = self.strategies.get(strategy_name)
+        if not strategy:
+            logger.warning(f"Unknown resolution strategy '{strategy_name}', using default")
+            strategy_name = self.default_strategy
+            strategy = self.strategies.get(strategy_name)
+            
+        source, target = frame.source, frame.target
+        
+        if isinstance(strategy, SourceWinsStrategy):
+            resolved = source.copy()
+        elif isinstance(strategy, TargetWinsStrategy):
+            resolved = target.copy()
+        elif isinstance(strategy, NewerWinsStrategy):
+            use_source = self._source_preferred(frame, strategy.timestamp_field)
+            resolved = self._select_rows(use_source, source, target)
+        elif isinstance(strategy, MergeStrategy):
+            timestamp_field = context.get('timestamp_field', 'updated_at') if context else 'updated_at'
+            resolved = self._merge_frame(frame, strategy, timestamp_field)
+        else:
+            # Strategies without a column-wise form resolve record by record
+            records = []
+            for conflict in frame.to_conflicts():
+                self.conflicts[conflict.conflict_id] = conflict
+                records.append(self.resolve_conflict(conflict, strategy_name, dict(context or {})))
+            return pd.DataFrame(records)
+            
+        if self.store_conflicts:
+            logger.info(f"Resolved {len(frame)} conflicts for table {frame.table_name} using {strategy_name}")
+            
+        return resolved.reset_index()
+        
+    def _index_frame(self, frame: pd.DataFrame, primary_keys: List[str]) -> pd.DataFrame:
+        """Index a frame by its primary key columns, keeping the last of duplicate keys."""
+        frame = frame.set_index(primary_keys)
+        if frame.index.has_duplicates:
+            logger.warning("Duplicate primary keys in conflict detection input, using the last row for each key")
+            frame = frame[~frame.index.duplicated(keep='last')]
+        return frame
+        
+    def _difference_mask(self, 
+                         source: pd.DataFrame,
+                         target: pd.DataFrame,
+                         column_types: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Compute which fields differ between two aligned frames.
+        
+        Args:
+            source: Source frame
+            target: Target frame with the same index and columns
+            column_types: Optional mapping of column names to SQL types
+            
+        Returns:
+            Boolean frame marking the differing fields
+        """
+        column_types = column_types or {}
+        return pd.DataFrame({
+            column: self._column_differs(source[column], target[column], column, column_types.get(column))
+            for column in source.columns
+        }, index=source.index, columns=source.columns)
+        
+    def _column_differs(self, 
+                        source: pd.Series,
+                        target: pd.Series,
+                        field_name: str,
+                        column_type: Optional[str] = None) -> np.ndarray:
+        """
+        Compute which values of a column differ.
+        
+        Args:
+            source: Source values
+            target: Target values, aligned with the source values
+            field_name: Name of the column
+            column_type: Optional SQL type of the column
+            
+        Returns:
+            Boolean array marking the differing values
+        """
+        source_null = source.isna().to_numpy()
+        target_null = target.isna().to_numpy()
+        differs = source_null != target_null
+        both = ~(source_null | target_null)
+        if not both.any():
+            return differs
+            
+        handler = get_handler_for_column(column_type or field_name)
+        
+        # Datetime columns compare with second precision
+        if (pd.api.types.is_datetime64_any_dtype(source) and pd.api.types.is_datetime64_any_dtype(target)
+                and (handler is None or isinstance(handler, DateTimeHandler))):
+            try:
+                if handler is None:
+                    # Same one-second tolerance as _values_differ
+                    delta = (source - target).abs() > pd.Timedelta(seconds=1)
+                else:
+                    delta = source.dt.floor('s') != target.dt.floor('s')
+                return differs | (both & delta.to_numpy())
+            except (TypeError, ValueError):
+                pass
+                
+        if (handler is None and pd.api.types.is_numeric_dtype(source) and pd.api.types.is_numeric_dtype(target)
+                and not pd.api.types.is_bool_dtype(source) and not pd.api.types.is_bool_dtype(target)):
+            delta = (source.astype(float) - target.astype(float)).abs().to_numpy() > 1e-10
+            return differs | (both & delta)
+            
+        # Equal values never differ; only the rest need the type-aware check
+        candidates = both & ~self._equal_values(source.to_numpy(dtype=object), target.to_numpy(dtype=object))
+        for position in np.flatnonzero(candidates):
+            value1 = source.iat[position]
+            value2 = target.iat[position]
+            if handler is not None:
+                differs[position] = handler.values_differ(value1, value2)
+            else:
+                differs[position] = self._values_differ(value1, value2, field_name)
+                
+        return differs
+        
+    def _equal_values(self, values1: np.ndarray, values2: np.ndarray) -> np.ndarray:
+        """Compare two object arrays element by element."""
+        try:
+            equal = values1 == values2
+            if isinstance(equal, np.ndarray) and equal.shape == values1.shape and equal.dtype == bool:
+                return equal
+        except (TypeError, ValueError):
+            pass
+            
+        # Values such as arrays do not compare to a single boolean
+        equal = np.zeros(len(values1), dtype=bool)
+        for position, (value1, value2) in enumerate(zip(values1, values2)):
+            try:
+                equal[position] = bool(value1 == value2)
+            except (TypeError, ValueError):
+                equal[position] = False
+        return equal
+        
+    def _compare_timestamps(self, source: pd.Series, target: pd.Series) -> pd.Series:
+        """
+        Compare source and target timestamps row by row.
+        
+        Args:
+            source: Source timestamps
+            target: Target timestamps
+            
+        Returns:
+            Series with 1 where the source is newer, 0 where equal, -1 where
+            older and NaN where either timestamp is missing or unparseable
+        """
+        try:
+            source_ts = self._to_datetime_series(source)
+            target_ts = self._to_datetime_series(target)
+            return np.sign((source_ts - target_ts) / pd.Timedelta(microseconds=1))
+        except (TypeError, ValueError):
+            pass
+            
+        # Mixed time zones cannot be converted together; compare pairwise
+        def compare(value1, value2):
+            if not isinstance(value1, datetime.datetime):
+                value1 = self._parse_timestamp(value1)
+            if not isinstance(value2, datetime.datetime):
+                value2 = self._parse_timestamp(value2)
+            if value1 is None or value2 is None:
+                return np.nan
+            try:
+                return float((value1 > value2) - (value1 < value2))
+            except TypeError:
+                return np.nan
+                
+        return pd.Series([compare(v1, v2) for v1, v2 in zip(source, target)], index=source.index, dtype=float)
+        
+    def _to_datetime_series(self, series: pd.Series) -> pd.Series:
+        """Convert timestamps to a datetime series, with NaT where they cannot be parsed."""
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+            
+        parsed = series.map(
+            lambda value: value if isinstance(value, datetime.datetime) else self._parse_timestamp(value)
+        )
+        return pd.to_datetime(parsed)
+        
+    def _source_preferred(self, frame: ConflictFrame, timestamp_field: str) -> np.ndarray:
+        """
+        Get the rows where the source record is not older than the target record.
+        
+        Like NewerWinsStrategy, the source is preferred when the timestamp
+        field is missing from either side or cannot be parsed.
+        """
+        if timestamp_field not in frame.source_columns or timestamp_field not in frame.target_columns:
+            return np.ones(len(frame), dtype=bool)
+            
+        order = self._compare_timestamps(frame.source[timestamp_field], frame.target[timestamp_field])
+        return (order.isna() | (order >= 0)).to_numpy()
+        
+    def _select_rows(self, use_source: np.ndarray, source: pd.DataFrame, target: pd.DataFrame) -> pd.DataFrame:
+        """Take whole rows from the source where use_source is set and from the target elsewhere."""
+        condition = np.repeat(use_source[:, np.newaxis], len(source.columns), axis=1)
+        return source.astype(object).where(condition, target.astype(object))
+        
+    def _merge_frame(self, frame: ConflictFrame, strategy: MergeStrategy, timestamp_field: str) -> pd.DataFrame:
+        """
+        Apply a merge strategy's field rules column by column.
+        
+        Args:
+            frame: Conflicts to resolve
+            strategy: Merge strategy with field rules
+            timestamp_field: Name of the timestamp field for 'newer' rules
+            
+        Returns:
+            Merged records, indexed by primary key
+        """
+        source, target = frame.source, frame.target
+        merged = source.astype(object)
+        use_source = None
+        
+        for column in source.columns:
+            rule = strategy.field_rules.get(column, strategy.default_rule)
+            
+            if rule == 'target':
+                if column in frame.target_columns:
+                    merged[column] = target[column].astype(object)
+            elif rule == 'newer':
+                if column in frame.target_columns:
+                    if use_source is None:
+                        use_source = self._source_preferred(frame, timestamp_field)
+                    merged[column] = np.where(use_source, source[column].astype(object), target[column].astype(object))
+            elif rule == 'non_null':
+                merged[column] = source[column].astype(object).where(source[column].notna(), target[column].astype(object))
+                
+        return merged
+        
     def get_conflicts(self, 
                     table_name: Optional[str] = None, 
                     status: Optional[str] = None) -> List[Conflict]:
@@ -26,6 +26,7 @@ from sync_service.terra_fusion.validator import Validator
 from sync_service.terra_fusion.conflict_resolver import ConflictResolver
 from sync_service.terra_fusion.audit_system import AuditSystem
 from sync_service.data_type_handlers import DataTypeHandler, get_handler_for_column
+from sync_service.table_dependency_graph import TableDependencyGraph
 
 logger = logging.getLogger(__name__)
 
@@ -159,6 +160,22 @@ class SyncOperation:
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
         
+    def to_compact(self) -> List[Any]:
+        """
+        Convert a finished operation to a compact journal representation.
+        
+        Only the fields needed for reporting are kept; records and record IDs
+        are dropped so finished operations cost a few bytes each.
+        """
+        return [
+            self.operation_id,
+            self.table_name,
+            self.operation_type,
+            self.status,
+            self.retry_count,
+            len(self.record_ids)
+        ]
+        
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'SyncOperation':
         """
@@ -199,7 +216,12 @@ class SyncState:
                  created_at: datetime.datetime = None,
                  updated_at: datetime.datetime = None,
                  start_time: datetime.datetime = None,
-                 end_time: datetime.datetime = None):
+                 end_time: datetime.datetime = None,
+                 apply_mode: str = 'row',
+                 completed_operations: Dict[str, Dict[str, Dict[str, int]]] = None,
+                 max_parallel_tables: int = None,
+                 table_checkpoints: Dict[str, Dict[str, Any]] = None,
+                 journal_sequence: int = 0):
         """
         Initialize sync state.
         
@@ -216,6 +238,13 @@ class SyncState:
             updated_at: Last update timestamp
             start_time: Job start timestamp
             end_time: Job end timestamp
+            apply_mode: How changes are applied to the target ('row' or 'bulk')
+            completed_operations: Counts of completed operations and records
+                by table name and operation type
+            max_parallel_tables: Maximum number of tables synchronized at once for
+                this job, or None to use the orchestrator default
+            table_checkpoints: Checkpoint data for each table by table name
+            journal_sequence: Sequence number of the last journaled save
         """
         self.job_id = job_id
         self.source_connection = source_connection
@@ -239,31 +268,160 @@ class SyncState:
         self.updated_at = updated_at or self.created_at
         self.start_time = start_time
         self.end_time = end_time
+        self.apply_mode = apply_mode
+        self.completed_operations = completed_operations or {}
+        self.max_parallel_tables = max_parallel_tables
+        self.table_checkpoints = table_checkpoints or {}
+        self.journal_sequence = journal_sequence
+        
+        # Journal entries recorded since the last save
+        self.pending_journal = []
         
     def add_operation(self, operation: SyncOperation):
         """
         Add a sync operation to the state.
         
+        Operations that are already completed are only counted, not kept.
+        
         Args:
             operation: The operation to add
         """
-        self.operations[operation.operation_id] = operation
+        if operation.status == 'completed':
+            self._complete_operation(operation)
+        else:
+            self.operations[operation.operation_id] = operation
+            self.pending_journal.append({'type': 'operation', 'operation': operation.to_dict()})
         self.updated_at = datetime.datetime.utcnow()
         
     def update_operation(self, operation_id: str, **kwargs):
         """
         Update an existing operation.
         
+        Operations updated to 'completed' are released from memory and only
+        counted in ``completed_operations``.
+        
         Args:
             operation_id: ID of the operation to update
             **kwargs: Attributes to update
         """
         if operation_id in self.operations:
+            operation = self.operations[operation_id]
             for key, value in kwargs.items():
-                setattr(self.operations[operation_id], key, value)
-            self.operations[operation_id].updated_at = datetime.datetime.utcnow()
+                setattr(operation, key, value)
+            operation.updated_at = datetime.datetime.utcnow()
             self.updated_at = datetime.datetime.utcnow()
             
+            if operation.status == 'completed':
+                del self.operations[operation_id]
+                self._complete_operation(operation)
+            else:
+                self.pending_journal.append({
+                    'type': 'operation_update',
+                    'operation_id': operation_id,
+                    'fields': kwargs,
+                    'updated_at': operation.updated_at.isoformat()
+                })
+                
+    def _complete_operation(self, operation: SyncOperation):
+        """
+        Count a completed operation and journal its compact form.
+        
+        Args:
+            operation: The completed operation
+        """
+        compact = operation.to_compact()
+        self._count_completed(compact)
+        self.pending_journal.append({'type': 'operation_completed', 'operation': compact})
+        
+    def _count_completed(self, compact: List[Any]):
+        """
+        Add a compact completed operation to the completion counters.
+        
+        Args:
+            compact: Compact operation as returned by SyncOperation.to_compact
+        """
+        _, table_name, operation_type, _, _, record_count = compact
+        counts = self.completed_operations.setdefault(table_name, {}).setdefault(
+            operation_type, {'operations': 0, 'records': 0}
+        )
+        counts['operations'] += 1
+        counts['records'] += record_count
+        
+    def drain_journal(self) -> List[Dict[str, Any]]:
+        """
+        Take the journal entries recorded since the last save.
+        
+        A trailing 'state' entry carries the job-level fields (status, stats,
+        checkpoint, tables and timestamps), which are small and replaced wholesale.
+        Every entry is stamped with the sequence number of this save, which a
+        snapshot records so entries it already covers are not replayed.
+        
+        Returns:
+            List of journal entries to append
+        """
+        entries = self.pending_journal
+        self.pending_journal = []
+        self.journal_sequence += 1
+        entries.append({
+            'type': 'state',
+            'tables': self.tables,
+            'status': self.status,
+            'stats': self.stats,
+            'checkpoint': self.checkpoint,
+            'table_checkpoints': self.table_checkpoints,
+            'apply_mode': self.apply_mode,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'start_time': self.start_time.isoformat() if self.start_time else None,
+            'end_time': self.end_time.isoformat() if self.end_time else None
+        })
+        for entry in entries:
+            entry['sequence'] = self.journal_sequence
+        return entries
+        
+    def restore_journal(self, entries: List[Dict[str, Any]]):
+        """
+        Put back journal entries taken by drain_journal whose save failed.
+        
+        The trailing 'state' entry is dropped; the next drain writes a fresh one.
+        
+        Args:
+            entries: Entries returned by drain_journal
+        """
+        self.pending_journal = entries[:-1] + self.pending_journal
+        
+    def apply_journal_entry(self, entry: Dict[str, Any]):
+        """
+        Replay a journal entry written by drain_journal.
+        
+        Args:
+            entry: Journal entry
+        """
+        entry_type = entry.get('type')
+        
+        if entry_type == 'operation':
+            operation = SyncOperation.from_dict(entry['operation'])
+            self.operations[operation.operation_id] = operation
+        elif entry_type == 'operation_update':
+            operation = self.operations.get(entry['operation_id'])
+            if operation:
+                for key, value in entry['fields'].items():
+                    setattr(operation, key, value)
+                if entry.get('updated_at'):
+                    operation.updated_at = datetime.datetime.fromisoformat(entry['updated_at'])
+        elif entry_type == 'operation_completed':
+            self.operations.pop(entry['operation'][0], None)
+            self._count_completed(entry['operation'])
+        elif entry_type == 'state':
+            self.tables = entry['tables']
+            self.status = entry['status']
+            self.stats = entry['stats']
+            self.checkpoint = entry['checkpoint'] or {}
+            self.table_checkpoints = entry.get('table_checkpoints') or {}
+            self.apply_mode = entry.get('apply_mode', self.apply_mode)
+            for field in ('updated_at', 'start_time', 'end_time'):
+                if entry.get(field):
+                    setattr(self, field, datetime.datetime.fromisoformat(entry[field]))
+            
     def get_operation(self, operation_id: str) -> Optional[SyncOperation]:
         """
         Get an operation by ID.
@@ -292,12 +450,43 @@ class SyncState:
         """
         Set checkpoint data for job resumption.
         
+        Tables synchronized in parallel each keep their own checkpoint, kept
+        by the checkpoint's 'current_table'. ``checkpoint`` holds the latest
+        one written by any table.
+        
         Args:
             checkpoint_data: Checkpoint data
         """
         self.checkpoint = checkpoint_data
+        table_name = checkpoint_data.get('current_table')
+        if table_name:
+            self.table_checkpoints[table_name] = checkpoint_data
         self.updated_at = datetime.datetime.utcnow()
         
+    def advance_checkpoint(self, table_name: str, amount: int = 1):
+        """
+        Count changes applied to a table in its checkpoint.
+        
+        Args:
+            table_name: Name of the table
+            amount: Number of changes applied
+        """
+        checkpoint = self.table_checkpoints.get(table_name) or {'current_table': table_name}
+        checkpoint['processed_changes'] = checkpoint.get('processed_changes', 0) + amount
+        self.set_checkpoint(checkpoint)
+        
+    def get_completed_tables(self) -> List[str]:
+        """
+        Get the tables whose checkpoint shows they finished synchronizing.
+        
+        Returns:
+            List of table names
+        """
+        return [
+            table_name for table_name, checkpoint in self.table_checkpoints.items()
+            if checkpoint.get('status') == 'completed'
+        ]
+        
     def increment_stat(self, stat_name: str, amount: int = 1):
         """
         Increment a statistic counter.
@@ -343,7 +532,12 @@ class SyncState:
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None
+            'end_time': self.end_time.isoformat() if self.end_time else None,
+            'apply_mode': self.apply_mode,
+            'completed_operations': self.completed_operations,
+            'max_parallel_tables': self.max_parallel_tables,
+            'table_checkpoints': self.table_checkpoints,
+            'journal_sequence': self.journal_sequence
         }
         
     @classmethod
@@ -374,7 +568,12 @@ class SyncState:
             created_at=datetime.datetime.fromisoformat(data['created_at']) if data.get('created_at') else None,
             updated_at=datetime.datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else None,
             start_time=datetime.datetime.fromisoformat(data['start_time']) if data.get('start_time') else None,
-            end_time=datetime.datetime.fromisoformat(data['end_time']) if data.get('end_time') else None
+            end_time=datetime.datetime.fromisoformat(data['end_time']) if data.get('end_time') else None,
+            apply_mode=data.get('apply_mode', 'row'),
+            completed_operations=data.get('completed_operations'),
+            max_parallel_tables=data.get('max_parallel_tables'),
+            table_checkpoints=data.get('table_checkpoints'),
+            journal_sequence=data.get('journal_sequence', 0)
         )
 
 
@@ -388,8 +587,11 @@ class SelfHealingOrchestrator:
     - Error handling and recovery
     - Checkpointing for resumable operations
     - Performance monitoring and optimization
+    - Per-row or set-based bulk application of changes
     """
     
+    APPLY_MODES = ('row', 'bulk')
+    
     def __init__(self, 
                  change_detector: ChangeDetector = None,
                  transformer: Transformer = None,
@@ -401,7 +603,9 @@ class SelfHealingOrchestrator:
                  max_parallel_operations: int = 5,
                  batch_size: int = 1000,
                  checkpoint_interval: int = 100,
-                 state_directory: str = 'sync_states'):
+                 state_directory: str = 'sync_states',
+                 apply_mode: str = 'row',
+                 journal_compaction_interval: int = 1000):
         """
         Initialize the Orchestrator.
         
@@ -417,7 +621,14 @@ class SelfHealingOrchestrator:
             batch_size: Number of records to process in a batch
             checkpoint_interval: Number of records between checkpoints
             state_directory: Directory for storing sync state files
+            apply_mode: Default apply mode for jobs ('row' applies each record in its
+                own transaction, 'bulk' applies each batch with multi-row statements)
+            journal_compaction_interval: Number of journal entries after which the
+                state journal is compacted into a new snapshot
         """
+        if apply_mode not in self.APPLY_MODES:
+            raise ValueError(f"Unknown apply mode: {apply_mode}")
+            
         self.change_detector = change_detector
         self.transformer = transformer
         self.validator = validator
@@ -429,10 +640,13 @@ class SelfHealingOrchestrator:
         self.batch_size = batch_size
         self.checkpoint_interval = checkpoint_interval
         self.state_directory = state_directory
+        self.apply_mode = apply_mode
+        self.journal_compaction_interval = journal_compaction_interval
         
         self.active_syncs = {}  # Map job_id to SyncState
         self.sync_locks = {}    # Map job_id to threading.Lock
         self.shutdown_flags = {}  # Map job_id to shutdown flag
+        self.journal_lengths = {}  # Map job_id to entries in its state journal
         
         # Create state directory if it doesn't exist
         os.makedirs(state_directory, exist_ok=True)
@@ -442,7 +656,9 @@ class SelfHealingOrchestrator:
                   target_engine: Engine,
                   tables: List[Dict[str, Any]],
                   job_id: str = None,
-                  async_mode: bool = True) -> str:
+                  async_mode: bool = True,
+                  apply_mode: str = None,
+                  max_parallel_tables: int = None) -> str:
         """
         Start a synchronization job.
         
@@ -452,6 +668,10 @@ class SelfHealingOrchestrator:
             tables: List of tables to synchronize, each with fields and primary keys
             job_id: Optional job ID, a new UUID will be generated if None
             async_mode: Whether to run the job asynchronously
+            apply_mode: Optional apply mode for this job ('row' or 'bulk'),
+                defaults to the orchestrator's apply mode
+            max_parallel_tables: Optional maximum number of tables to synchronize
+                at once for this job, defaults to the orchestrator's setting
             
         Returns:
             Job ID
@@ -459,6 +679,10 @@ class SelfHealingOrchestrator:
         # Generate job ID if not provided
         job_id = job_id or str(uuid.uuid4())
         
+        apply_mode = apply_mode or self.apply_mode
+        if apply_mode not in self.APPLY_MODES:
+            raise ValueError(f"Unknown apply mode: {apply_mode}")
+        
         # Initialize Change Detector if needed
         if not self.change_detector:
             self.change_detector = ChangeDetector(
@@ -488,7 +712,9 @@ class SelfHealingOrchestrator:
                 'deleted_records': 0,
                 'error_records': 0,
                 'conflict_records': 0
-            }
+            },
+            apply_mode=apply_mode,
+            max_parallel_tables=max_parallel_tables
         )
         
         # Register the sync in memory
@@ -537,7 +763,7 @@ class SelfHealingOrchestrator:
                 with self.sync_locks[job_id]:
                     state = self.active_syncs[job_id]
                     state.update_status('stopped')
-                    self._save_state(state)
+                    self._save_state(state, compact=True)
                     del self.active_syncs[job_id]
                     del self.sync_locks[job_id]
                     del self.shutdown_flags[job_id]
@@ -677,7 +903,7 @@ class SelfHealingOrchestrator:
                 with self.sync_locks[job_id]:
                     state = self.active_syncs[job_id]
                     state.update_status('stopped')
-                    self._save_state(state)
+                    self._save_state(state, compact=True)
                     
                 # Clean up
                 del self.active_syncs[job_id]
@@ -689,7 +915,7 @@ class SelfHealingOrchestrator:
             with self.sync_locks[job_id]:
                 state = self.active_syncs[job_id]
                 state.update_status('completed')
-                self._save_state(state)
+                self._save_state(state, compact=True)
                 
             # Clean up
             del self.active_syncs[job_id]
@@ -707,7 +933,7 @@ class SelfHealingOrchestrator:
                     state.update_status('failed')
                     if 'error' not in state.stats:
                         state.stats['error'] = str(e)
-                    self._save_state(state)
+                    self._save_state(state, compact=True)
             except Exception:
                 pass
                 
@@ -719,7 +945,17 @@ class SelfHealingOrchestrator:
             except Exception:
                 pass
                 
-    def _sync_tables(self, job_id: str, source_engine: Engine, target_engine: Engine):
+        finally:
+            # Forget the reference keys validated for this job
+            if self.validator:
+                self.validator.clear_reference_cache(job_id)
+                
+            # Write out the job's buffered audit events
+            if self.audit_system:
+                self.audit_system.flush()
+                
+    def _sync_tables(self, job_id: str, source_engine: Engine, target_engine: Engine,
+                     tables: List[Dict[str, Any]] = None):
         """
         Synchronize all tables for a job.
         
@@ -727,30 +963,121 @@ class SelfHealingOrchestrator:
             job_id: ID of the sync job
             source_engine: SQLAlchemy engine for source database
             target_engine: SQLAlchemy engine for target database
+            tables: Tables to synchronize, or None for all of the job's tables
         """
         # Get tables to process
         with self.sync_locks[job_id]:
             state = self.active_syncs[job_id]
-            tables = state.tables
+            if tables is None:
+                tables = state.tables
+            max_parallel_tables = state.max_parallel_tables or self.max_parallel_tables
             
         # Process tables based on parallel settings
-        if self.max_parallel_tables <= 1:
+        if max_parallel_tables <= 1:
             # Process tables sequentially
             for table_info in tables:
                 if self.shutdown_flags.get(job_id, False):
                     break
                 self._sync_table(job_id, table_info, source_engine, target_engine)
         else:
-            # Process tables in parallel
-            # TODO: Implement parallel table processing
-            # For now, just do sequential processing
-            for table_info in tables:
-                if self.shutdown_flags.get(job_id, False):
-                    break
-                self._sync_table(job_id, table_info, source_engine, target_engine)
-                
+            self._sync_tables_parallel(job_id, tables, source_engine, target_engine, max_parallel_tables)
+            
+    def _sync_tables_parallel(self, job_id: str, tables: List[Dict[str, Any]],
+                              source_engine: Engine, target_engine: Engine,
+                              max_parallel_tables: int):
+        """
+        Synchronize tables concurrently following their foreign key dependencies.
+        
+        Inserts and updates run with parents before children. Deletes are held
+        back and applied in a second pass with children before parents, and a
+        table is only recorded as completed once its deletes are applied. Each
+        worker checks out its own connections from the engines' pools.
+        
+        Args:
+            job_id: ID of the sync job
+            tables: Tables to synchronize
+            source_engine: SQLAlchemy engine for source database
+            target_engine: SQLAlchemy engine for target database
+            max_parallel_tables: Maximum number of tables processed at once
+        """
+        tables_by_name = {table_info['name']: table_info for table_info in tables}
+        graph = TableDependencyGraph.from_engine(target_engine, list(tables_by_name))
+        deferred_deletes = {}
+        
+        def should_stop():
+            return self.shutdown_flags.get(job_id, False)
+            
+        logger.info(f"Syncing {len(tables)} tables for job {job_id} with up to {max_parallel_tables} in parallel")
+        
+        graph.run(
+            lambda name: self._sync_table(job_id, tables_by_name[name], source_engine,
+                                          target_engine, deferred_deletes),
+            max_workers=max_parallel_tables,
+            should_stop=should_stop
+        )
+        
+        graph.run(
+            lambda name: self._finish_deferred_table(job_id, tables_by_name[name],
+                                                     deferred_deletes.pop(name, None), target_engine),
+            max_workers=max_parallel_tables,
+            reverse=True,
+            should_stop=should_stop
+        )
+        
+    def _finish_deferred_table(self, job_id: str, table_info: Dict[str, Any],
+                               deferred: Optional[Dict[str, Any]], target_engine: Engine):
+        """
+        Apply a table's held-back deletions and record the table as completed.
+        
+        Args:
+            job_id: ID of the sync job
+            table_info: Information about the table
+            deferred: Deletions and apply statistics stored by _sync_table, or
+                None if the table failed before its deletions were detected
+            target_engine: SQLAlchemy engine for target database
+        """
+        if deferred is None:
+            return
+            
+        table_name = table_info['name']
+        
+        try:
+            apply_start = time.time()
+            self._apply_deleted_records(job_id, table_info, deferred['records'], target_engine)
+            apply_seconds = deferred['apply_seconds'] + time.time() - apply_start
+            
+            self._complete_table(job_id, table_name, deferred['apply_mode'],
+                                 deferred['total_changes'], apply_seconds)
+        except Exception as e:
+            self._fail_table(job_id, table_name, e)
+            
+    def _apply_deleted_records(self, job_id: str, table_info: Dict[str, Any],
+                               records: List[Dict[str, Any]], target_engine: Engine):
+        """
+        Apply deletions for a table using the job's apply mode.
+        
+        Args:
+            job_id: ID of the sync job
+            table_info: Information about the table
+            records: Records to delete
+            target_engine: SQLAlchemy engine for target database
+        """
+        if not records:
+            return
+            
+        with self.sync_locks[job_id]:
+            apply_mode = self.active_syncs[job_id].apply_mode
+            
+        if apply_mode == 'bulk':
+            self._bulk_apply_records(job_id, table_info['name'], table_info['primary_keys'],
+                                     'delete', records, target_engine)
+        else:
+            self._process_deleted_records(job_id, table_info['name'], table_info['primary_keys'],
+                                          records, target_engine)
+
     def _sync_table(self, job_id: str, table_info: Dict[str, Any], 
-                   source_engine: Engine, target_engine: Engine):
+                   source_engine: Engine, target_engine: Engine,
+                   deferred_deletes: Dict[str, List[Dict[str, Any]]] = None):
         """
         Synchronize a single table.
         
@@ -759,6 +1086,9 @@ class SelfHealingOrchestrator:
             table_info: Information about the table to sync
             source_engine: SQLAlchemy engine for source database
             target_engine: SQLAlchemy engine for target database
+            deferred_deletes: If given, deleted records are stored here by table
+                name instead of being applied, so they can be applied later in
+                reverse dependency order by _finish_deferred_table
         """
         table_name = table_info['name']
         primary_keys = table_info['primary_keys']
@@ -798,44 +1128,96 @@ class SelfHealingOrchestrator:
                     'processed_changes': 0,
                     'status': 'changes_detected'
                 })
+                apply_mode = state.apply_mode
                 
-            # Process new records
-            self._process_new_records(job_id, table_name, primary_keys, changes['new'], target_engine)
+            apply_start = time.time()
             
-            # Process modified records
-            self._process_modified_records(job_id, table_name, primary_keys, changes['modified'], target_engine)
-            
-            # Process deleted records
-            self._process_deleted_records(job_id, table_name, primary_keys, changes['deleted'], target_engine)
-            
-            # Update table completion status
-            with self.sync_locks[job_id]:
-                state = self.active_syncs[job_id]
-                state.increment_stat('processed_tables')
-                state.set_checkpoint({
-                    'current_table': table_name,
-                    'status': 'completed'
-                })
+            if apply_mode == 'bulk':
+                # Apply each batch with multi-row statements
+                self._bulk_apply_records(job_id, table_name, primary_keys, 'insert', changes['new'], target_engine)
+                self._bulk_apply_records(job_id, table_name, primary_keys, 'update', changes['modified'], target_engine)
+            else:
+                # Process new records
+                self._process_new_records(job_id, table_name, primary_keys, changes['new'], target_engine)
+                
+                # Process modified records
+                self._process_modified_records(job_id, table_name, primary_keys, changes['modified'], target_engine)
+                
+            # Process deleted records, unless they are applied later in dependency order
+            if deferred_deletes is not None:
+                deferred_deletes[table_name] = {
+                    'records': changes['deleted'],
+                    'apply_mode': apply_mode,
+                    'total_changes': total_changes,
+                    'apply_seconds': time.time() - apply_start
+                }
+                with self.sync_locks[job_id]:
+                    state = self.active_syncs[job_id]
+                    checkpoint = dict(state.table_checkpoints.get(table_name, {}))
+                    checkpoint['status'] = 'deletes_pending'
+                    state.set_checkpoint(checkpoint)
+                return
                 
-            logger.info(f"Completed sync for table {table_name} in job {job_id}")
+            self._apply_deleted_records(job_id, table_info, changes['deleted'], target_engine)
+            
+            self._complete_table(job_id, table_name, apply_mode, total_changes, time.time() - apply_start)
             
         except Exception as e:
-            logger.error(f"Error syncing table {table_name} for job {job_id}: {str(e)}")
-            logger.error(traceback.format_exc())
+            self._fail_table(job_id, table_name, e)
+            
+    def _complete_table(self, job_id: str, table_name: str, apply_mode: str,
+                        total_changes: int, apply_seconds: float):
+        """
+        Record a table's throughput and mark it completed in its checkpoint.
+        
+        Args:
+            job_id: ID of the sync job
+            table_name: Name of the table
+            apply_mode: Apply mode used for the table
+            total_changes: Number of changes detected for the table
+            apply_seconds: Time spent applying the changes
+        """
+        with self.sync_locks[job_id]:
+            state = self.active_syncs[job_id]
+            state.stats.setdefault('table_throughput', {})[table_name] = {
+                'apply_mode': apply_mode,
+                'records': total_changes,
+                'seconds': round(apply_seconds, 3),
+                'rows_per_second': round(total_changes / apply_seconds, 1) if apply_seconds > 0 else None
+            }
+            state.increment_stat('processed_tables')
+            state.set_checkpoint({
+                'current_table': table_name,
+                'status': 'completed'
+            })
+            
+        logger.info(f"Completed sync for table {table_name} in job {job_id}")
+        
+    def _fail_table(self, job_id: str, table_name: str, error: Exception):
+        """
+        Record a table failure in the job's stats and the table's checkpoint.
+        
+        Args:
+            job_id: ID of the sync job
+            table_name: Name of the table
+            error: The error raised while syncing the table
+        """
+        logger.error(f"Error syncing table {table_name} for job {job_id}: {str(error)}")
+        logger.error(traceback.format_exc())
+        
+        # Update error status
+        with self.sync_locks[job_id]:
+            state = self.active_syncs[job_id]
+            state.increment_stat('error_records')
+            if 'table_errors' not in state.stats:
+                state.stats['table_errors'] = {}
+            state.stats['table_errors'][table_name] = str(error)
+            state.set_checkpoint({
+                'current_table': table_name,
+                'status': 'error',
+                'error': str(error)
+            })
             
-            # Update error status
-            with self.sync_locks[job_id]:
-                state = self.active_syncs[job_id]
-                state.increment_stat('error_records')
-                if 'table_errors' not in state.stats:
-                    state.stats['table_errors'] = {}
-                state.stats['table_errors'][table_name] = str(e)
-                state.set_checkpoint({
-                    'current_table': table_name,
-                    'status': 'error',
-                    'error': str(e)
-                })
-                
     def _process_new_records(self, job_id: str, table_name: str, 
                            primary_keys: List[str], records: List[Dict[str, Any]], 
                            target_engine: Engine):
@@ -868,7 +1250,7 @@ class SelfHealingOrchestrator:
                 
             # Validate records if needed
             if self.validator:
-                valid, error_map = self.validator.validate_records(table_name, transformed_batch)
+                valid, error_map = self._validate_batch(job_id, table_name, transformed_batch, target_engine)
                 if not valid:
                     # Log validation errors
                     for idx, errors in error_map.items():
@@ -919,11 +1301,7 @@ class SelfHealingOrchestrator:
                         state.increment_stat('inserted_records')
                         
                         # Update checkpoint
-                        current_checkpoint = state.checkpoint
-                        current_checkpoint['processed_changes'] = (
-                            current_checkpoint.get('processed_changes', 0) + 1
-                        )
-                        state.set_checkpoint(current_checkpoint)
+                        state.advance_checkpoint(table_name)
                         
                         # Save state periodically
                         if state.stats['processed_records'] % self.checkpoint_interval == 0:
@@ -967,7 +1345,7 @@ class SelfHealingOrchestrator:
                 
             # Validate records if needed
             if self.validator:
-                valid, error_map = self.validator.validate_records(table_name, transformed_batch)
+                valid, error_map = self._validate_batch(job_id, table_name, transformed_batch, target_engine)
                 if not valid:
                     # Log validation errors
                     for idx, errors in error_map.items():
@@ -1018,11 +1396,7 @@ class SelfHealingOrchestrator:
                         state.increment_stat('updated_records')
                         
                         # Update checkpoint
-                        current_checkpoint = state.checkpoint
-                        current_checkpoint['processed_changes'] = (
-                            current_checkpoint.get('processed_changes', 0) + 1
-                        )
-                        state.set_checkpoint(current_checkpoint)
+                        state.advance_checkpoint(table_name)
                         
                         # Save state periodically
                         if state.stats['processed_records'] % self.checkpoint_interval == 0:
@@ -1096,11 +1470,7 @@ class SelfHealingOrchestrator:
                         state.increment_stat('deleted_records')
                         
                         # Update checkpoint
-                        current_checkpoint = state.checkpoint
-                        current_checkpoint['processed_changes'] = (
-                            current_checkpoint.get('processed_changes', 0) + 1
-                        )
-                        state.set_checkpoint(current_checkpoint)
+                        state.advance_checkpoint(table_name)
                         
                         # Save state periodically
                         if state.stats['processed_records'] % self.checkpoint_interval == 0:
@@ -1112,6 +1482,314 @@ class SelfHealingOrchestrator:
                     # Handle the error based on retry policy
                     self._handle_operation_error(job_id, operation, str(e))
                     
+    def _bulk_apply_records(self, job_id: str, table_name: str,
+                            primary_keys: List[str], operation_type: str,
+                            records: List[Dict[str, Any]], target_engine: Engine):
+        """
+        Apply records in set-based batches (bulk apply mode).
+        
+        Each batch is written in a single transaction using multi-row statements.
+        If the batch fails as a whole it is rolled back and re-applied row by row,
+        so only the rows that actually fail go through the retry policy. State and
+        statistics are updated once per batch.
+        
+        Args:
+            job_id: ID of the sync job
+            table_name: Name of the table
+            primary_keys: List of primary key columns
+            operation_type: Type of operation ('insert', 'update', 'delete')
+            records: List of records to apply
+            target_engine: SQLAlchemy engine for target database
+        """
+        if not records:
+            return
+            
+        logger.info(f"Bulk applying {len(records)} {operation_type} records for table {table_name}")
+        
+        stat_name = {
+            'insert': 'inserted_records',
+            'update': 'updated_records',
+            'delete': 'deleted_records'
+        }[operation_type]
+        
+        for i in range(0, len(records), self.batch_size):
+            if self.shutdown_flags.get(job_id, False):
+                break
+                
+            batch = records[i:i+self.batch_size]
+            
+            # Deletes only need primary keys, so they skip transformation and validation
+            if operation_type != 'delete':
+                batch = self._prepare_batch(job_id, table_name, primary_keys, batch, target_engine)
+                
+            if not batch:
+                continue
+                
+            failed = []
+            try:
+                with target_engine.begin() as conn:
+                    if operation_type == 'insert':
+                        self._execute_bulk_insert(conn, table_name, batch, primary_keys)
+                    elif operation_type == 'update':
+                        self._execute_bulk_update(conn, table_name, batch, primary_keys)
+                    else:
+                        self._execute_bulk_delete(conn, table_name, batch, primary_keys)
+                        
+            except Exception as e:
+                logger.warning(
+                    f"Bulk {operation_type} of {len(batch)} records in {table_name} failed, "
+                    f"falling back to per-row apply: {str(e)}"
+                )
+                failed = self._apply_rows_individually(
+                    table_name, primary_keys, operation_type, batch, target_engine
+                )
+                
+            succeeded = len(batch) - len(failed)
+            
+            # Record the batch as a single completed operation and update stats once
+            with self.sync_locks[job_id]:
+                state = self.active_syncs[job_id]
+                
+                if succeeded:
+                    failed_ids = {id(record) for record, _ in failed}
+                    operation = SyncOperation(
+                        operation_id=str(uuid.uuid4()),
+                        table_name=table_name,
+                        operation_type=operation_type,
+                        record_ids=[
+                            self._format_record_id(record, primary_keys)
+                            for record in batch if id(record) not in failed_ids
+                        ],
+                        records=[],
+                        status='completed'
+                    )
+                    state.add_operation(operation)
+                    
+                previous_processed = state.stats['processed_records']
+                state.increment_stat('processed_records', succeeded)
+                state.increment_stat(stat_name, succeeded)
+                
+                state.advance_checkpoint(table_name, succeeded)
+                
+                # Save state whenever the batch crosses a checkpoint boundary
+                if (previous_processed // self.checkpoint_interval !=
+                        state.stats['processed_records'] // self.checkpoint_interval):
+                    self._save_state(state)
+                    
+            # Hand the rows that failed individually to the retry policy
+            for record, error in failed:
+                operation = SyncOperation(
+                    operation_id=str(uuid.uuid4()),
+                    table_name=table_name,
+                    operation_type=operation_type,
+                    record_ids=[self._format_record_id(record, primary_keys)],
+                    records=[record],
+                    status='pending'
+                )
+                with self.sync_locks[job_id]:
+                    self.active_syncs[job_id].add_operation(operation)
+                    
+                logger.error(f"Error applying {operation_type} for record {operation.record_ids[0]} in {table_name}: {error}")
+                self._handle_operation_error(job_id, operation, error)
+                
+    def _prepare_batch(self, job_id: str, table_name: str, primary_keys: List[str],
+                       batch: List[Dict[str, Any]], target_engine: Engine) -> List[Dict[str, Any]]:
+        """
+        Transform and validate a batch of records, dropping invalid ones.
+        
+        Args:
+            job_id: ID of the sync job
+            table_name: Name of the table
+            primary_keys: List of primary key columns
+            batch: Records to prepare
+            target_engine: SQLAlchemy engine for target database
+            
+        Returns:
+            List of transformed, valid records
+        """
+        if self.transformer:
+            batch = self.transformer.transform_records(batch)
+            
+        if self.validator:
+            valid, error_map = self._validate_batch(job_id, table_name, batch, target_engine)
+            if not valid:
+                for idx, errors in error_map.items():
+                    record_id = self._format_record_id(batch[idx], primary_keys)
+                    logger.warning(f"Validation errors for record {record_id} in {table_name}: {', '.join(errors)}")
+                    
+                batch = [rec for idx, rec in enumerate(batch) if idx not in error_map]
+                
+        return batch
+        
+    def _validate_batch(self, job_id: str, table_name: str, batch: List[Dict[str, Any]],
+                        target_engine: Engine) -> Tuple[bool, Dict[int, List[str]]]:
+        """
+        Validate a batch of records in the context of its job.
+        
+        Reference rules check the target database, and the keys they find are
+        reused by later batches of the same job.
+        
+        Args:
+            job_id: ID of the sync job
+            table_name: Name of the table
+            batch: Records to validate
+            target_engine: SQLAlchemy engine for target database
+            
+        Returns:
+            Tuple of (all_valid, {record_index: list_of_error_messages})
+        """
+        with target_engine.connect() as conn:
+            return self.validator.validate_records(table_name, batch, {'job_id': job_id, 'connection': conn})
+            
+    def _apply_rows_individually(self, table_name: str, primary_keys: List[str],
+                                 operation_type: str, batch: List[Dict[str, Any]],
+                                 target_engine: Engine) -> List[Tuple[Dict[str, Any], str]]:
+        """
+        Apply a batch one record per transaction after a bulk statement failed.
+        
+        Args:
+            table_name: Name of the table
+            primary_keys: List of primary key columns
+            operation_type: Type of operation ('insert', 'update', 'delete')
+            batch: Records to apply
+            target_engine: SQLAlchemy engine for target database
+            
+        Returns:
+            List of (record, error message) tuples for the records that failed
+        """
+        failed = []
+        
+        for record in batch:
+            try:
+                with target_engine.begin() as conn:
+                    if operation_type == 'insert':
+                        self._execute_insert(conn, table_name, record)
+                    elif operation_type == 'update':
+                        self._execute_update(conn, table_name, record, primary_keys)
+                    else:
+                        self._execute_delete(conn, table_name, record, primary_keys)
+            except Exception as e:
+                failed.append((record, str(e)))
+                
+        return failed
+        
+    def _group_by_columns(self, records: List[Dict[str, Any]]) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+        """
+        Group records by their column set so each group can share one statement.
+        
+        Args:
+            records: Records to group
+            
+        Returns:
+            Dictionary mapping column tuples to the records that have exactly those columns
+        """
+        groups = {}
+        for record in records:
+            groups.setdefault(tuple(record.keys()), []).append(record)
+        return groups
+        
+    def _execute_bulk_insert(self, conn: Connection, table_name: str,
+                             records: List[Dict[str, Any]], primary_keys: List[str]):
+        """
+        Execute a multi-row insert for a batch of records.
+        
+        On PostgreSQL and SQLite the insert is written as an upsert on the primary
+        key so that re-applying a batch after a resume is idempotent.
+        
+        Args:
+            conn: SQLAlchemy connection
+            table_name: Name of the table
+            records: Records to insert
+            primary_keys: List of primary key columns
+        """
+        supports_upsert = conn.dialect.name in ('postgresql', 'sqlite')
+        
+        for columns, group in self._group_by_columns(records).items():
+            column_list = ', '.join(columns)
+            placeholders = ', '.join(f':c{i}' for i in range(len(columns)))
+            sql = f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders})"
+            
+            if supports_upsert and primary_keys and all(pk in columns for pk in primary_keys):
+                update_columns = [col for col in columns if col not in primary_keys]
+                conflict_target = ', '.join(primary_keys)
+                if update_columns:
+                    set_clause = ', '.join(f"{col} = excluded.{col}" for col in update_columns)
+                    sql += f" ON CONFLICT ({conflict_target}) DO UPDATE SET {set_clause}"
+                else:
+                    sql += f" ON CONFLICT ({conflict_target}) DO NOTHING"
+                    
+            params = [
+                {f'c{i}': record[col] for i, col in enumerate(columns)}
+                for record in group
+            ]
+            conn.execute(text(sql), params)
+            
+    def _execute_bulk_update(self, conn: Connection, table_name: str,
+                             records: List[Dict[str, Any]], primary_keys: List[str]):
+        """
+        Execute a batched update using one prepared statement per column set.
+        
+        Args:
+            conn: SQLAlchemy connection
+            table_name: Name of the table
+            records: Records to update
+            primary_keys: List of primary key columns
+        """
+        for columns, group in self._group_by_columns(records).items():
+            missing = [pk for pk in primary_keys if pk not in columns]
+            if missing:
+                raise ValueError(f"Primary key {missing[0]} not found in record")
+                
+            update_columns = [col for col in columns if col not in primary_keys]
+            if not update_columns:
+                # Nothing to update
+                continue
+                
+            set_clause = ', '.join(f"{col} = :val_{i}" for i, col in enumerate(update_columns))
+            where_clause = ' AND '.join(f"{pk} = :pk_{i}" for i, pk in enumerate(primary_keys))
+            query = text(f"UPDATE {table_name} SET {set_clause} WHERE {where_clause}")
+            
+            params = []
+            for record in group:
+                row_params = {f'val_{i}': record[col] for i, col in enumerate(update_columns)}
+                row_params.update({f'pk_{i}': record[pk] for i, pk in enumerate(primary_keys)})
+                params.append(row_params)
+                
+            conn.execute(query, params)
+            
+    def _execute_bulk_delete(self, conn: Connection, table_name: str,
+                             records: List[Dict[str, Any]], primary_keys: List[str]):
+        """
+        Execute a batched delete.
+        
+        Single-column keys are deleted with one ``DELETE ... WHERE pk IN (...)``
+        statement; composite keys use one prepared statement executed for all rows.
+        
+        Args:
+            conn: SQLAlchemy connection
+            table_name: Name of the table
+            records: Records to delete
+            primary_keys: List of primary key columns
+        """
+        for record in records:
+            for pk in primary_keys:
+                if pk not in record:
+                    raise ValueError(f"Primary key {pk} not found in record")
+                    
+        if len(primary_keys) == 1:
+            pk = primary_keys[0]
+            query = text(f"DELETE FROM {table_name} WHERE {pk} IN :pk_values").bindparams(
+                sa.bindparam('pk_values', expanding=True)
+            )
+            conn.execute(query, {'pk_values': [record[pk] for record in records]})
+        else:
+            where_clause = ' AND '.join(f"{pk} = :pk_{i}" for i, pk in enumerate(primary_keys))
+            query = text(f"DELETE FROM {table_name} WHERE {where_clause}")
+            conn.execute(query, [
+                {f'pk_{i}': record[pk] for i, pk in enumerate(primary_keys)}
+                for record in records
+            ])
+            
     def _execute_insert(self, conn: Connection, table_name: str, record: Dict[str, Any]):
         """
         Execute an insert operation.
@@ -1369,6 +2047,10 @@ class SelfHealingOrchestrator:
         """
         Resume a sync job from its last checkpoint.
         
+        Every table whose own checkpoint is not 'completed' is synchronized
+        again, so tables that were running in parallel when the job stopped
+        are neither skipped nor repeated.
+        
         Args:
             job_id: ID of the sync job to resume
             source_engine: SQLAlchemy engine for source database
@@ -1379,76 +2061,29 @@ class SelfHealingOrchestrator:
             state = self.active_syncs[job_id]
             checkpoint = state.checkpoint
             tables = state.tables
-            
-        if not checkpoint:
-            # No checkpoint, just start from the beginning
-            self._sync_tables(job_id, source_engine, target_engine)
-            return
-            
-        # Find the table to resume from
-        current_table = checkpoint.get('current_table')
-        if not current_table:
-            # No current table, start from the beginning
-            self._sync_tables(job_id, source_engine, target_engine)
-            return
-            
-        # Find the table info
-        current_table_idx = next(
-            (i for i, t in enumerate(tables) if t['name'] == current_table),
-            None
-        )
+            completed_tables = set(state.get_completed_tables())
+            has_table_checkpoints = bool(state.table_checkpoints)
+            
+        if not has_table_checkpoints and checkpoint.get('current_table'):
+            # States saved before per-table checkpoints only record the table
+            # being synced, and tables were synced one after another
+            current_table_idx = next(
+                (i for i, t in enumerate(tables) if t['name'] == checkpoint['current_table']),
+                None
+            )
+            if current_table_idx is not None:
+                if checkpoint.get('status') == 'completed':
+                    current_table_idx += 1
+                completed_tables = {t['name'] for t in tables[:current_table_idx]}
+                
+        remaining_tables = [t for t in tables if t['name'] not in completed_tables]
         
-        if current_table_idx is None:
-            # Table not found, start from the beginning
-            self._sync_tables(job_id, source_engine, target_engine)
-            return
+        if len(remaining_tables) < len(tables):
+            logger.info(f"Resuming job {job_id}: skipping {len(tables) - len(remaining_tables)} completed tables")
             
-        # Check the status
-        status = checkpoint.get('status', '')
+        # Process the remaining tables
+        self._sync_tables(job_id, source_engine, target_engine, remaining_tables)
         
-        if status == 'completed':
-            # Table was completed, start with the next table
-            remaining_tables = tables[current_table_idx + 1:]
-            
-            # Set up the remaining tables
-            with self.sync_locks[job_id]:
-                state = self.active_syncs[job_id]
-                state.tables = remaining_tables
-                
-            # Process the remaining tables
-            self._sync_tables(job_id, source_engine, target_engine)
-            
-        elif status == 'error':
-            # There was an error with this table, try again
-            remaining_tables = tables[current_table_idx:]
-            
-            # Set up the remaining tables
-            with self.sync_locks[job_id]:
-                state = self.active_syncs[job_id]
-                state.tables = remaining_tables
-                
-            # Process the remaining tables
-            self._sync_tables(job_id, source_engine, target_engine)
-            
-        else:
-            # Table is in progress, resume it
-            table_info = tables[current_table_idx]
-            
-            # Resume this table and then do the rest
-            self._sync_table(job_id, table_info, source_engine, target_engine)
-            
-            # Process remaining tables
-            remaining_tables = tables[current_table_idx + 1:]
-            
-            if remaining_tables:
-                # Set up the remaining tables
-                with self.sync_locks[job_id]:
-                    state = self.active_syncs[job_id]
-                    state.tables = remaining_tables
-                    
-                # Process the remaining tables
-                self._sync_tables(job_id, source_engine, target_engine)
-                
     def _format_record_id(self, record: Dict[str, Any], primary_keys: List[str]) -> str:
         """
         Format a record's primary key values as a string.
@@ -1468,35 +2103,74 @@ class SelfHealingOrchestrator:
             # Composite primary key
             return '|'.join(str(record.get(pk, 'None')) for pk in primary_keys)
             
-    def _save_state(self, state: SyncState):
+    def _state_paths(self, job_id: str) -> Tuple[str, str]:
         """
-        Save a sync state to a file.
+        Get the snapshot and journal file paths for a job.
+        
+        Args:
+            job_id: ID of the job
+            
+        Returns:
+            Tuple of (snapshot_path, journal_path)
+        """
+        base_path = os.path.join(self.state_directory, job_id)
+        return f"{base_path}.json", f"{base_path}.journal"
+        
+    def _save_state(self, state: SyncState, compact: bool = False):
+        """
+        Save a sync state.
+        
+        Changes since the last save are appended to the job's journal. A full
+        snapshot is written (and the journal truncated) when no snapshot exists
+        yet, when the journal reaches ``journal_compaction_interval`` entries,
+        or when ``compact`` is requested. If the write fails, the changes are
+        kept for the next save.
         
         Args:
             state: The state to save
+            compact: Whether to force a snapshot
         """
+        snapshot_path, journal_path = self._state_paths(state.job_id)
+        entries = state.drain_journal()
+        journal_length = self.journal_lengths.get(state.job_id, 0) + len(entries)
+        
         try:
-            # Convert state to dictionary
-            state_dict = state.to_dict()
-            
-            # Remove large data from records to save space
-            if 'operations' in state_dict:
-                for op_id, op in state_dict['operations'].items():
-                    if 'records' in op:
-                        del op['records']
-                        
-            # Save to file
-            file_path = os.path.join(self.state_directory, f"{state.job_id}.json")
-            
-            with open(file_path, 'w') as f:
-                json.dump(state_dict, f, indent=2)
-                
+            if (compact or journal_length >= self.journal_compaction_interval or
+                    not os.path.exists(snapshot_path)):
+                # Write the snapshot atomically; it covers every journal entry so far
+                temp_path = f"{snapshot_path}.tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(state.to_dict(), f, default=str)
+                os.replace(temp_path, snapshot_path)
+                journal_length = 0
+            else:
+                offset = os.path.getsize(journal_path) if os.path.exists(journal_path) else 0
+                try:
+                    with open(journal_path, 'a') as f:
+                        f.write(''.join(json.dumps(entry, default=str) + '\n' for entry in entries))
+                except Exception:
+                    # Cut off a partial append so its entries are not replayed twice
+                    with open(journal_path, 'a') as f:
+                        f.truncate(offset)
+                    raise
+                    
         except Exception as e:
+            state.restore_journal(entries)
             logger.error(f"Error saving sync state for job {state.job_id}: {str(e)}")
+            return
+            
+        self.journal_lengths[state.job_id] = journal_length
+        
+        if journal_length == 0 and os.path.exists(journal_path):
+            # Entries left behind if this fails are skipped by their sequence number
+            try:
+                os.remove(journal_path)
+            except OSError as e:
+                logger.warning(f"Error removing state journal for job {state.job_id}: {str(e)}")
             
     def _load_state(self, job_id: str) -> SyncState:
         """
-        Load a sync state from a file.
+        Load a sync state by replaying its journal over the last snapshot.
         
         Args:
             job_id: ID of the job to load
@@ -1507,17 +2181,39 @@ class SelfHealingOrchestrator:
         Raises:
             FileNotFoundError: If the state file doesn't exist
         """
-        file_path = os.path.join(self.state_directory, f"{job_id}.json")
+        snapshot_path, journal_path = self._state_paths(job_id)
         
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Sync state file not found: {file_path}")
+        if not os.path.exists(snapshot_path):
+            raise FileNotFoundError(f"Sync state file not found: {snapshot_path}")
             
         try:
-            with open(file_path, 'r') as f:
-                state_dict = json.load(f)
+            with open(snapshot_path, 'r') as f:
+                state = SyncState.from_dict(json.load(f))
+            snapshot_sequence = state.journal_sequence
                 
-            return SyncState.from_dict(state_dict)
+            journal_length = 0
+            if os.path.exists(journal_path):
+                with open(journal_path, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # A torn final line from an interrupted append
+                            logger.warning(f"Ignoring incomplete journal entry for job {job_id}")
+                            break
+                        journal_length += 1
+                        
+                        # Skip entries the snapshot was written after
+                        sequence = entry.get('sequence')
+                        if sequence is not None:
+                            if sequence <= snapshot_sequence:
+                                continue
+                            state.journal_sequence = max(state.journal_sequence, sequence)
+                        state.apply_journal_entry(entry)
+                        
+            self.journal_lengths[job_id] = journal_length
+            return state
             
         except Exception as e:
             logger.error(f"Error loading sync state for job {job_id}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -143,6 +143,7 @@ def register_blueprint(app: Flask) -> Dict[str, Any]:
                             'conflict_strategy': request.form.get('conflict_strategy', 'source_wins'),
                             'max_parallel_tables': int(request.form.get('max_parallel_tables', 1)),
                             'max_parallel_operations': int(request.form.get('max_parallel_operations', 5)),
+                            'apply_mode': request.form.get('apply_mode', 'row'),
                             'audit_level': request.form.get('audit_level', 'standard')
                         }
                     }
@@ -65,11 +65,15 @@ class TerraFusionSyncService:
             'max_parallel_tables': 1,
             'max_parallel_operations': 5,
             'checkpoint_interval': 100,
+            'journal_compaction_interval': 1000,
+            'apply_mode': 'row',  # 'row' (one transaction per record) or 'bulk' (multi-row batches)
             
             # Change detection configuration
             'detection_strategy': 'hash',
             'cdc_enabled': False,
             'cdc_table_prefix': '_cdc',
+            'fingerprint_directory': 'sync_fingerprints',
+            'fingerprint_buckets': 1024,
             
             # Schema validation configuration
             'schema_validation': True,
@@ -90,6 +94,9 @@ class TerraFusionSyncService:
             'audit_level': 'standard',
             'include_data': False,
             'audit_table': 'sync_audit_events',
+            'audit_buffer_size': 10000,
+            'audit_flush_batch_size': 500,
+            'audit_flush_interval': 1.0,
             
             # Directory configuration
             'state_directory': 'sync_states',
@@ -123,7 +130,9 @@ class TerraFusionSyncService:
             batch_size=self.config['batch_size'],
             detection_strategy=self.config['detection_strategy'],
             cdc_table_prefix=self.config['cdc_table_prefix'],
-            cdc_enabled=self.config['cdc_enabled']
+            cdc_enabled=self.config['cdc_enabled'],
+            fingerprint_directory=self.config['fingerprint_directory'],
+            fingerprint_buckets=self.config['fingerprint_buckets']
         )
         
         # Transformer
@@ -155,7 +164,10 @@ class TerraFusionSyncService:
             audit_store=audit_store,
             engine=self.target_engine,
             audit_level=self.config['audit_level'],
-            include_data=self.config['include_data']
+            include_data=self.config['include_data'],
+            buffer_size=self.config['audit_buffer_size'],
+            flush_batch_size=self.config['audit_flush_batch_size'],
+            flush_interval=self.config['audit_flush_interval']
         )
         
         # Retry Policy
@@ -178,7 +190,9 @@ class TerraFusionSyncService:
             max_parallel_operations=self.config['max_parallel_operations'],
             batch_size=self.config['batch_size'],
             checkpoint_interval=self.config['checkpoint_interval'],
-            state_directory=self.config['state_directory']
+            state_directory=self.config['state_directory'],
+            apply_mode=self.config['apply_mode'],
+            journal_compaction_interval=self.config['journal_compaction_interval']
         )
         
     def start_full_sync(self, async_mode: bool = True) -> str:
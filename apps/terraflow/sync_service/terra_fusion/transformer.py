@@ -20,6 +20,125 @@ from sync_service.data_type_handlers import DataTypeHandler, get_handler_for_col
 
 logger = logging.getLogger(__name__)
 
+# Convertible value types for field mappings
+CONVERTIBLE_TYPES = (str, int, float, bool, datetime.datetime)
+
+# Marker for complex mappings that produce no value
+_SKIP = object()
+
+
+class MappingPlan:
+    """
+    A mapping compiled for repeated application.
+    
+    Compiling resolves the type converters for each field, parses transform
+    strings into closures and compiles Python expressions to code objects, so
+    applying the plan to a record does no per-value interpretation of the
+    mapping definition.
+    """
+    
+    def __init__(self,
+                 field_steps: List[Tuple[str, str, Optional[Dict[str, Callable]], Optional[Callable], bool, Any]],
+                 constants: List[Tuple[str, Any]],
+                 complex_steps: List[Tuple[str, Callable[[Dict[str, Any]], Any]]]):
+        """
+        Initialize the plan.
+        
+        Args:
+            field_steps: Tuples of (target_field, source_field, converters by source
+                type name, transform function, has_default, default)
+            constants: Tuples of (target_field, value)
+            complex_steps: Tuples of (target_field, function of the source record)
+        """
+        self.field_steps = field_steps
+        self.constants = constants
+        self.complex_steps = complex_steps
+        self._column_handlers: Dict[str, Optional[DataTypeHandler]] = {}
+        
+    def apply(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply the plan to a single record.
+        
+        Args:
+            record: The record to transform
+            
+        Returns:
+            Transformed record
+        """
+        return self.apply_batch([record])[0]
+        
+    def apply_batch(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply the plan to a batch of records, one mapping step at a time.
+        
+        Args:
+            records: The records to transform
+            
+        Returns:
+            List of transformed records
+        """
+        results = [{} for _ in records]
+        
+        # Apply field mappings
+        for target_field, source_field, converters, transform, has_default, default in self.field_steps:
+            for record, result in zip(records, results):
+                if source_field in record:
+                    value = record[source_field]
+                    
+                    # Apply type conversion if needed
+                    if converters and isinstance(value, CONVERTIBLE_TYPES):
+                        converter = converters.get(type(value).__name__)
+                        if converter is not None:
+                            try:
+                                value = converter(value)
+                            except Exception as e:
+                                logger.warning(f"Failed to convert {source_field} from {type(value).__name__}: {str(e)}")
+                                # Use default if available
+                                if has_default:
+                                    value = default
+                                    
+                    # Apply custom transformation if specified
+                    if transform is not None:
+                        value = transform(value)
+                        
+                    result[target_field] = value
+                elif has_default:
+                    # Source field not present, use default value
+                    result[target_field] = default
+                    
+        # Apply constants
+        for target_field, value in self.constants:
+            for result in results:
+                result[target_field] = value
+                
+        # Apply complex mappings
+        for target_field, evaluate in self.complex_steps:
+            for record, result in zip(records, results):
+                try:
+                    value = evaluate(record)
+                    if value is not _SKIP:
+                        result[target_field] = value
+                except Exception as e:
+                    logger.error(f"Error evaluating complex mapping for {target_field}: {str(e)}")
+                    
+        # Check if we need to handle special data types
+        for record, result in zip(records, results):
+            for field in record:
+                # If field hasn't been handled yet and has a specialized data type
+                if field not in result:
+                    handler = self._get_column_handler(field)
+                    if handler:
+                        # Use the same field name if not mapped otherwise
+                        result[field] = handler.transform_value(record)
+                        
+        return results
+        
+    def _get_column_handler(self, field: str) -> Optional[DataTypeHandler]:
+        """Get the data type handler for an unmapped field, memoized per plan."""
+        if field not in self._column_handlers:
+            self._column_handlers[field] = get_handler_for_column(field)
+        return self._column_handlers[field]
+
 
 class Transformer:
     """
@@ -52,6 +171,9 @@ class Transformer:
         self.use_ai_transformation = use_ai_transformation
         self.ai_service_url = ai_service_url
         self.mappings = {}
+        self._plans: Dict[str, MappingPlan] = {}
+        self._generated_mappings: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._transform_functions: Dict[str, Callable[[Any], Any]] = {}
         self.type_conversions = {
             # Standard type conversions
             ('str', 'int'): lambda v: int(v) if v else 0,
@@ -107,30 +229,8 @@ class Transformer:
         Returns:
             Transformed record
         """
-        # Determine which mapping to use
-        mapping = None
-        
-        if custom_mapping:
-            mapping = custom_mapping
-        elif mapping_name and mapping_name in self.mappings:
-            mapping = self.mappings[mapping_name]
-        elif source_schema and target_schema:
-            mapping_key = f"{source_schema}_to_{target_schema}"
-            if mapping_key in self.mappings:
-                mapping = self.mappings[mapping_key]
-                
-        if not mapping:
-            # No explicit mapping, try with schema registry
-            if source_schema and target_schema and source_schema in self.schema_registry and target_schema in self.schema_registry:
-                # Auto-generate mapping based on field names and types
-                mapping = self._generate_mapping(source_schema, target_schema)
-            else:
-                # Identity transform - return record as is
-                logger.warning(f"No mapping found, returning original record")
-                return record.copy()
-        
-        # Apply mapping
-        return self._apply_mapping(record, mapping)
+        return self.transform_records([record], source_schema, target_schema,
+                                      mapping_name, custom_mapping)[0]
     
     def transform_records(self, 
                          records: List[Dict[str, Any]], 
@@ -141,6 +241,9 @@ class Transformer:
         """
         Transform multiple records from source schema to target schema.
         
+        The mapping is resolved and compiled once, then applied column-wise
+        over the batch.
+        
         Args:
             records: The records to transform
             source_schema: Name of the source schema
@@ -151,18 +254,61 @@ class Transformer:
         Returns:
             List of transformed records
         """
-        return [
-            self.transform_record(
-                record, source_schema, target_schema, mapping_name, custom_mapping
-            )
-            for record in records
-        ]
+        if not records:
+            return []
+            
+        mapping = self._resolve_mapping(source_schema, target_schema, mapping_name, custom_mapping)
+        
+        if not mapping:
+            # Identity transform - return records as is
+            logger.warning(f"No mapping found, returning original records")
+            return [record.copy() for record in records]
+        
+        # Apply mapping
+        return self.compile_mapping(mapping).apply_batch(records)
     
-    def _apply_mapping(self, record: Dict[str, Any], mapping: Dict[str, Any]) -> Dict[str, Any]:
+    def _resolve_mapping(self,
+                         source_schema: str = None,
+                         target_schema: str = None,
+                         mapping_name: str = None,
+                         custom_mapping: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """
-        Apply a mapping to transform a record.
+        Determine which mapping to use for a transformation.
         
-        Mapping format:
+        Args:
+            source_schema: Name of the source schema
+            target_schema: Name of the target schema
+            mapping_name: Name of the predefined mapping to use
+            custom_mapping: Custom mapping definition (overrides other mappings)
+            
+        Returns:
+            Mapping definition, or None if no mapping applies
+        """
+        if custom_mapping:
+            return custom_mapping
+        elif mapping_name and mapping_name in self.mappings:
+            return self.mappings[mapping_name]
+        elif source_schema and target_schema:
+            mapping_key = f"{source_schema}_to_{target_schema}"
+            if mapping_key in self.mappings:
+                return self.mappings[mapping_key]
+                
+        # No explicit mapping, try with schema registry
+        if source_schema and target_schema and source_schema in self.schema_registry and target_schema in self.schema_registry:
+            # Auto-generate mapping based on field names and types
+            schema_pair = (source_schema, target_schema)
+            if schema_pair not in self._generated_mappings:
+                self._generated_mappings[schema_pair] = self._generate_mapping(source_schema, target_schema)
+            return self._generated_mappings[schema_pair]
+            
+        return None
+    
+    def compile_mapping(self, mapping: Dict[str, Any]) -> MappingPlan:
+        """
+        Compile a mapping into a reusable plan.
+        
+        Plans are cached by the mapping's contents, so a mapping edited in place
+        is compiled again. Mapping format:
         {
             "field_mappings": {
                 "target_field1": {
@@ -185,93 +331,112 @@ class Transformer:
                 ...
             ]
         }
-        """
-        result = {}
         
-        # Apply field mappings
-        if 'field_mappings' in mapping:
-            for target_field, field_config in mapping['field_mappings'].items():
-                source_field = field_config.get('source_field')
+        Args:
+            mapping: The mapping definition
+            
+        Returns:
+            Compiled MappingPlan
+        """
+        plan_key = json.dumps(mapping, sort_keys=True, default=repr)
+        plan = self._plans.get(plan_key)
+        if plan is not None:
+            return plan
+            
+        field_steps = []
+        for target_field, field_config in mapping.get('field_mappings', {}).items():
+            source_field = field_config.get('source_field')
+            target_type = field_config.get('type')
+            transform = field_config.get('transform')
+            
+            converters = None
+            if target_type:
+                converters = {
+                    source_type: converter
+                    for (source_type, to_type), converter in self.type_conversions.items()
+                    if to_type == target_type
+                }
                 
-                if source_field and source_field in record:
-                    value = record[source_field]
-                    
-                    # Apply type conversion if needed
-                    target_type = field_config.get('type')
-                    if target_type and isinstance(value, (str, int, float, bool, datetime.datetime)):
-                        source_type = type(value).__name__
-                        conversion_key = (source_type, target_type)
-                        
-                        if conversion_key in self.type_conversions:
-                            try:
-                                value = self.type_conversions[conversion_key](value)
-                            except Exception as e:
-                                logger.warning(f"Failed to convert {source_field} from {source_type} to {target_type}: {str(e)}")
-                                # Use default if available
-                                if 'default' in field_config:
-                                    value = field_config['default']
-                                    
-                    # Apply custom transformation if specified
-                    transform = field_config.get('transform')
-                    if transform:
-                        value = self._apply_transformation(value, transform)
-                        
-                    result[target_field] = value
-                elif 'default' in field_config:
-                    # Source field not present, use default value
-                    result[target_field] = field_config['default']
+            field_steps.append((
+                target_field,
+                source_field,
+                converters,
+                self._compile_transformation(transform) if transform else None,
+                'default' in field_config,
+                field_config.get('default')
+            ))
+            
+        constants = list(mapping.get('constants', {}).items())
+        
+        complex_steps = []
+        for complex_mapping in mapping.get('complex_mappings', []):
+            target_field = complex_mapping.get('target_field')
+            expression = complex_mapping.get('expression')
+            
+            if target_field and expression:
+                evaluate = self._compile_expression(expression, target_field)
+                if evaluate is not None:
+                    complex_steps.append((target_field, evaluate))
                     
-        # Apply constants
-        if 'constants' in mapping:
-            for target_field, value in mapping['constants'].items():
-                result[target_field] = value
+        plan = MappingPlan(field_steps, constants, complex_steps)
+        
+        # Keep the plan cache bounded when callers pass many different mappings
+        if len(self._plans) >= 256:
+            self._plans.clear()
+        self._plans[plan_key] = plan
+        
+        return plan
+    
+    def _compile_expression(self, expression: str, target_field: str) -> Optional[Callable[[Dict[str, Any]], Any]]:
+        """
+        Compile a complex mapping expression into a function of the source record.
+        
+        Args:
+            expression: The expression, prefixed with python:, handler: or ai:
+            target_field: The target field name
+            
+        Returns:
+            Function evaluating the expression, or None if it produces nothing
+        """
+        if expression.startswith('python:'):
+            # Python expression, executed with 'source' and 'record' variables
+            try:
+                code = compile(expression[7:], f"<mapping {target_field}>", 'eval')
+            except SyntaxError as e:
+                error = e
                 
-        # Apply complex mappings
-        if 'complex_mappings' in mapping:
-            for complex_mapping in mapping['complex_mappings']:
-                target_field = complex_mapping.get('target_field')
-                expression = complex_mapping.get('expression')
+                def evaluate(record):
+                    raise error
                 
-                if target_field and expression:
-                    try:
-                        # Handle different expression types
-                        if expression.startswith('python:'):
-                            # Python expression
-                            python_expr = expression[7:]
-                            # Execute in a context with 'source' and 'record' variables
-                            source = record  # To maintain backward compatibility
-                            value = eval(python_expr, {"__builtins__": {}}, {"source": source, "record": record})
-                            result[target_field] = value
-                        elif expression.startswith('handler:'):
-                            # Use data type handler
-                            handler_name = expression[8:]
-                            handler = get_handler_for_column(handler_name)
-                            if handler:
-                                value = handler.transform_value(record)
-                                result[target_field] = value
-                            else:
-                                logger.warning(f"Handler not found: {handler_name}")
-                        elif self.use_ai_transformation and expression.startswith('ai:'):
-                            # AI-assisted transformation
-                            ai_expr = expression[3:]
-                            value = self._ai_transform(record, ai_expr, target_field)
-                            result[target_field] = value
-                            
-                    except Exception as e:
-                        logger.error(f"Error evaluating complex mapping for {target_field}: {str(e)}")
-                        
-        # Check if we need to handle special data types
-        for field, value in record.items():
-            # If field hasn't been handled yet and has a specialized data type
-            if field not in result:
-                handler = get_handler_for_column(field)
-                if handler:
-                    # Use handler to transform the value
-                    transformed_value = handler.transform_value(record)
-                    # Use the same field name if not mapped otherwise
-                    result[field] = transformed_value
-        
-        return result
+                return evaluate
+                
+            return lambda record: eval(code, {"__builtins__": {}}, {"source": record, "record": record})
+        elif expression.startswith('handler:'):
+            # Use data type handler
+            handler_name = expression[8:]
+            handler = get_handler_for_column(handler_name)
+            if handler:
+                return handler.transform_value
+                
+            def evaluate(record):
+                logger.warning(f"Handler not found: {handler_name}")
+                return _SKIP
+            
+            return evaluate
+        elif self.use_ai_transformation and expression.startswith('ai:'):
+            # AI-assisted transformation
+            ai_expr = expression[3:]
+            return lambda record: self._ai_transform(record, ai_expr, target_field)
+            
+        return None
+    
+    def _apply_mapping(self, record: Dict[str, Any], mapping: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply a mapping to transform a record.
+        
+        See compile_mapping for the mapping format.
+        """
+        return self.compile_mapping(mapping).apply(record)
     
     def _apply_transformation(self, value: Any, transform: str) -> Any:
         """
@@ -288,36 +453,60 @@ class Transformer:
         if not transform or not isinstance(transform, str):
             return value
             
-        if transform == 'uppercase' and isinstance(value, str):
-            return value.upper()
-        elif transform == 'lowercase' and isinstance(value, str):
-            return value.lower()
-        elif transform == 'trim' and isinstance(value, str):
-            return value.strip()
-        elif transform.startswith('truncate:') and isinstance(value, str):
-            try:
-                length = int(transform.split(':', 1)[1])
-                return value[:length]
-            except (ValueError, IndexError):
-                return value
-        elif transform.startswith('format:') and isinstance(value, (str, int, float)):
-            try:
-                fmt = transform.split(':', 1)[1]
-                return fmt.format(value)
-            except (ValueError, IndexError, KeyError):
-                return value
-        elif transform.startswith('replace:') and isinstance(value, str):
+        return self._compile_transformation(transform)(value)
+    
+    def _compile_transformation(self, transform: str) -> Callable[[Any], Any]:
+        """
+        Parse a named transformation into a function, memoized per transform string.
+        
+        See _apply_transformation for the built-in transformations.
+        """
+        if not isinstance(transform, str):
+            return lambda value: value
+            
+        if transform in self._transform_functions:
+            return self._transform_functions[transform]
+            
+        def unknown(value):
+            # Unknown transformation, or one that does not apply to this value
+            logger.warning(f"Unknown transformation: {transform}")
+            return value
+        
+        def for_types(types, func):
+            return lambda value: func(value) if isinstance(value, types) else unknown(value)
+        
+        name, separator, argument = transform.partition(':')
+        if not separator:
+            name = None
+        
+        if transform == 'uppercase':
+            function = for_types(str, str.upper)
+        elif transform == 'lowercase':
+            function = for_types(str, str.lower)
+        elif transform == 'trim':
+            function = for_types(str, str.strip)
+        elif name == 'truncate':
             try:
-                args = transform.split(':', 1)[1].split(',', 1)
-                if len(args) == 2:
-                    old, new = args
-                    return value.replace(old, new)
-            except (ValueError, IndexError):
-                pass
-                
-        # Unknown transformation
-        logger.warning(f"Unknown transformation: {transform}")
-        return value
+                length = int(argument)
+                function = for_types(str, lambda value: value[:length])
+            except ValueError:
+                function = for_types(str, lambda value: value)
+        elif name == 'format':
+            def apply_format(value):
+                try:
+                    return argument.format(value)
+                except (ValueError, IndexError, KeyError):
+                    return value
+            
+            function = for_types((str, int, float), apply_format)
+        elif name == 'replace' and ',' in argument:
+            old, new = argument.split(',', 1)
+            function = for_types(str, lambda value: value.replace(old, new))
+        else:
+            function = unknown
+            
+        self._transform_functions[transform] = function
+        return function
     
     def _generate_mapping(self, source_schema: str, target_schema: str) -> Dict[str, Any]:
         """
@@ -405,6 +594,7 @@ class Transformer:
             converter: Function that converts from source type to target type
         """
         self.type_conversions[(source_type, target_type)] = converter
+        self._plans.clear()
         
     def add_schema_to_registry(self, schema_name: str, fields: Dict[str, str]):
         """
@@ -415,6 +605,7 @@ class Transformer:
             fields: Dictionary mapping field names to their types
         """
         self.schema_registry[schema_name] = fields
+        self._generated_mappings.clear()
         
     def create_mapping(self, mapping_name: str, mapping_definition: Dict[str, Any]):
         """
@@ -20,6 +20,9 @@ from sync_service.data_type_handlers import DataTypeHandler, get_handler_for_col
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of values resolved per reference lookup query
+REFERENCE_LOOKUP_CHUNK_SIZE = 1000
+
 
 class ValidationRule:
     """Base class for validation rules."""
@@ -47,6 +50,26 @@ class ValidationRule:
             Tuple of (is_valid, error_message)
         """
         raise NotImplementedError("Subclasses must implement validate method")
+        
+    def validate_batch(self, records: List[Dict[str, Any]], context: Dict[str, Any] = None) -> List[Optional[str]]:
+        """
+        Validate a batch of records against this rule.
+        
+        Subclasses override this when the batch can be checked more cheaply
+        than record by record.
+        
+        Args:
+            records: The records to validate
+            context: Additional context for validation
+            
+        Returns:
+            List with the error message for each invalid record, or None for valid ones
+        """
+        errors = []
+        for record in records:
+            is_valid, error = self.validate(record, context)
+            errors.append(None if is_valid else error)
+        return errors
 
 
 class RequiredFieldRule(ValidationRule):
@@ -202,6 +225,28 @@ class RangeRule(ValidationRule):
             return False, f"Field '{self.field_name}' with value {value} is greater than maximum {self.max_value}"
             
         return True, None
+        
+    def validate_batch(self, records: List[Dict[str, Any]], context: Dict[str, Any] = None) -> List[Optional[str]]:
+        """Check a batch of field values against the range."""
+        field_name = self.field_name
+        min_value = self.min_value
+        max_value = self.max_value
+        errors = []
+        
+        for record in records:
+            value = record.get(field_name)
+            if value is None:
+                errors.append(None)
+            elif not isinstance(value, (int, float)):
+                errors.append(f"Field '{field_name}' with value '{value}' is not numeric")
+            elif min_value is not None and value < min_value:
+                errors.append(f"Field '{field_name}' with value {value} is less than minimum {min_value}")
+            elif max_value is not None and value > max_value:
+                errors.append(f"Field '{field_name}' with value {value} is greater than maximum {max_value}")
+            else:
+                errors.append(None)
+                
+        return errors
 
 
 class PatternRule(ValidationRule):
@@ -241,6 +286,28 @@ class PatternRule(ValidationRule):
             return False, f"Field '{self.field_name}' with value '{value}' does not match pattern '{self.pattern}'"
             
         return True, None
+        
+    def validate_batch(self, records: List[Dict[str, Any]], context: Dict[str, Any] = None) -> List[Optional[str]]:
+        """Match each distinct string value in the batch once."""
+        field_name = self.field_name
+        match = self.regex.match
+        results_by_value = {}
+        errors = []
+        
+        for record in records:
+            value = record.get(field_name)
+            if value is None:
+                errors.append(None)
+            elif not isinstance(value, str):
+                errors.append(f"Field '{field_name}' with value '{value}' is not a string")
+            else:
+                if value not in results_by_value:
+                    results_by_value[value] = None if match(value) else (
+                        f"Field '{field_name}' with value '{value}' does not match pattern '{self.pattern}'"
+                    )
+                errors.append(results_by_value[value])
+                
+        return errors
 
 
 class EnumRule(ValidationRule):
@@ -260,6 +327,22 @@ class EnumRule(ValidationRule):
         )
         self.field_name = field_name
         self.allowed_values = allowed_values
+        self._allowed_description = ', '.join(str(v) for v in allowed_values)
+        
+        # Membership is checked against a set; the list keeps the order for messages
+        try:
+            self._allowed_set = frozenset(allowed_values)
+        except TypeError:
+            self._allowed_set = None
+            
+    def _is_allowed(self, value: Any) -> bool:
+        """Check if a value is allowed, using the set where the value is hashable."""
+        if self._allowed_set is not None:
+            try:
+                return value in self._allowed_set
+            except TypeError:
+                pass
+        return value in self.allowed_values
         
     def validate(self, record: Dict[str, Any], context: Dict[str, Any] = None) -> Tuple[bool, Optional[str]]:
         """Check if the field value is in the list of allowed values."""
@@ -272,10 +355,24 @@ class EnumRule(ValidationRule):
             # Skip validation for None values
             return True, None
             
-        if value not in self.allowed_values:
-            return False, f"Field '{self.field_name}' with value '{value}' is not in allowed values: {', '.join(str(v) for v in self.allowed_values)}"
+        if not self._is_allowed(value):
+            return False, f"Field '{self.field_name}' with value '{value}' is not in allowed values: {self._allowed_description}"
             
         return True, None
+        
+    def validate_batch(self, records: List[Dict[str, Any]], context: Dict[str, Any] = None) -> List[Optional[str]]:
+        """Check a batch of field values against the allowed values."""
+        field_name = self.field_name
+        errors = []
+        
+        for record in records:
+            value = record.get(field_name)
+            if value is None or self._is_allowed(value):
+                errors.append(None)
+            else:
+                errors.append(f"Field '{field_name}' with value '{value}' is not in allowed values: {self._allowed_description}")
+                
+        return errors
 
 
 class ReferenceRule(ValidationRule):
@@ -320,7 +417,85 @@ class ReferenceRule(ValidationRule):
         if result.scalar():
             return True, None
         else:
-            return False, f"Field '{self.field_name}' with value '{value}' does not reference an existing {self.reference_table}.{self.reference_field}"
+            return False, self._error_message(value)
+            
+    def validate_batch(self, records: List[Dict[str, Any]], context: Dict[str, Any] = None) -> List[Optional[str]]:
+        """
+        Check the distinct referenced values of a batch with chunked IN queries.
+        
+        Values found are added to the known-good key set in
+        context['reference_cache'] when present, so later batches of the same
+        job skip them. Unhashable values are checked record by record.
+        """
+        if not context or 'connection' not in context:
+            logger.warning("Cannot validate reference rule without a database connection")
+            return [None] * len(records)
+            
+        reference_cache = context.get('reference_cache')
+        if reference_cache is not None:
+            known = reference_cache.setdefault((self.reference_table, self.reference_field), set())
+        else:
+            known = set()
+            
+        # Collect distinct values that are not known to exist
+        unknown = set()
+        for record in records:
+            value = record.get(self.field_name)
+            if value is None:
+                continue
+            try:
+                if value not in known:
+                    unknown.add(value)
+            except TypeError:
+                continue
+                
+        if unknown:
+            known.update(self._find_existing(context['connection'], list(unknown)))
+            
+        errors = []
+        for record in records:
+            value = record.get(self.field_name)
+            if value is None:
+                errors.append(None)
+                continue
+            try:
+                errors.append(None if value in known else self._error_message(value))
+            except TypeError:
+                is_valid, error = self.validate(record, context)
+                errors.append(None if is_valid else error)
+                
+        return errors
+        
+    def _find_existing(self, conn: Connection, values: List[Any]) -> Set[Any]:
+        """
+        Find which values exist in the referenced table.
+        
+        Args:
+            conn: Database connection
+            values: Distinct values to look up
+            
+        Returns:
+            Set of the given values that exist
+        """
+        query = text(
+            f"SELECT DISTINCT {self.reference_field} FROM {self.reference_table} "
+            f"WHERE {self.reference_field} IN :values"
+        ).bindparams(sa.bindparam('values', expanding=True))
+        
+        existing = set()
+        for i in range(0, len(values), REFERENCE_LOOKUP_CHUNK_SIZE):
+            chunk = values[i:i + REFERENCE_LOOKUP_CHUNK_SIZE]
+            found = {row[0] for row in conn.execute(query, {'values': chunk})}
+            
+            # The database may coerce the bound values, so also compare as text
+            found_text = {str(value) for value in found}
+            existing.update(value for value in chunk if value in found or str(value) in found_text)
+            
+        return existing
+        
+    def _error_message(self, value: Any) -> str:
+        """Build the error message for a missing reference."""
+        return f"Field '{self.field_name}' with value '{value}' does not reference an existing {self.reference_table}.{self.reference_field}"
 
 
 class CustomRule(ValidationRule):
@@ -358,6 +533,7 @@ class Validator:
         """Initialize the Validator component."""
         self.rules = {}  # Map table names to lists of validation rules
         self.schema_registry = {}  # Map table names to field type dictionaries
+        self.reference_caches = {}  # Map job IDs to known-good reference keys
         
     def add_rule(self, table_name: str, rule: ValidationRule):
         """
@@ -452,6 +628,9 @@ class Validator:
         """
         Validate multiple records against all rules for a table.
         
+        Each rule checks the whole batch at once. When the context carries a
+        'job_id', reference lookups reuse that job's known-good keys.
+        
         Args:
             table_name: Name of the table
             records: Records to validate
@@ -464,16 +643,33 @@ class Validator:
             # No rules for this table
             return True, {}
             
-        all_valid = True
-        error_map = {}
+        # Share known-good reference keys across the batches of a job
+        batch_context = dict(context or {})
+        if 'reference_cache' not in batch_context and batch_context.get('job_id'):
+            batch_context['reference_cache'] = self.reference_caches.setdefault(batch_context['job_id'], {})
+            
+        # Validate rule by rule over the whole batch
+        rule_errors = [rule.validate_batch(records, batch_context) for rule in self.rules[table_name]]
         
-        for i, record in enumerate(records):
-            is_valid, errors = self.validate_record(table_name, record, context)
-            if not is_valid:
-                all_valid = False
+        error_map = {}
+        for i in range(len(records)):
+            errors = [errors_for_rule[i] for errors_for_rule in rule_errors if errors_for_rule[i]]
+            if errors:
                 error_map[i] = errors
                 
-        return all_valid, error_map
+        return len(error_map) == 0, error_map
+        
+    def clear_reference_cache(self, job_id: str = None):
+        """
+        Forget known-good reference keys.
+        
+        Args:
+            job_id: Job whose cache to clear, or None to clear all jobs
+        """
+        if job_id is None:
+            self.reference_caches.clear()
+        else:
+            self.reference_caches.pop(job_id, None)
         
     def validate_schema_compatibility(self, source_schema: Dict[str, str], 
                                     target_schema: Dict[str, str]) -> Tuple[bool, List[str]]:
@@ -0,0 +1,222 @@
+"""
+Tests for the TerraFusion Audit System stores
+"""
+import os
+import json
+import datetime
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Import the module to test
+from sync_service.terra_fusion.audit_system import (
+    AuditEvent, AuditSystem, BufferedAuditStore, FileAuditStore, InMemoryAuditStore
+)
+
+def make_event(index, job_id='job-1'):
+    """Create a test audit event"""
+    return AuditEvent(
+        event_id=f'event-{index}',
+        event_type='operation',
+        component='Sync',
+        job_id=job_id,
+        table_name='parcel',
+        record_id=str(index),
+        operation='insert'
+    )
+
+class RecordingStore(InMemoryAuditStore):
+    """In-memory store that records the size of each batch written"""
+
+    def __init__(self, gate=None):
+        super().__init__()
+        self.batches = []
+        self.flushes = 0
+        self.gate = gate
+
+    def store_events(self, events):
+        # Hold up the background writer until the gate opens
+        if self.gate is not None and threading.current_thread().name == 'audit-writer':
+            self.gate.wait()
+        self.batches.append(len(events))
+        return super().store_events(events)
+
+    def flush(self, timeout=None):
+        self.flushes += 1
+        return super().flush(timeout)
+
+class TestFileAuditStore(unittest.TestCase):
+    """Test cases for the file audit store"""
+
+    def setUp(self):
+        """Create a temporary audit directory"""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary audit directory"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_store_events_appends_lines(self):
+        """Test that a batch is appended as one JSON event per line"""
+        store = FileAuditStore(self.directory)
+
+        self.assertEqual(store.store_events([make_event(i) for i in range(3)]), 3)
+        self.assertTrue(store.store_event(make_event(3)))
+
+        with open(store.current_file) as f:
+            lines = f.read().splitlines()
+        self.assertEqual([json.loads(line)['event_id'] for line in lines],
+                         ['event-0', 'event-1', 'event-2', 'event-3'])
+        self.assertEqual(store.get_event('event-2').record_id, '2')
+
+    def test_reopen_reads_index_and_legacy_files(self):
+        """Test that events survive a restart, including legacy JSON array files"""
+        with open(os.path.join(self.directory, 'audit_001.json'), 'w') as f:
+            f.write('[\n' + json.dumps(make_event(0).to_dict()) + ',\n]')
+
+        FileAuditStore(self.directory).store_events([make_event(1), make_event(2)])
+        store = FileAuditStore(self.directory)
+
+        self.assertEqual(len(store.get_events(job_id='job-1')), 3)
+        self.assertEqual(store.get_event('event-0').event_id, 'event-0')
+        self.assertEqual(store.get_event('event-2').record_id, '2')
+
+    def test_reopen_uses_manifest(self):
+        """Test that reopening the store reads the manifest instead of the audit files"""
+        store = FileAuditStore(self.directory)
+        store.store_events([make_event(i) for i in range(3)])
+        store.close()
+
+        with mock.patch.object(FileAuditStore, '_read_file', side_effect=AssertionError('file was rescanned')):
+            store = FileAuditStore(self.directory)
+            self.assertEqual(store.get_event('event-1').record_id, '1')
+
+    def test_recovers_unindexed_events(self):
+        """Test that events written after the index was last saved are indexed on restart"""
+        store = FileAuditStore(self.directory)
+        store.store_event(make_event(0))
+        store.close()
+        store.store_event(make_event(1))
+
+        store = FileAuditStore(self.directory)
+
+        self.assertEqual(store.get_event('event-1').record_id, '1')
+        self.assertEqual(len(store.get_events(job_id='job-1')), 2)
+
+    def test_stores_sharing_directory(self):
+        """Test that two open stores write separate files and both keep their manifest entries"""
+        first = FileAuditStore(self.directory)
+        second = FileAuditStore(self.directory)
+        first.store_events([make_event(i) for i in range(2)])
+        second.store_events([make_event(i) for i in range(2, 5)])
+        first.close()
+        second.close()
+
+        self.assertNotEqual(first.current_file, second.current_file)
+        with open(os.path.join(self.directory, FileAuditStore.MANIFEST_FILE)) as f:
+            manifest = json.load(f)['files']
+        self.assertEqual(sorted(summary['count'] for summary in manifest.values()), [2, 3])
+
+        with mock.patch.object(FileAuditStore, '_read_file', side_effect=AssertionError('file was rescanned')):
+            store = FileAuditStore(self.directory)
+            self.assertEqual(len(store.get_events(job_id='job-1')), 5)
+
+    def test_events_without_timestamps(self):
+        """Test that files whose events carry no timestamps are still searched"""
+        event = make_event(0).to_dict()
+        del event['timestamp']
+        with open(os.path.join(self.directory, 'audit_001.json'), 'w') as f:
+            f.write('[\n' + json.dumps(event) + '\n]')
+        store = FileAuditStore(self.directory)
+        store.store_events([make_event(i) for i in range(1, 3)])
+
+        self.assertEqual(len(store.get_events(limit=2)), 2)
+        self.assertEqual(len(store.get_events()), 3)
+
+    def test_filters_use_postings(self):
+        """Test job, table and time range lookups across partitioned files"""
+        store = FileAuditStore(self.directory)
+        old_event = make_event(0, job_id='job-old')
+        old_event.timestamp = datetime.datetime(2024, 1, 1, 12)
+        store.store_events([old_event] + [make_event(i, job_id=f'job-{i % 2}') for i in range(1, 5)])
+
+        self.assertEqual(len(store.file_indexes), 2)
+        self.assertEqual([e.record_id for e in store.get_events(job_id='job-old')], ['0'])
+        self.assertEqual(sorted(e.record_id for e in store.get_events(job_id='job-1', table_name='parcel')),
+                         ['1', '3'])
+        self.assertEqual(len(store.get_events(start_time=datetime.datetime(2024, 1, 2))), 4)
+        self.assertEqual(len(store.get_events(limit=2)), 2)
+
+class TestBufferedAuditStore(unittest.TestCase):
+    """Test cases for the buffered audit store"""
+
+    def test_batches_and_read_after_write(self):
+        """Test that queued events are written in batches and visible to reads"""
+        inner = RecordingStore()
+        store = BufferedAuditStore(inner, batch_size=10, flush_interval=60)
+
+        for i in range(25):
+            store.store_event(make_event(i))
+
+        self.assertEqual(len(store.get_events(job_id='job-1')), 25)
+        self.assertEqual(inner.batches[:2], [10, 10])
+        store.close()
+
+    def test_close_flushes(self):
+        """Test that closing the store writes all queued events"""
+        inner = RecordingStore()
+        store = BufferedAuditStore(inner, batch_size=1000, flush_interval=60)
+        store.store_events([make_event(i) for i in range(5)])
+
+        store.close()
+
+        self.assertEqual(len(inner.events), 5)
+        self.assertTrue(store.store_event(make_event(5)))
+        self.assertEqual(len(inner.events), 6)
+
+    def test_flush_flushes_wrapped_store(self):
+        """Test that flushing writes queued events and then flushes the wrapped store"""
+        inner = RecordingStore()
+        store = BufferedAuditStore(inner, batch_size=1000, flush_interval=60)
+        store.store_events([make_event(i) for i in range(3)])
+
+        self.assertTrue(store.flush(timeout=5))
+
+        self.assertEqual(len(inner.events), 3)
+        self.assertEqual(inner.flushes, 1)
+        store.close()
+
+    def test_back_pressure(self):
+        """Test that a full queue falls back to synchronous writes instead of dropping events"""
+        gate = threading.Event()
+        inner = RecordingStore(gate)
+        store = BufferedAuditStore(inner, max_queue_size=2, batch_size=1, flush_interval=60, put_timeout=0.01)
+
+        threads = [threading.Thread(target=store.store_event, args=(make_event(i),)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        gate.set()
+        store.close()
+
+        stats = store.get_stats()
+        self.assertEqual(len(inner.events), 6)
+        self.assertGreater(stats['synchronous'], 0)
+        self.assertEqual(stats['failed'], 0)
+
+    def test_audit_system_flushes_on_job_end(self):
+        """Test that logging the job end writes the job's buffered events"""
+        inner = RecordingStore()
+        audit_system = AuditSystem(audit_store=inner, buffer_size=100, flush_interval=60)
+        audit_system.log_operation('job-1', 'parcel', 'insert', '1')
+
+        audit_system.log_job_end('job-1', True, {})
+
+        self.assertEqual(len(inner.events), 2)
+        audit_system.close()
+
+if __name__ == '__main__':
+    unittest.main()
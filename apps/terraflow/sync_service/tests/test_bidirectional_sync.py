@@ -102,5 +102,30 @@ class TestBidirectionalSync(unittest.TestCase):
         except (ImportError, AttributeError):
             self.skipTest("Up-sync API not implemented yet")
 
+    def test_up_sync_coalesce_changes(self):
+        """Test that field changes to the same row collapse into one update"""
+        try:
+            from sync_service.bidirectional_sync import UpSyncEngine
+        except ImportError:
+            self.skipTest("UpSyncEngine not implemented yet")
+            
+        # Skip __init__ so no database connections are needed
+        engine = UpSyncEngine.__new__(UpSyncEngine)
+        
+        changes = [
+            {'table_name': 'property', 'keys': 'prop_id=1', 'field_name': 'land_value', 'new_value': '100', 'action': 'update'},
+            {'table_name': 'property', 'keys': 'prop_id=2', 'field_name': 'land_value', 'new_value': '200', 'action': 'update'},
+            {'table_name': 'property', 'keys': 'prop_id=1', 'field_name': 'imprv_value', 'new_value': '50', 'action': 'update'},
+            {'table_name': 'property', 'keys': 'prop_id=1', 'field_name': 'land_value', 'new_value': '150', 'action': 'update'},
+            {'table_name': 'property', 'keys': 'prop_id=2', 'field_name': 'land_value', 'new_value': None, 'action': 'delete'},
+        ]
+        
+        rounds = engine._coalesce_changes(changes)
+        
+        # One statement per row, with the latest value of each field
+        self.assertEqual(len(rounds), 1)
+        self.assertIn(('property', 'update', {'prop_id': '1'}, {'land_value': '150', 'imprv_value': '50'}), rounds[0])
+        self.assertIn(('property', 'delete', {'prop_id': '2'}, {}), rounds[0])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
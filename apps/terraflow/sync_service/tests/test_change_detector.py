@@ -0,0 +1,172 @@
+"""
+Tests for the TerraFusion Change Detector
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, text
+
+# Import the module to test
+from sync_service.terra_fusion.change_detector import ChangeDetector
+
+def make_engine(rows):
+    """Create an in-memory SQLite parcel table with (county, id, value) rows"""
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE parcel (county TEXT, id INTEGER, value TEXT, PRIMARY KEY (county, id))"))
+        conn.execute(text("INSERT INTO parcel VALUES (:county, :id, :value)"),
+                     [{'county': county, 'id': pk, 'value': value} for county, pk, value in rows])
+    return engine
+
+class TestStreamingHashDetection(unittest.TestCase):
+    """Test cases for the streaming hash strategy against a real database"""
+
+    def setUp(self):
+        """Create source and target databases"""
+        self.source = make_engine([('A', 1, 'a'), ('A', 2, 'b'), ('B', 3, 'c')])
+        self.target = make_engine([('A', 1, 'a'), ('A', 2, 'x'), ('B', 4, 'd')])
+        self.detector = ChangeDetector(self.source, self.target, batch_size=2,
+                                       detection_strategy='stream_hash')
+
+    def detect(self, primary_keys):
+        """Detect changes without allowing a fallback to the in-memory strategy"""
+        with mock.patch.object(self.detector, '_detect_changes_hash',
+                               side_effect=AssertionError('fell back to in-memory hash comparison')):
+            return self.detector.detect_changes('parcel', primary_keys, ['county', 'id', 'value'])
+
+    def test_single_key(self):
+        """Test that changed rows are fetched by key from each side"""
+        changes = self.detect(['id'])
+
+        self.assertEqual(changes['new'], [{'county': 'B', 'id': 3, 'value': 'c'}])
+        self.assertEqual(changes['modified'], [{'county': 'A', 'id': 2, 'value': 'b'}])
+        self.assertEqual(changes['deleted'], [{'county': 'B', 'id': 4, 'value': 'd'}])
+
+    def test_composite_key(self):
+        """Test that composite keys are matched as tuples"""
+        changes = self.detect(['county', 'id'])
+
+        self.assertEqual([record['id'] for record in changes['new']], [3])
+        self.assertEqual([record['id'] for record in changes['modified']], [2])
+        self.assertEqual([record['id'] for record in changes['deleted']], [4])
+
+class TestBucketHashDetection(unittest.TestCase):
+    """Test cases for the bucket fingerprint strategy
+
+    SQLite cannot run the PostgreSQL fingerprint and row hash queries, so they
+    are computed here in Python over the same key range buckets.
+    """
+
+    def setUp(self):
+        """Create source and target databases and a fingerprint directory"""
+        self.directory = tempfile.mkdtemp()
+        self.source = make_engine([('A', i, 'a') for i in range(1, 41)])
+        self.target = make_engine([('A', i, 'x' if i == 17 else 'a') for i in range(1, 41) if i != 33] +
+                                  [('A', 50, 'd')])
+        self.detector = ChangeDetector(self.source, self.target, batch_size=5,
+                                       detection_strategy='bucket_hash',
+                                       fingerprint_directory=self.directory,
+                                       fingerprint_buckets=4)
+
+    def tearDown(self):
+        """Remove the fingerprint directory"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def bucket_fingerprints(self, engine, table_name, pk, columns, bucket_width):
+        """Compute bucket fingerprints like the PostgreSQL query does"""
+        buckets = {}
+        with engine.connect() as conn:
+            for row in conn.execute(text(f"SELECT {', '.join(columns)} FROM {table_name} ORDER BY {pk}")):
+                bucket = buckets.setdefault(row._mapping[pk] // bucket_width, [0, hashlib.md5()])
+                bucket[0] += 1
+                bucket[1].update(repr(tuple(row)).encode())
+        return {bucket: (count, digest.hexdigest()) for bucket, (count, digest) in buckets.items()}
+
+    def detect(self):
+        """Detect changes with bucket fingerprints computed in Python"""
+        stream_pk_hashes = self.detector._stream_pk_hashes
+        with mock.patch.object(self.detector, '_supports_bucket_fingerprints', return_value=True), \
+                mock.patch.object(self.detector, '_get_bucket_fingerprints', side_effect=self.bucket_fingerprints), \
+                mock.patch.object(self.detector, '_stream_pk_hashes',
+                                  side_effect=lambda engine, table_name, primary_keys, columns, in_database, *args:
+                                  stream_pk_hashes(engine, table_name, primary_keys, columns, False, *args)) as stream, \
+                mock.patch.object(self.detector, '_detect_changes_stream_hash',
+                                  side_effect=AssertionError('fell back to streaming hash comparison')):
+            changes = self.detector.detect_changes('parcel', ['id'], ['county', 'id', 'value'])
+        return changes, stream
+
+    def stored_width(self):
+        """Get the bucket width stored for the parcel table"""
+        path = os.path.join(self.directory, 'parcel.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)['bucket_width']
+
+    def test_only_changed_buckets_compared(self):
+        """Test that rows are compared only in buckets whose fingerprints differ"""
+        changes, stream = self.detect()
+
+        self.assertEqual([record['id'] for record in changes['new']], [33])
+        self.assertEqual([record['id'] for record in changes['modified']], [17])
+        self.assertEqual([record['id'] for record in changes['deleted']], [50])
+        # Width 13 over keys 1-50: buckets 1, 2 and 3 changed, bucket 0 did not
+        self.assertEqual(self.stored_width(), 13)
+        self.assertEqual(sorted(call.args[6]['range_start'] for call in stream.call_args_list), [13, 13, 26, 26, 39, 39])
+
+    def test_empty_tables_do_not_fix_width(self):
+        """Test that a width is not stored until the tables have rows"""
+        for engine in (self.source, self.target):
+            with engine.begin() as conn:
+                conn.execute(text("DELETE FROM parcel"))
+
+        changes, _ = self.detect()
+        self.assertEqual(changes, {'new': [], 'modified': [], 'deleted': []})
+        self.assertIsNone(self.stored_width())
+
+        with self.source.begin() as conn:
+            conn.execute(text("INSERT INTO parcel VALUES ('A', 100, 'a')"))
+        self.assertEqual([record['id'] for record in self.detect()[0]['new']], [100])
+        self.assertEqual(self.stored_width(), 1)
+
+    def test_outgrown_width_chosen_again(self):
+        """Test that a width giving far more buckets than wanted is replaced"""
+        self.detector._save_fingerprints('parcel', {'bucket_width': 1})
+
+        changes, _ = self.detect()
+
+        self.assertEqual([record['id'] for record in changes['modified']], [17])
+        self.assertEqual(self.stored_width(), 13)
+
+    def test_bucket_fingerprint_query(self):
+        """Test that fingerprints are read as bucket -> (count, hash)"""
+        engine = mock.MagicMock()
+        conn = engine.connect.return_value.__enter__.return_value
+        conn.execute.return_value = [(0, 3, 'abc'), (2, 1, 'def')]
+
+        fingerprints = self.detector._get_bucket_fingerprints(engine, 'parcel', 'id', ['id', 'value'], 100)
+
+        self.assertEqual(fingerprints, {0: (3, 'abc'), 2: (1, 'def')})
+        query, params = conn.execute.call_args.args
+        self.assertIn("floor(id::numeric / :bucket_width)", str(query))
+        self.assertIn("GROUP BY 1", str(query))
+        self.assertEqual(params, {'bucket_width': 100})
+
+    def test_falls_back_without_bucket_support(self):
+        """Test that SQLite tables use the streaming hash comparison"""
+        self.assertFalse(self.detector._supports_bucket_fingerprints('parcel', ['id']))
+
+        changes = self.detector.detect_changes('parcel', ['id'], ['county', 'id', 'value'])
+
+        self.assertEqual([record['id'] for record in changes['new']], [33])
+        self.assertEqual([record['id'] for record in changes['modified']], [17])
+        self.assertEqual([record['id'] for record in changes['deleted']], [50])
+        self.assertIsNone(self.stored_width())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Tests for the chunked ETL processor
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from sync_service import chunked_etl
+from sync_service.chunked_etl import ChunkedETLProcessor
+from sync_service.enhanced_etl import EnhancedETL
+from sqlalchemy import create_engine
+
+class TestChunkedETLProcessor(unittest.TestCase):
+    """Test cases for the chunked ETL processor"""
+
+    def setUp(self):
+        """Create a source CSV file and a target SQLite database"""
+        self.directory = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.directory, 'tax.csv')
+        self.target_path = os.path.join(self.directory, 'target.db')
+        self.target_connection = f'sqlite:///{self.target_path}'
+
+        self.source_df = pd.DataFrame({
+            'tax_id': [f'T{i:03d}' for i in range(25)],
+            'property_id': [f'P{i:03d}' for i in range(25)],
+            'tax_year': [None if i % 10 == 3 else 2024 for i in range(25)],
+            'total_tax': [float(i * 100) for i in range(25)]
+        })
+        self.source_df.to_csv(self.csv_path, index=False)
+
+        etl = EnhancedETL(db_engine=create_engine(self.target_connection))
+        etl.create_sql_table('tax_data', etl.schemas['tax'])
+        with sqlite3.connect(self.target_path) as conn:
+            conn.execute("CREATE UNIQUE INDEX idx_tax_data_tax_id ON tax_data (tax_id)")
+
+    def tearDown(self):
+        """Remove the temporary files"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def make_processor(self, max_workers=1):
+        """Create a processor loading into the target database"""
+        etl = EnhancedETL(db_engine=create_engine(self.target_connection))
+        return ChunkedETLProcessor(chunk_size=10, max_workers=max_workers, etl=etl)
+
+    def target_count(self):
+        """Count the rows loaded into the target table"""
+        with sqlite3.connect(self.target_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM tax_data").fetchone()[0]
+
+    def test_chunk_boundaries_are_deterministic(self):
+        """Test that a chunk extracted on its own matches the chunk read in order"""
+        processor = self.make_processor()
+
+        total_rows, chunks = processor.plan_chunks(self.csv_path, '', 'file')
+        chunks = list(chunks)
+
+        self.assertEqual(total_rows, 25)
+        self.assertEqual([(spec.start, spec.stop) for spec, _ in chunks], [(0, 10), (10, 20), (20, 25)])
+        spec, chunk_df = chunks[1]
+        pd.testing.assert_frame_equal(
+            processor.extract_chunk(spec, self.csv_path, '', 'file').reset_index(drop=True),
+            chunk_df.reset_index(drop=True)
+        )
+
+    def test_parallel_load(self):
+        """Test that worker processes transform, validate and load every chunk"""
+        processor = self.make_processor(max_workers=2)
+        progress = []
+
+        result = processor.execute_chunked_etl(
+            self.csv_path, '', 'tax', options={'parallel': True},
+            progress_callback=lambda chunk, completed, total: progress.append((completed, total))
+        )
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['chunking']['workers'], 2)
+        self.assertEqual(result['validate']['invalid_records'], 3)
+        self.assertEqual(result['load']['records'], 22)
+        self.assertEqual(self.target_count(), 22)
+        self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+
+    def test_database_chunks_share_engine(self):
+        """Test that chunks are processed in this process by default and share one source engine"""
+        source_path = os.path.join(self.directory, 'source.db')
+        with sqlite3.connect(source_path) as conn:
+            self.source_df.to_sql('tax_source', conn, index=False)
+        source_connection = f'sqlite:///{source_path}'
+        processor = self.make_processor(max_workers=2)
+
+        with mock.patch.object(chunked_etl, 'create_engine', wraps=create_engine) as engine_factory:
+            result = processor.execute_chunked_etl(
+                source_connection, "SELECT * FROM tax_source ORDER BY tax_id", 'tax', source_type='database'
+            )
+
+        self.assertEqual(result['chunking']['workers'], 1)
+        self.assertEqual(result['load']['records'], 22)
+        self.assertEqual(engine_factory.call_count, 1)
+        self.assertEqual(processor._source_engines, {})
+
+    def test_retry_failed_chunk(self):
+        """Test that a failed chunk is rolled back and can be retried alone"""
+        self.source_df.loc[15, 'tax_id'] = 'T012'
+        self.source_df.to_csv(self.csv_path, index=False)
+        processor = self.make_processor()
+
+        result = processor.execute_chunked_etl(self.csv_path, '', 'tax')
+
+        self.assertEqual(result['status'], 'partial')
+        self.assertEqual([chunk['index'] for chunk in result['chunking']['failed_chunks']], [1])
+        self.assertEqual(self.target_count(), 13)
+
+        self.source_df.loc[15, 'tax_id'] = 'T015'
+        self.source_df.to_csv(self.csv_path, index=False)
+        retry = processor.retry_chunk(result['chunking']['failed_chunks'][0], self.csv_path, '', 'tax')
+
+        self.assertIsNone(retry['error'])
+        self.assertEqual(retry['loaded_records'], 9)
+        self.assertEqual(self.target_count(), 22)
+
+    def test_key_range_chunks(self):
+        """Test that a keyed database query is split into key ranges covering every row"""
+        source_path = os.path.join(self.directory, 'source.db')
+        with sqlite3.connect(source_path) as conn:
+            conn.execute("CREATE TABLE parcels (id INTEGER, name TEXT)")
+            conn.executemany("INSERT INTO parcels VALUES (?, ?)",
+                             [(i * 3, f'parcel {i}') for i in range(25)] + [(None, 'unkeyed')])
+        source_connection = f'sqlite:///{source_path}'
+        query = "SELECT id, name FROM parcels"
+        processor = self.make_processor()
+
+        total_rows, chunks = processor.plan_chunks(source_connection, query, 'database', {'key_column': 'id'})
+        specs = [spec for spec, _ in chunks]
+        frames = [processor.extract_chunk(spec, source_connection, query, 'database') for spec in specs]
+
+        self.assertEqual(total_rows, 26)
+        self.assertEqual([(spec.lower, spec.upper) for spec in specs], [(None, 30), (30, 60), (60, None)])
+        self.assertEqual([len(frame) for frame in frames], [11, 10, 5])
+        self.assertEqual(sorted(pd.concat(frames)['name']), sorted(['unkeyed'] + [f'parcel {i}' for i in range(25)]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for the TerraFusion Conflict Resolver
+"""
+import datetime
+import unittest
+
+import pandas as pd
+
+# Import the module to test
+from sync_service.terra_fusion.conflict_resolver import ConflictResolver, MergeStrategy
+
+class TestConflictFrame(unittest.TestCase):
+    """Test cases for frame-based conflict detection and resolution"""
+
+    def setUp(self):
+        """Create aligned parcel records"""
+        self.resolver = ConflictResolver()
+        older = datetime.datetime(2024, 1, 1)
+        newer = datetime.datetime(2024, 2, 1)
+        self.source_records = [
+            {'id': 1, 'owner': 'Smith', 'value': 100.0, 'attributes_json': {'zone': 'R1'}, 'updated_at': older},
+            {'id': 2, 'owner': 'Jones', 'value': 200.0, 'attributes_json': {'zone': 'C1'}, 'updated_at': older},
+            {'id': 3, 'owner': 'Brown', 'value': 300.0, 'attributes_json': None, 'updated_at': newer},
+            {'id': 4, 'owner': 'Green', 'value': 400.0, 'attributes_json': None, 'updated_at': older},
+        ]
+        self.target_records = [
+            {'id': 1, 'owner': 'Smith', 'value': 100.0, 'attributes_json': '{"zone": "R1"}', 'updated_at': older},
+            {'id': 2, 'owner': 'Jonas', 'value': 250.0, 'attributes_json': {'zone': 'C1'}, 'updated_at': newer},
+            {'id': 3, 'owner': 'Brown', 'value': 350.0, 'attributes_json': None, 'updated_at': older},
+            {'id': 4, 'owner': None, 'value': 400.0, 'attributes_json': None, 'updated_at': older},
+        ]
+        self.source = pd.DataFrame(self.source_records)
+        self.target = pd.DataFrame(self.target_records)
+
+    def test_matches_record_detection(self):
+        """Test that frame detection finds the same conflicts as record-by-record detection"""
+        frame = self.resolver.detect_conflicts_frame(self.source, self.target, 'parcel', ['id'])
+
+        expected = {}
+        for source, target in zip(self.source_records, self.target_records):
+            conflict = ConflictResolver().detect_conflicts(source, target, 'parcel', ['id'])
+            if conflict:
+                expected[conflict.conflict_id] = conflict.differences
+
+        conflicts = frame.to_conflicts()
+        self.assertEqual({c.conflict_id: c.differences for c in conflicts}, expected)
+        self.assertEqual(sorted(c.primary_key_values['id'] for c in conflicts), [2, 4])
+
+    def test_column_wise_strategies(self):
+        """Test that strategies are applied column-wise"""
+        frame = self.resolver.detect_conflicts_frame(self.source, self.target, 'parcel', ['id'])
+
+        newer = self.resolver.resolve_conflict_frame(frame, 'newer_wins').set_index('id')
+        self.assertEqual(newer.loc[2, 'owner'], 'Jonas')
+        self.assertEqual(newer.loc[4, 'owner'], 'Green')
+
+        merge = MergeStrategy(field_rules={'owner': 'non_null', 'value': 'target'})
+        merge.name = 'parcel_merge'
+        self.resolver.add_strategy(merge)
+        merged = self.resolver.resolve_conflict_frame(frame, 'parcel_merge').set_index('id')
+        self.assertEqual(merged.loc[2, 'owner'], 'Jones')
+        self.assertEqual(merged.loc[2, 'value'], 250.0)
+        self.assertEqual(merged.loc[4, 'owner'], 'Green')
+        self.assertEqual(self.resolver.get_conflicts(), [])
+
+    def test_record_strategies_fall_back(self):
+        """Test that strategies without a column-wise form resolve record by record"""
+        self.resolver.create_custom_strategy('keep_target', 'Keep target', lambda s, t, c: t)
+        frame = self.resolver.detect_conflicts_frame(self.source, self.target, 'parcel', ['id'])
+
+        resolved = self.resolver.resolve_conflict_frame(frame, 'keep_target')
+
+        self.assertEqual(sorted(resolved['owner'].fillna('')), ['', 'Jonas'])
+        self.assertEqual(len(self.resolver.get_conflicts(status='resolved')), 2)
+
+    def test_three_way_detection(self):
+        """Test that changes on only one side of the base merge cleanly"""
+        base = self.source.copy()
+        base.loc[base['id'] == 2, 'owner'] = 'Jonas'
+        source = self.source.copy()
+        source.loc[source['id'] == 2, 'value'] = 225.0
+
+        frame = self.resolver.detect_conflicts_frame(source, self.target, 'parcel', ['id'], base_df=base)
+
+        self.assertEqual(list(frame.source.index), [2])
+        self.assertEqual(list(frame.differences.columns[frame.differences.iloc[0]]), ['value'])
+        merged = frame.auto_merged.set_index('id')
+        self.assertEqual(merged.loc[3, 'value'], 350.0)
+        self.assertTrue(pd.isna(merged.loc[4, 'owner']))
+
+if __name__ == '__main__':
+    unittest.main()
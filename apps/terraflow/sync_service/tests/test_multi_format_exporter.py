@@ -191,6 +191,88 @@ class TestMultiFormatExporter(unittest.TestCase):
         
         # Verify the new record
         self.assertEqual(df.loc[df['id'] == 4, 'name'].iloc[0], 'David')
+    
+    def test_parquet_stream_export(self):
+        """Test streaming batches to Parquet with one row group per batch."""
+        import pyarrow.parquet as pq
+        
+        batches = [
+            pd.DataFrame({
+                'parcel_id': [f'P{i:04d}' for i in range(start, start + 100)],
+                'property_class': ['RES' if i % 3 else 'COM' for i in range(start, start + 100)],
+                'neighborhood': ['North' if i % 2 else 'South' for i in range(start, start + 100)],
+                'assessed_value': [1000.0 * i for i in range(start, start + 100)]
+            })
+            for start in (0, 100, 200)
+        ]
+        batches[2].loc[5, 'property_class'] = 'AG'
+        
+        parquet_path = self.exporter.export_stream(iter(batches), 'parcels', 'parquet')
+        
+        parquet_file = pq.ParquetFile(parquet_path)
+        self.assertEqual(parquet_file.metadata.num_rows, 300)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        
+        table = parquet_file.read()
+        self.assertTrue(str(table.schema.field('property_class').type).startswith('dictionary'))
+        self.assertFalse(str(table.schema.field('parcel_id').type).startswith('dictionary'))
+        
+        df = table.to_pandas()
+        self.assertEqual(list(df['parcel_id'][:2]), ['P0000', 'P0001'])
+        self.assertEqual(df['property_class'].iloc[205], 'AG')
+        self.assertEqual(df['assessed_value'].sum(), sum(1000.0 * i for i in range(300)))
+    
+    def test_stream_export_widens_schema(self):
+        """Test that columns whose type changes between batches are widened."""
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+
+        def batches():
+            yield pd.DataFrame({'parcel_id': [1, 2], 'remarks': [None, None], 'acres': [1, 2]})
+            yield pd.DataFrame({'parcel_id': [3, 4], 'remarks': ['corner lot', None], 'acres': [30.5, 4]})
+            yield pd.DataFrame({'parcel_id': [5, 6], 'remarks': ['flag lot', 'alley'], 'acres': [6, 7]})
+
+        parquet_path = self.exporter.export_stream(batches(), 'parcels', 'parquet', dictionary_columns=[])
+        feather_path = self.exporter.export_stream(batches(), 'parcels', 'feather', dictionary_columns=[])
+
+        parquet_file = pq.ParquetFile(parquet_path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        for table in (parquet_file.read(), feather.read_table(feather_path)):
+            df = table.to_pandas()
+            self.assertEqual(str(table.schema.field('acres').type), 'double')
+            self.assertEqual(list(df['parcel_id']), [1, 2, 3, 4, 5, 6])
+            self.assertEqual(list(df['acres']), [1.0, 2.0, 30.5, 4.0, 6.0, 7.0])
+            self.assertEqual(list(df['remarks'].iloc[2:].fillna('')), ['corner lot', '', 'flag lot', 'alley'])
+        self.assertEqual(sorted(os.listdir(self.test_dir)),
+                         sorted([os.path.basename(parquet_path), 'parcels.parquet',
+                                 os.path.basename(feather_path), 'parcels.feather']))
+
+    def test_feather_export(self):
+        """Test exporting data to Feather format."""
+        import pyarrow.feather as feather
+        
+        feather_path = self.exporter.export_data(self.sample_df, 'test', 'feather')
+        
+        df = feather.read_table(feather_path).to_pandas()
+        self.assertEqual(list(df['name']), ['Alice', 'Bob', 'Charlie'])
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, 'test.feather')))
+    
+    def test_stream_from_database(self):
+        """Test streaming a query result to CSV and NDJSON in batches."""
+        db_path = os.path.join(self.test_dir, 'source.sqlite')
+        with sqlite3.connect(db_path) as conn:
+            self.sample_df.to_sql('people', conn, index=False)
+        
+        with sqlite3.connect(db_path) as conn:
+            csv_path = self.exporter.export_stream(conn, 'people', 'csv',
+                                                   query="SELECT * FROM people ORDER BY id", batch_size=2)
+            ndjson_path = self.exporter.export_stream(conn, 'people', 'ndjson',
+                                                      query="SELECT * FROM people ORDER BY id", batch_size=2)
+        
+        self.assertEqual(list(pd.read_csv(csv_path)['name']), ['Alice', 'Bob', 'Charlie'])
+        with open(ndjson_path, 'r') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record['id'] for record in records], [1, 2, 3])
         
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
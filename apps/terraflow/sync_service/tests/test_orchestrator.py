@@ -0,0 +1,283 @@
+"""
+Tests for the TerraFusion Self-Healing Orchestrator checkpoints
+"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, text
+
+# Import the module to test
+from sync_service.terra_fusion.orchestrator import RetryPolicy, SelfHealingOrchestrator, SyncOperation, SyncState
+from sync_service.terra_fusion.validator import ReferenceRule, Validator
+
+TABLES = [
+    {'name': 'owner', 'primary_keys': ['id'], 'fields': ['id', 'name']},
+    {'name': 'parcel', 'primary_keys': ['id'], 'fields': ['id', 'owner_id']},
+    {'name': 'sale', 'primary_keys': ['id'], 'fields': ['id', 'parcel_id']}
+]
+
+class StaticChangeDetector:
+    """Change detector returning the same changes for every run"""
+
+    def __init__(self, changes):
+        self.changes = changes
+
+    def detect_changes(self, table_name, primary_keys, columns):
+        return self.changes[table_name]
+
+class TestOrchestratorCheckpoints(unittest.TestCase):
+    """Test cases for per-table checkpoints"""
+
+    def setUp(self):
+        """Create a target database and an orchestrator"""
+        self.directory = tempfile.mkdtemp()
+        self.target_engine = create_engine(f'sqlite:///{self.directory}/target.db')
+        with self.target_engine.begin() as conn:
+            conn.execute(text("CREATE TABLE owner (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(text("CREATE TABLE parcel (id INTEGER PRIMARY KEY, owner_id INTEGER REFERENCES owner (id))"))
+            conn.execute(text("CREATE TABLE sale (id INTEGER PRIMARY KEY, parcel_id INTEGER REFERENCES parcel (id))"))
+            conn.execute(text("INSERT INTO owner VALUES (9, 'old')"))
+            conn.execute(text("INSERT INTO parcel VALUES (9, 9)"))
+
+        self.orchestrator = SelfHealingOrchestrator(
+            change_detector=StaticChangeDetector({
+                'owner': {'new': [{'id': 1, 'name': 'a'}], 'modified': [], 'deleted': [{'id': 9}]},
+                'parcel': {'new': [{'id': 1, 'owner_id': 1}], 'modified': [], 'deleted': [{'id': 9}]},
+                'sale': {'new': [{'id': 1, 'parcel_id': 1}], 'modified': [], 'deleted': []}
+            }),
+            max_parallel_tables=3,
+            state_directory=self.directory
+        )
+
+    def tearDown(self):
+        """Remove the temporary files"""
+        self.target_engine.dispose()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def add_job(self, state):
+        """Register a job state with the orchestrator"""
+        self.orchestrator.active_syncs[state.job_id] = state
+        self.orchestrator.sync_locks[state.job_id] = threading.Lock()
+        self.orchestrator.shutdown_flags[state.job_id] = False
+
+    def test_parallel_tables_keep_own_checkpoints(self):
+        """Test that tables synced in parallel complete only after their deferred deletes"""
+        state = SyncState('job-1', tables=TABLES, apply_mode='bulk')
+        self.add_job(state)
+
+        self.orchestrator._sync_tables('job-1', None, self.target_engine)
+
+        self.assertEqual(sorted(state.get_completed_tables()), ['owner', 'parcel', 'sale'])
+        self.assertEqual(state.stats['processed_tables'], 3)
+        self.assertEqual(state.stats['deleted_records'], 2)
+        self.assertEqual(state.stats['table_throughput']['owner']['records'], 2)
+
+        restored = SyncState.from_dict(state.to_dict())
+        self.assertEqual(restored.table_checkpoints, state.table_checkpoints)
+
+    def test_resume_skips_only_completed_tables(self):
+        """Test that resuming syncs every table not completed, whichever table wrote last"""
+        state = SyncState('job-2', tables=TABLES, table_checkpoints={
+            'owner': {'current_table': 'owner', 'status': 'changes_detected', 'processed_changes': 1},
+            'parcel': {'current_table': 'parcel', 'status': 'completed'}
+        })
+        state.checkpoint = state.table_checkpoints['parcel']
+        self.add_job(state)
+
+        with mock.patch.object(self.orchestrator, '_sync_tables') as sync_tables:
+            self.orchestrator._resume_from_checkpoint('job-2', None, self.target_engine)
+
+        self.assertEqual([table['name'] for table in sync_tables.call_args[0][3]], ['owner', 'sale'])
+
+    def test_validation_checks_references_per_job(self):
+        """Test that reference rules see the target database and forget their keys when the job ends"""
+        validator = Validator()
+        validator.add_rule('parcel', ReferenceRule('owner_id', 'owner', 'id'))
+        self.orchestrator.validator = validator
+        self.orchestrator.change_detector.changes['parcel']['new'].append({'id': 2, 'owner_id': 404})
+        self.add_job(SyncState('job-3', tables=TABLES, apply_mode='bulk'))
+
+        with mock.patch.object(validator, 'clear_reference_cache',
+                               wraps=validator.clear_reference_cache) as clear_reference_cache:
+            self.orchestrator._run_sync('job-3', None, self.target_engine)
+
+        with self.target_engine.connect() as conn:
+            self.assertEqual([row[0] for row in conn.execute(text("SELECT id FROM parcel"))], [1])
+        clear_reference_cache.assert_called_once_with('job-3')
+        self.assertEqual(validator.reference_caches, {})
+
+class TestBulkApply(unittest.TestCase):
+    """Test cases for set-based batch application"""
+
+    def setUp(self):
+        """Create a target table and an orchestrator that does not retry"""
+        self.directory = tempfile.mkdtemp()
+        self.target_engine = create_engine(f'sqlite:///{self.directory}/target.db')
+        with self.target_engine.begin() as conn:
+            conn.execute(text("CREATE TABLE parcel (county TEXT, id INTEGER, owner TEXT NOT NULL, "
+                              "PRIMARY KEY (county, id))"))
+            conn.execute(text("INSERT INTO parcel VALUES ('A', 1, 'old'), ('A', 2, 'old'), ('B', 1, 'old')"))
+
+        self.orchestrator = SelfHealingOrchestrator(retry_policy=RetryPolicy(max_retries=0),
+                                                    batch_size=3, state_directory=self.directory)
+        self.state = SyncState('job-1', tables=TABLES, apply_mode='bulk')
+        self.orchestrator.active_syncs['job-1'] = self.state
+        self.orchestrator.sync_locks['job-1'] = threading.Lock()
+        self.orchestrator.shutdown_flags['job-1'] = False
+
+    def tearDown(self):
+        """Remove the temporary files"""
+        self.target_engine.dispose()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def apply(self, operation_type, records):
+        """Bulk apply records to the parcel table"""
+        self.orchestrator._bulk_apply_records('job-1', 'parcel', ['county', 'id'], operation_type,
+                                              records, self.target_engine)
+
+    def rows(self):
+        """Get the parcel table as (county, id, owner) rows"""
+        with self.target_engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(text("SELECT county, id, owner FROM parcel ORDER BY county, id"))]
+
+    def test_bulk_insert_update_delete(self):
+        """Test that whole batches are inserted, updated and deleted"""
+        self.apply('insert', [{'county': 'B', 'id': i, 'owner': f'new {i}'} for i in range(2, 7)])
+        self.apply('update', [{'county': 'A', 'id': 1, 'owner': 'a1'}, {'county': 'B', 'id': 1, 'owner': 'b1'}])
+        self.apply('delete', [{'county': 'A', 'id': 2}, {'county': 'B', 'id': 6}])
+
+        self.assertEqual(self.rows(), [('A', 1, 'a1'), ('B', 1, 'b1'), ('B', 2, 'new 2'), ('B', 3, 'new 3'),
+                                       ('B', 4, 'new 4'), ('B', 5, 'new 5')])
+        self.assertEqual(self.state.stats['inserted_records'], 5)
+        self.assertEqual(self.state.stats['updated_records'], 2)
+        self.assertEqual(self.state.stats['deleted_records'], 2)
+        self.assertEqual(self.state.completed_operations['parcel']['insert'], {'operations': 2, 'records': 5})
+
+    def test_failed_batch_applied_row_by_row(self):
+        """Test that the good rows of a failed batch land and the bad row is reported"""
+        records = [{'county': 'C', 'id': 1, 'owner': 'c1'}, {'county': 'C', 'id': 2, 'owner': None},
+                   {'county': 'C', 'id': 3, 'owner': 'c3'}]
+
+        with mock.patch.object(self.orchestrator, '_handle_operation_error',
+                               wraps=self.orchestrator._handle_operation_error) as handle_error:
+            self.apply('insert', records)
+            self.apply('update', [{'county': 'A', 'id': 1, 'owner': None}, {'county': 'A', 'id': 2, 'owner': 'a2'}])
+
+        self.assertEqual(self.rows(), [('A', 1, 'old'), ('A', 2, 'a2'), ('B', 1, 'old'), ('C', 1, 'c1'), ('C', 3, 'c3')])
+        self.assertEqual(self.state.stats['inserted_records'], 2)
+        self.assertEqual(self.state.stats['updated_records'], 1)
+        self.assertEqual(self.state.stats['processed_records'], 3)
+
+        self.assertEqual([call.args[1].record_ids for call in handle_error.call_args_list], [['C|2'], ['A|1']])
+        self.assertIn('NOT NULL', handle_error.call_args_list[0].args[2])
+        failed = self.state.get_operations_by_status('failed')
+        self.assertEqual(sorted(operation.record_ids[0] for operation in failed), ['A|1', 'C|2'])
+
+class TestStateJournal(unittest.TestCase):
+    """Test cases for the state snapshot and journal"""
+
+    def setUp(self):
+        """Create an orchestrator with a state directory"""
+        self.directory = tempfile.mkdtemp()
+        self.orchestrator = SelfHealingOrchestrator(state_directory=self.directory,
+                                                    journal_compaction_interval=100)
+        self.snapshot_path, self.journal_path = self.orchestrator._state_paths('job-1')
+
+    def tearDown(self):
+        """Remove the state files"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def make_changes(self, state, prefix):
+        """Add, update and complete some operations"""
+        for name in ('a', 'b'):
+            state.add_operation(SyncOperation(f'{prefix}-{name}', 'parcel', 'insert', [1, 2], [{'id': 1}, {'id': 2}]))
+        state.update_operation(f'{prefix}-a', status='failed', retry_count=1, last_error='locked')
+        state.update_operation(f'{prefix}-b', status='completed')
+        state.increment_stat('processed_records', 2)
+        state.set_checkpoint({'current_table': 'parcel', 'processed_changes': 2})
+
+    def load(self):
+        """Load the job's state with a fresh orchestrator"""
+        return SelfHealingOrchestrator(state_directory=self.directory)._load_state('job-1')
+
+    def test_journal_round_trip(self):
+        """Test that changes appended to the journal replay to the saved state"""
+        state = SyncState('job-1', tables=TABLES)
+        self.orchestrator._save_state(state)
+        for prefix in ('op1', 'op2'):
+            self.make_changes(state, prefix)
+            self.orchestrator._save_state(state)
+
+        self.assertTrue(os.path.exists(self.journal_path))
+        self.assertEqual(self.load().to_dict(), state.to_dict())
+        self.assertEqual(state.completed_operations['parcel']['insert'], {'operations': 2, 'records': 4})
+
+    def test_torn_last_line_ignored(self):
+        """Test that a partly written final entry is skipped"""
+        state = SyncState('job-1', tables=TABLES)
+        self.orchestrator._save_state(state)
+        self.make_changes(state, 'op1')
+        self.orchestrator._save_state(state)
+        with open(self.journal_path, 'a') as f:
+            f.write('{"type": "operation_completed", "operat')
+
+        with self.assertLogs('sync_service.terra_fusion.orchestrator', 'WARNING'):
+            loaded = self.load()
+
+        self.assertEqual(loaded.to_dict(), state.to_dict())
+
+    def test_compaction(self):
+        """Test that a full journal is folded into a new snapshot"""
+        self.orchestrator.journal_compaction_interval = 10
+        state = SyncState('job-1', tables=TABLES)
+        self.orchestrator._save_state(state)
+        self.make_changes(state, 'op1')
+        self.orchestrator._save_state(state)
+        self.assertTrue(os.path.exists(self.journal_path))
+
+        self.make_changes(state, 'op2')
+        self.orchestrator._save_state(state)
+
+        self.assertFalse(os.path.exists(self.journal_path))
+        self.assertEqual(self.orchestrator.journal_lengths['job-1'], 0)
+        self.assertEqual(self.load().to_dict(), state.to_dict())
+
+    def test_stale_journal_not_replayed(self):
+        """Test that a journal left behind by a compaction does not apply twice"""
+        state = SyncState('job-1', tables=TABLES)
+        self.orchestrator._save_state(state)
+        self.make_changes(state, 'op1')
+        self.orchestrator._save_state(state)
+        with open(self.journal_path) as f:
+            stale_journal = f.read()
+
+        self.make_changes(state, 'op2')
+        self.orchestrator._save_state(state, compact=True)
+        with open(self.journal_path, 'w') as f:
+            f.write(stale_journal)
+
+        self.assertEqual(self.load().to_dict(), state.to_dict())
+
+        self.make_changes(state, 'op3')
+        self.orchestrator._save_state(state)
+        self.assertEqual(self.load().to_dict(), state.to_dict())
+
+    def test_failed_save_keeps_changes(self):
+        """Test that changes from a failed journal write are written by the next save"""
+        state = SyncState('job-1', tables=TABLES)
+        self.orchestrator._save_state(state)
+        self.make_changes(state, 'op1')
+        with mock.patch('sync_service.terra_fusion.orchestrator.json.dumps', side_effect=OSError('disk full')):
+            self.orchestrator._save_state(state)
+
+        self.make_changes(state, 'op2')
+        self.orchestrator._save_state(state)
+
+        self.assertEqual(self.load().to_dict(), state.to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -160,6 +160,58 @@ class TestSQLiteExporter(unittest.TestCase):
             self.assertEqual(df.loc[df['id'] == 2, 'use_code'].iloc[0], 'C-Updated')
             # Verify the new record
             self.assertEqual(df.loc[df['id'] == 4, 'assessed_value'].iloc[0], 120000)
+    
+    def test_incremental_merge_with_watermark(self):
+        """Test that watermark merges skip old records and never overwrite newer ones."""
+        working_df = self.working_df.assign(last_update=[datetime(2024, 1, 1, 12, 0, 0, 500)] * 3)
+        db_path = self.exporter.merge_with_working_db(working_df, ['id'], watermark_column='last_update')
+        self.assertEqual(self.exporter.get_watermark('working', db_path), '2024-01-01 12:00:00')
+        
+        merge_data = pd.DataFrame({
+            'id': [1, 2, 4],
+            'owner': ['Stale Owner', 'Jane Smith-Updated', 'New Owner'],
+            'use_code': ['R', 'R', 'I'],
+            'parcel_id': ['123-45-678', '234-56-789', '456-78-901'],
+            'last_update': [datetime(2023, 12, 31), datetime(2024, 2, 1), datetime(2024, 3, 1)]
+        })
+        self.exporter.merge_with_working_db(merge_data, ['id'], db_path, watermark_column='last_update')
+        
+        with sqlite3.connect(db_path) as conn:
+            df = pd.read_sql("SELECT * FROM working ORDER BY id", conn)
+            self.assertEqual(list(df['owner']), ['John Doe', 'Jane Smith-Updated', 'Acme Corp', 'New Owner'])
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'delete')
+        self.assertEqual(self.exporter.get_watermark('working', db_path), '2024-03-01 00:00:00')
+    
+    def test_watermark_keeps_records_in_same_second(self):
+        """Test that records modified within the watermark's second are still merged."""
+        working_df = self.working_df.assign(last_update=[datetime(2024, 1, 1, 12, 0, 0)] * 3)
+        db_path = self.exporter.merge_with_working_db(working_df, ['id'], watermark_column='last_update')
+        
+        merge_data = self.working_df.iloc[:2].assign(
+            owner=['John Doe', 'Late Owner'],
+            last_update=[datetime(2024, 1, 1, 12, 0, 0)] * 2
+        )
+        merge_data.loc[1, 'id'] = 5
+        self.exporter.merge_with_working_db(merge_data, ['id'], db_path, watermark_column='last_update')
+        
+        with sqlite3.connect(db_path) as conn:
+            df = pd.read_sql("SELECT * FROM working ORDER BY id", conn)
+        self.assertEqual(list(df['id']), [1, 2, 3, 5])
+        self.assertEqual(df.loc[df['id'] == 5, 'owner'].iloc[0], 'Late Owner')
+        self.assertEqual(self.exporter.get_watermark('working', db_path), '2024-01-01 12:00:00')
+    
+    def test_merge_with_duplicate_existing_keys(self):
+        """Test merging into a table whose existing keys are not unique."""
+        stats_df = pd.concat([self.stats_df, self.stats_df.iloc[[0]]], ignore_index=True)
+        db_path = self.exporter.create_and_load_stats_db(stats_df)
+        
+        merge_data = pd.DataFrame({'id': [1, 5], 'use_code': ['C', 'R'], 'acres': [9.0, 1.0]})
+        self.exporter.merge_with_stats_db(merge_data, ['id'], db_path)
+        
+        with sqlite3.connect(db_path) as conn:
+            df = pd.read_sql("SELECT * FROM stats ORDER BY id", conn)
+            self.assertEqual(list(df['id']), [1, 1, 2, 3, 5])
+            self.assertEqual(list(df.loc[df['id'] == 1, 'acres']), [9.0, 9.0])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -5,6 +5,8 @@ import unittest
 import datetime
 from unittest.mock import patch, MagicMock
 
+from sqlalchemy import create_engine, text
+
 # Import the module to test
 from sync_service.sync_engine import SyncEngine
 
@@ -84,5 +86,64 @@ class TestSyncEngine(unittest.TestCase):
         self.assertEqual(tables, ["table1", "table2"])
         mock_table_config.query.order_by.assert_called_once()
 
+    @patch('sync_service.sync_engine.SyncJob')
+    @patch('sync_service.sync_engine.db')
+    @patch('sync_service.sync_engine.sa')
+    def test_build_extract_query_keyset(self, mock_sa, mock_db, mock_sync_job):
+        """Test that extract queries page by primary key after the last loaded key"""
+        # Setup
+        mock_query = MagicMock()
+        mock_sync_job.query.return_value = mock_query
+        mock_query.filter_by.return_value = mock_query
+        mock_query.first.return_value = None
+        
+        # Create a sync engine
+        engine = SyncEngine(job_id="test_job", user_id=1)
+        engine.source_engine.dialect.name = 'postgresql'
+        
+        # First page has no keyset condition
+        query, params = engine._build_extract_query("parcels", ["id"], ["id", "name"])
+        self.assertNotIn("WHERE", query)
+        self.assertIn("ORDER BY id", query)
+        self.assertEqual(params, {})
+        
+        # Later pages continue after the last composite key
+        query, params = engine._build_extract_query(
+            "parcels", ["year", "id"], ["year", "id", "name"], last_key=[2024, 17])
+        self.assertIn("(year > :last_key_0) OR (year = :last_key_0 AND id > :last_key_1)", query)
+        self.assertEqual(params, {'last_key_0': 2024, 'last_key_1': 17})
+
+    @patch('sync_service.sync_engine.BATCH_SIZE', 2)
+    @patch('sync_service.sync_engine.SyncJob')
+    @patch('sync_service.sync_engine.db')
+    @patch('sync_service.sync_engine.sa')
+    def test_extract_pages_composite_key(self, mock_sa, mock_db, mock_sync_job):
+        """Test that extract pages run against a database and resume after the last key"""
+        # Setup
+        mock_query = MagicMock()
+        mock_sync_job.query.return_value = mock_query
+        mock_query.filter_by.return_value = mock_query
+        mock_query.first.return_value = None
+        
+        engine = SyncEngine(job_id="test_job", user_id=1)
+        engine.log = MagicMock()
+        engine.source_engine = create_engine('sqlite://')
+        with engine.source_engine.begin() as conn:
+            conn.execute(text("CREATE TABLE parcels (year INTEGER, id INTEGER, name TEXT, PRIMARY KEY (year, id))"))
+            conn.execute(text("INSERT INTO parcels VALUES (:year, :id, :name)"),
+                         [{'year': year, 'id': pk, 'name': f"{year}-{pk}"} for year in (2023, 2024) for pk in (3, 1, 2)])
+        
+        # Every row comes back once, in key order, as plain dicts
+        pages = list(engine._extract_pages("parcels", ["year", "id"], ["year", "id", "name"]))
+        self.assertEqual([len(page) for page in pages], [2, 2, 2])
+        self.assertEqual([record['name'] for page in pages for record in page],
+                         ["2023-1", "2023-2", "2023-3", "2024-1", "2024-2", "2024-3"])
+        
+        # Resuming after a stored key continues with the next row
+        pages = list(engine._extract_pages("parcels", ["year", "id"], ["year", "id", "name"],
+                                           resume_key=[2023, 3]))
+        self.assertEqual([record['name'] for page in pages for record in page],
+                         ["2024-1", "2024-2", "2024-3"])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
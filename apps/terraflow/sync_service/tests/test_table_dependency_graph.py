@@ -0,0 +1,69 @@
+"""
+Tests for the Table Dependency Graph
+"""
+import threading
+import unittest
+
+# Import the module to test
+from sync_service.table_dependency_graph import TableDependencyGraph
+
+class TestTableDependencyGraph(unittest.TestCase):
+    """Test cases for the Table Dependency Graph"""
+
+    def setUp(self):
+        """Build a graph of parcel tables"""
+        self.graph = TableDependencyGraph(['sale', 'parcel', 'owner', 'improvement', 'lookup'])
+        self.graph.add_dependency('parcel', 'owner')
+        self.graph.add_dependency('sale', 'parcel')
+        self.graph.add_dependency('improvement', 'parcel')
+
+    def test_topological_order(self):
+        """Test that parents come before children"""
+        order = self.graph.topological_order()
+
+        self.assertEqual(sorted(order), sorted(self.graph.table_names))
+        self.assertLess(order.index('owner'), order.index('parcel'))
+        self.assertLess(order.index('parcel'), order.index('sale'))
+        self.assertLess(order.index('parcel'), order.index('improvement'))
+
+    def test_reverse_order(self):
+        """Test that children come before parents when reversed"""
+        order = self.graph.topological_order(reverse=True)
+
+        self.assertLess(order.index('sale'), order.index('parcel'))
+        self.assertLess(order.index('improvement'), order.index('parcel'))
+        self.assertLess(order.index('parcel'), order.index('owner'))
+
+    def test_run_failure_releases_dependents(self):
+        """Test that a failing table does not block the rest of the graph"""
+        processed = []
+        lock = threading.Lock()
+
+        def process(name):
+            with lock:
+                processed.append(name)
+            if name == 'parcel':
+                raise RuntimeError('load failed')
+
+        results = self.graph.run(process, max_workers=3)
+
+        self.assertEqual(sorted(processed), sorted(self.graph.table_names))
+        self.assertIsInstance(results['parcel'], RuntimeError)
+        self.assertIsNone(results['sale'])
+
+    def test_run_cycle(self):
+        """Test that a dependency cycle is broken instead of deadlocking"""
+        graph = TableDependencyGraph(['a', 'b'])
+        graph.add_dependency('a', 'b')
+        graph.add_dependency('b', 'a')
+
+        self.assertEqual(graph.topological_order(), ['a', 'b'])
+
+    def test_should_stop(self):
+        """Test that no tables are started once a stop is requested"""
+        results = self.graph.run(lambda name: None, max_workers=1, should_stop=lambda: True)
+
+        self.assertEqual(results, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Tests for the TerraFusion Transformer
+"""
+import datetime
+import shutil
+import tempfile
+import unittest
+
+# Import the module to test
+from sync_service.terra_fusion.transformer import MappingPlan, Transformer
+
+MAPPING = {
+    'field_mappings': {
+        'parcel_id': {'source_field': 'id', 'type': 'str', 'transform': 'format:P{}'},
+        'owner': {'source_field': 'owner_name', 'transform': 'uppercase'},
+        'acres': {'source_field': 'acres', 'type': 'float', 'default': -1.0},
+        'zone': {'source_field': 'zoning', 'default': 'R1'},
+        'situs': {'source_field': 'address', 'transform': 'truncate:8'}
+    },
+    'constants': {'county': 'Benton'},
+    'complex_mappings': [
+        {'target_field': 'value_thousands', 'expression': "python:source['value'] // 1000"},
+        {'target_field': 'label', 'expression': "python:record['owner_name'].split()[0]"}
+    ]
+}
+
+class TestMappingPlan(unittest.TestCase):
+    """Test cases for compiled mapping plans"""
+
+    def setUp(self):
+        """Create a transformer without mapping files"""
+        self.directory = tempfile.mkdtemp()
+        self.transformer = Transformer(mapping_directory=self.directory)
+        self.records = [
+            {'id': 7, 'owner_name': 'ada lovelace', 'acres': '2.5', 'value': 100000,
+             'zoning': 'C2', 'address': '12 Main Street'},
+            {'id': 8, 'owner_name': 'alan turing', 'acres': 'n/a', 'value': 5000, 'address': '3 Elm'}
+        ]
+
+    def tearDown(self):
+        """Remove the mapping directory"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_plan_matches_per_record_results(self):
+        """Test that a compiled batch gives the records the per-record interpreter gave"""
+        expected = [
+            {'parcel_id': 'P7', 'owner': 'ADA LOVELACE', 'acres': 2.5, 'zone': 'C2', 'situs': '12 Main ',
+             'county': 'Benton', 'value_thousands': 100, 'label': 'ada'},
+            {'parcel_id': 'P8', 'owner': 'ALAN TURING', 'acres': -1.0, 'zone': 'R1', 'situs': '3 Elm',
+             'county': 'Benton', 'value_thousands': 5, 'label': 'alan'}
+        ]
+
+        plan = self.transformer.compile_mapping(MAPPING)
+
+        self.assertIsInstance(plan, MappingPlan)
+        self.assertEqual(plan.apply_batch(self.records), expected)
+        self.assertEqual([plan.apply(record) for record in self.records], expected)
+        self.assertEqual(self.transformer.transform_records(self.records, custom_mapping=MAPPING), expected)
+
+    def test_plan_recompiled_after_edit(self):
+        """Test that editing a mapping in place is not hidden by the plan cache"""
+        mapping = {'field_mappings': {'parcel_id': {'source_field': 'id'}}}
+        self.assertIs(self.transformer.compile_mapping(mapping),
+                      self.transformer.compile_mapping({'field_mappings': {'parcel_id': {'source_field': 'id'}}}))
+
+        mapping['field_mappings']['owner'] = {'source_field': 'owner_name'}
+        mapping['constants'] = {'county': 'Benton'}
+
+        self.assertEqual(self.transformer.transform_record(self.records[0], custom_mapping=mapping),
+                         {'parcel_id': 7, 'owner': 'ada lovelace', 'county': 'Benton'})
+
+    def test_compiled_transformations(self):
+        """Test that compiled transformations match the documented behavior"""
+        cases = [
+            ('uppercase', 'abc', 'ABC'),
+            ('lowercase', 'ABC', 'abc'),
+            ('trim', '  abc ', 'abc'),
+            ('truncate:2', 'abc', 'ab'),
+            ('truncate:x', 'abc', 'abc'),
+            ('format:{:>4}', 7, '   7'),
+            ('format:{1}', 7, 7),
+            ('replace:a,o', 'banana', 'bonono'),
+            ('uppercase', 12, 12),
+            ('reverse', 'abc', 'abc')
+        ]
+
+        for transform, value, expected in cases:
+            with self.subTest(transform=transform, value=value):
+                self.assertEqual(self.transformer._compile_transformation(transform)(value), expected)
+                self.assertEqual(self.transformer._apply_transformation(value, transform), expected)
+        self.assertIs(self.transformer._compile_transformation('trim'),
+                      self.transformer._compile_transformation('trim'))
+
+    def test_compiled_expressions(self):
+        """Test python: expressions, syntax errors and unsupported prefixes"""
+        evaluate = self.transformer._compile_expression("python:source['a'] * 2 + record['b']", 'total')
+        self.assertEqual(evaluate({'a': 3, 'b': 1}), 7)
+
+        broken = self.transformer._compile_expression("python:source['a'] +", 'total')
+        with self.assertRaises(SyntaxError):
+            broken({'a': 1})
+
+        no_builtins = self.transformer._compile_expression("python:open('x')", 'total')
+        with self.assertRaises(NameError):
+            no_builtins({})
+
+        self.assertIsNone(self.transformer._compile_expression('ai:summarize', 'total'))
+
+    def test_type_conversion_registration_recompiles(self):
+        """Test that registering a type conversion is picked up by cached plans"""
+        mapping = {'field_mappings': {'sold': {'source_field': 'sold', 'type': 'date'}}}
+        record = {'sold': '2024-03-01'}
+        self.assertEqual(self.transformer.transform_record(record, custom_mapping=mapping), record)
+
+        self.transformer.register_type_conversion('str', 'date', datetime.date.fromisoformat)
+
+        self.assertEqual(self.transformer.transform_record(record, custom_mapping=mapping),
+                         {'sold': datetime.date(2024, 3, 1)})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,7 @@ from app import db, app
 from sync_service.data_sanitization import (
     DataSanitizer, SanitizationRule, SanitizationLog, create_data_sanitizer
 )
-from sync_service.models import FieldConfiguration, TableConfiguration
+from sync_service.models import FieldConfiguration
 
 
 class TestDataSanitization(unittest.TestCase):
@@ -38,20 +38,11 @@ class TestDataSanitization(unittest.TestCase):
         self.mock_field_config_instance = MagicMock()
         self.mock_field_config.query.filter_by.return_value.first.return_value = self.mock_field_config_instance
         self.mock_field_config_instance.data_type = 'personal_data'
-        
-        # Patch TableConfiguration.query
-        self.table_config_patcher = patch('sync_service.data_sanitization.TableConfiguration')
-        self.mock_table_config = self.table_config_patcher.start()
-        
-        # Mock query result for table config
-        self.mock_table_config_instance = MagicMock()
-        self.mock_table_config.query.filter_by.return_value.first.return_value = self.mock_table_config_instance
     
     def tearDown(self):
         """Clean up after tests"""
         self.patcher.stop()
         self.field_config_patcher.stop()
-        self.table_config_patcher.stop()
         self.app_context.pop()
     
     def test_sanitizer_initialization(self):
@@ -246,6 +237,26 @@ class TestDataSanitization(unittest.TestCase):
             self.assertFalse(was_modified)
             self.assertEqual(value, 123)
     
+    def test_sanitize_field_writes_logs(self):
+        """Test that a single field call writes its log, and a record writes its logs once"""
+        self.sanitizer.sanitize_field("users", "full_name", "John Doe", 1, field_type="personal_data")
+        
+        rows = self.mock_db.session.bulk_insert_mappings.call_args[0][1]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["field_name"], "full_name")
+        self.mock_db.session.commit.assert_called_once()
+        
+        self.mock_db.session.commit.reset_mock()
+        self.mock_field_config.query.filter_by.return_value.all.return_value = [
+            MagicMock(field_name="name", data_type="personal_data"),
+            MagicMock(field_name="ssn", data_type="financial")
+        ]
+        self.sanitizer.sanitize_record("members", {"id": 2, "name": "Jane Roe", "ssn": "123-45-6789"})
+        
+        rows = self.mock_db.session.bulk_insert_mappings.call_args[0][1]
+        self.assertEqual(len(rows), 2)
+        self.mock_db.session.commit.assert_called_once()
+    
     def test_sanitize_record(self):
         """Test sanitizing an entire record"""
         # Mock FieldConfiguration query
@@ -303,9 +314,53 @@ class TestDataSanitization(unittest.TestCase):
             context={"field_type": "personal_data"}
         )
         
+        # Logs are buffered until flushed
+        self.mock_db.session.commit.assert_not_called()
+        self.assertEqual(self.sanitizer.flush_logs(), 1)
+        
         # Verify log entry was created and saved
+        rows = self.mock_db.session.bulk_insert_mappings.call_args[0][1]
+        self.assertEqual(rows[0]["context"], {"field_type": "personal_data"})
         self.mock_db.session.add.assert_called()
-        self.mock_db.session.commit.assert_called()
+        self.mock_db.session.commit.assert_called_once()
+    
+    def test_sanitize_records(self):
+        """Test sanitizing a batch of records with one configuration query"""
+        self.mock_field_config.query.filter_by.return_value.all.return_value = [
+            MagicMock(field_name="name", data_type="personal_data"),
+            MagicMock(field_name="ssn", data_type="financial")
+        ]
+        records = [
+            {"id": i, "name": f"Person {i}", "ssn": "123-45-6789", "notes": None}
+            for i in range(5)
+        ]
+        
+        result = self.sanitizer.sanitize_records("users", records)
+        
+        self.assertEqual([r["id"] for r in result], list(range(5)))
+        self.assertEqual(result[0]["name"], "PXXXXXX0")
+        self.assertIsNone(result[0]["ssn"])
+        self.assertIsNone(result[0]["notes"])
+        self.assertEqual(self.mock_field_config.query.filter_by.call_count, 1)
+        
+        # One bulk insert and one commit for the whole batch
+        rows = self.mock_db.session.bulk_insert_mappings.call_args[0][1]
+        self.assertEqual(len(rows), 10)
+        self.mock_db.session.commit.assert_called_once()
+    
+    def test_summary_logging(self):
+        """Test that summary logging writes counts per field and rule"""
+        sanitizer = DataSanitizer(self.test_job_id, log_detail="summary")
+        records = [{"id": i, "name": f"Person {i}"} for i in range(3)]
+        
+        sanitizer.sanitize_records("users", records, skip_fields={"id"})
+        
+        rows = self.mock_db.session.bulk_insert_mappings.call_args[0][1]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["context"]["count"], 3)
+        self.assertEqual(rows[0]["context"]["rule_name"], "mask_text")
+        sync_log = self.mock_db.session.add.call_args[0][0]
+        self.assertEqual(sync_log.record_count, 3)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,374 @@
+"""
+Test Legacy Format Handlers
+
+This module tests the batch readers of the legacy format handlers.
+"""
+
+import os
+import sys
+import struct
+import shutil
+import tempfile
+import unittest
+import warnings
+from unittest.mock import patch
+
+import pandas as pd
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from legacy_formats.csv_handler import CSVHandler
+from legacy_formats.dbf_handler import DBFHandler, DBFReader
+from legacy_formats.excel_handler import ExcelHandler
+from legacy_formats.fixed_width_handler import FixedWidthHandler, decode_fixed_width
+from legacy_formats.xml_handler import HAS_LXML, XMLHandler
+
+
+def write_dbf(file_path, fields, records, deleted=()):
+    """Write a dBASE III file with the given (name, type, length, decimal) fields"""
+    record_length = 1 + sum(length for _, _, length, _ in fields)
+    header_length = 32 + 32 * len(fields) + 1
+
+    with open(file_path, "wb") as f:
+        f.write(struct.pack("<B3BIHH20x", 0x03, 124, 1, 1, len(records), header_length, record_length))
+        for name, field_type, length, decimal in fields:
+            f.write(struct.pack("<11sc4xBB14x", name.encode("ascii"), field_type.encode("ascii"), length, decimal))
+        f.write(b"\x0d")
+        for i, record in enumerate(records):
+            f.write(b"*" if i in deleted else b" ")
+            for (_, field_type, length, _), value in zip(fields, record):
+                text = "" if value is None else str(value)
+                if field_type == "N":
+                    f.write(text.rjust(length).encode("ascii"))
+                else:
+                    f.write(text.ljust(length).encode("cp437"))
+        f.write(b"\x1a")
+
+
+class TestCSVHandler(unittest.TestCase):
+    """Test cases for the CSV handler"""
+
+    def setUp(self):
+        """Write a test file with variable-length rows and a short-row head"""
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "sales.csv")
+        self.df = pd.DataFrame({
+            "parcel_id": [i for i in range(2000)],
+            "price": [f"{i * 10.5}" for i in range(2000)],
+            "sale_date": [f"2024-01-{i % 28 + 1:02d}" for i in range(2000)],
+            "qualified": ["Y" if i % 3 else "N" for i in range(2000)],
+            "remarks": ["" if i < 20 else "x" * (i * 7 % 60) for i in range(2000)]
+        })
+        self.df.to_csv(self.file_path, index=False)
+        self.handler = CSVHandler()
+
+    def tearDown(self):
+        """Remove the test file"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_schema_types(self):
+        """Test that column types are inferred from the whole sample"""
+        schema = self.handler.read_schema(self.file_path)
+        columns = schema["columns"]
+
+        self.assertEqual({name: column["type"] for name, column in columns.items()}, {
+            "parcel_id": "integer",
+            "price": "float",
+            "sale_date": "date",
+            "qualified": "boolean",
+            "remarks": "string"
+        })
+        self.assertEqual(columns["parcel_id"]["sample_values"], ["0", "1", "2", "3", "4"])
+        self.assertEqual(schema["row_count_estimate"], 2000)
+        self.assertTrue(schema["row_count_exact"])
+
+    def test_sampled_windows(self):
+        """Test that large files are sampled at the head, middle and tail"""
+        with open(self.file_path, "a") as f:
+            f.write("unknown,0.5,2024-02-01,Y,tail\n")
+
+        with patch("legacy_formats.csv_handler.SAMPLE_WINDOW_SIZE", 1024):
+            windows = self.handler._read_sample_windows(self.file_path)
+            schema = self.handler.read_schema(self.file_path)
+
+        self.assertEqual(len(windows), 3)
+        self.assertTrue(all(window.endswith(b"\n") for window in windows))
+        self.assertEqual(schema["columns"]["parcel_id"]["type"], "string")
+        self.assertFalse(schema["row_count_exact"])
+        self.assertLess(abs(schema["row_count_estimate"] - 2001), 2001 * 0.05)
+
+    def test_count_rows(self):
+        """Test that the exact count scans every line"""
+        with open(self.file_path, "a") as f:
+            f.write("2000,1.5,2024-02-01,Y,no line break")
+
+        self.assertEqual(self.handler.count_rows(self.file_path), 2001)
+        with patch("legacy_formats.csv_handler.SCAN_BLOCK_SIZE", 100):
+            self.assertEqual(CSVHandler(exact_row_count=True)._estimate_row_count(self.file_path), 2001)
+
+
+class TestExcelHandler(unittest.TestCase):
+    """Test cases for the Excel handler"""
+
+    def setUp(self):
+        """Write a test workbook"""
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "parcels.xlsx")
+        self.df = pd.DataFrame({
+            "parcel_id": [f"P{i:04d}" for i in range(25)],
+            "assessed_value": [1000.5 * i for i in range(25)],
+            "year": [2024] * 25
+        })
+        self.df.to_excel(self.file_path, index=False)
+        self.handler = ExcelHandler()
+
+    def tearDown(self):
+        """Remove the test workbook"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_read_data_in_batches(self):
+        """Test that batches cover every row once, with the header reused"""
+        batches = list(self.handler.read_data(self.file_path, batch_size=10))
+
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        for batch in batches:
+            self.assertEqual(list(batch.columns), ["parcel_id", "assessed_value", "year"])
+        pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), self.df)
+
+    def test_workbook_opened_once(self):
+        """Test that reading does not re-parse the workbook for every batch"""
+        with patch("legacy_formats.excel_handler.pd.read_excel") as read_excel:
+            batches = list(self.handler.read_data(self.file_path, batch_size=5))
+
+        read_excel.assert_not_called()
+        self.assertEqual(len(batches), 5)
+
+    def test_header_names(self):
+        """Test that blank and repeated header cells are named like pandas names them"""
+        self.assertEqual(
+            self.handler._clean_header(("id", None, " name ", "name", None)),
+            ["id", "Unnamed: 1", "name", "name.1"]
+        )
+
+    def test_row_count_from_dimensions(self):
+        """Test that the row count comes from the sheet dimensions"""
+        self.assertEqual(self.handler._estimate_row_count(self.file_path, 0), 25)
+        self.assertEqual(self.handler.read_schema(self.file_path)["row_count_estimate"], 25)
+
+
+class TestDBFHandler(unittest.TestCase):
+    """Test cases for the DBF handler"""
+
+    def setUp(self):
+        """Write a test DBF file with some deleted records"""
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "parcels.dbf")
+        self.fields = [("PARCEL_ID", "C", 10, 0), ("OWNER", "C", 20, 0), ("VALUE", "N", 12, 2),
+                       ("ACRES", "N", 6, 0), ("SALE_DATE", "D", 8, 0), ("VACANT", "L", 1, 0)]
+        self.records = [
+            (f"P{i:04d}", "Zoë Owner" if i % 7 == 0 else None, f"{i * 1000.25:.2f}",
+             i if i % 5 else None, f"2024{(i % 12) + 1:02d}15", "T" if i % 2 else "F")
+            for i in range(25)
+        ]
+        write_dbf(self.file_path, self.fields, self.records, deleted={3, 17})
+        self.handler = DBFHandler()
+
+    def tearDown(self):
+        """Remove the test DBF file"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_decodes_fields(self):
+        """Test that each field type is decoded into a typed column"""
+        with DBFReader(self.file_path) as reader:
+            df = reader.read_records(0, 8)
+
+        self.assertEqual(list(df.columns), ["PARCEL_ID", "OWNER", "VALUE", "ACRES", "SALE_DATE", "VACANT"])
+        self.assertEqual(df["PARCEL_ID"].tolist(), ["P0000", "P0001", "P0002", "P0004", "P0005", "P0006", "P0007"])
+        self.assertEqual(df["OWNER"].iloc[0], "Zoë Owner")
+        self.assertEqual(df["OWNER"].isna().tolist(), [False, True, True, True, True, True, False])
+        self.assertEqual(df["VALUE"].tolist()[:2], [0.0, 1000.25])
+        self.assertTrue(pd.isna(df["ACRES"].iloc[0]))
+        self.assertEqual(df["ACRES"].iloc[1], 1)
+        self.assertEqual(df["SALE_DATE"].iloc[1], pd.Timestamp(2024, 2, 15))
+        self.assertEqual(df["VACANT"].tolist()[:2], [False, True])
+
+    def test_read_data_in_batches(self):
+        """Test that batches cover every record once and skip deleted records"""
+        batches = list(self.handler.read_data(self.file_path, batch_size=10))
+
+        self.assertEqual([len(batch) for batch in batches], [9, 9, 5])
+        parcel_ids = pd.concat(batches)["PARCEL_ID"].tolist()
+        self.assertEqual(parcel_ids, [f"P{i:04d}" for i in range(25) if i not in (3, 17)])
+
+    def test_parallel_matches_sequential(self):
+        """Test that worker processes decode the same batches in the same order"""
+        with DBFReader(self.file_path) as reader:
+            sequential = list(reader.iter_batches(batch_size=6))
+            parallel = list(reader.iter_batches(batch_size=6, max_workers=2))
+
+        self.assertEqual(len(parallel), 5)
+        for expected, actual in zip(sequential, parallel):
+            pd.testing.assert_frame_equal(expected, actual)
+
+    def test_schema(self):
+        """Test that the schema comes from the field descriptors"""
+        schema = self.handler.read_schema(self.file_path)
+
+        self.assertEqual(schema["row_count"], 25)
+        self.assertEqual(schema["columns"]["VALUE"]["dbf_type"], "N")
+        self.assertEqual(schema["columns"]["VALUE"]["decimal_places"], 2)
+        self.assertEqual(schema["columns"]["OWNER"]["length"], 20)
+
+
+
+class TestFixedWidthHandler(unittest.TestCase):
+    """Test cases for the fixed-width handler"""
+
+    def setUp(self):
+        """Write a test fixed-width file with known column specs"""
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "parcels.txt")
+        lines = [f"P{i:05d}{'Owner ' + str(i):<12}{i * 10:>8}{'2024-01-15' if i else '          '}"
+                 for i in range(25)]
+        lines[20] = "X" + lines[20][1:14] + "   n/a  " + lines[20][22:]
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        self.handler = FixedWidthHandler()
+        self.handler.column_specs = [("parcel_id", 0, 5), ("owner", 6, 17), ("value", 18, 25), ("sale_date", 26, 35)]
+        self.handler.has_inferred_specs = True
+
+    def tearDown(self):
+        """Remove the test file"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_read_data_in_batches(self):
+        """Test that batches cover every line once with types fixed from the first batch"""
+        batches = list(self.handler.read_data(self.file_path, batch_size=10))
+
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        df = pd.concat(batches, ignore_index=True)
+        self.assertEqual(df["parcel_id"].iloc[3], "P00003")
+        self.assertEqual(df["owner"].iloc[3], "Owner 3")
+        self.assertEqual(df["value"].iloc[3], 30)
+        self.assertTrue(pd.isna(df["value"].iloc[20]))
+        self.assertEqual(df["sale_date"].iloc[1], pd.Timestamp(2024, 1, 15))
+        self.assertTrue(pd.isna(df["sale_date"].iloc[0]))
+
+    def test_number_columns_keep_one_dtype(self):
+        """Test that number columns keep one dtype in every batch and dropped values are logged"""
+        acres = {7: "", 9: "n/a"}
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("".join(f"{'12.5' if i == 8 else i:>4}{acres.get(i, i * 1.5):>8}\n" for i in range(10)))
+        self.handler.column_specs = [("id", 0, 3), ("acres", 4, 11)]
+
+        with self.assertLogs("legacy_formats.fixed_width_handler", "WARNING") as logs:
+            batches = list(self.handler.read_data(self.file_path, batch_size=5))
+
+        self.assertEqual([str(batch["id"].dtype) for batch in batches], ["Int64", "Int64"])
+        self.assertEqual([str(batch["acres"].dtype) for batch in batches], ["float64", "float64"])
+        self.assertEqual(batches[1]["acres"].iloc[1], 9.0)
+        self.assertTrue(pd.isna(batches[1]["acres"].iloc[2]))
+        self.assertTrue(pd.isna(batches[1]["id"].iloc[3]))
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("Set 1 of 5 values in column id to missing", logs.output[0])
+        self.assertIn("Set 1 of 5 values in column acres to missing", logs.output[1])
+
+    def test_ragged_lines_and_multibyte_characters(self):
+        """Test that short lines are padded and columns are character offsets"""
+        data = "Zoë  12\r\nAl\r\n\r\nBob  7\r\n".encode("utf-8")
+
+        df = decode_fixed_width(data, [("name", 0, 4), ("count", 5, 6)], "utf-8")
+
+        self.assertEqual(df["name"].tolist(), ["Zoë", "Al", "Bob"])
+        self.assertEqual(df["count"].fillna("").tolist(), ["12", "", "7"])
+
+    def test_parallel_matches_sequential(self):
+        """Test that worker processes decode the file in order"""
+        sequential = pd.concat(self.handler.read_data(self.file_path, batch_size=5), ignore_index=True)
+        self.handler.max_workers = 2
+        parallel = pd.concat(self.handler.read_data(self.file_path, batch_size=5), ignore_index=True)
+
+        pd.testing.assert_frame_equal(sequential, parallel)
+
+
+
+class TestXMLHandler(unittest.TestCase):
+    """Test cases for the XML handler"""
+
+    def setUp(self):
+        """Write a test XML roll"""
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "roll.xml")
+        parcels = "".join(
+            f'<parcel id="P{i:04d}"><owner>Owner {i}</owner><value>{i * 100}</value>'
+            f'<address><city>City {i % 3}</city></address></parcel><!-- row {i} -->'
+            for i in range(25)
+        )
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(f'<?xml version="1.0"?><roll><header><county>Benton</county></header>'
+                    f'<parcels>{parcels}</parcels></roll>')
+        self.handler = XMLHandler()
+        self.handler.use_lxml = False
+
+    def tearDown(self):
+        """Remove the test file"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_read_data_in_batches(self):
+        """Test that rows and columns are detected and read in batches"""
+        batches = list(self.handler.read_data(self.file_path, batch_size=10))
+
+        self.assertEqual(self.handler.row_xpath, "./parcels/parcel")
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        df = pd.concat(batches, ignore_index=True)
+        self.assertEqual(df["id"].tolist()[:2], ["P0000", "P0001"])
+        self.assertEqual(df["owner"].iloc[24], "Owner 24")
+        self.assertEqual(df["value"].iloc[3], 300)
+        self.assertEqual(df["city"].iloc[4], "City 1")
+
+    def test_never_parses_whole_tree(self):
+        """Test that schema and data reads stream the file and clear finished rows"""
+        with patch("legacy_formats.xml_handler.ET.parse", side_effect=AssertionError("whole tree parsed")), \
+                patch("legacy_formats.xml_handler.ANALYSIS_ELEMENT_LIMIT", 40):
+            schema = self.handler.read_schema(self.file_path)
+            rows = list(self.handler._iter_row_elements(self.file_path))
+
+        self.assertEqual(schema["row_count_estimate"], 25)
+        self.assertEqual(len(rows), 25)
+        self.assertTrue(all(len(row) == 0 and not row.attrib for row in rows))
+
+    @unittest.skipUnless(HAS_LXML, "lxml is not installed")
+    def test_lxml_matches_elementtree(self):
+        """Test that lxml and ElementTree read the same data"""
+        expected = pd.concat(self.handler.read_data(self.file_path), ignore_index=True)
+        handler = XMLHandler()
+        handler.use_lxml = True
+
+        pd.testing.assert_frame_equal(pd.concat(handler.read_data(self.file_path), ignore_index=True), expected)
+
+    @unittest.skipUnless(HAS_LXML, "lxml is not installed")
+    def test_lxml_skips_comments_in_rows(self):
+        """Test that comments inside rows do not become columns or warn on every batch"""
+        parcels = "".join(
+            f'<parcel><!-- parcel {i} --><owner>Owner {i}</owner><sold>Sold {i}</sold></parcel>'
+            for i in range(10)
+        )
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(f'<?xml version="1.0"?><roll>{parcels}</roll>')
+        handler = XMLHandler()
+        handler.use_lxml = True
+
+        schema = handler.read_schema(self.file_path)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            df = pd.concat(handler.read_data(self.file_path, batch_size=5), ignore_index=True)
+
+        self.assertNotIn("error", schema)
+        self.assertEqual(list(schema["columns"]), ["owner", "sold"])
+        self.assertEqual(df["sold"].iloc[9], "Sold 9")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,12 +8,15 @@ import os
 import sys
 import unittest
 import time
+import tempfile
+import threading
 from unittest.mock import patch, MagicMock
 
 # Add parent directory to path to import modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from performance.optimization import PerformanceOptimizer, cached, timed
+from performance.cache import LRUTTLCache, SQLiteCacheBackend, MISSING
 
 
 class TestPerformanceOptimizer(unittest.TestCase):
@@ -229,6 +232,85 @@ class TestPerformanceOptimizer(unittest.TestCase):
         # Restore original size
         self.optimizer.max_cache_size = original_size
 
+    def test_cache_key_equal_objects(self):
+        """Test that equal complex arguments share a cache key"""
+        class Query:
+            def __init__(self, table):
+                self.table = table
+        
+        def test_function(query):
+            return query.table
+        
+        key1 = self.optimizer._create_cache_key(test_function, (Query("parcels"),), {})
+        key2 = self.optimizer._create_cache_key(test_function, (Query("parcels"),), {})
+        key3 = self.optimizer._create_cache_key(test_function, (Query("sales"),), {})
+        
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(key1, key3)
+
+    def test_cache_single_flight(self):
+        """Test that concurrent misses for the same key compute once"""
+        call_count = 0
+        started = threading.Event()
+        
+        @self.optimizer.cache(ttl=5)
+        def slow_function(x):
+            nonlocal call_count
+            call_count += 1
+            started.set()
+            time.sleep(0.2)
+            return x * 2
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow_function(10))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(results, [20] * 5)
+        self.assertEqual(call_count, 1)
+
+    def test_cache_byte_limit(self):
+        """Test eviction by total size in bytes"""
+        cache = LRUTTLCache(max_entries=100, max_bytes=3000)
+        
+        for i in range(5):
+            cache.set(f"key{i}", "x" * 1000, ttl=10)
+        
+        stats = cache.get_stats()
+        self.assertLessEqual(stats["bytes"], 3000)
+        self.assertIs(cache.get("key0"), MISSING)
+        self.assertEqual(cache.get("key4"), "x" * 1000)
+
+    def test_shared_cache_backend(self):
+        """Test that separate caches share results through the SQLite backend"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache.db")
+            first = LRUTTLCache(shared_backend=SQLiteCacheBackend(path))
+            second = LRUTTLCache(shared_backend=SQLiteCacheBackend(path))
+            
+            first.set("parcels", {"count": 3}, ttl=10)
+            self.assertEqual(second.get("parcels"), {"count": 3})
+            self.assertEqual(second.get_stats()["shared_hits"], 1)
+            
+            first.clear("^parc")
+            self.assertIs(LRUTTLCache(shared_backend=SQLiteCacheBackend(path)).get("parcels"), MISSING)
+
+    def test_configure_rebuilds_cache(self):
+        """Test that configuring an existing optimizer applies the cache settings"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {"cache_shared_path": os.path.join(temp_dir, "cache.db"), "max_cache_size": 2}
+            self.optimizer.configure(config)
+            other = PerformanceOptimizer(config)
+
+            self.optimizer._cache.set("parcels", [1, 2, 3], ttl=10)
+
+            self.assertEqual(self.optimizer.max_cache_size, 2)
+            self.assertEqual(self.optimizer.cache_default_ttl, 10)
+            self.assertIsNotNone(self.optimizer._cache.shared_backend)
+            self.assertEqual(other._cache.get("parcels"), [1, 2, 3])
+
     def test_measure_time_decorator(self):
         """Test time measurement decorator"""
         # Define a function that will exceed the slow threshold
@@ -0,0 +1,181 @@
+"""
+Test Spatial Service
+
+This module tests keyset paging and counting of layer features.
+"""
+
+import os
+import sys
+import json
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+from psycopg2 import sql
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api import spatial_service
+from api.spatial_service import spatial_bp
+
+
+def render(query):
+    """Render a composed query as SQL text, with identifiers double-quoted"""
+    if isinstance(query, str):
+        return query
+    if isinstance(query, sql.Composed):
+        return "".join(render(part) for part in query.seq)
+    if isinstance(query, sql.Identifier):
+        return ".".join(f'"{name}"' for name in query.strings)
+    return query.string
+
+
+class FakeLayerCursor:
+    """Cursor over an in-memory layer answering the queries the feature endpoint makes"""
+
+    def __init__(self, layer):
+        self.layer = layer
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        pass
+
+    def execute(self, query, params=None):
+        text = render(query)
+        params = list(params or [])
+        self.layer.queries.append(text)
+
+        if "geometry_columns" in text:
+            self.rows = [{"geometry_column": "geom", "srid": 4326}]
+        elif "pg_index" in text:
+            self.rows = [{"column_name": column} for column in self.layer.primary_key]
+        elif "information_schema.columns" in text:
+            self.rows = [{"column_name": column} for column in ("id", "name", "geom")]
+        elif text.startswith("EXPLAIN"):
+            self.rows = [{"QUERY PLAN": json.dumps([{"Plan": {"Plan Rows": self.layer.estimate}}])}]
+        elif "COUNT(*)" in text:
+            self.rows = [{"count": len(self.layer.features)}]
+        else:
+            features = sorted(self.layer.features, key=lambda feature: feature["id"])
+            if '"id" > %s' in text:
+                after = int(params.pop(0))
+                features = [feature for feature in features if feature["id"] > after]
+            limit = params.pop(0) if "LIMIT %s" in text else None
+            offset = params.pop(0) if "OFFSET %s" in text else 0
+            features = features[offset:offset + limit if limit is not None else None]
+            self.rows = [dict(feature) for feature in features]
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+class FakeLayerConnection:
+    """Connection handing out cursors over an in-memory layer"""
+
+    def __init__(self, features, primary_key=("id",), estimate=0):
+        self.features = features
+        self.primary_key = list(primary_key)
+        self.estimate = estimate
+        self.queries = []
+
+    def cursor(self, name=None, cursor_factory=None):
+        return FakeLayerCursor(self)
+
+    def rollback(self):
+        pass
+
+
+class TestLayerFeatures(unittest.TestCase):
+    """Test cases for paging through layer features"""
+
+    def setUp(self):
+        """Serve a layer of ten parcels, two without geometry"""
+        self.features = [
+            {"id": i, "name": f"Parcel {i}",
+             "__geojson": None if i in (4, 9) else json.dumps({"type": "Point", "coordinates": [i, i]})}
+            for i in range(1, 11)
+        ]
+        self.connection = FakeLayerConnection(self.features, estimate=12)
+
+        for name, replacement in (("get_db_connection", lambda: self.connection),
+                                  ("release_db_connection", lambda conn: None)):
+            patcher = patch.object(spatial_service, name, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        app = Flask(__name__)
+        app.register_blueprint(spatial_bp)
+        self.client = app.test_client()
+
+    def get_features(self, **params):
+        """Request a page of features and decode the GeoJSON"""
+        response = self.client.get("/api/v1/spatial/layer/parcels/features", query_string=params)
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        return json.loads(response.get_data(as_text=True))
+
+    def page_through(self, **params):
+        """Follow nextCursor from the first page to the last"""
+        pages = [self.get_features(limit=3, **params)]
+        while "nextCursor" in pages[-1]:
+            pages.append(self.get_features(limit=3, cursor=pages[-1]["nextCursor"], **params))
+        return pages
+
+    def test_cursor_pages_cover_layer_once(self):
+        """Test that following cursors returns every feature once, past pages ending without geometry"""
+        for stream in ("false", "true"):
+            with self.subTest(stream=stream):
+                pages = self.page_through(stream=stream)
+
+                ids = [feature["properties"]["id"] for page in pages for feature in page["features"]]
+                self.assertEqual(ids, [1, 2, 3, 5, 6, 7, 8, 10])
+                self.assertEqual([page.get("nextCursor") for page in pages], [3, 6, 9, None])
+                self.assertEqual(pages[0]["features"][0]["geometry"], {"type": "Point", "coordinates": [1, 1]})
+                self.assertNotIn("__geojson", pages[0]["features"][0]["properties"])
+
+    def test_cursor_query_pages_by_key(self):
+        """Test that a cursor filters and orders by the primary key instead of using OFFSET"""
+        self.get_features(limit=3, cursor=6, offset=30)
+
+        query = self.connection.queries[-1]
+        self.assertIn('WHERE "id" > %s ORDER BY "id" LIMIT %s', query)
+        self.assertNotIn("OFFSET", query)
+        self.assertNotIn('"geom",', query)
+        self.assertIn('ST_AsGeoJSON("geom") AS __geojson', query)
+
+    def test_count_modes(self):
+        """Test exact, estimated and skipped total counts"""
+        exact = self.get_features(limit=3)
+        self.assertEqual((exact["totalFeatures"], exact["countMode"]), (10, "exact"))
+
+        estimate = self.get_features(limit=3, count="estimate")
+        self.assertEqual((estimate["totalFeatures"], estimate["countMode"]), (12, "estimate"))
+
+        self.assertNotIn("totalFeatures", self.get_features(limit=3, count="none"))
+        self.assertNotIn("totalFeatures", self.get_features(limit=3, stream="true"))
+        self.assertEqual(self.client.get("/api/v1/spatial/layer/parcels/features?count=some").status_code, 400)
+
+    def test_cursor_needs_single_column_key(self):
+        """Test that layers without a single-column primary key cannot be paged by cursor"""
+        self.connection.primary_key = ["county", "id"]
+
+        response = self.client.get("/api/v1/spatial/layer/parcels/features?cursor=3")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("nextCursor", self.get_features(limit=3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Test Supabase Connection Pool
+
+This module tests the bounded Supabase client pool.
+"""
+
+import os
+import sys
+import time
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import supabase_connection_pool as pool_module
+from supabase_connection_pool import ConnectionPool, PoolTimeoutError
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test cases for the connection pool"""
+
+    def setUp(self):
+        """Replace client creation with plain objects"""
+        patcher = patch.object(pool_module, "create_client", lambda url, key: object(), create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = ConnectionPool("https://example.supabase.co", "key", max_size=2)
+
+    def test_reuses_released_connections(self):
+        """Test that a released connection is reused instead of creating another"""
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+
+        self.assertIs(self.pool.acquire(), conn)
+        self.assertEqual(self.pool.get_status()["created"], 1)
+
+    def test_hard_cap_times_out(self):
+        """Test that the pool never grows past its size and times out waiters"""
+        self.pool.acquire()
+        self.pool.acquire()
+
+        with self.assertRaises(PoolTimeoutError):
+            self.pool.acquire(timeout=0.05)
+
+        status = self.pool.get_status()
+        self.assertEqual(status["total"], 2)
+        self.assertEqual(status["timeouts"], 1)
+        self.assertEqual(status["utilization"], 1.0)
+        self.assertEqual(status["waiting"], 0)
+
+    def test_waiters_served_in_order(self):
+        """Test that released connections go to waiters first come, first served"""
+        pool = ConnectionPool("https://example.supabase.co", "key", max_size=1)
+        held = pool.acquire()
+        served = []
+
+        def wait_for_connection(name):
+            conn = pool.acquire(timeout=5)
+            served.append(name)
+            pool.release(conn)
+
+        threads = []
+        for name in ("first", "second", "third"):
+            thread = threading.Thread(target=wait_for_connection, args=(name,))
+            thread.start()
+            threads.append(thread)
+            while pool.get_status()["waiting"] < len(threads):
+                time.sleep(0.001)
+
+        pool.release(held)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(served, ["first", "second", "third"])
+        self.assertEqual(pool.get_status()["waits"], 3)
+
+    def test_acquire_reclaims_orphans(self):
+        """Test that connections left by exited threads are reclaimed without the reaper"""
+        errors = []
+
+        def acquire_without_release():
+            try:
+                self.pool.acquire(timeout=1)
+            except PoolTimeoutError as e:
+                errors.append(e)
+
+        for _ in range(5):
+            thread = threading.Thread(target=acquire_without_release)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.pool.get_status()["total"], 2)
+        self.assertEqual(self.pool.get_status()["orphaned"], 4)
+
+    def test_waiter_reclaims_orphan(self):
+        """Test that a waiting caller gets the connection of a holder that exits"""
+        self.pool.acquire()
+        acquired = threading.Event()
+        exited = threading.Event()
+
+        def hold_until_released():
+            self.pool.acquire()
+            acquired.set()
+            exited.wait()
+
+        thread = threading.Thread(target=hold_until_released)
+        thread.start()
+        acquired.wait()
+        threading.Timer(0.1, exited.set).start()
+
+        self.assertIsNotNone(self.pool.acquire(timeout=5))
+        thread.join()
+        self.assertEqual(self.pool.get_status()["orphaned"], 1)
+
+    def test_reap(self):
+        """Test that expired idle connections are removed and orphaned ones reclaimed"""
+        thread = threading.Thread(target=self.pool.acquire)
+        thread.start()
+        thread.join()
+        idle = self.pool.acquire()
+        self.pool.release(idle)
+        idle.last_used -= pool_module.IDLE_TIMEOUT_SECONDS + 1
+
+        self.assertEqual(self.pool.reap(), 2)
+
+        status = self.pool.get_status()
+        self.assertEqual(status["orphaned"], 1)
+        self.assertEqual(status["expired"], 1)
+        self.assertEqual(status["total"], 1)
+        self.assertEqual(status["active"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
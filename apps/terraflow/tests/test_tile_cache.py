@@ -0,0 +1,111 @@
+"""
+Test Tile Cache
+
+This module tests the vector tile cache.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.tile_cache import TileCache, tile_range, tiles_for_bbox, COUNTY_EXTENT
+
+
+class TestTileCache(unittest.TestCase):
+    """Test cases for the tile cache"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = TileCache(self.cache_dir, memory_limit_bytes=1024)
+        self.z = 12
+        self.x, self.y = tile_range((-119.2, 46.2, -119.2, 46.2), self.z)[:2]
+
+    def tearDown(self):
+        """Clean up test environment"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_get_or_generate(self):
+        """Test that tiles are generated once and then served from the cache"""
+        calls = []
+
+        def generate():
+            calls.append(True)
+            return b"tile"
+
+        self.assertEqual(self.cache.get_or_generate("parcels", self.z, self.x, self.y, generate), b"tile")
+        self.assertEqual(self.cache.get_or_generate("parcels", self.z, self.x, self.y, generate), b"tile")
+        self.assertEqual(len(calls), 1)
+
+        metrics = self.cache.get_metrics()
+        self.assertEqual(metrics["generated"], 1)
+        self.assertEqual(metrics["memory_hits"], 1)
+        self.assertEqual(metrics["hit_rate"], 0.5)
+
+    def test_disk_tiles_survive_restart(self):
+        """Test that tiles are read back from disk by a new cache instance"""
+        self.cache.put("parcels", self.z, self.x, self.y, b"tile")
+
+        cache = TileCache(self.cache_dir)
+        self.assertEqual(cache.get("parcels", self.z, self.x, self.y), b"tile")
+        self.assertEqual(cache.get_metrics()["disk_hits"], 1)
+
+    def test_invalidate_bbox(self):
+        """Test that only tiles near the changed area are invalidated"""
+        self.cache.put("parcels", self.z, self.x, self.y, b"near")
+        self.cache.put("parcels", self.z, self.x + 5, self.y, b"far")
+
+        removed = self.cache.invalidate_bbox("parcels", (-119.2, 46.2, -119.2, 46.2))
+
+        self.assertEqual(removed, 1)
+        self.assertIsNone(self.cache.get("parcels", self.z, self.x, self.y))
+        self.assertEqual(self.cache.get("parcels", self.z, self.x + 5, self.y), b"far")
+
+    def test_invalidate_layer(self):
+        """Test that bumping the layer version invalidates all of its tiles"""
+        self.cache.put("parcels", self.z, self.x, self.y, b"tile")
+
+        self.assertEqual(self.cache.invalidate_layer("parcels"), 2)
+        self.assertIsNone(self.cache.get("parcels", self.z, self.x, self.y))
+        self.assertEqual(TileCache(self.cache_dir).get_layer_version("parcels"), 2)
+
+    def test_invalidation_seen_by_other_instances(self):
+        """Test that caches sharing a directory stop serving tiles another one invalidated"""
+        worker_a = TileCache(self.cache_dir, version_check_seconds=0)
+        worker_b = TileCache(self.cache_dir, version_check_seconds=0)
+        worker_a.put("parcels", self.z, self.x, self.y, b"old")
+        self.assertEqual(worker_b.get("parcels", self.z, self.x, self.y), b"old")
+
+        worker_a.invalidate_bbox("parcels", (-119.2, 46.2, -119.2, 46.2))
+        self.assertIsNone(worker_b.get("parcels", self.z, self.x, self.y))
+
+        worker_b.put("parcels", self.z, self.x, self.y, b"new")
+        self.assertEqual(worker_a.get("parcels", self.z, self.x, self.y), b"new")
+
+        self.assertEqual(worker_b.invalidate_layer("parcels"), 2)
+        self.assertIsNone(worker_a.get("parcels", self.z, self.x, self.y))
+        self.assertEqual(worker_a.invalidate_layer("parcels"), 3)
+        self.assertEqual(worker_b.get_layer_version("parcels"), 3)
+
+    def test_invalid_layer_name(self):
+        """Test that layer names cannot escape the cache directory"""
+        with self.assertRaises(ValueError):
+            self.cache.get("..", 1, 0, 0)
+
+    def test_tiles_for_bbox(self):
+        """Test tile enumeration over the county extent"""
+        tiles = list(tiles_for_bbox(COUNTY_EXTENT, 10, 11))
+        min_x, min_y, max_x, max_y = tile_range(COUNTY_EXTENT, 10)
+
+        self.assertEqual(sum(1 for z, _, _ in tiles if z == 10),
+                         (max_x - min_x + 1) * (max_y - min_y + 1))
+        self.assertTrue(all(z in (10, 11) for z, _, _ in tiles))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Vector Tile Cache Seeder for GeoAssessmentPro
+
+This script pre-generates vector tiles for one or more layers over a range of
+zoom levels, so the first map views after a deploy or re-sync are served from
+the tile cache. By default the county extent is seeded.
+
+Usage:
+  python seed_tile_cache.py --layer parcels --min-zoom 10 --max-zoom 16 [--bbox minx,miny,maxx,maxy]
+"""
+
+import os
+import sys
+import json
+import argparse
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("seed_tile_cache")
+
+# Add parent directory to path to import shared modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.spatial_service import seed_tiles, invalidate_tiles
+from api.tile_cache import get_tile_cache
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Pre-seed the vector tile cache")
+    parser.add_argument("--layer", "-l", action="append", required=True,
+                        help="Layer to seed (can be given multiple times)")
+    parser.add_argument("--min-zoom", type=int, default=10, help="Lowest zoom level to seed")
+    parser.add_argument("--max-zoom", type=int, default=16, help="Highest zoom level to seed")
+    parser.add_argument("--bbox", "-b", help="Bounding box to seed: minx,miny,maxx,maxy (default: county extent)")
+    parser.add_argument("--srid", type=int, choices=[4326, 3857], default=4326,
+                        help="SRID of the bounding box")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Invalidate the layer's cached tiles before seeding")
+    args = parser.parse_args()
+
+    if args.min_zoom < 0 or args.max_zoom < args.min_zoom:
+        logger.error("Zoom range must satisfy 0 <= min-zoom <= max-zoom")
+        return 1
+
+    bbox = None
+    if args.bbox:
+        try:
+            bbox = [float(value) for value in args.bbox.split(",")]
+            if len(bbox) != 4:
+                raise ValueError
+        except ValueError:
+            logger.error("bbox should be in format: minx,miny,maxx,maxy")
+            return 1
+
+    for layer_name in args.layer:
+        try:
+            if args.refresh:
+                invalidate_tiles(layer_name)
+            result = seed_tiles(layer_name, args.min_zoom, args.max_zoom, bbox, args.srid)
+            print(json.dumps(result))
+        except Exception as e:
+            logger.error(f"Error seeding tiles for {layer_name}: {str(e)}")
+            return 1
+
+    print(json.dumps(get_tile_cache().get_metrics()))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())